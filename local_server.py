@@ -1,10 +1,16 @@
 import json
 import logging
+import os
+import time
+from typing import Iterator, Optional
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from src.lambda_function import lambda_handler
+from src.application.dtos.message_dto import ProcessMessageInput
+from src.domain.entities.deadline import Deadline
+from src.presentation.handlers import lambda_handler as presentation_handler
 
 # Configuração de Logs
 logging.basicConfig(level=logging.INFO)
@@ -17,8 +23,24 @@ app = FastAPI(
 )
 
 
+# Orçamento por requisição no servidor local (a Lambda usa o tempo restante real)
+LOCAL_DEADLINE_MS = int(os.getenv("LOCAL_DEADLINE_MS", "10000"))
+
+
 class ChatRequest(BaseModel):
     message: str
+    # Id da conversa: sem ele, o turno não usa nem grava histórico de sessão
+    session: Optional[str] = None
+
+
+class LocalLambdaContext:
+    """Simula o contexto da Lambda com um orçamento fixo (LOCAL_DEADLINE_MS)."""
+
+    def __init__(self, budget_ms: int = LOCAL_DEADLINE_MS):
+        self._expires_at = time.monotonic() + budget_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(int((self._expires_at - time.monotonic()) * 1000), 0)
 
 
 @app.post("/chat")
@@ -27,13 +49,15 @@ async def chat(request: ChatRequest):
     Simula a invocação da Lambda via API Gateway
     """
     # Simula estrutura do evento API Gateway
-    event = {"body": json.dumps({"message": request.message})}
-    context = {}  # Contexto vazio para simulação
+    event = {
+        "body": json.dumps({"message": request.message, "session": request.session})
+    }
+    context = LocalLambdaContext()
 
     logger.info(f"Recebendo mensagem: {request.message}")
 
-    # Chama o handler original
-    response = lambda_handler(event, context)
+    # Chama o handler assíncrono (não bloqueia o event loop durante RAG/LLM)
+    response = await presentation_handler.alambda_handler(event, context)
 
     # Processa resposta
     if response["statusCode"] != 200:
@@ -48,6 +72,56 @@ async def chat(request: ChatRequest):
         return response["body"]
 
 
+def _sse_event(data: dict, event: str = None) -> str:
+    """Formata um evento Server-Sent Events."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/chat/stream")
+def chat_stream(request: ChatRequest):
+    """
+    Versão em streaming do /chat via Server-Sent Events.
+    Os fragmentos do LLM são enviados assim que gerados (menor time-to-first-token).
+    Endpoint síncrono: o FastAPI o executa no threadpool, pois `stream` faz a
+    verificação de segurança, o RAG e os caches de forma bloqueante; o gerador
+    de eventos também é consumido no threadpool pelo StreamingResponse.
+    """
+    logger.info(f"Recebendo mensagem (stream): {request.message}")
+
+    if not request.message:
+        raise HTTPException(status_code=400, detail="Mensagem vazia")
+
+    input_dto = ProcessMessageInput(
+        user_id="anonymous",
+        session_id=request.session,
+        message=request.message,
+        platform="api",
+        deadline=Deadline.after(LOCAL_DEADLINE_MS / 1000),
+    )
+    output = presentation_handler.process_message_uc.stream(input_dto)
+
+    def event_source() -> Iterator[str]:
+        yield _sse_event({"risk_detected": output.risk_detected}, event="meta")
+        try:
+            for chunk in output.chunks:
+                yield _sse_event({"token": chunk})
+        except Exception as e:
+            logger.error(f"Erro durante o streaming: {str(e)}", exc_info=True)
+            yield _sse_event({"error": "Erro interno do servidor"}, event="error")
+        yield _sse_event({}, event="done")
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok", "environment": "local_docker"}
+    return {
+        "status": "ok",
+        "environment": "local_docker",
+        "llm": presentation_handler.llm_resilience_stats(),
+    }
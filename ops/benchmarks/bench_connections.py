@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+Benchmark do overhead de conexão por requisição contra um servidor HTTP local
+que imita o bedrock-runtime (POST /model/{id}/invoke). Cada conexão nova paga
+`--handshake-ms` (simula TCP + TLS até a região) e as requisições chegam em
+rajadas de `--concurrency` chamadas. Todos os cenários reutilizam o cliente
+entre chamadas: boto3 com a configuração padrão (pool de 10 conexões) x o da
+ClientFactory (pool dimensionado + keep-alive), com e sem deadline por chamada
+(call_timeout) e, para comparação, um cliente por segundo de timeout (como o
+BedrockLLM fazia antes); httpx.Client padrão x o da ClientFactory.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.infrastructure.client_factory import (  # noqa: E402
+    ClientFactory,
+    ClientSettings,
+    call_timeout,
+)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # o padrão (5) recusa conexões sob concorrência
+
+    def __init__(self, handshake_ms: float, latency_ms: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.handshake_ms = handshake_ms
+        self.latency_ms = latency_ms
+        self.connections = 0
+        self._lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake_ms / 1000)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency_ms / 1000)
+        body = json.dumps({"generation": "Resposta simulada."}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(server: StandInServer, call, requests: int, concurrency: int):
+    server.connections = 0
+    latencies = []
+
+    def timed(_):
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    # Rajadas de `concurrency` chamadas: entre elas todas as conexões voltam ao
+    # pool e um pool menor que a rajada descarta o excedente
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(max(1, requests // concurrency)):
+            list(executor.map(timed, range(concurrency)))
+    return statistics.median(latencies), statistics.quantiles(latencies, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de pool de conexões")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    import boto3
+    import httpx
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    server = StandInServer(args.handshake_ms, args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    body = json.dumps({"prompt": "Oi"})
+
+    default_client = boto3.client(
+        "bedrock-runtime", region_name="us-east-1", endpoint_url=endpoint
+    )
+    factory = ClientFactory(ClientSettings(max_pool_connections=args.concurrency))
+    pooled_client = factory.aws_client(
+        "bedrock-runtime", endpoint_url=endpoint, max_attempts=1, per_call_timeout=True
+    )
+    default_http = httpx.Client()
+    shared_http = factory.http_client()
+
+    def invoke(client):
+        # Como o BedrockLLM: ler o corpo devolve a conexão ao pool
+        return lambda: client.invoke_model(modelId="m", body=body)["body"].read()
+
+    def deadline() -> float:
+        # Tempo restante até o deadline: varia a cada requisição
+        return random.uniform(1.0, 10.0)
+
+    # Cliente próprio (pool frio) para comparar as conexões novas com o sem deadline
+    deadline_client = ClientFactory(
+        ClientSettings(max_pool_connections=args.concurrency)
+    ).aws_client(
+        "bedrock-runtime", endpoint_url=endpoint, max_attempts=1, per_call_timeout=True
+    )
+
+    def invoke_with_deadline():
+        with call_timeout(deadline()):
+            invoke(deadline_client)()
+
+    def invoke_client_per_timeout():
+        seconds = max(int(math.ceil(deadline())), 1)
+        client = factory.aws_client(
+            "bedrock-runtime",
+            endpoint_url=endpoint,
+            read_timeout=seconds,
+            max_attempts=1,
+        )
+        invoke(client)()
+
+    def post(client):
+        return lambda: client.post(f"{endpoint}/model/m/invoke", content=body)
+
+    scenarios = {
+        "boto3 padrão (pool 10)": invoke(default_client),
+        "boto3 ClientFactory": invoke(pooled_client),
+        "  + deadline por chamada": invoke_with_deadline,
+        "  cliente por timeout": invoke_client_per_timeout,
+        "httpx padrão": post(default_http),
+        "httpx ClientFactory": post(shared_http),
+    }
+    for name, call in scenarios.items():
+        call()  # aquece (import/assinatura) fora da medição
+        if call is invoke_client_per_timeout:
+            # Um cliente (e pool) por segundo de timeout: todos criados antes
+            for seconds in range(1, 11):
+                factory.aws_client(
+                    "bedrock-runtime",
+                    endpoint_url=endpoint,
+                    read_timeout=seconds,
+                    max_attempts=1,
+                )
+        p50, p99 = run(server, call, args.requests, args.concurrency)
+        print(
+            f"{name:<26} p50={p50:6.1f} ms  p99={p99:6.1f} ms  "
+            f"conexões novas={server.connections}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
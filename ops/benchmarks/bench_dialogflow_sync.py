@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+"""
+Benchmark da sincronização do DialogflowManager contra um agente em memória
+(InMemoryAgent) com latência de rede injetada: agente sintético com N intents
+e M entidades (parte das intents usa entidades como parâmetro), sincronizado
+em modo serial e concorrente, primeiro criando tudo e depois atualizando.
+Reporta tempo total, chamadas à API, pico de chamadas simultâneas e p50/p99
+de latência por RPC. `--rpm` aplica o token bucket (cota do projeto). Por fim,
+compara o sync completo com o `apply` incremental após alterar `--changed`
+intents.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.dialogflow.in_memory_agent import InMemoryAgent  # noqa: E402
+from src.dialogflow.manager import DialogflowManager  # noqa: E402
+
+
+def synthetic_config(intents: int, entities: int, dependent_share: float) -> dict:
+    entity_names = [f"entidade_{i}" for i in range(entities)]
+    config = {
+        "entities": [
+            {
+                "display_name": name,
+                "kind": "KIND_MAP",
+                "entries": [
+                    {"value": f"{name}_{j}", "synonyms": [f"{name}_{j}"]}
+                    for j in range(5)
+                ],
+            }
+            for name in entity_names
+        ],
+        "intents": [],
+    }
+    dependent = int(intents * dependent_share) if entity_names else 0
+    for i in range(intents):
+        intent = {
+            "display_name": f"intent_{i}",
+            "training_phrases": [f"frase {i} {j}" for j in range(10)],
+            "messages": [{"text": [f"resposta {i}"]}],
+        }
+        if i < dependent:
+            intent["parameters"] = [
+                {
+                    "display_name": "item",
+                    "entity_type_display_name": f"@{entity_names[i % len(entity_names)]}",
+                }
+            ]
+        config["intents"].append(intent)
+    return config
+
+
+def build_manager(agent: InMemoryAgent, workers: int, rpm: float):
+    return DialogflowManager(
+        agent.parent.split("/")[1],
+        max_workers=workers,
+        requests_per_minute=rpm or None,
+        intents_client=agent.intents_client,
+        entity_types_client=agent.entity_types_client,
+    )
+
+
+def run(agent: InMemoryAgent, path: str, workers: int, rpm: float) -> dict:
+    manager = build_manager(agent, workers, rpm)
+    agent.max_in_flight = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.sync_from_json(path)
+    elapsed = time.perf_counter() - started
+    latencies = sorted(
+        sample for samples in manager.rpc_latencies.values() for sample in samples
+    )
+    failed = manager.stats["intents_failed"] + manager.stats["entities_failed"]
+    return {
+        "elapsed": elapsed,
+        "rpcs": sum(manager.rpc_counts.values()),
+        "max_in_flight": agent.max_in_flight,
+        "failed": failed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da sincronização")
+    parser.add_argument("--intents", type=int, default=120)
+    parser.add_argument("--entities", type=int, default=15)
+    parser.add_argument("--dependent-share", type=float, default=0.3)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=15.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rpm", type=float, default=0, help="0 = sem limitador")
+    parser.add_argument("--changed", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger("DialogflowAutomation").setLevel(logging.WARNING)
+    config = synthetic_config(args.intents, args.entities, args.dependent_share)
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as f:
+        json.dump(config, f)
+        path = f.name
+
+    print(
+        f"agente: {args.intents} intents, {args.entities} entidades | "
+        f"latência {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms | "
+        f"rpm={args.rpm or '-'}"
+    )
+    try:
+        baseline = {}
+        for workers in args.workers:
+            agent = InMemoryAgent(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+            for phase in ("criação", "atualização"):
+                result = run(agent, path, workers, args.rpm)
+                baseline.setdefault(phase, result["elapsed"])
+                print(
+                    f"{phase:<12} workers={workers:<3} "
+                    f"tempo={result['elapsed']:6.2f}s "
+                    f"({baseline[phase] / result['elapsed']:4.1f}x)  "
+                    f"rpcs={result['rpcs']:<4} em voo={result['max_in_flight']:<3} "
+                    f"falhas={result['failed']}  "
+                    f"rpc p50={result['p50']:.0f} ms p99={result['p99']:.0f} ms"
+                )
+
+        # Deploy incremental: só as intents alteradas vão à API
+        workers = max(args.workers)
+        state = path + ".state"
+        agent = InMemoryAgent(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_manager(agent, workers, args.rpm).sync_from_json(path, state)
+        for intent in config["intents"][: args.changed]:
+            intent["training_phrases"].append("frase nova")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+        for name, deploy in (
+            ("sync", lambda m: m.sync_from_json(path)),
+            ("apply", lambda m: m.apply(path, state)),
+        ):
+            manager = build_manager(agent, workers, args.rpm)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                deploy(manager)
+            print(
+                f"{args.changed} intents alteradas, {name:<5} workers={workers:<3} "
+                f"tempo={time.perf_counter() - started:6.2f}s  "
+                f"rpcs={sum(manager.rpc_counts.values())}"
+            )
+    finally:
+        for leftover in (path, path + ".state"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+"""
+Benchmark do caminho rápido de intents (IntentMatcher): tráfego simulado com
+variações das frases de treino do Dialogflow (sem acento, com erro de
+digitação, com palavras extras) misturadas a perguntas novas, ou as mensagens
+de `--traffic` (uma por linha). Reporta a fração respondida sem LLM, acertos de
+intent, perguntas novas desviadas por engano e a latência do match e do
+pipeline com e sem o caminho rápido (RAG e LLM simulados).
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.application.dtos.message_dto import ProcessMessageInput  # noqa: E402
+from src.application.services.fallback_responder import (  # noqa: E402
+    load_canned_responses,
+)
+from src.application.services.intent_matcher import IntentMatcher  # noqa: E402
+from src.application.use_cases.process_message import ProcessUserMessage  # noqa: E402
+from src.domain.interfaces.repositories import (  # noqa: E402
+    ContextRepository,
+    LLMProvider,
+)
+from src.utils.text_normalization import fold_accents  # noqa: E402
+
+CONFIG = os.path.join(
+    os.path.dirname(__file__), "../../src/dialogflow/data/initial_config.json"
+)
+
+NOVEL_QUESTIONS = [
+    "Qual a relação entre TDAH e ansiedade?",
+    "Meu filho de 7 anos não para quieto na escola, o que faço?",
+    "Quanto custa uma consulta particular?",
+    "Como falar com meu chefe sobre meu diagnóstico?",
+    "O metilfenidato causa dependência?",
+    "Existe TDAH em adultos?",
+    "Posso beber álcool tomando ritalina?",
+    "Como explicar TDAH para minha família?",
+    "Mulheres têm sintomas diferentes de TDAH?",
+    "Qual a diferença entre TDAH e autismo?",
+    "Como estudar para concursos tendo TDAH?",
+    "Venvanse engorda?",
+    "Quanto tempo a ritalina demora para fazer efeito?",
+    "O que é hiperfoco?",
+]
+
+FILLERS = ["por favor, {}", "{} por favor", "me diz uma coisa: {}", "{}??", "bom, {}"]
+
+
+class SlowContextRepository(ContextRepository):
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def retrieve_context(self, query: str) -> str:
+        time.sleep(self.latency_ms / 1000)
+        return "TDAH é um transtorno do neurodesenvolvimento."
+
+
+class SlowLLM(LLMProvider):
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def invoke(self, prompt: str, context: dict = None, timeout: float = None) -> str:
+        time.sleep(self.latency_ms / 1000)
+        return "Resposta simulada."
+
+
+def variant(phrase: str, rng: random.Random) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return fold_accents(phrase.lower()).strip("?!.")
+    if kind == 1:
+        i = rng.randrange(1, max(2, len(phrase) - 1))
+        return phrase[:i] + phrase[i + 1 :]
+    return rng.choice(FILLERS).format(phrase.lower())
+
+
+def synthetic_traffic(responses, requests: int, faq_share: float, seed: int):
+    """Lista de (mensagem, intent esperado ou None para perguntas novas)."""
+    rng = random.Random(seed)
+    phrases = [(p, r.intent) for r in responses for p in r.training_phrases]
+    traffic = []
+    for _ in range(requests):
+        if rng.random() < faq_share:
+            phrase, intent = rng.choice(phrases)
+            traffic.append((variant(phrase, rng), intent))
+        else:
+            traffic.append((rng.choice(NOVEL_QUESTIONS), None))
+    return traffic
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def pipeline_latency(use_case: ProcessUserMessage, traffic, requests: int):
+    latencies = []
+    for i, (message, _) in enumerate(traffic[:requests]):
+        started = time.perf_counter()
+        use_case.execute(ProcessMessageInput("bench", f"s{i}", message, "api"))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.mean(latencies), statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark do caminho rápido de intents"
+    )
+    parser.add_argument("--traffic", help="Arquivo com uma mensagem por linha")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--faq-share", type=float, default=0.4)
+    parser.add_argument("--min-score", type=float, default=0.7)
+    parser.add_argument("--pipeline-requests", type=int, default=40)
+    parser.add_argument("--retrieval-ms", type=float, default=60.0)
+    parser.add_argument("--llm-ms", type=float, default=400.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    responses = load_canned_responses(CONFIG)
+    started = time.perf_counter()
+    matcher = IntentMatcher(responses, min_score=args.min_score)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    if args.traffic:
+        with open(args.traffic, encoding="utf-8") as f:
+            traffic = [(line.strip(), None) for line in f if line.strip()]
+    else:
+        traffic = synthetic_traffic(responses, args.requests, args.faq_share, args.seed)
+
+    latencies, served, correct, false_hits = [], 0, 0, 0
+    for message, expected in traffic:
+        started = time.perf_counter()
+        match = matcher.match(message)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        if match is None:
+            continue
+        served += 1
+        correct += match.intent == expected
+        false_hits += expected is None and not args.traffic
+
+    print(
+        f"índice: {len(matcher)} frases em {build_ms:.1f} ms | "
+        f"{len(traffic)} mensagens | min_score={args.min_score}"
+    )
+    print(f"respondidas sem LLM: {served / len(traffic):.1%}")
+    if not args.traffic:
+        faq = sum(expected is not None for _, expected in traffic)
+        print(
+            f"  intent correto: {correct}/{served}  "
+            f"variações de FAQ cobertas: {correct / max(1, faq):.1%}  "
+            f"perguntas novas desviadas: {false_hits}"
+        )
+    print(
+        f"match: p50={percentile(latencies, 0.5):.0f} µs  "
+        f"p99={percentile(latencies, 0.99):.0f} µs"
+    )
+
+    for name, intent_matcher in (
+        ("sem caminho rápido", None),
+        ("com caminho rápido", matcher),
+    ):
+        use_case = ProcessUserMessage(
+            SlowLLM(args.llm_ms),
+            SlowContextRepository(args.retrieval_ms),
+            intent_matcher=intent_matcher,
+        )
+        mean, p50 = pipeline_latency(use_case, traffic, args.pipeline_requests)
+        print(f"pipeline {name:<20} média={mean:7.1f} ms  p50={p50:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
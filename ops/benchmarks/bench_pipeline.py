@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import statistics
+import sys
+import time
+
+"""
+Benchmark do pipeline de ProcessUserMessage: sequencial (segurança -> RAG ->
+LLM) x concorrente (RAG especulativo em paralelo com a segurança). Latências
+de rede simuladas por etapa; reporta o tempo de parede e os tempos por etapa.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.application.dtos.message_dto import ProcessMessageInput  # noqa: E402
+from src.application.use_cases.process_message import ProcessUserMessage  # noqa: E402
+from src.domain.interfaces.repositories import (  # noqa: E402
+    ContextRepository,
+    LLMProvider,
+)
+from src.utils.safety_filters import check_safety  # noqa: E402
+
+
+class SlowContextRepository(ContextRepository):
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def retrieve_context(self, query: str) -> str:
+        time.sleep(self.latency_ms / 1000)
+        return "TDAH é um transtorno do neurodesenvolvimento."
+
+
+class SlowLLM(LLMProvider):
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def invoke(self, prompt: str, context: dict) -> str:
+        time.sleep(self.latency_ms / 1000)
+        return "Resposta simulada."
+
+
+def slow_safety(latency_ms: float):
+    def check(text: str):
+        time.sleep(latency_ms / 1000)
+        return check_safety(text)
+
+    return check
+
+
+def run(use_case: ProcessUserMessage, requests: int):
+    wall, stages = [], {}
+    for i in range(requests):
+        start = time.perf_counter()
+        output = use_case.execute(
+            ProcessMessageInput(
+                "bench", f"s{i}", "Como lidar com a procrastinação?", "api"
+            )
+        )
+        wall.append((time.perf_counter() - start) * 1000)
+        for stage, ms in output.metadata["timings"]["stages_ms"].items():
+            stages.setdefault(stage, []).append(ms)
+    return statistics.median(wall), {k: statistics.median(v) for k, v in stages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequencial x concorrente")
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--safety-ms", type=float, default=40.0)
+    parser.add_argument("--retrieval-ms", type=float, default=60.0)
+    parser.add_argument("--llm-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    results = {}
+    for concurrent in (False, True):
+        use_case = ProcessUserMessage(
+            SlowLLM(args.llm_ms),
+            SlowContextRepository(args.retrieval_ms),
+            concurrent=concurrent,
+            safety_check=slow_safety(args.safety_ms),
+        )
+        name = "concorrente" if concurrent else "sequencial"
+        results[name] = run(use_case, args.requests)
+
+    for name, (wall_ms, stages) in results.items():
+        detail = "  ".join(f"{k}={v:.1f}" for k, v in stages.items())
+        print(f"{name:<12} p50={wall_ms:7.1f} ms   ({detail})")
+    saved = results["sequencial"][0] - results["concorrente"][0]
+    print(f"Economia de tempo de parede: {saved:.1f} ms por requisição")
+
+
+if __name__ == "__main__":
+    main()
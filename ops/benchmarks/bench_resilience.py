@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import time
+
+"""
+Benchmark de um incidente no provedor LLM: uma requisição a cada
+`--interval-ms` durante `--duration` s; entre `--incident-start` e
+`--incident-end` o provedor só devolve timeout (após `--timeout-ms`). Compara
+o adapter puro com o ResilientLLMProvider (retry com jitter + circuit
+breaker): p50/p99 da requisição completa, respostas degradadas e quantas
+chamadas chegaram ao provedor.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.application.dtos.message_dto import ProcessMessageInput  # noqa: E402
+from src.application.use_cases.process_message import ProcessUserMessage  # noqa: E402
+from src.domain.interfaces.repositories import (  # noqa: E402
+    ContextRepository,
+    LLMProvider,
+)
+from src.infrastructure.llm.resilient_provider import (  # noqa: E402
+    CircuitBreaker,
+    ResilientLLMProvider,
+)
+
+
+class StaticContextRepository(ContextRepository):
+    def retrieve_context(self, query: str) -> str:
+        return "A procrastinação é comum no TDAH. Divida tarefas em etapas curtas."
+
+
+class IncidentLLM(LLMProvider):
+    """Responde em `latency_ms`; durante o incidente, timeout após `timeout_ms`."""
+
+    def __init__(self, latency_ms: float, timeout_ms: float):
+        self.latency_ms = latency_ms
+        self.timeout_ms = timeout_ms
+        self.failing = False
+        self.calls = 0
+
+    def invoke(self, prompt: str, context: dict = None, timeout: float = None) -> str:
+        self.calls += 1
+        if self.failing:
+            time.sleep(self.timeout_ms / 1000)
+            return self._provider_error(
+                TimeoutError("Read timed out"),
+                "Desculpe, estou tendo dificuldades (Erro simulado).",
+            )
+        time.sleep(self.latency_ms / 1000)
+        return "Resposta simulada."
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(provider: LLMProvider, llm: IncidentLLM, args) -> tuple:
+    use_case = ProcessUserMessage(provider, StaticContextRepository())
+    latencies, degraded = [], 0
+    began = time.perf_counter()
+    i = 0
+    while (elapsed := time.perf_counter() - began) < args.duration:
+        llm.failing = args.incident_start <= elapsed < args.incident_end
+        start = time.perf_counter()
+        output = use_case.execute(
+            ProcessMessageInput(
+                "bench", f"s{i}", "Como vencer a procrastinação?", "api"
+            )
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        degraded += bool(output.metadata["timings"].get("fallbacks"))
+        time.sleep(args.interval_ms / 1000)
+        i += 1
+    return latencies, degraded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de incidente no LLM")
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--incident-start", type=float, default=0.5)
+    parser.add_argument("--incident-end", type=float, default=2.5)
+    parser.add_argument("--interval-ms", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--timeout-ms", type=float, default=200.0)
+    parser.add_argument("--reset-seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    variants = {
+        "adapter puro": lambda llm: llm,
+        "resiliente": lambda llm: ResilientLLMProvider(
+            llm,
+            name="bench",
+            base_delay=0.02,
+            max_delay=0.1,
+            breaker=CircuitBreaker(reset_timeout=args.reset_seconds),
+        ),
+    }
+    for name, wrap in variants.items():
+        llm = IncidentLLM(args.latency_ms, args.timeout_ms)
+        provider = wrap(llm)
+        latencies, degraded = run(provider, llm, args)
+        print(
+            f"{name:<14} p50={percentile(latencies, 0.5):7.1f} ms  "
+            f"p99={percentile(latencies, 0.99):7.1f} ms  "
+            f"requisições={len(latencies)}  "
+            f"lentas={sum(ms >= args.timeout_ms for ms in latencies)}  "
+            f"chamadas={llm.calls}  degradadas={degraded}"
+        )
+        if isinstance(provider, ResilientLLMProvider):
+            print(f"{'':<14} {provider.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+"""
+Benchmark de latência da recuperação de contexto (RAG):
+índice vetorial local (exato e IVF aproximado) x caminho remoto (OpenSearch),
+índice lexical BM25 e recuperação híbrida (BM25 + vetorial com RRF).
+
+Sem OPENSEARCH_HOST, o caminho remoto usa o InMemoryOpenSearchClient com
+latência de rede simulada (--rtt-ms).
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.infrastructure.repositories.bm25_repository import (  # noqa: E402
+    BM25ContextRepository,
+)
+from src.infrastructure.repositories.hybrid_repository import (  # noqa: E402
+    HybridContextRepository,
+)
+from src.infrastructure.repositories.in_memory_opensearch import (  # noqa: E402
+    InMemoryOpenSearchClient,
+)
+from src.infrastructure.repositories.local_vector_repository import (  # noqa: E402
+    LocalVectorContextRepository,
+)
+from src.infrastructure.repositories.opensearch_repository import (  # noqa: E402
+    OpenSearchContextRepository,
+)
+
+
+class PrecomputedEmbeddings:
+    """Devolve vetores de consulta pré-sorteados (isola o custo do embedding)."""
+
+    in_process = True
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.position = 0
+
+    def embed(self, texts):
+        vector = self.vectors[self.position % len(self.vectors)]
+        self.position += 1
+        return [vector]
+
+
+def measure(repo, queries: int, texts: list = None) -> list:
+    timings = []
+    for i in range(queries):
+        query = texts[i % len(texts)] if texts else f"consulta {i}"
+        start = time.perf_counter()
+        repo.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<28} p50={p50:8.3f} ms   p95={p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recuperação de contexto")
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--rtt-ms", type=float, default=8.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    corpus = rng.normal(size=(args.chunks, args.dimension)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dimension)).astype(np.float32)
+    ids = [f"chunk-{i}" for i in range(args.chunks)]
+    vocabulary = [f"termo{i}" for i in range(20000)] + ["tcc", "sus", "caps"]
+    texts = [" ".join(rng.choice(vocabulary, 150)) for _ in range(args.chunks)]
+    query_texts = [" ".join(rng.choice(vocabulary, 6)) for _ in range(args.queries)]
+
+    print(
+        f"Corpus: {args.chunks} chunks x {args.dimension} dims | "
+        f"{args.queries} consultas | top-{args.top_k}"
+    )
+
+    exact = LocalVectorContextRepository(
+        PrecomputedEmbeddings(queries),
+        ids,
+        texts,
+        corpus,
+        top_k=args.top_k,
+        approximate=False,
+    )
+    report("local (exato)", measure(exact, args.queries))
+
+    approximate = LocalVectorContextRepository(
+        PrecomputedEmbeddings(queries),
+        ids,
+        texts,
+        corpus,
+        top_k=args.top_k,
+        approximate=True,
+    )
+    report("local (IVF aproximado)", measure(approximate, args.queries))
+
+    client = InMemoryOpenSearchClient(latency_ms=args.rtt_ms)
+    remote = OpenSearchContextRepository(
+        client, PrecomputedEmbeddings(queries), index_name="bench", top_k=args.top_k
+    )
+    remote.ensure_index(dimension=args.dimension)
+    for chunk_id, text, vector in zip(ids, texts, corpus):
+        client.indices_store["bench"]["docs"][chunk_id] = {
+            "text": text,
+            "embedding": vector,
+        }
+    remote_queries = min(args.queries, 50)
+    report(
+        f"remoto (RTT {args.rtt_ms:.0f} ms simulado)",
+        measure(remote, remote_queries),
+    )
+
+    lexical = BM25ContextRepository(ids, texts, top_k=args.top_k)
+    report("BM25 (lexical)", measure(lexical, args.queries, query_texts))
+
+    hybrid = HybridContextRepository([lexical, exact], top_k=args.top_k)
+    report("híbrido (BM25 + exato)", measure(hybrid, args.queries, query_texts))
+
+    hybrid_remote = HybridContextRepository([lexical, remote], top_k=args.top_k)
+    report(
+        "híbrido (BM25 + remoto)",
+        measure(hybrid_remote, remote_queries, query_texts),
+    )
+
+
+if __name__ == "__main__":
+    main()
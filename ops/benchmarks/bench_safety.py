@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import re
+import statistics
+import string
+import sys
+import time
+
+"""
+Benchmark do filtro de risco: laço de regex por palavra-chave (implementação
+anterior de check_safety, com e sem pré-compilação) x autômato Aho-Corasick (RiskMatcher), para
+léxicos de tamanhos diferentes. O custo do autômato deve ficar praticamente
+constante com o crescimento do léxico. Mede também o custo por fragmento da
+verificação incremental da saída em streaming (OutputSafetyGuard).
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.application.services.output_safety import OutputSafetyGuard  # noqa: E402
+from src.utils.risk_matcher import RiskMatcher  # noqa: E402
+from src.utils.safety_filters import RISK_KEYWORDS  # noqa: E402
+
+MESSAGES = [
+    "Oi, tenho TDAH e estou com dificuldade de organizar minha rotina de estudos.",
+    "Quais são os sintomas mais comuns de desatenção em adultos?",
+    "Como funciona o tratamento com terapia cognitivo-comportamental pelo SUS?",
+    "Meu filho não consegue terminar as tarefas da escola, o que posso fazer?",
+]
+
+
+def synthetic_lexicon(size: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    terms = list(RISK_KEYWORDS)
+    while len(terms) < size:
+        length = rng.randint(5, 12)
+        terms.append("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return terms[:size]
+
+
+def regex_loop(terms: list, compiled: bool = False):
+    patterns = [r"\b" + re.escape(term) for term in terms]
+    if compiled:
+        patterns = [re.compile(p) for p in patterns]
+
+    def check(text: str) -> bool:
+        normalized = text.lower()
+        if compiled:
+            return any(p.search(normalized) for p in patterns)
+        return any(re.search(p, normalized) for p in patterns)
+
+    return check
+
+
+def measure(check, rounds: int) -> float:
+    """Mediana em microssegundos por mensagem."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for message in MESSAGES:
+            check(message)
+        timings.append((time.perf_counter() - start) * 1e6 / len(MESSAGES))
+    return statistics.median(timings)
+
+
+def measure_stream(rounds: int, chunk_size: int = 4) -> tuple:
+    """Custo por fragmento (µs) do streaming com e sem OutputSafetyGuard."""
+    answer = " ".join(MESSAGES * 5)
+    chunks = [answer[i : i + chunk_size] for i in range(0, len(answer), chunk_size)]
+    guard = OutputSafetyGuard()
+
+    def consume(wrap: bool) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            stream = iter(chunks)
+            for _ in guard.wrap(stream) if wrap else stream:
+                pass
+        return (time.perf_counter() - start) * 1e6 / (rounds * len(chunks))
+
+    baseline = consume(False)
+    return consume(True) - baseline, guard.stats()["avg_chunk_us"], len(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do filtro de risco")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    print(
+        f"{'termos':>7} {'regex (loop)':>14} {'regex compilado':>16} "
+        f"{'aho-corasick':>14} {'estados':>9}"
+    )
+    for size in args.sizes:
+        terms = synthetic_lexicon(size)
+        start = time.perf_counter()
+        matcher = RiskMatcher({"bench": terms})
+        build_ms = (time.perf_counter() - start) * 1000
+        regex_us = measure(regex_loop(terms), args.rounds)
+        compiled_us = measure(regex_loop(terms, compiled=True), args.rounds)
+        matcher_us = measure(matcher.find, args.rounds)
+        print(
+            f"{size:>7} {regex_us:>11.1f} µs {compiled_us:>13.1f} µs "
+            f"{matcher_us:>11.1f} µs "
+            f"{len(matcher._goto):>9}   (compilação {build_ms:.0f} ms)"
+        )
+
+    overhead_us, scan_us, chunks = measure_stream(max(args.rounds // 10, 1))
+    print(
+        f"\nStreaming ({chunks} fragmentos): overhead {overhead_us:.2f} µs/fragmento "
+        f"(varredura {scan_us:.2f} µs/fragmento)"
+    )
+
+
+if __name__ == "__main__":
+    main()
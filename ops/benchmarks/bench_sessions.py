@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+"""
+Benchmark de latência por turno do histórico de sessões (leitura + gravação):
+sem cache x LRU em memória x LRU + write-behind.
+
+Por padrão usa o InMemoryDynamoDBTable com latência de rede simulada (--rtt-ms);
+com --endpoint-url, usa uma tabela real (ex: DynamoDB Local).
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.domain.entities.session import Message, Session  # noqa: E402
+from src.infrastructure.repositories.dynamodb_session_repository import (  # noqa: E402
+    DynamoDBSessionRepository,
+)
+from src.infrastructure.repositories.in_memory_dynamodb import (  # noqa: E402
+    InMemoryDynamoDBTable,
+)
+
+
+def run_turns(repo, sessions: int, turns: int) -> list:
+    timings = []
+    for turn in range(turns):
+        for s in range(sessions):
+            start = time.perf_counter()
+            now = datetime.now()
+            session = repo.get_session(f"s{s}") or Session(
+                f"s{s}", "bench", [], created_at=now, updated_at=now
+            )
+            session.messages.append(Message(f"pergunta {turn}", "user", now))
+            session.messages.append(Message(f"resposta {turn}", "assistant", now))
+            repo.save_session(session)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list, flush_ms: float = 0.0):
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    extra = f"   flush={flush_ms:7.1f} ms" if flush_ms else ""
+    print(f"{name:<26} p50={p50:8.3f} ms   p95={p95:8.3f} ms{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do histórico de sessões")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    parser.add_argument("--endpoint-url", default=None)
+    parser.add_argument("--table", default="chatbot-sessions")
+    args = parser.parse_args()
+
+    def table():
+        if args.endpoint_url:
+            return None
+        return InMemoryDynamoDBTable("session_id", latency_ms=args.rtt_ms)
+
+    print(
+        f"{args.sessions} sessões x {args.turns} turnos | "
+        + (args.endpoint_url or f"stand-in local (RTT {args.rtt_ms:.0f} ms simulado)")
+    )
+
+    scenarios = [
+        ("sem cache, escrita síncrona", dict(cache_size=0, write_behind=False)),
+        ("LRU, escrita síncrona", dict(write_behind=False)),
+        ("LRU + write-behind", dict(write_behind=True)),
+    ]
+    for name, options in scenarios:
+        repo = DynamoDBSessionRepository(
+            table_name=args.table,
+            endpoint_url=args.endpoint_url,
+            table=table(),
+            **options,
+        )
+        timings = run_turns(repo, args.sessions, args.turns)
+        start = time.perf_counter()
+        repo.flush(timeout=60)
+        report(name, timings, (time.perf_counter() - start) * 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import sys
+
+"""
+Bootstrap do índice vetorial (k-NN/HNSW) da base de conhecimento no OpenSearch.
+Idempotente: não recria o índice se ele já existir.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.repositories.opensearch_repository import (  # noqa: E402
+    build_knn_index_body,
+    get_opensearch_client,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("OpenSearchBootstrap")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cria o índice k-NN do OpenSearch")
+    parser.add_argument("--index", default=os.getenv("OPENSEARCH_INDEX", "kb-chunks"))
+    parser.add_argument("--dimension", type=int, default=512)
+    parser.add_argument("--engine", default="nmslib", choices=["nmslib", "faiss"])
+    parser.add_argument("--space-type", default="cosinesimil")
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=128)
+    parser.add_argument("--ef-search", type=int, default=None)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Apenas imprime o mapping"
+    )
+    args = parser.parse_args()
+
+    body = build_knn_index_body(
+        args.dimension,
+        engine=args.engine,
+        space_type=args.space_type,
+        ef_construction=args.ef_construction,
+        m=args.m,
+        ef_search=args.ef_search,
+    )
+    if args.dry_run:
+        print(json.dumps(body, indent=2))
+        return
+
+    username = os.getenv("OPENSEARCH_USER") or os.getenv("OPENSEARCH_USERNAME")
+    client = get_opensearch_client(
+        host=os.getenv("OPENSEARCH_HOST", "localhost"),
+        port=int(os.getenv("OPENSEARCH_PORT", "443")),
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        http_auth=(username, os.getenv("OPENSEARCH_PASSWORD")) if username else None,
+        use_ssl=os.getenv("OPENSEARCH_USE_SSL", "true").lower() == "true",
+        timeout=30.0,
+    )
+
+    if client.indices.exists(index=args.index):
+        logger.info(f"Índice '{args.index}' já existe. Nada a fazer.")
+        return
+
+    client.indices.create(index=args.index, body=body)
+    logger.info(f"✅ Índice '{args.index}' criado (dim={args.dimension}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import sys
+
+"""
+Ingestão incremental da base de conhecimento (RAG).
+
+Lê documentos locais ou do bucket S3 da base de conhecimento, divide em chunks,
+gera embeddings em lotes e grava no vector store (índice local .npz ou
+OpenSearch). O manifesto de hashes permite reexecutar só sobre o que mudou.
+
+Exemplos:
+    python ops/ingest_knowledge_base.py docs/esudo-de-caso.md --target local
+    python ops/ingest_knowledge_base.py --s3-bucket mvp-tdah-kb-docs --target opensearch
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.application.use_cases.ingest_knowledge_base import (  # noqa: E402
+    IngestKnowledgeBase,
+)
+from src.infrastructure.embeddings.bedrock_embeddings import (  # noqa: E402
+    BedrockEmbeddings,
+)
+from src.infrastructure.embeddings.hashing_embeddings import (  # noqa: E402
+    HashingEmbeddings,
+)
+from src.infrastructure.repositories.document_sources import (  # noqa: E402
+    iter_local_documents,
+    iter_s3_documents,
+)
+from src.infrastructure.repositories.local_vector_repository import (  # noqa: E402
+    LocalVectorStoreWriter,
+)
+from src.infrastructure.repositories.opensearch_repository import (  # noqa: E402
+    OpenSearchContextRepository,
+    OpenSearchVectorStoreWriter,
+    get_opensearch_client,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("KnowledgeBaseIngestion")
+
+
+def _build_writer(args, embedding_provider):
+    if args.target == "local":
+        return LocalVectorStoreWriter(args.index_path)
+
+    username = os.getenv("OPENSEARCH_USER") or os.getenv("OPENSEARCH_USERNAME")
+    client = get_opensearch_client(
+        host=os.getenv("OPENSEARCH_HOST", "localhost"),
+        port=int(os.getenv("OPENSEARCH_PORT", "443")),
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        http_auth=(username, os.getenv("OPENSEARCH_PASSWORD")) if username else None,
+        use_ssl=os.getenv("OPENSEARCH_USE_SSL", "true").lower() == "true",
+        timeout=30.0,
+    )
+    dimension = len(embedding_provider.embed(["dimensão"])[0])
+    OpenSearchContextRepository(
+        client, embedding_provider, index_name=args.index
+    ).ensure_index(dimension)
+    return OpenSearchVectorStoreWriter(client, index_name=args.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão da base de conhecimento")
+    parser.add_argument("paths", nargs="*", help="Arquivos, diretórios ou globs")
+    parser.add_argument("--s3-bucket", default=os.getenv("KB_BUCKET_NAME"))
+    parser.add_argument("--s3-prefix", default="")
+    parser.add_argument("--target", default="local", choices=["local", "opensearch"])
+    parser.add_argument(
+        "--index-path",
+        default=os.getenv("LOCAL_VECTOR_INDEX_PATH", "data/kb_index.npz"),
+    )
+    parser.add_argument("--index", default=os.getenv("OPENSEARCH_INDEX", "kb-chunks"))
+    parser.add_argument(
+        "--manifest", default=os.getenv("KB_MANIFEST_PATH", "data/kb_manifest.json")
+    )
+    parser.add_argument("--max-chars", type=int, default=1200)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument(
+        "--full", action="store_true", help="Ignora o manifesto e reindexa tudo"
+    )
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Não remove documentos ausentes desta execução",
+    )
+    args = parser.parse_args()
+
+    if not args.paths and not args.s3_bucket:
+        parser.error("Informe caminhos locais e/ou --s3-bucket")
+
+    if os.getenv("EMBEDDING_PROVIDER", "bedrock").lower() == "hashing":
+        embedding_provider = HashingEmbeddings()
+    else:
+        embedding_provider = BedrockEmbeddings(
+            region_name=os.getenv("AWS_REGION", "us-east-1")
+        )
+
+    manifest = {}
+    if os.path.exists(args.manifest) and not args.full:
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    def documents():
+        if args.paths:
+            yield from iter_local_documents(args.paths)
+        if args.s3_bucket:
+            yield from iter_s3_documents(args.s3_bucket, args.s3_prefix)
+
+    for path in (args.manifest, args.index_path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    use_case = IngestKnowledgeBase(
+        embedding_provider,
+        _build_writer(args, embedding_provider),
+        max_chars=args.max_chars,
+        overlap=args.overlap,
+    )
+    report = use_case.execute(documents(), manifest, prune=not args.no_prune)
+
+    with open(args.manifest, "w", encoding="utf-8") as f:
+        json.dump(report.manifest, f, indent=2, ensure_ascii=False)
+
+    logger.info(
+        f"✅ {report.documents} documentos, {report.embedded_chunks} chunks embedados "
+        f"({report.embedding_batches} lotes), {report.reused_chunks} reaproveitados, "
+        f"{report.deleted_chunks} removidos em {report.elapsed_ms:.0f} ms."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import os
+import sys
+
+"""
+Geração offline de respostas para perguntas frequentes.
+
+Lê a lista curada (arquivo com uma pergunta por linha e/ou as frases de
+`topic_triggers` do CaseStudyParser), recupera o contexto e chama o LLM com o
+mesmo composition root da Lambda (LLM_PROVIDER, CONTEXT_REPOSITORY,
+RESPONSE_CACHE_VERSION) e grava o artefato versionado lido no cold start
+(PRECOMPUTED_ANSWERS_PATH). Reexecuções só regeneram respostas novas ou
+desatualizadas (contexto da base, modelo, prompt ou namespace mudaram).
+
+Exemplos:
+    python ops/precompute_answers.py --topic-triggers --output data/precomputed_answers.json
+    python ops/precompute_answers.py --questions faq.txt --check
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.application.services.precomputed_answers import (  # noqa: E402
+    load_artifact,
+    save_artifact,
+)
+from src.application.use_cases.precompute_answers import PrecomputeAnswers  # noqa: E402
+from src.dialogflow.parsers.markdown_parser import CaseStudyParser  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("PrecomputeAnswers")
+
+
+def _questions(args):
+    questions = []
+    if args.topic_triggers:
+        for phrases in CaseStudyParser().topic_triggers.values():
+            questions.extend(phrases)
+    for path in args.questions or []:
+        with open(path, encoding="utf-8") as f:
+            questions.extend(line.strip() for line in f if line.strip())
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Respostas pré-computadas")
+    parser.add_argument(
+        "--questions", action="append", help="Arquivo com uma pergunta por linha"
+    )
+    parser.add_argument(
+        "--topic-triggers",
+        action="store_true",
+        help="Inclui as frases de topic_triggers do CaseStudyParser",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.getenv("PRECOMPUTED_ANSWERS_PATH", "data/precomputed_answers.json"),
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--full", action="store_true", help="Ignora o artefato anterior e gera tudo"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Só lista respostas novas/desatualizadas (sai com 1 se houver)",
+    )
+    args = parser.parse_args()
+
+    questions = _questions(args)
+    if not questions:
+        parser.error("Informe --questions e/ou --topic-triggers")
+
+    previous = None
+    if os.path.exists(args.output) and not args.full:
+        previous = load_artifact(args.output)
+
+    # Mesmo provedor, recuperação e namespace da Lambda: chaves compatíveis
+    from src.presentation.handlers import lambda_handler as handler
+
+    use_case = PrecomputeAnswers(
+        handler.llm_provider,
+        handler.context_repo,
+        namespace=os.getenv("RESPONSE_CACHE_VERSION", "v1"),
+        max_concurrency=args.concurrency,
+    )
+    report = use_case.execute(questions, previous, dry_run=args.check)
+
+    for question in report.stale:
+        logger.info(f"Desatualizada: {question}")
+    if args.check:
+        pending = report.questions - report.unchanged
+        logger.info(
+            f"{report.unchanged}/{report.questions} respostas em dia, "
+            f"{pending} a gerar ({len(report.stale)} desatualizadas), "
+            f"{report.removed} fora da lista."
+        )
+        sys.exit(1 if pending or report.removed else 0)
+
+    save_artifact(report.artifact, args.output)
+    logger.info(
+        f"✅ {len(report.artifact['answers'])} respostas em {args.output}: "
+        f"{report.generated} geradas, {report.unchanged} reaproveitadas, "
+        f"{len(report.failed)} falhas em {report.elapsed_ms:.0f} ms."
+    )
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+"""
+Treino e avaliação do classificador de risco local (tier 2 de check_safety).
+
+Separa um conjunto de teste estratificado, treina a regressão logística sobre
+n-gramas, reporta recall/precisão por limiar, a fração de mensagens ambíguas
+(que seriam escaladas) e a latência por mensagem (individual e em lote). Por
+fim, treina com todos os dados, confere que nenhuma frase de treino das intents
+do Dialogflow (exceto as de crise) é marcada como risco e só então grava o
+artefato .npz carregado em produção.
+"""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.risk_classifier import train_logistic_regression  # noqa: E402
+from src.utils.safety_filters import (  # noqa: E402
+    DEFAULT_RISK_CLASSIFIER_PATH,
+    RISK_HIGH_THRESHOLD,
+    RISK_LOW_THRESHOLD,
+)
+
+DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "src", "utils", "data", "risk_training.jsonl"
+)
+INTENTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "src", "dialogflow", "data", "initial_config.json"
+)
+# Intents cujas frases de treino são, de fato, de risco
+CRISIS_INTENTS = {"Crisis Support"}
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("RiskClassifierTraining")
+
+
+def load_dataset(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [r["text"] for r in rows], np.asarray([r["label"] for r in rows])
+
+
+def stratified_split(labels: np.ndarray, test_fraction: float, seed: int):
+    rng = np.random.default_rng(seed)
+    test = []
+    for label in np.unique(labels):
+        members = rng.permutation(np.flatnonzero(labels == label))
+        test.extend(members[: max(1, int(len(members) * test_fraction))].tolist())
+    test_mask = np.zeros(len(labels), dtype=bool)
+    test_mask[test] = True
+    return np.flatnonzero(~test_mask), np.flatnonzero(test_mask)
+
+
+def evaluate(classifier, texts, labels):
+    scores = classifier.score_batch(texts)
+    print(f"{'limiar':>7} {'recall':>7} {'precisão':>9}")
+    for threshold in (RISK_LOW_THRESHOLD, 0.5, RISK_HIGH_THRESHOLD):
+        predicted = scores >= threshold
+        true_positives = int((predicted & (labels == 1)).sum())
+        recall = true_positives / max(int((labels == 1).sum()), 1)
+        precision = true_positives / max(int(predicted.sum()), 1)
+        print(f"{threshold:>7.2f} {recall:>7.2f} {precision:>9.2f}")
+
+    ambiguous = (scores > RISK_LOW_THRESHOLD) & (scores < RISK_HIGH_THRESHOLD)
+    confident_risk = scores >= RISK_HIGH_THRESHOLD
+    # Recall do pipeline: risco certo + ambíguos (escalados) entre os positivos
+    escalated_recall = float(
+        ((confident_risk | ambiguous) & (labels == 1)).sum()
+    ) / max(int((labels == 1).sum()), 1)
+    print(
+        f"Ambíguas (escaladas): {ambiguous.mean():.0%} | "
+        f"recall com escalonamento: {escalated_recall:.2f}"
+    )
+    return escalated_recall
+
+
+def measure_latency(classifier, texts, rounds: int = 200):
+    single = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        classifier.score(texts[i % len(texts)])
+        single.append((time.perf_counter() - start) * 1000)
+    single.sort()
+
+    start = time.perf_counter()
+    for _ in range(20):
+        classifier.score_batch(texts)
+    batch_ms = (time.perf_counter() - start) * 1000 / (20 * len(texts))
+
+    p95 = single[int(len(single) * 0.95) - 1]
+    print(
+        f"Latência tier 2: p50={statistics.median(single):.3f} ms  "
+        f"p95={p95:.3f} ms  lote={batch_ms:.3f} ms/mensagem"
+    )
+    return statistics.median(single)
+
+
+def flagged_intent_phrases(classifier, path: str):
+    """Frases de treino de intents comuns (não de crise) com score de risco."""
+    with open(path, "r", encoding="utf-8") as f:
+        intents = json.load(f).get("intents", [])
+    phrases = [
+        (intent["display_name"], phrase)
+        for intent in intents
+        if intent["display_name"] not in CRISIS_INTENTS
+        for phrase in intent.get("training_phrases", [])
+    ]
+    if not phrases:
+        return []
+    scores = classifier.score_batch([phrase for _, phrase in phrases])
+    return [
+        (intent, phrase, float(score))
+        for (intent, phrase), score in zip(phrases, scores)
+        if score >= RISK_HIGH_THRESHOLD
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina o classificador de risco")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--output", default=DEFAULT_RISK_CLASSIFIER_PATH)
+    parser.add_argument("--dimensions", type=int, default=2**15)
+    parser.add_argument("--epochs", type=int, default=800)
+    parser.add_argument("--test-fraction", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--intents", default=INTENTS_PATH)
+    parser.add_argument("--eval-only", action="store_true", help="Não grava o artefato")
+    args = parser.parse_args()
+
+    texts, labels = load_dataset(args.data)
+    train, test = stratified_split(labels, args.test_fraction, args.seed)
+    logger.info(
+        f"{len(texts)} exemplos ({int(labels.sum())} positivos); teste: {len(test)}"
+    )
+
+    classifier = train_logistic_regression(
+        [texts[i] for i in train],
+        labels[train],
+        dimensions=args.dimensions,
+        epochs=args.epochs,
+    )
+    recall = evaluate(classifier, [texts[i] for i in test], labels[test])
+    latency_ms = measure_latency(classifier, [texts[i] for i in test])
+
+    if args.eval_only:
+        return
+
+    final = train_logistic_regression(
+        texts, labels, dimensions=args.dimensions, epochs=args.epochs
+    )
+    flagged = flagged_intent_phrases(final, args.intents)
+    for intent, phrase, score in flagged:
+        logger.error(f"Falso positivo em '{intent}': {phrase!r} (score {score:.3f})")
+    if flagged:
+        logger.error(
+            "Artefato NÃO gravado: adicione negativos equivalentes em "
+            f"{os.path.basename(args.data)} e treine de novo."
+        )
+        sys.exit(1)
+
+    final.save(args.output, {"holdout_recall": recall, "p50_latency_ms": latency_ms})
+    logger.info(f"✅ Artefato gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
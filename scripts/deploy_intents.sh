@@ -6,6 +6,13 @@
 # Este script configura o ambiente e executa a sincronização de intents e entidades
 # definidas em src/dialogflow/data/initial_config.json para o projeto GCP.
 #
+# Uso: scripts/deploy_intents.sh [plan|apply|sync] [--offline]
+#   plan  - mostra o diff (creates/updates/deletes) sem alterar o agente
+#   apply - envia só o diff e atualiza o estado (padrão)
+#   sync  - reenvia todas as intents e entidades
+# O estado do último apply (hash por intent/entidade) fica em
+# src/dialogflow/data/deploy_state.json (ou DIALOGFLOW_STATE_PATH).
+#
 # Pré-requisitos:
 # - Python 3.9+ instalado
 # - Dependências instaladas (pip install -r requirements.txt)
@@ -93,7 +100,7 @@ while [ $RETRY_COUNT -lt $MAX_RETRIES ]; do
     # Adiciona PROJECT_ROOT ao PYTHONPATH para garantir imports corretos
     export PYTHONPATH="${PROJECT_ROOT}:$PYTHONPATH"
 
-    python3 "$PYTHON_SCRIPT"
+    python3 "$PYTHON_SCRIPT" "$@"
     EXIT_CODE=$?
 
     if [ $EXIT_CODE -eq 0 ]; then
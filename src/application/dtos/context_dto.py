@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class CompressedContext:
+    text: str
+    original_tokens: int
+    tokens: int
+    budget: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def as_metadata(self) -> Dict[str, Any]:
+        return {
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "tokens_saved": self.tokens_saved,
+            "budget": self.budget,
+        }
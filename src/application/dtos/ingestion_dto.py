@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+@dataclass
+class IngestionReport:
+    documents: int = 0
+    unchanged_documents: int = 0
+    removed_documents: int = 0
+    embedded_chunks: int = 0
+    reused_chunks: int = 0
+    deleted_chunks: int = 0
+    # Chunks recusados pelo vector store (ficam fora do manifesto: nova tentativa)
+    failed_chunks: int = 0
+    embedding_batches: int = 0
+    elapsed_ms: float = 0.0
+    manifest: Dict[str, Any] = field(default_factory=dict)
@@ -1,14 +1,19 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
+
+from src.domain.entities.deadline import Deadline
 
 
 @dataclass
 class ProcessMessageInput:
     user_id: str
-    session_id: str
+    # Sem sessão informada (None), o turno não usa nem grava histórico
+    session_id: Optional[str]
     message: str
     platform: str  # 'dialogflow' | 'api'
     metadata: Optional[Dict[str, Any]] = None
+    # Prazo da requisição (ex: tempo restante da Lambda / timeout do webhook)
+    deadline: Optional[Deadline] = None
 
 
 @dataclass
@@ -16,3 +21,10 @@ class ProcessMessageOutput:
     response_text: str
     risk_detected: bool
     metadata: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class ProcessMessageStreamOutput:
+    chunks: Iterator[str]
+    risk_detected: bool
+    metadata: Optional[Dict[str, Any]] = None
@@ -0,0 +1,36 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class PipelineTimings:
+    """Tempos por etapa de ProcessUserMessage (ms) e o tempo total de parede."""
+
+    mode: str = "sequential"
+    stages: Dict[str, float] = field(default_factory=dict)
+    timeouts: List[str] = field(default_factory=list)
+    cancelled: List[str] = field(default_factory=list)
+    # Orçamento (ms) restante até o deadline no início e etapas que usaram fallback
+    budget_ms: Optional[float] = None
+    fallbacks: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def record(self, stage: str, started: float) -> None:
+        self.stages[stage] = (time.perf_counter() - started) * 1000
+
+    def as_metadata(self) -> Dict[str, Any]:
+        metadata = {
+            "mode": self.mode,
+            "stages_ms": {k: round(v, 3) for k, v in self.stages.items()},
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+        }
+        if self.timeouts:
+            metadata["timeouts"] = list(self.timeouts)
+        if self.cancelled:
+            metadata["cancelled"] = list(self.cancelled)
+        if self.budget_ms is not None:
+            metadata["budget_ms"] = round(self.budget_ms, 3)
+        if self.fallbacks:
+            metadata["fallbacks"] = list(self.fallbacks)
+        return metadata
@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class PrecomputeReport:
+    questions: int = 0
+    generated: int = 0
+    unchanged: int = 0
+    # Perguntas com resposta desatualizada (contexto, modelo ou prompt mudou)
+    stale: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    removed: int = 0
+    elapsed_ms: float = 0.0
+    artifact: Dict[str, Any] = field(default_factory=dict)
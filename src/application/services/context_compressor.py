@@ -0,0 +1,123 @@
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.application.dtos.context_dto import CompressedContext
+from src.domain.interfaces.repositories import LLMProvider
+from src.utils.text_normalization import normalize_text, tokenize
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+class ContextCompressor:
+    """
+    Monta o contexto RAG que vai para o prompt dentro de um orçamento de tokens:
+    remove frases repetidas entre chunks sobrepostos, mantém as frases mais
+    relevantes para a pergunta e preserva a ordem original do texto.
+    """
+
+    def __init__(
+        self,
+        default_budget: int = 1200,
+        budgets: Optional[Dict[str, int]] = None,
+        chunk_separator: str = "\n\n",
+        cache_size: int = 8192,
+    ):
+        """
+        Args:
+            default_budget: Orçamento de tokens do contexto quando o modelo não
+                tem um valor próprio em `budgets`.
+            budgets: Orçamento por model_id (ex: {"gpt-3.5-turbo": 2000}).
+            cache_size: Quantas contagens de tokens por frase manter em cache.
+        """
+        self.default_budget = default_budget
+        self.budgets = dict(budgets or {})
+        self.chunk_separator = chunk_separator
+        self.cache_size = cache_size
+        self._token_cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def budget_for(self, model_id: str) -> int:
+        return self.budgets.get(model_id, self.default_budget)
+
+    def _count(self, provider: LLMProvider, text: str) -> int:
+        """Contagem de tokens com cache LRU por (modelo, frase)."""
+        key = (str(getattr(provider, "model_id", "unknown")), text)
+        with self._lock:
+            cached = self._token_cache.get(key)
+            if cached is not None:
+                self._token_cache.move_to_end(key)
+                return cached
+
+        count = provider.count_tokens(text)
+        with self._lock:
+            self._token_cache[key] = count
+            if len(self._token_cache) > self.cache_size:
+                self._token_cache.popitem(last=False)
+        return count
+
+    def _sentences(self, context: str) -> List[Tuple[int, str]]:
+        """Frases únicas (chunk de origem, frase), na ordem em que aparecem."""
+        seen = set()
+        sentences = []
+        for chunk_index, chunk in enumerate(context.split(self.chunk_separator)):
+            for sentence in _SENTENCE_SPLIT.split(chunk):
+                sentence = sentence.strip()
+                key = normalize_text(sentence)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                sentences.append((chunk_index, sentence))
+        return sentences
+
+    @staticmethod
+    def _scores(query: str, sentences: List[Tuple[int, str]]) -> List[float]:
+        """
+        Relevância de cada frase: soma do IDF (entre as frases) dos termos da
+        pergunta que ela contém, com leve preferência pelos chunks mais bem ranqueados.
+        """
+        query_terms = set(tokenize(query))
+        sentence_terms = [set(tokenize(sentence)) for _, sentence in sentences]
+        document_frequency = Counter(t for terms in sentence_terms for t in terms)
+        total = len(sentences)
+
+        scores = []
+        for (chunk_index, _), terms in zip(sentences, sentence_terms):
+            relevance = sum(
+                math.log(1 + total / document_frequency[t]) for t in terms & query_terms
+            )
+            scores.append(relevance + 0.01 / (1 + chunk_index))
+        return scores
+
+    def compress(
+        self, query: str, context: str, provider: LLMProvider
+    ) -> CompressedContext:
+        budget = self.budget_for(str(getattr(provider, "model_id", "unknown")))
+        if not context:
+            return CompressedContext("", 0, 0, budget)
+
+        original_tokens = provider.count_tokens(context)
+        sentences = self._sentences(context)
+        costs = [self._count(provider, sentence) for _, sentence in sentences]
+
+        if sum(costs) <= budget:
+            selected = set(range(len(sentences)))
+        else:
+            scores = self._scores(query, sentences)
+            selected = set()
+            used = 0
+            for i in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+                if used + costs[i] <= budget:
+                    selected.add(i)
+                    used += costs[i]
+
+        chunks: Dict[int, List[str]] = {}
+        for i, (chunk_index, sentence) in enumerate(sentences):
+            if i in selected:
+                chunks.setdefault(chunk_index, []).append(sentence)
+        text = self.chunk_separator.join(" ".join(parts) for parts in chunks.values())
+
+        tokens = provider.count_tokens(text)
+        return CompressedContext(text, original_tokens, tokens, budget)
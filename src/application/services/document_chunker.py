@@ -0,0 +1,69 @@
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+from src.domain.entities.knowledge import Document, DocumentChunk
+
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+def chunk_id_for(source: str, text: str) -> str:
+    """Id determinístico do chunk: muda apenas quando o conteúdo muda."""
+    return hashlib.sha256(f"{source}\x1f{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def _sections(text: str) -> List[Tuple[Optional[str], str]]:
+    """Divide o markdown em (título, corpo) a cada cabeçalho."""
+    sections = []
+    matches = list(_HEADING.finditer(text))
+    if not matches or matches[0].start() > 0:
+        preamble = text[: matches[0].start()] if matches else text
+        sections.append((None, preamble))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append((match.group(1), text[match.start() : end]))
+    return [(heading, body.strip()) for heading, body in sections if body.strip()]
+
+
+def _split(body: str, max_chars: int, overlap: int) -> List[str]:
+    """Janelas de até max_chars com sobreposição, cortando em parágrafo/frase."""
+    if len(body) <= max_chars:
+        return [body]
+
+    pieces = []
+    start = 0
+    while start < len(body):
+        end = min(start + max_chars, len(body))
+        if end < len(body):
+            window = body[start:end]
+            cut = max(window.rfind("\n\n"), window.rfind(". "), window.rfind("\n"))
+            if cut > max_chars // 2:
+                end = start + cut + 1
+        pieces.append(body[start:end].strip())
+        if end >= len(body):
+            break
+        start = max(end - overlap, start + 1)
+    return [piece for piece in pieces if piece]
+
+
+def chunk_document(
+    document: Document, max_chars: int = 1200, overlap: int = 200
+) -> List[DocumentChunk]:
+    """
+    Divide um documento em chunks que respeitam os cabeçalhos markdown: cada
+    seção vira um ou mais chunks (com sobreposição) que carregam o seu título.
+    """
+    chunks = []
+    for heading, body in _sections(document.text):
+        for text in _split(body, max_chars, overlap):
+            if heading and not text.startswith("#"):
+                text = f"{heading}\n{text}"
+            chunks.append(
+                DocumentChunk(
+                    chunk_id=chunk_id_for(document.source, text),
+                    source=document.source,
+                    text=text,
+                    heading=heading,
+                )
+            )
+    return chunks
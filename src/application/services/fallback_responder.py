@@ -0,0 +1,103 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from src.utils.text_normalization import tokenize
+
+if TYPE_CHECKING:
+    from src.application.services.intent_matcher import IntentMatch, IntentMatcher
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+DEADLINE_FALLBACK_MESSAGE = (
+    "Não consegui preparar uma resposta completa a tempo. "
+    "Pode me enviar a pergunta novamente em instantes?"
+)
+CONTEXT_FALLBACK_PREFIX = (
+    "Não consegui preparar uma resposta completa a tempo, "
+    "mas este trecho do nosso material pode ajudar:"
+)
+
+
+@dataclass(frozen=True)
+class CannedResponse:
+    """Resposta pronta de um intent (frases de treino -> mensagens)."""
+
+    intent: str
+    training_phrases: Tuple[str, ...]
+    text: str
+
+
+def load_canned_responses(path: str) -> List[CannedResponse]:
+    """Lê as respostas dos intents do arquivo de configuração do Dialogflow."""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    responses = []
+    for intent in config.get("intents", []):
+        texts = [t for m in intent.get("messages", []) for t in m.get("text", [])]
+        if texts and intent.get("training_phrases"):
+            responses.append(
+                CannedResponse(
+                    intent=intent["display_name"],
+                    training_phrases=tuple(intent["training_phrases"]),
+                    text="\n\n".join(texts),
+                )
+            )
+    return responses
+
+
+class FallbackResponder:
+    """
+    Resposta rápida, sem LLM, para quando o deadline da requisição não será
+    cumprido ou o provedor está indisponível: a resposta pronta do intent que
+    o IntentMatcher (o mesmo do caminho rápido) casar com a mensagem, as frases do contexto RAG mais próximas da
+    pergunta ou, sem nada relevante, uma mensagem curta pedindo para tentar de novo.
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 2,
+        max_chars: int = 400,
+        intent_matcher: Optional["IntentMatcher"] = None,
+    ):
+        """
+        Args:
+            intent_matcher: Classificador das respostas prontas dos intents; o
+                limiar é o `min_score` dele.
+        """
+        self.max_sentences = max_sentences
+        self.max_chars = max_chars
+        self.intent_matcher = intent_matcher
+
+    def canned(self, message: str) -> Optional["IntentMatch"]:
+        """Resposta pronta do intent mais parecido (None abaixo do mínimo)."""
+        if self.intent_matcher is None:
+            return None
+        return self.intent_matcher.closest(message)
+
+    def _excerpt(self, message: str, context: str) -> List[str]:
+        query = set(tokenize(message))
+        sentences = [
+            s.strip() for s in _SENTENCE_SPLIT.split(context or "") if s.strip()
+        ]
+        scored = [
+            (len(query & set(tokenize(sentence))), i)
+            for i, sentence in enumerate(sentences)
+        ]
+        best = sorted(
+            (item for item in scored if item[0] > 0), key=lambda x: (-x[0], x[1])
+        )[: self.max_sentences]
+        # Mantém a ordem original do texto
+        return [sentences[i] for _, i in sorted(best, key=lambda x: x[1])]
+
+    def answer(self, message: str, context: str = "") -> str:
+        canned = self.canned(message)
+        if canned is not None:
+            return canned.text
+        excerpt = " ".join(self._excerpt(message, context))
+        if not excerpt:
+            return DEADLINE_FALLBACK_MESSAGE
+        if len(excerpt) > self.max_chars:
+            excerpt = excerpt[: self.max_chars].rsplit(" ", 1)[0] + "…"
+        return f"{CONTEXT_FALLBACK_PREFIX}\n\n{excerpt}"
@@ -0,0 +1,176 @@
+import logging
+import threading
+import weakref
+from typing import List, Optional
+
+from src.domain.entities.session import Message, Session
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    LLMProvider,
+    SessionRepository,
+    timeout_kwargs,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY = "history_summary"
+SUMMARIZED_UNTIL_KEY = "summarized_until"
+
+_ROLE_LABELS = {"user": "Usuário", "assistant": "Assistente"}
+
+# Prompt de sistema do resumo (substitui o de psicoeducação dos adapters)
+SUMMARY_INSTRUCTIONS = (
+    "Você resume conversas entre um usuário e um assistente de apoio em saúde "
+    "mental (TDAH, ansiedade e depressão). O resumo é usado só internamente, "
+    "como memória do assistente nos próximos turnos. Escreva em terceira "
+    "pessoa, em texto corrido, sem bullet points nem negrito. Preserve "
+    "dificuldades relatadas, estratégias combinadas, sinais de risco e dados "
+    "relevantes do usuário; omita saudações e repetições. Não dê conselhos "
+    "nem invente informações que não estejam nas mensagens."
+)
+
+
+def _truncate_words(text: str, max_words: int) -> str:
+    words = text.split()
+    if len(words) <= max_words:
+        return text.strip()
+    return " ".join(words[:max_words]) + "…"
+
+
+class HistoryCompactor:
+    """
+    Compactação contínua do histórico da conversa para prompts multi-turno.
+
+    O prompt recebe o resumo acumulado + as últimas `keep_turns` trocas na
+    íntegra, então o tamanho fica praticamente constante. Os turnos que saem da
+    janela são incorporados ao resumo de forma incremental, no início do turno
+    seguinte (`due`/`compact`, dentro do orçamento da requisição: em Lambda,
+    threads depois da resposta ficam congeladas); o resumo fica em cache em
+    `Session.context`.
+    """
+
+    def __init__(
+        self,
+        summarizer: LLMProvider,
+        session_repo: SessionRepository,
+        keep_turns: int = 4,
+        compact_every: int = 2,
+        max_summary_words: int = 150,
+        max_message_words: int = 120,
+        timeout: Optional[float] = None,
+        budget_share: float = 0.25,
+        answer_seconds: float = 2.5,
+    ):
+        """
+        Args:
+            summarizer: Modelo usado para atualizar o resumo.
+            keep_turns: Trocas (usuário + assistente) mantidas na íntegra no prompt.
+            compact_every: Só resume quando houver ao menos esse número de trocas
+                fora da janela ainda não resumidas (menos chamadas ao LLM).
+            max_message_words: Limite de palavras por mensagem no prompt.
+            timeout: Limite (s) da chamada de resumo.
+            budget_share: Fração máxima do orçamento do turno gasta no resumo.
+            answer_seconds: Tempo (s) de uma resposta completa do LLM; sem essa
+                folga depois do resumo, a compactação fica para outro turno.
+        """
+        self.summarizer = summarizer
+        self.session_repo = session_repo
+        self.keep_turns = keep_turns
+        self.compact_every = compact_every
+        self.max_summary_words = max_summary_words
+        self.max_message_words = max_message_words
+        self.timeout = timeout
+        self.budget_share = budget_share
+        self.answer_seconds = answer_seconds
+        # Um lock por sessão (liberado quando ninguém o usa): serializa a
+        # leitura-modificação-gravação da sessão sem bloquear as outras conversas
+        self._locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._locks_guard = threading.Lock()
+
+    def lock_for(self, session_id: str) -> threading.Lock:
+        """Lock da sessão, compartilhado com o registro de turnos."""
+        with self._locks_guard:
+            lock = self._locks.get(session_id)
+            if lock is None:
+                lock = self._locks[session_id] = threading.Lock()
+            return lock
+
+    def compaction_timeout(self, budget: Optional[float]) -> Optional[float]:
+        """
+        Limite (s) do resumo dentro do orçamento do turno: no máximo
+        `budget_share` dele, e só se ainda sobrar `answer_seconds` para a
+        resposta. None quando não há orçamento para compactar agora.
+        """
+        if budget is None:
+            return self.timeout
+        timeout = budget * self.budget_share
+        if self.timeout is not None:
+            timeout = min(timeout, self.timeout)
+        if timeout <= 0 or budget - timeout < self.answer_seconds:
+            return None
+        return timeout
+
+    def _format(self, messages: List[Message]) -> str:
+        return "\n".join(
+            f"{_ROLE_LABELS.get(m.role, m.role)}: "
+            f"{_truncate_words(m.content, self.max_message_words)}"
+            for m in messages
+        )
+
+    def build_history(self, session: Optional[Session]) -> str:
+        """Histórico para o prompt: resumo + últimas trocas na íntegra."""
+        if session is None or not session.messages:
+            return ""
+        summary = (session.context or {}).get(SUMMARY_KEY)
+        recent = session.messages[-self.keep_turns * 2 :]
+        parts = [f"Resumo da conversa anterior: {summary}"] if summary else []
+        parts.append(self._format(recent))
+        return "\n".join(parts)
+
+    def _pending(self, session: Session) -> List[Message]:
+        """Mensagens fora da janela que ainda não entraram no resumo."""
+        since = (session.context or {}).get(SUMMARIZED_UNTIL_KEY)
+        older = session.messages[: -self.keep_turns * 2]
+        return [m for m in older if since is None or m.created_at.isoformat() > since]
+
+    def due(self, session: Optional[Session]) -> bool:
+        """Há trocas suficientes fora da janela para valer uma chamada de resumo."""
+        return session is not None and (
+            len(self._pending(session)) >= self.compact_every * 2
+        )
+
+    def compact(self, session_id: str, timeout: Optional[float] = None) -> bool:
+        """Atualiza o resumo da sessão. Retorna True se o resumo mudou."""
+        session = self.session_repo.get_session(session_id)
+        if not self.due(session):
+            return False
+        pending = self._pending(session)
+
+        summary = (session.context or {}).get(SUMMARY_KEY) or "(vazio)"
+        instruction = (
+            f"Resumo atual: {summary}\n"
+            "Atualize o resumo com as novas mensagens do contexto, em no máximo "
+            f"{self.max_summary_words} palavras."
+        )
+        updated = self.summarizer.invoke(
+            prompt=instruction,
+            context={
+                "rag_content": self._format(pending),
+                "instructions": SUMMARY_INSTRUCTIONS,
+            },
+            **timeout_kwargs(timeout if timeout is not None else self.timeout),
+        )
+        if not updated or updated.startswith(PROVIDER_ERROR_PREFIX):
+            return False
+
+        with self.lock_for(session_id):
+            latest = self.session_repo.get_session(session_id) or session
+            latest.context = {
+                **(latest.context or {}),
+                SUMMARY_KEY: _truncate_words(updated, self.max_summary_words),
+                SUMMARIZED_UNTIL_KEY: pending[-1].created_at.isoformat(),
+            }
+            self.session_repo.save_session(latest)
+        return True
@@ -0,0 +1,186 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from src.application.services.fallback_responder import CannedResponse
+from src.utils.text_normalization import tokenize
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    intent: str
+    score: float
+    text: str
+
+
+def _features(text: str, ngram: int) -> Counter:
+    """Tokens (sem stopwords) + n-gramas de caracteres (tolera erros de digitação)."""
+    tokens = tokenize(text)
+    features = Counter(f"w:{token}" for token in tokens)
+    # N-gramas sobre os tokens: stopwords ("o que é") não aproximam frases
+    padded = f" {' '.join(tokens)} "
+    features.update(f"c:{padded[i:i + ngram]}" for i in range(len(padded) - ngram + 1))
+    return features
+
+
+class IntentMatcher:
+    """
+    Classificador local de intents para o caminho rápido: índice TF-IDF
+    (palavras + n-gramas de caracteres) das frases de treino do Dialogflow,
+    construído uma vez, na primeira consulta (ou em `warm_up`): o import do
+    NumPy e a montagem da matriz saem do cold start. A mensagem vira um vetor esparso e o
+    vizinho mais próximo (cosseno) sai de um único produto com as colunas da
+    matriz dos termos presentes. Acima de `min_score` a resposta pronta do
+    intent é devolvida sem RAG nem LLM.
+    """
+
+    def __init__(
+        self,
+        canned_responses: Sequence[CannedResponse],
+        min_score: float = 0.6,
+        ngram: int = 3,
+    ):
+        """
+        Args:
+            canned_responses: Respostas prontas por intent (load_canned_responses).
+            min_score: Similaridade de cosseno mínima com a frase de treino mais
+                próxima para responder pelo caminho rápido.
+            ngram: Tamanho dos n-gramas de caracteres.
+        """
+        self.min_score = min_score
+        self.ngram = ngram
+        self._canned_responses = list(canned_responses)
+        self._responses: List[CannedResponse] = [
+            response
+            for response in self._canned_responses
+            for _ in response.training_phrases
+        ]
+        self._indexed = False
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+        self.total_lookup_ms = 0.0
+        self.last_score = 0.0
+
+    def _build_index(self) -> None:
+        import numpy as np
+
+        phrases = [
+            _features(phrase, self.ngram)
+            for response in self._canned_responses
+            for phrase in response.training_phrases
+        ]
+        document_frequency = Counter(f for features in phrases for f in features)
+        n_phrases = len(phrases)
+        self._vocabulary = {f: i for i, f in enumerate(document_frequency)}
+        self._idf = np.array(
+            [
+                math.log((1 + n_phrases) / (1 + document_frequency[f])) + 1
+                for f in self._vocabulary
+            ],
+            dtype=np.float32,
+        )
+        # Peso de termos fora do vocabulário (df = 0): entram só na norma da consulta
+        self._unknown_idf = math.log(1 + n_phrases) + 1
+
+        # Termos x frases: a consulta lê só as linhas dos seus termos
+        self._matrix = np.zeros((len(self._vocabulary), n_phrases), dtype=np.float32)
+        for column, features in enumerate(phrases):
+            rows = [self._vocabulary[f] for f in features]
+            weights = self._weights(features.values()) * self._idf[rows]
+            norm = np.linalg.norm(weights)
+            self._matrix[rows, column] = weights / (norm or 1.0)
+
+        self._indexed = True
+        logger.info(
+            f"Índice de intents construído: {len({r.intent for r in self._responses})} "
+            f"intents, {n_phrases} frases, {len(self._vocabulary)} termos"
+        )
+
+    def warm_up(self) -> float:
+        """Constrói o índice, se ainda não existir; devolve o tempo gasto (ms)."""
+        started = time.perf_counter()
+        if not self._indexed:
+            with self._lock:
+                if not self._indexed:
+                    self._build_index()
+        return (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _weights(counts) -> "np.ndarray":
+        import numpy as np
+
+        # tf sublinear: repetições pesam pouco
+        return 1 + np.log(np.fromiter(counts, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _scores(self, message: str) -> "np.ndarray":
+        import numpy as np
+
+        features = _features(message, self.ngram)
+        known = [f for f in features if f in self._vocabulary]
+        if not known or not self._responses:
+            return np.zeros(len(self._responses), dtype=np.float32)
+        rows = [self._vocabulary[f] for f in known]
+        weights = self._weights(features[f] for f in known) * self._idf[rows]
+        unknown = self._weights(
+            features[f] for f in features if f not in self._vocabulary
+        )
+        norm = math.sqrt(
+            float(weights @ weights) + float(unknown @ unknown) * self._unknown_idf**2
+        )
+        return (weights / norm) @ self._matrix[rows]
+
+    def _nearest(self, message: str) -> Optional[IntentMatch]:
+        import numpy as np
+
+        if not self._indexed:
+            self.warm_up()
+        scores = self._scores(message)
+        if not len(scores):
+            return None
+        best = int(np.argmax(scores))
+        response = self._responses[best]
+        return IntentMatch(response.intent, float(scores[best]), response.text)
+
+    def match(self, message: str) -> Optional[IntentMatch]:
+        """Intent da frase de treino mais próxima (None abaixo de `min_score`)."""
+        started = time.perf_counter()
+        self.lookups += 1
+        nearest = self._nearest(message)
+        self.last_score = nearest.score if nearest is not None else 0.0
+        self.total_lookup_ms += (time.perf_counter() - started) * 1000
+        if self.last_score < self.min_score:
+            return None
+        self.hits += 1
+        return nearest
+
+    def closest(self, message: str) -> Optional[IntentMatch]:
+        """Como `match`, sem entrar nas métricas do caminho rápido (ex: fallback)."""
+        nearest = self._nearest(message)
+        if nearest is None or nearest.score < self.min_score:
+            return None
+        return nearest
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "score": round(self.last_score, 4),
+            "avg_lookup_ms": (
+                round(self.total_lookup_ms / self.lookups, 4) if self.lookups else 0.0
+            ),
+        }
@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.utils.risk_matcher import RiskMatch, RiskMatcher, normalize_for_matching
+from src.utils.safety_filters import (
+    EMERGENCY_MESSAGE,
+    OUTPUT_EMERGENCY_CATEGORIES,
+    OUTPUT_RISK_MATCHER,
+    SAFE_FALLBACK_MESSAGE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GuardedStream:
+    """
+    Fragmentos do LLM verificados conforme chegam. O scanner mantém o estado do
+    autômato entre fragmentos (nada é varrido duas vezes) e só o trecho final
+    que ainda pode completar um termo fica retido; ao casar, o stream é
+    interrompido e a mensagem substituta é enviada no lugar.
+    """
+
+    def __init__(self, guard: "OutputSafetyGuard", chunks: Iterator[str]):
+        self.guard = guard
+        self._chunks = chunks
+        self.scanner = guard.matcher.scanner()
+        self.match: Optional[RiskMatch] = None
+        self.chunks = 0
+        self.scan_ms = 0.0
+
+    def _holdback(self, pending: str) -> int:
+        """Caracteres do final de `pending` que precisam ficar retidos."""
+        depth = self.scanner.partial_length
+        # Profundidade 1 é só o separador de palavra: nada a reter
+        if depth <= 1:
+            return 0
+        keep = depth
+        while (
+            keep < len(pending) and len(normalize_for_matching(pending[-keep:])) < depth
+        ):
+            keep += depth
+        return min(keep, len(pending))
+
+    def __iter__(self) -> Iterator[str]:
+        pending = ""
+        released = False
+        for chunk in self._chunks:
+            start = time.perf_counter()
+            self.match = self.scanner.feed(chunk)
+            if self.match is None:
+                pending += chunk
+                cut = len(pending) - self._holdback(pending)
+                release, pending = pending[:cut], pending[cut:]
+            self.scan_ms += (time.perf_counter() - start) * 1000
+            self.chunks += 1
+
+            if self.match is not None:
+                self._stop()
+                replacement = self.guard.replacement_for(self.match)
+                yield "\n\n" + replacement if released else replacement
+                return
+            if release:
+                released = True
+                yield release
+
+        if pending:
+            yield pending
+        self.guard.record(self)
+
+    def _stop(self) -> None:
+        """Encerra a geração no provedor e registra o bloqueio."""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+        logger.warning(
+            f"Saída do LLM bloqueada no fragmento {self.chunks} "
+            f"(categoria: {self.match.category})."
+        )
+        self.guard.record(self)
+
+
+class OutputSafetyGuard:
+    """
+    Verificação de segurança da resposta gerada pelo LLM, com streaming
+    (`wrap`) ou sobre o texto completo (`screen`). Termos de método/incentivo
+    de autolesão são trocados pela mensagem de emergência; os demais, por uma
+    resposta neutra.
+    """
+
+    def __init__(
+        self,
+        matcher: RiskMatcher = OUTPUT_RISK_MATCHER,
+        emergency_categories=OUTPUT_EMERGENCY_CATEGORIES,
+        emergency_message: str = EMERGENCY_MESSAGE,
+        fallback_message: str = SAFE_FALLBACK_MESSAGE,
+    ):
+        self.matcher = matcher
+        self.emergency_categories = frozenset(emergency_categories)
+        self.emergency_message = emergency_message
+        self.fallback_message = fallback_message
+
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.chunks = 0
+        self.blocked = 0
+        self.scan_ms = 0.0
+
+    def replacement_for(self, match: RiskMatch) -> str:
+        if match.category in self.emergency_categories:
+            return self.emergency_message
+        return self.fallback_message
+
+    def wrap(self, chunks: Iterator[str]) -> GuardedStream:
+        return GuardedStream(self, chunks)
+
+    def screen(self, text: str) -> Tuple[str, Optional[RiskMatch]]:
+        """Verifica uma resposta completa; retorna (texto final, termo bloqueado)."""
+        start = time.perf_counter()
+        match = self.matcher.find(text)
+        self._add(1, (time.perf_counter() - start) * 1000, match is not None)
+        if match is None:
+            return text, None
+        logger.warning(f"Saída do LLM bloqueada (categoria: {match.category}).")
+        return self.replacement_for(match), match
+
+    def record(self, stream: GuardedStream) -> None:
+        self._add(stream.chunks, stream.scan_ms, stream.match is not None)
+
+    def _add(self, chunks: int, scan_ms: float, blocked: bool) -> None:
+        with self._lock:
+            self.responses += 1
+            self.chunks += chunks
+            self.scan_ms += scan_ms
+            self.blocked += int(blocked)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "blocked_responses": self.blocked,
+                "chunks": self.chunks,
+                "scan_ms": round(self.scan_ms, 3),
+                "avg_chunk_us": (
+                    round(self.scan_ms * 1000 / self.chunks, 2) if self.chunks else 0.0
+                ),
+            }
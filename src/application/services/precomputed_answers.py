@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from src.domain.interfaces.repositories import LLMProvider
+from src.utils.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Formato do artefato (mudanças incompatíveis incrementam)
+ARTIFACT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PrecomputedAnswer:
+    """
+    Resposta gerada offline. `key` é a chave do cache de respostas
+    (build_response_cache_key): pergunta + hash do contexto + modelo + versão
+    do prompt + namespace; mudou algum deles, a resposta está desatualizada.
+    """
+
+    question: str
+    answer: str
+    key: str
+    context_hash: str
+
+
+def build_artifact(
+    answers: Iterable[PrecomputedAnswer],
+    namespace: str,
+    model_id: str,
+    prompt_version: str,
+) -> Dict[str, Any]:
+    return {
+        "version": ARTIFACT_VERSION,
+        "namespace": namespace,
+        "model_id": model_id,
+        "prompt_version": prompt_version,
+        "created_at": int(time.time()),
+        "answers": [asdict(answer) for answer in answers],
+    }
+
+
+def save_artifact(artifact: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_artifact(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        artifact = json.load(f)
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Versão de artefato não suportada: {artifact.get('version')}")
+    return artifact
+
+
+def artifact_answers(
+    artifact: Optional[Dict[str, Any]]
+) -> Dict[str, PrecomputedAnswer]:
+    """Respostas do artefato por pergunta normalizada."""
+    answers = {}
+    for item in (artifact or {}).get("answers", []):
+        answer = PrecomputedAnswer(**item)
+        answers[normalize_text(answer.question)] = answer
+    return answers
+
+
+class PrecomputedAnswerStore:
+    """
+    Respostas pré-computadas (ops/precompute_answers.py) servidas em memória:
+    busca exata pela pergunta normalizada, sem RAG nem LLM. Um artefato de
+    outro namespace (RESPONSE_CACHE_VERSION), ou gerado com outro modelo/versão
+    de prompt que o `llm_provider` em uso, é ignorado por inteiro.
+    """
+
+    def __init__(
+        self,
+        artifact: Dict[str, Any],
+        namespace: Optional[str] = None,
+        llm_provider: Optional[LLMProvider] = None,
+    ):
+        """
+        Args:
+            llm_provider: Provedor em uso; conferido na primeira busca (ler o
+                `model_id` de um provedor preguiçoso o constrói).
+        """
+        self.namespace = artifact.get("namespace")
+        self.model_id = artifact.get("model_id")
+        self.prompt_version = artifact.get("prompt_version")
+        self._llm_provider = llm_provider
+        self._check_lock = threading.Lock()
+        self._answers: Dict[str, PrecomputedAnswer] = {}
+        if namespace is not None and self.namespace != namespace:
+            logger.warning(
+                f"Respostas pré-computadas ignoradas: namespace {self.namespace!r} "
+                f"!= {namespace!r} (regenere com ops/precompute_answers.py)"
+            )
+        else:
+            self._answers = artifact_answers(artifact)
+
+        self.lookups = 0
+        self.hits = 0
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        namespace: Optional[str] = None,
+        llm_provider: Optional[LLMProvider] = None,
+    ) -> "PrecomputedAnswerStore":
+        return cls(load_artifact(path), namespace=namespace, llm_provider=llm_provider)
+
+    def _check_model(self) -> None:
+        """Descarta as respostas se o artefato não for do modelo/prompt em uso."""
+        with self._check_lock:
+            provider, self._llm_provider = self._llm_provider, None
+            if provider is None:
+                return
+            live = (provider.model_id, provider.prompt_version)
+            if (self.model_id, self.prompt_version) != live:
+                logger.warning(
+                    f"Respostas pré-computadas ignoradas: geradas com "
+                    f"{self.model_id!r}/prompt {self.prompt_version!r}, em uso "
+                    f"{live[0]!r}/prompt {live[1]!r} (regenere com ops/precompute_answers.py)"
+                )
+                self._answers = {}
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def lookup(self, message: str) -> Optional[PrecomputedAnswer]:
+        if self._llm_provider is not None:
+            self._check_model()
+        self.lookups += 1
+        answer = self._answers.get(normalize_text(message))
+        if answer is not None:
+            self.hits += 1
+        return answer
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "entries": len(self._answers),
+        }
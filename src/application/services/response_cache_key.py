@@ -0,0 +1,31 @@
+import hashlib
+
+from src.utils.text_normalization import normalize_text
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_response_cache_key(
+    message: str,
+    rag_context: str,
+    model_id: str,
+    prompt_version: str = "1",
+    namespace: str = "v1",
+    history: str = "",
+) -> str:
+    """
+    Monta a chave do cache de respostas.
+
+    A chave combina a mensagem normalizada, o hash do contexto recuperado e o
+    modelo. `namespace` (ex: versão do índice da base de conhecimento) e
+    `prompt_version` são prefixos versionados: alterá-los invalida as entradas antigas.
+    Com `history` (histórico da sessão no prompt), o hash dele também entra:
+    a resposta só serve à mesma conversa. Sem histórico, a chave não muda.
+    """
+    parts = [normalize_text(message), _sha256(rag_context or ""), model_id or ""]
+    if history:
+        parts.append(_sha256(history))
+    digest = _sha256("\x1f".join(parts))
+    return f"{namespace}:p{prompt_version}:{digest}"
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.application.dtos.ingestion_dto import IngestionReport
+from src.application.services.document_chunker import chunk_document
+from src.domain.entities.knowledge import Document, DocumentChunk
+from src.domain.interfaces.repositories import EmbeddingProvider, VectorStoreWriter
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestKnowledgeBase:
+    """
+    Ingestão incremental da base de conhecimento: documentos -> chunks ->
+    embeddings em lotes -> escrita em bulk no vector store.
+
+    O manifesto ({source: {"content_hash", "chunks"}}) guarda o estado da última
+    execução: documentos inalterados são pulados, só chunks novos são
+    embedados e chunks que sumiram são removidos do índice. Chunks recusados
+    pelo vector store não entram no manifesto e o documento fica sem hash: a
+    próxima execução incremental tenta gravá-los de novo.
+    """
+
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        writer: VectorStoreWriter,
+        max_chars: int = 1200,
+        overlap: int = 200,
+        batch_size: Optional[int] = None,
+    ):
+        self.embedding_provider = embedding_provider
+        self.writer = writer
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.batch_size = batch_size or embedding_provider.max_batch_size
+
+    def _embed_and_write(
+        self, chunks: List[DocumentChunk], report: IngestionReport
+    ) -> Set[str]:
+        """Embeda e grava em lotes; devolve os ids recusados pelo vector store."""
+        failed: Set[str] = set()
+        for start in range(0, len(chunks), self.batch_size):
+            batch = chunks[start : start + self.batch_size]
+            vectors = self.embedding_provider.embed([chunk.text for chunk in batch])
+            failed.update(self.writer.upsert(batch, vectors))
+            report.embedding_batches += 1
+            report.embedded_chunks += len(batch)
+        return failed
+
+    @staticmethod
+    def _forget_failed(current: Dict[str, Any], failed: Set[str]) -> None:
+        for source, entry in current.items():
+            if failed.isdisjoint(entry["chunks"]):
+                continue
+            # Sem hash, o documento é reprocessado; os chunks gravados são reaproveitados
+            current[source] = {
+                "content_hash": None,
+                "chunks": [c for c in entry["chunks"] if c not in failed],
+            }
+
+    def execute(
+        self,
+        documents: Iterable[Document],
+        manifest: Optional[Dict[str, Any]] = None,
+        prune: bool = True,
+    ) -> IngestionReport:
+        """
+        Args:
+            manifest: Manifesto da execução anterior (vazio = reindexação completa).
+            prune: Remove do índice os documentos que não vieram nesta execução.
+        """
+        start = time.perf_counter()
+        previous = dict(manifest or {})
+        current: Dict[str, Any] = {}
+        report = IngestionReport()
+        pending: List[DocumentChunk] = []
+        stale_ids: List[str] = []
+        failed: Set[str] = set()
+
+        for document in documents:
+            report.documents += 1
+            doc_hash = content_hash(document.text)
+            entry = previous.pop(document.source, None)
+            if entry and entry.get("content_hash") == doc_hash:
+                current[document.source] = entry
+                report.unchanged_documents += 1
+                continue
+
+            chunks = chunk_document(document, self.max_chars, self.overlap)
+            known = set(entry.get("chunks", [])) if entry else set()
+            new_ids: List[str] = []
+            seen = set()
+            for chunk in chunks:
+                if chunk.chunk_id in seen:
+                    continue
+                seen.add(chunk.chunk_id)
+                new_ids.append(chunk.chunk_id)
+                if chunk.chunk_id in known:
+                    report.reused_chunks += 1
+                else:
+                    pending.append(chunk)
+            stale_ids.extend(known - seen)
+            current[document.source] = {"content_hash": doc_hash, "chunks": new_ids}
+
+            # Embeda em lotes conforme os chunks se acumulam (streaming)
+            if len(pending) >= self.batch_size:
+                full = len(pending) - len(pending) % self.batch_size
+                failed |= self._embed_and_write(pending[:full], report)
+                pending = pending[full:]
+
+        failed |= self._embed_and_write(pending, report)
+        if failed:
+            self._forget_failed(current, failed)
+            report.failed_chunks = len(failed)
+
+        if prune:
+            for source, entry in previous.items():
+                stale_ids.extend(entry.get("chunks", []))
+                report.removed_documents += 1
+        else:
+            current.update(previous)
+
+        if stale_ids:
+            self.writer.delete(stale_ids)
+            report.deleted_chunks = len(stale_ids)
+        self.writer.flush()
+
+        report.manifest = current
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Ingestão: {report.documents} documentos "
+            f"({report.unchanged_documents} inalterados), "
+            f"{report.embedded_chunks} chunks embedados, "
+            f"{report.deleted_chunks} removidos em {report.elapsed_ms:.0f} ms"
+        )
+        if report.failed_chunks:
+            logger.warning(
+                f"{report.failed_chunks} chunks recusados pelo vector store; "
+                "ficam fora do manifesto para a próxima execução."
+            )
+        return report
@@ -0,0 +1,137 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.application.dtos.precompute_dto import PrecomputeReport
+from src.application.services.precomputed_answers import (
+    PrecomputedAnswer,
+    artifact_answers,
+    build_artifact,
+)
+from src.application.services.response_cache_key import build_response_cache_key
+from src.application.use_cases.ingest_knowledge_base import content_hash
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    ContextRepository,
+    LLMProvider,
+)
+from src.utils.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class PrecomputeAnswers:
+    """
+    Gera offline as respostas de uma lista curada de perguntas frequentes:
+    recupera o contexto (RAG) e chama o LLM com no máximo `max_concurrency`
+    perguntas em voo. Com o artefato anterior, só as perguntas novas ou
+    desatualizadas (chave diferente: contexto, modelo, prompt ou namespace
+    mudaram) vão ao LLM; as demais são copiadas.
+    """
+
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        context_repo: ContextRepository,
+        namespace: str = "v1",
+        max_concurrency: int = 4,
+    ):
+        self.llm_provider = llm_provider
+        self.context_repo = context_repo
+        self.namespace = namespace
+        self.max_concurrency = max_concurrency
+
+    def _key(self, question: str, context: str) -> str:
+        return build_response_cache_key(
+            question,
+            context,
+            model_id=str(getattr(self.llm_provider, "model_id", "unknown")),
+            prompt_version=str(getattr(self.llm_provider, "prompt_version", "1")),
+            namespace=self.namespace,
+        )
+
+    def _generate(self, question: str, context: str) -> Optional[str]:
+        try:
+            answer = self.llm_provider.invoke(
+                prompt=question, context={"rag_content": context}
+            )
+        except Exception as e:
+            logger.error(f"Falha ao gerar resposta para {question!r}: {str(e)}")
+            return None
+        if not answer or answer.startswith(PROVIDER_ERROR_PREFIX):
+            return None
+        return answer.strip()
+
+    def execute(
+        self,
+        questions: Iterable[str],
+        previous: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+    ) -> PrecomputeReport:
+        """
+        Args:
+            previous: Artefato da execução anterior (vazio = gera tudo).
+            dry_run: Só aponta as perguntas novas/desatualizadas, sem chamar o LLM.
+        """
+        start = time.perf_counter()
+        report = PrecomputeReport()
+        known = artifact_answers(previous)
+
+        unique: Dict[str, str] = {}
+        for question in questions:
+            unique.setdefault(normalize_text(question), question.strip())
+        report.questions = len(unique)
+        report.removed = len(set(known) - set(unique))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            contexts = list(
+                executor.map(self.context_repo.retrieve_context, unique.values())
+            )
+
+            answers: Dict[str, PrecomputedAnswer] = {}
+            pending: List[tuple] = []
+            for (normalized, question), context in zip(unique.items(), contexts):
+                key = self._key(question, context)
+                current = known.get(normalized)
+                if current is not None and current.key == key:
+                    answers[normalized] = current
+                    report.unchanged += 1
+                    continue
+                if current is not None:
+                    report.stale.append(question)
+                pending.append((normalized, question, context, key))
+
+            if not dry_run:
+                generated = executor.map(
+                    lambda item: self._generate(item[1], item[2]), pending
+                )
+                for (normalized, question, context, key), answer in zip(
+                    pending, generated
+                ):
+                    if answer is None:
+                        report.failed.append(question)
+                        continue
+                    answers[normalized] = PrecomputedAnswer(
+                        question=question,
+                        answer=answer,
+                        key=key,
+                        context_hash=content_hash(context or ""),
+                    )
+                    report.generated += 1
+
+        # Mantém a ordem da lista curada
+        report.artifact = build_artifact(
+            (answers[n] for n in unique if n in answers),
+            namespace=self.namespace,
+            model_id=str(getattr(self.llm_provider, "model_id", "unknown")),
+            prompt_version=str(getattr(self.llm_provider, "prompt_version", "1")),
+        )
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Respostas pré-computadas: {report.questions} perguntas, "
+            f"{report.generated} geradas, {report.unchanged} inalteradas, "
+            f"{len(report.stale)} desatualizadas, {len(report.failed)} falhas "
+            f"em {report.elapsed_ms:.0f} ms"
+        )
+        return report
@@ -1,27 +1,954 @@
-from src.application.dtos.message_dto import ProcessMessageInput, ProcessMessageOutput
-from src.domain.interfaces.repositories import ContextRepository, LLMProvider
-from src.utils.safety_filters import (  # Assuming this exists, will refactor later to be injectable
-    check_safety,
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from src.application.dtos.context_dto import CompressedContext
+from src.application.dtos.message_dto import (
+    ProcessMessageInput,
+    ProcessMessageOutput,
+    ProcessMessageStreamOutput,
+)
+from src.application.dtos.pipeline_dto import PipelineTimings
+from src.application.services.context_compressor import ContextCompressor
+from src.application.services.fallback_responder import FallbackResponder
+from src.application.services.history_compactor import HistoryCompactor
+from src.application.services.intent_matcher import IntentMatch, IntentMatcher
+from src.application.services.output_safety import GuardedStream, OutputSafetyGuard
+from src.application.services.precomputed_answers import (
+    PrecomputedAnswer,
+    PrecomputedAnswerStore,
+)
+from src.application.services.response_cache_key import build_response_cache_key
+from src.domain.entities.deadline import Deadline
+from src.domain.entities.session import Message, Session
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    ContextRepository,
+    LLMProvider,
+    ResponseCache,
+    SemanticCache,
+    SessionRepository,
+    timeout_kwargs,
 )
+from src.utils.safety_filters import EMERGENCY_MESSAGE, check_safety, detect_risk
+
+logger = logging.getLogger(__name__)
 
 
 class ProcessUserMessage:
-    def __init__(self, llm_provider: LLMProvider, context_repo: ContextRepository):
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        context_repo: ContextRepository,
+        response_cache: Optional[ResponseCache] = None,
+        cache_namespace: str = "v1",
+        semantic_cache: Optional[SemanticCache] = None,
+        context_compressor: Optional[ContextCompressor] = None,
+        session_repo: Optional[SessionRepository] = None,
+        history_compactor: Optional[HistoryCompactor] = None,
+        output_guard: Optional[OutputSafetyGuard] = None,
+        concurrent: bool = False,
+        safety_timeout: Optional[float] = None,
+        retrieval_timeout: Optional[float] = None,
+        max_workers: int = 8,
+        safety_check: Callable[[str], Tuple[bool, Optional[str]]] = check_safety,
+        fallback_responder: Optional[FallbackResponder] = None,
+        deadline_reserve: float = 0.25,
+        min_llm_seconds: float = 0.5,
+        intent_matcher: Optional[IntentMatcher] = None,
+        precomputed_answers: Optional[PrecomputedAnswerStore] = None,
+        intent_platforms: Tuple[str, ...] = ("api",),
+    ):
+        """
+        Args:
+            concurrent: Inicia a recuperação (RAG) especulativamente em paralelo
+                com a verificação de segurança; descartada se houver risco.
+            safety_timeout: Limite (s) da verificação completa no modo concorrente;
+                ao estourar, vale só o léxico (tier 1), que é imediato.
+            retrieval_timeout: Limite (s) da recuperação no modo concorrente;
+                ao estourar, o LLM responde sem contexto RAG.
+            safety_check: Verificação de segurança da mensagem (padrão: check_safety).
+            fallback_responder: Resposta rápida quando o deadline da requisição
+                (`input_dto.deadline`) não será cumprido pelo LLM ou quando o
+                provedor falha (ex: circuit breaker aberto).
+            deadline_reserve: Tempo (s) reservado após o LLM (pós-processamento
+                e serialização da resposta).
+            min_llm_seconds: Abaixo desse orçamento, nem chama o LLM.
+            intent_matcher: Caminho rápido: mensagens que casam com confiança
+                com um intent conhecido recebem a resposta pronta, sem RAG nem LLM.
+            precomputed_answers: Respostas geradas offline para perguntas
+                frequentes (busca exata, antes dos intents).
+            intent_platforms: Origens em que o intent_matcher é consultado. No
+                Dialogflow, o agente já casou os intents antes de chamar o webhook.
+        """
         self.llm_provider = llm_provider
         self.context_repo = context_repo
+        self.response_cache = response_cache
+        self.cache_namespace = cache_namespace
+        self.semantic_cache = semantic_cache
+        self.context_compressor = context_compressor
+        self.session_repo = session_repo
+        self.history_compactor = history_compactor
+        self.output_guard = output_guard
+        self.concurrent = concurrent
+        self.safety_timeout = safety_timeout
+        self.retrieval_timeout = retrieval_timeout
+        self.safety_check = safety_check
+        self.fallback_responder = fallback_responder or FallbackResponder()
+        self.deadline_reserve = deadline_reserve
+        self.min_llm_seconds = min_llm_seconds
+        self.intent_matcher = intent_matcher
+        self.precomputed_answers = precomputed_answers
+        self.intent_platforms = tuple(intent_platforms)
+        self._max_workers = max_workers
+        # Pool persistente: reaproveitado entre invocações quentes
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+            if concurrent
+            else None
+        )
+        # Pool próprio das chamadas ao LLM com deadline: as abandonadas ocupam
+        # uma thread até o timeout do SDK sem atrasar segurança e recuperação
+        self._llm_executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _bypass_cache(input_dto: ProcessMessageInput) -> bool:
+        """Permite ao chamador pular os caches (ex: metadata={"bypass_cache": True})."""
+        return bool((input_dto.metadata or {}).get("bypass_cache"))
+
+    def _cache_key(self, message: str, context: str, history: str = "") -> str:
+        return build_response_cache_key(
+            message,
+            context,
+            model_id=str(getattr(self.llm_provider, "model_id", "unknown")),
+            prompt_version=str(getattr(self.llm_provider, "prompt_version", "1")),
+            namespace=self.cache_namespace,
+            history=history,
+        )
+
+    def _metadata(
+        self,
+        hit: Optional[bool] = None,
+        semantic_hit: Optional[bool] = None,
+        compressed: Optional[CompressedContext] = None,
+        output_blocked: Optional[bool] = None,
+        timings: Optional[PipelineTimings] = None,
+        intent: Optional[IntentMatch] = None,
+        precomputed: Optional[PrecomputedAnswer] = None,
+    ) -> Optional[Dict[str, Any]]:
+        metadata = {}
+        if precomputed is not None:
+            metadata["precomputed"] = {
+                "hit": True,
+                **self.precomputed_answers.stats(),
+            }
+        if intent is not None:
+            metadata["intent"] = {
+                "name": intent.intent,
+                **self.intent_matcher.stats(),
+            }
+        if hit is not None:
+            metadata["cache"] = {"hit": hit, **self.response_cache.stats()}
+        if semantic_hit is not None:
+            metadata["semantic_cache"] = {
+                "hit": semantic_hit,
+                **self.semantic_cache.stats(),
+            }
+        if compressed is not None:
+            metadata["context"] = compressed.as_metadata()
+        if output_blocked is not None:
+            metadata["output_safety"] = {
+                "blocked": output_blocked,
+                **self.output_guard.stats(),
+            }
+        if timings is not None:
+            metadata["timings"] = timings.as_metadata()
+        return metadata or None
+
+    def _timings(self, input_dto: ProcessMessageInput) -> PipelineTimings:
+        timings = PipelineTimings(
+            mode="concurrent" if self.concurrent else "sequential"
+        )
+        if input_dto.deadline is not None:
+            timings.budget_ms = input_dto.deadline.remaining() * 1000
+        return timings
+
+    def _bounded(
+        self, timeout: Optional[float], input_dto: ProcessMessageInput
+    ) -> Optional[float]:
+        """Timeout de uma etapa limitado ao tempo restante até o deadline."""
+        if input_dto.deadline is None:
+            return timeout
+        remaining = input_dto.deadline.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _llm_budget(self, input_dto: ProcessMessageInput) -> Optional[float]:
+        """Tempo (s) disponível para o LLM; None quando não há deadline."""
+        if input_dto.deadline is None:
+            return None
+        return input_dto.deadline.remaining() - self.deadline_reserve
+
+    def _fallback(
+        self, input_dto: ProcessMessageInput, context: str, timings: PipelineTimings
+    ) -> str:
+        timings.fallbacks.append("llm")
+        logger.warning("LLM indisponível ou fora do deadline; usando fallback.")
+        return self.fallback_responder.answer(input_dto.message, context)
+
+    def _degrade_on_error(
+        self,
+        response_text: str,
+        input_dto: ProcessMessageInput,
+        context: str,
+        timings: PipelineTimings,
+    ) -> str:
+        """Falha do provedor (ex: circuito aberto): resposta degradada sem LLM."""
+        if not response_text or response_text.startswith(PROVIDER_ERROR_PREFIX):
+            return self._fallback(input_dto, context, timings)
+        return response_text
+
+    def _degrade_stream(
+        self,
+        chunks: Iterator[str],
+        input_dto: ProcessMessageInput,
+        context: str,
+        timings: PipelineTimings,
+    ) -> Iterator[str]:
+        """
+        _degrade_on_error para streaming: falha antes do primeiro fragmento vira a
+        resposta degradada; depois dele, a resposta parcial é encerrada sem o
+        pedido de desculpas (e, marcada em fallbacks, não entra nos caches).
+        """
+        streamed = False
+        try:
+            for chunk in chunks:
+                if chunk.strip().startswith(PROVIDER_ERROR_PREFIX):
+                    break
+                streamed = True
+                yield chunk
+            else:
+                if streamed:
+                    return
+        except Exception as e:
+            logger.error(f"Erro no streaming do LLM: {str(e)}")
+        if streamed:
+            timings.fallbacks.append("llm_stream")
+            logger.warning("Streaming do LLM interrompido; resposta parcial encerrada.")
+            return
+        yield self._fallback(input_dto, context, timings)
+
+    def _deadline_executor(self) -> ThreadPoolExecutor:
+        # Criado sob demanda: só requisições com deadline pagam o custo
+        if self._llm_executor is None:
+            self._llm_executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="pipeline-llm"
+            )
+        return self._llm_executor
+
+    def _invoke_until(self, deadline: Deadline, prompt: str, context: str) -> str:
+        """
+        Roda no pool: o timeout do SDK é o que resta do prazo quando a chamada
+        de fato começa (a espera na fila não estende o prazo). Chamadas
+        abandonadas pelo deadline terminam junto com ele em vez de seguirem
+        até o timeout padrão do SDK.
+        """
+        timeout = deadline.remaining()
+        if timeout <= 0:
+            return ""
+        return self.llm_provider.invoke(prompt=prompt, context=context, timeout=timeout)
+
+    def _invoke_llm(
+        self,
+        input_dto: ProcessMessageInput,
+        prompt_context: str,
+        timings: PipelineTimings,
+        history: str = "",
+    ) -> str:
+        """
+        Chama o LLM respeitando o deadline: o tempo restante vai como `timeout`
+        para o adapter e a espera é limitada aqui; se não der tempo (ou o
+        provedor falhar), responde com o fallback em vez de estourar o prazo.
+        """
+        llm_context = self._llm_context(prompt_context, history)
+        budget = self._llm_budget(input_dto)
+        if budget is None:
+            response_text = self.llm_provider.invoke(
+                prompt=input_dto.message, context=llm_context
+            )
+            return self._degrade_on_error(
+                response_text, input_dto, prompt_context, timings
+            )
+        if budget < self.min_llm_seconds:
+            return self._fallback(input_dto, prompt_context, timings)
+
+        future = self._deadline_executor().submit(
+            self._invoke_until, Deadline.after(budget), input_dto.message, llm_context
+        )
+        try:
+            response_text = future.result(timeout=budget)
+        except FutureTimeoutError:
+            # Ainda na fila: nem chega a chamar o provedor
+            future.cancel()
+            timings.timeouts.append("llm")
+            return self._fallback(input_dto, prompt_context, timings)
+        return self._degrade_on_error(response_text, input_dto, prompt_context, timings)
+
+    async def _ainvoke_llm(
+        self,
+        input_dto: ProcessMessageInput,
+        prompt_context: str,
+        timings: PipelineTimings,
+        history: str = "",
+    ) -> str:
+        llm_context = self._llm_context(prompt_context, history)
+        budget = self._llm_budget(input_dto)
+        if budget is None:
+            response_text = await self.llm_provider.ainvoke(
+                prompt=input_dto.message, context=llm_context
+            )
+            return self._degrade_on_error(
+                response_text, input_dto, prompt_context, timings
+            )
+        if budget < self.min_llm_seconds:
+            return self._fallback(input_dto, prompt_context, timings)
+
+        try:
+            response_text = await asyncio.wait_for(
+                self.llm_provider.ainvoke(
+                    prompt=input_dto.message, context=llm_context, timeout=budget
+                ),
+                timeout=budget,
+            )
+        except asyncio.TimeoutError:
+            timings.timeouts.append("llm")
+            return self._fallback(input_dto, prompt_context, timings)
+        return self._degrade_on_error(response_text, input_dto, prompt_context, timings)
+
+    def _start_retrieval(self, input_dto: ProcessMessageInput) -> Optional[Future]:
+        """Modo concorrente: dispara a recuperação antes da verificação de segurança."""
+        if not self.concurrent:
+            return None
+        return self._executor.submit(self._timed_retrieval, input_dto.message)
+
+    def _timed_retrieval(self, message: str) -> Tuple[str, float]:
+        started = time.perf_counter()
+        context = self.context_repo.retrieve_context(message)
+        return context, (time.perf_counter() - started) * 1000
+
+    def _check_safety(
+        self, input_dto: ProcessMessageInput, timings: PipelineTimings
+    ) -> Tuple[bool, Optional[str]]:
+        started = time.perf_counter()
+        try:
+            if not self.concurrent:
+                return self.safety_check(input_dto.message)
+            future = self._executor.submit(self.safety_check, input_dto.message)
+            try:
+                return future.result(
+                    timeout=self._bounded(self.safety_timeout, input_dto)
+                )
+            except FutureTimeoutError:
+                # Sem resposta das camadas lentas, decide só pelo léxico
+                timings.timeouts.append("safety")
+                logger.warning("Timeout na verificação de segurança; usando o léxico.")
+                if detect_risk(input_dto.message) is not None:
+                    return False, EMERGENCY_MESSAGE
+                return True, None
+        finally:
+            timings.record("safety", started)
+
+    def _cancel_retrieval(
+        self, retrieval: Optional[Future], timings: PipelineTimings
+    ) -> None:
+        """Descarta a recuperação especulativa (risco detectado ou cache semântico)."""
+        if retrieval is not None:
+            retrieval.cancel()
+            timings.cancelled.append("retrieval")
+
+    def _retrieve(
+        self,
+        input_dto: ProcessMessageInput,
+        retrieval: Optional[Future],
+        timings: PipelineTimings,
+    ) -> str:
+        if retrieval is None:
+            started = time.perf_counter()
+            context = self.context_repo.retrieve_context(input_dto.message)
+            timings.record("retrieval", started)
+            return context
+
+        started = time.perf_counter()
+        try:
+            context, elapsed_ms = retrieval.result(
+                timeout=self._bounded(self.retrieval_timeout, input_dto)
+            )
+            timings.stages["retrieval"] = elapsed_ms
+            timings.record("retrieval_wait", started)
+            return context
+        except FutureTimeoutError:
+            retrieval.cancel()
+            timings.timeouts.append("retrieval")
+            timings.record("retrieval_wait", started)
+            logger.warning("Timeout na recuperação de contexto; seguindo sem RAG.")
+            return ""
+
+    def _precomputed_lookup(
+        self, input_dto: ProcessMessageInput, timings: PipelineTimings
+    ) -> Optional[PrecomputedAnswer]:
+        if self.precomputed_answers is None or self._bypass_cache(input_dto):
+            return None
+        started = time.perf_counter()
+        answer = self.precomputed_answers.lookup(input_dto.message)
+        timings.record("precomputed", started)
+        return answer
+
+    def _match_intent(
+        self, input_dto: ProcessMessageInput, timings: PipelineTimings
+    ) -> Optional[IntentMatch]:
+        """Intent conhecido com confiança (resposta pronta); None segue o fluxo."""
+        if (
+            self.intent_matcher is None
+            or input_dto.platform not in self.intent_platforms
+            or self._bypass_cache(input_dto)
+        ):
+            return None
+        started = time.perf_counter()
+        match = self.intent_matcher.match(input_dto.message)
+        timings.record("intent", started)
+        return match
+
+    def _semantic_lookup(
+        self, input_dto: ProcessMessageInput, history: str = ""
+    ) -> Tuple[Optional[bool], Optional[str]]:
+        """
+        Consulta o cache semântico.
+        Retorna (None, None) quando não se aplica, senão (acertou?, resposta).
+        Com histórico no prompt, a resposta é da conversa: nem consulta nem grava.
+        """
+        if self.semantic_cache is None or self._bypass_cache(input_dto) or history:
+            return None, None
+        answer = self.semantic_cache.lookup(input_dto.message)
+        return answer is not None, answer
+
+    async def _asemantic_lookup(
+        self, input_dto: ProcessMessageInput, history: str = ""
+    ) -> Tuple[Optional[bool], Optional[str]]:
+        if self.semantic_cache is None or self._bypass_cache(input_dto) or history:
+            return None, None
+        answer = await self.semantic_cache.alookup(input_dto.message)
+        return answer is not None, answer
+
+    def _response_cache_key(
+        self, input_dto: ProcessMessageInput, context: str, history: str = ""
+    ) -> Optional[str]:
+        if self.response_cache is None or self._bypass_cache(input_dto):
+            return None
+        return self._cache_key(input_dto.message, context, history)
+
+    def _compress(
+        self, input_dto: ProcessMessageInput, context: str
+    ) -> Tuple[str, Optional[CompressedContext]]:
+        """Ajusta o contexto RAG ao orçamento de tokens do modelo (se configurado)."""
+        if self.context_compressor is None:
+            return context, None
+        compressed = self.context_compressor.compress(
+            input_dto.message, context, self.llm_provider
+        )
+        return compressed.text, compressed
+
+    def _screen(self, response_text: str) -> Tuple[str, Optional[bool]]:
+        """Verificação de segurança da resposta do LLM (se configurada)."""
+        if self.output_guard is None:
+            return response_text, None
+        response_text, match = self.output_guard.screen(response_text)
+        return response_text, match is not None
+
+    def _guard_stream(self, chunks: Iterator[str]) -> Iterator[str]:
+        if self.output_guard is None:
+            return chunks
+        return self.output_guard.wrap(chunks)
+
+    def _store(
+        self,
+        input_dto: ProcessMessageInput,
+        cache_key: Optional[str],
+        semantic_hit: Optional[bool],
+        response_text: str,
+    ) -> None:
+        if not response_text or response_text.startswith(PROVIDER_ERROR_PREFIX):
+            return
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response_text)
+        if semantic_hit is not None:
+            self.semantic_cache.store(input_dto.message, response_text)
+
+    async def _astore(
+        self,
+        input_dto: ProcessMessageInput,
+        cache_key: Optional[str],
+        semantic_hit: Optional[bool],
+        response_text: str,
+    ) -> None:
+        if not response_text or response_text.startswith(PROVIDER_ERROR_PREFIX):
+            return
+        if cache_key is not None:
+            await self.response_cache.aset(cache_key, response_text)
+        if semantic_hit is not None:
+            await self.semantic_cache.astore(input_dto.message, response_text)
+
+    def _record_turn(self, input_dto: ProcessMessageInput, response_text: str) -> None:
+        """
+        Acrescenta o turno (pergunta + resposta) ao histórico da sessão.
+        Falhas de persistência nunca afetam a resposta ao usuário.
+        """
+        if self.session_repo is None or not input_dto.session_id or not response_text:
+            return
+        try:
+            with self._session_lock(input_dto.session_id):
+                now = datetime.now()
+                session = self.session_repo.get_session(
+                    input_dto.session_id
+                ) or Session(
+                    session_id=input_dto.session_id,
+                    user_id=input_dto.user_id,
+                    messages=[],
+                    created_at=now,
+                    updated_at=now,
+                )
+                session.messages.append(Message(input_dto.message, "user", now))
+                session.messages.append(Message(response_text, "assistant", now))
+                self.session_repo.save_session(session)
+        except Exception as e:
+            logger.error(f"Erro ao registrar turno da sessão: {str(e)}")
+
+    def _session_lock(self, session_id: str):
+        if self.history_compactor is not None:
+            return self.history_compactor.lock_for(session_id)
+        return nullcontext()
+
+    def _history(self, input_dto: ProcessMessageInput, timings: PipelineTimings) -> str:
+        """
+        Histórico compactado da sessão para o prompt (vazio no primeiro turno).
+        O resumo pendente é atualizado aqui, no início do turno: em Lambda, o
+        que roda depois da resposta fica congelado até a próxima invocação.
+        """
+        if (
+            self.history_compactor is None
+            or self.session_repo is None
+            or not input_dto.session_id
+        ):
+            return ""
+        started = time.perf_counter()
+        try:
+            session = self.session_repo.get_session(input_dto.session_id)
+            if self.history_compactor.due(session):
+                session = self._compact_history(input_dto) or session
+            return self.history_compactor.build_history(session)
+        except Exception as e:
+            logger.error(f"Erro ao carregar histórico da sessão: {str(e)}")
+            return ""
+        finally:
+            timings.record("history", started)
+
+    def _compact_history(self, input_dto: ProcessMessageInput) -> Optional[Session]:
+        """Resume os turnos antigos dentro do orçamento; sem folga, fica para depois."""
+        budget = self._llm_budget(input_dto)
+        timeout = self.history_compactor.compaction_timeout(budget)
+        if budget is not None and timeout is None:
+            logger.info("Sem orçamento para compactar o histórico neste turno.")
+            return None
+        try:
+            if self.history_compactor.compact(input_dto.session_id, timeout=timeout):
+                return self.session_repo.get_session(input_dto.session_id)
+        except Exception as e:
+            logger.error(f"Erro ao compactar histórico da sessão: {str(e)}")
+        return None
+
+    @staticmethod
+    def _llm_context(rag_content: str, history: str = "") -> Dict:
+        """Contexto do prompt: RAG + histórico compactado da sessão (se houver)."""
+        context = {"rag_content": rag_content}
+        if history:
+            context["history"] = history
+        return context
 
     def execute(self, input_dto: ProcessMessageInput) -> ProcessMessageOutput:
+        output = self._execute(input_dto)
+        self._record_turn(input_dto, output.response_text)
+        return output
+
+    async def aexecute(self, input_dto: ProcessMessageInput) -> ProcessMessageOutput:
+        """
+        Variante assíncrona de execute: RAG e LLM são aguardados sem bloquear o event loop.
+        """
+        output = await self._aexecute(input_dto)
+        if self.session_repo is not None:
+            # Leitura/gravação da sessão bloqueiam (rede e lock): fora do event loop
+            await asyncio.to_thread(self._record_turn, input_dto, output.response_text)
+        return output
+
+    def stream(self, input_dto: ProcessMessageInput) -> ProcessMessageStreamOutput:
+        """
+        Variante em streaming do fluxo: segurança e RAG são resolvidos antes,
+        e os fragmentos do LLM são repassados conforme chegam.
+        """
+        output = self._stream(input_dto)
+        if self.session_repo is not None:
+            output.chunks = self._stream_and_record(input_dto, output.chunks)
+        return output
+
+    def _stream_and_record(
+        self, input_dto: ProcessMessageInput, chunks: Iterator[str]
+    ) -> Iterator[str]:
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self._record_turn(input_dto, "".join(parts).strip())
+
+    def _execute(self, input_dto: ProcessMessageInput) -> ProcessMessageOutput:
+        timings = self._timings(input_dto)
+        # 0. Modo concorrente: RAG especulativo em paralelo com a segurança
+        retrieval = self._start_retrieval(input_dto)
+
+        # 1. Check Safety (mensagens de risco nunca passam pelos caches)
+        is_safe, emergency_msg = self._check_safety(input_dto, timings)
+        if not is_safe:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=emergency_msg,
+                risk_detected=True,
+                metadata=self._metadata(timings=timings),
+            )
+
+        # 2. Respostas pré-computadas e intents conhecidos: sem RAG nem LLM
+        precomputed = self._precomputed_lookup(input_dto, timings)
+        if precomputed is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=precomputed.answer,
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, precomputed=precomputed),
+            )
+        intent = self._match_intent(input_dto, timings)
+        if intent is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=intent.text,
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, intent=intent),
+            )
+
+        # 2.1 Histórico da sessão: define se os caches se aplicam a este turno
+        history = self._history(input_dto, timings)
+
+        # 2.2 Semantic Cache (antes do RAG: perguntas parafraseadas)
+        semantic_hit, semantic_answer = self._semantic_lookup(input_dto, history)
+        if semantic_hit:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=semantic_answer,
+                risk_detected=False,
+                metadata=self._metadata(semantic_hit=True, timings=timings),
+            )
+
+        # 3. Retrieve Context (RAG)
+        context = self._retrieve(input_dto, retrieval, timings)
+
+        # 4. Response Cache
+        cache_key = self._response_cache_key(input_dto, context, history)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return ProcessMessageOutput(
+                    response_text=cached,
+                    risk_detected=False,
+                    metadata=self._metadata(
+                        hit=True, semantic_hit=semantic_hit, timings=timings
+                    ),
+                )
+
+        # 5. Compress Context + Invoke LLM
+        prompt_context, compressed = self._compress(input_dto, context)
+        started = time.perf_counter()
+        response_text = self._invoke_llm(input_dto, prompt_context, timings, history)
+        timings.record("llm", started)
+
+        # 6. Output Safety (respostas bloqueadas e fallbacks não entram nos caches)
+        response_text, blocked = self._screen(response_text)
+        if not blocked and not timings.fallbacks:
+            self._store(input_dto, cache_key, semantic_hit, response_text)
+        return ProcessMessageOutput(
+            response_text=response_text,
+            risk_detected=False,
+            metadata=self._metadata(
+                hit=False if cache_key is not None else None,
+                semantic_hit=semantic_hit,
+                compressed=compressed,
+                output_blocked=blocked,
+                timings=timings,
+            ),
+        )
+
+    async def _acheck_safety(
+        self, input_dto: ProcessMessageInput, timings: PipelineTimings
+    ) -> Tuple[bool, Optional[str]]:
+        if not self.concurrent:
+            return self._check_safety(input_dto, timings)
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._executor, self.safety_check, input_dto.message
+                ),
+                timeout=self._bounded(self.safety_timeout, input_dto),
+            )
+        except asyncio.TimeoutError:
+            timings.timeouts.append("safety")
+            logger.warning("Timeout na verificação de segurança; usando o léxico.")
+            if detect_risk(input_dto.message) is not None:
+                return False, EMERGENCY_MESSAGE
+            return True, None
+        finally:
+            timings.record("safety", started)
+
+    async def _aretrieve(
+        self,
+        input_dto: ProcessMessageInput,
+        retrieval: Optional["asyncio.Future"],
+        timings: PipelineTimings,
+    ) -> str:
+        started = time.perf_counter()
+        try:
+            if retrieval is None:
+                return await self.context_repo.aretrieve_context(input_dto.message)
+            return await asyncio.wait_for(
+                retrieval, timeout=self._bounded(self.retrieval_timeout, input_dto)
+            )
+        except asyncio.TimeoutError:
+            timings.timeouts.append("retrieval")
+            logger.warning("Timeout na recuperação de contexto; seguindo sem RAG.")
+            return ""
+        finally:
+            timings.record("retrieval", started)
+
+    async def _aexecute(self, input_dto: ProcessMessageInput) -> ProcessMessageOutput:
+        timings = self._timings(input_dto)
+        # 0. Modo concorrente: RAG especulativo como task, segurança no pool
+        retrieval = (
+            asyncio.ensure_future(
+                self.context_repo.aretrieve_context(input_dto.message)
+            )
+            if self.concurrent
+            else None
+        )
+
+        # 1. Check Safety (CPU-bound e rápido; inline no modo sequencial)
+        is_safe, emergency_msg = await self._acheck_safety(input_dto, timings)
+        if not is_safe:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=emergency_msg,
+                risk_detected=True,
+                metadata=self._metadata(timings=timings),
+            )
+
+        # 2. Respostas pré-computadas e intents conhecidos
+        precomputed = self._precomputed_lookup(input_dto, timings)
+        if precomputed is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=precomputed.answer,
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, precomputed=precomputed),
+            )
+        intent = self._match_intent(input_dto, timings)
+        if intent is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=intent.text,
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, intent=intent),
+            )
+
+        # 2.1 Histórico da sessão (repositório e resumo bloqueiam: fora do loop)
+        history = await asyncio.to_thread(self._history, input_dto, timings)
+
+        # 2.2 Semantic Cache (o embedding da pergunta não roda no event loop)
+        semantic_hit, semantic_answer = await self._asemantic_lookup(input_dto, history)
+        if semantic_hit:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageOutput(
+                response_text=semantic_answer,
+                risk_detected=False,
+                metadata=self._metadata(semantic_hit=True, timings=timings),
+            )
+
+        # 3. Retrieve Context (RAG)
+        context = await self._aretrieve(input_dto, retrieval, timings)
+
+        # 4. Response Cache
+        cache_key = self._response_cache_key(input_dto, context, history)
+        if cache_key is not None:
+            cached = await self.response_cache.aget(cache_key)
+            if cached is not None:
+                return ProcessMessageOutput(
+                    response_text=cached,
+                    risk_detected=False,
+                    metadata=self._metadata(
+                        hit=True, semantic_hit=semantic_hit, timings=timings
+                    ),
+                )
+
+        # 5. Compress Context + Invoke LLM
+        prompt_context, compressed = self._compress(input_dto, context)
+        started = time.perf_counter()
+        response_text = await self._ainvoke_llm(
+            input_dto, prompt_context, timings, history
+        )
+        timings.record("llm", started)
+
+        # 6. Output Safety (respostas bloqueadas e fallbacks não entram nos caches)
+        response_text, blocked = self._screen(response_text)
+        if not blocked and not timings.fallbacks:
+            await self._astore(input_dto, cache_key, semantic_hit, response_text)
+        return ProcessMessageOutput(
+            response_text=response_text,
+            risk_detected=False,
+            metadata=self._metadata(
+                hit=False if cache_key is not None else None,
+                semantic_hit=semantic_hit,
+                compressed=compressed,
+                output_blocked=blocked,
+                timings=timings,
+            ),
+        )
+
+    def _stream(self, input_dto: ProcessMessageInput) -> ProcessMessageStreamOutput:
+        timings = self._timings(input_dto)
+        retrieval = self._start_retrieval(input_dto)
+
         # 1. Check Safety
-        is_safe, emergency_msg = check_safety(input_dto.message)
+        is_safe, emergency_msg = self._check_safety(input_dto, timings)
         if not is_safe:
-            return ProcessMessageOutput(response_text=emergency_msg, risk_detected=True)
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageStreamOutput(
+                chunks=iter([emergency_msg]),
+                risk_detected=True,
+                metadata=self._metadata(timings=timings),
+            )
+
+        # 2. Respostas pré-computadas e intents conhecidos
+        precomputed = self._precomputed_lookup(input_dto, timings)
+        if precomputed is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageStreamOutput(
+                chunks=iter([precomputed.answer]),
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, precomputed=precomputed),
+            )
+        intent = self._match_intent(input_dto, timings)
+        if intent is not None:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageStreamOutput(
+                chunks=iter([intent.text]),
+                risk_detected=False,
+                metadata=self._metadata(timings=timings, intent=intent),
+            )
+
+        # 2.1 Histórico da sessão
+        history = self._history(input_dto, timings)
+
+        # 2.2 Semantic Cache
+        semantic_hit, semantic_answer = self._semantic_lookup(input_dto, history)
+        if semantic_hit:
+            self._cancel_retrieval(retrieval, timings)
+            return ProcessMessageStreamOutput(
+                chunks=iter([semantic_answer]),
+                risk_detected=False,
+                metadata=self._metadata(semantic_hit=True, timings=timings),
+            )
+
+        # 3. Retrieve Context (RAG)
+        context = self._retrieve(input_dto, retrieval, timings)
+
+        # 4. Response Cache
+        cache_key = self._response_cache_key(input_dto, context, history)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return ProcessMessageStreamOutput(
+                    chunks=iter([cached]),
+                    risk_detected=False,
+                    metadata=self._metadata(
+                        hit=True, semantic_hit=semantic_hit, timings=timings
+                    ),
+                )
+
+        # 5. Compress Context + Stream LLM (6. Output Safety a cada fragmento)
+        prompt_context, compressed = self._compress(input_dto, context)
+        budget = self._llm_budget(input_dto)
+        if budget is not None and budget < self.min_llm_seconds:
+            return ProcessMessageStreamOutput(
+                chunks=iter([self._fallback(input_dto, prompt_context, timings)]),
+                risk_detected=False,
+                metadata=self._metadata(timings=timings),
+            )
+        chunks = self._guard_stream(
+            self._degrade_stream(
+                self.llm_provider.stream(
+                    prompt=input_dto.message,
+                    context=self._llm_context(prompt_context, history),
+                    **timeout_kwargs(budget),
+                ),
+                input_dto,
+                prompt_context,
+                timings,
+            )
+        )
 
-        # 2. Retrieve Context (RAG)
-        context = self.context_repo.retrieve_context(input_dto.message)
+        if cache_key is None and semantic_hit is None:
+            return ProcessMessageStreamOutput(
+                chunks=chunks,
+                risk_detected=False,
+                metadata=self._metadata(compressed=compressed, timings=timings),
+            )
 
-        # 3. Invoke LLM
-        response_text = self.llm_provider.invoke(
-            prompt=input_dto.message, context={"rag_content": context}
+        return ProcessMessageStreamOutput(
+            chunks=self._stream_and_store(
+                input_dto, cache_key, semantic_hit, chunks, timings
+            ),
+            risk_detected=False,
+            metadata=self._metadata(
+                hit=False if cache_key is not None else None,
+                semantic_hit=semantic_hit,
+                compressed=compressed,
+                timings=timings,
+            ),
         )
 
-        return ProcessMessageOutput(response_text=response_text, risk_detected=False)
+    def _stream_and_store(
+        self,
+        input_dto: ProcessMessageInput,
+        cache_key: Optional[str],
+        semantic_hit: Optional[bool],
+        chunks: Iterator[str],
+        timings: PipelineTimings,
+    ) -> Iterator[str]:
+        """Repassa os fragmentos e grava a resposta completa nos caches ao final."""
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        if isinstance(chunks, GuardedStream) and chunks.match is not None:
+            return
+        # Resposta degradada ou parcial (falha do provedor): fora dos caches
+        if timings.fallbacks:
+            return
+        self._store(input_dto, cache_key, semantic_hit, "".join(parts).strip())
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("DialogflowAutomation")
+
+# Formato do arquivo de estado (mudanças incompatíveis incrementam)
+STATE_VERSION = 1
+
+# Seções do config/estado: entidades antes de intents (dependência)
+KINDS = ("entities", "intents")
+LABELS = {"entities": "entidade", "intents": "intent"}
+
+
+def resource_hash(resource: Dict[str, Any]) -> str:
+    """Hash do conteúdo de uma intent/entidade do config (JSON canônico)."""
+    canonical = json.dumps(
+        resource, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def empty_state(project_id: str) -> Dict[str, Any]:
+    return {
+        "version": STATE_VERSION,
+        "project_id": project_id,
+        "entities": {},
+        "intents": {},
+    }
+
+
+def load_state(path: str, project_id: str) -> Dict[str, Any]:
+    """
+    Estado do último apply: display_name -> {"hash", "name"} por seção.
+    Arquivo ausente, de outra versão ou de outro projeto = estado vazio.
+    """
+    if not os.path.exists(path):
+        return empty_state(project_id)
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        logger.warning(f"Estado {path} ignorado: versão {state.get('version')}")
+        return empty_state(project_id)
+    if state.get("project_id") != project_id:
+        logger.warning(
+            f"Estado {path} ignorado: projeto {state.get('project_id')!r} "
+            f"!= {project_id!r}"
+        )
+        return empty_state(project_id)
+    return state
+
+
+def save_state(state: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+@dataclass
+class ResourceChanges:
+    """Diferença de uma seção (entities/intents) entre o config e o agente."""
+
+    create: List[str] = field(default_factory=list)
+    update: List[str] = field(default_factory=list)
+    # display_name -> resource name
+    delete: Dict[str, str] = field(default_factory=dict)
+    unchanged: int = 0
+
+    @property
+    def changes(self) -> int:
+        return len(self.create) + len(self.update) + len(self.delete)
+
+
+@dataclass
+class DeployPlan:
+    against: str
+    entities: ResourceChanges = field(default_factory=ResourceChanges)
+    intents: ResourceChanges = field(default_factory=ResourceChanges)
+    # display_name -> hash do config, por seção
+    hashes: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def changes(self) -> int:
+        return self.entities.changes + self.intents.changes
+
+    def format(self) -> str:
+        lines = [f"Plano de deploy (comparado com: {self.against})"]
+        for kind in KINDS:
+            section: ResourceChanges = getattr(self, kind)
+            label = LABELS[kind]
+            lines += [f"  + {label} {name}" for name in section.create]
+            lines += [f"  ~ {label} {name}" for name in section.update]
+            lines += [f"  - {label} {name}" for name in section.delete]
+        lines.append(
+            f"Entidades: {len(self.entities.create)} a criar, "
+            f"{len(self.entities.update)} a atualizar, "
+            f"{len(self.entities.delete)} a remover, "
+            f"{self.entities.unchanged} inalteradas"
+        )
+        lines.append(
+            f"Intents: {len(self.intents.create)} a criar, "
+            f"{len(self.intents.update)} a atualizar, "
+            f"{len(self.intents.delete)} a remover, "
+            f"{self.intents.unchanged} inalteradas"
+        )
+        if not self.changes:
+            lines.append("Nenhuma alteração: o agente está em dia com o config.")
+        return "\n".join(lines)
+
+
+def compute_plan(
+    config: Dict[str, Any],
+    state: Dict[str, Any],
+    live: Optional[Dict[str, Dict[str, str]]] = None,
+) -> DeployPlan:
+    """
+    Menor conjunto de creates/updates/deletes para levar o agente ao config.
+
+    Args:
+        state: Estado do último apply (hash e resource name por display_name).
+        live: Índices display_name -> resource name do agente (entities/intents).
+            Sem eles, a existência vem só do estado (plano offline, 0 chamadas).
+
+    Só recursos registrados no estado são removidos: intents e entidades
+    criadas fora do config (ex.: Default Welcome Intent) nunca entram no plano.
+    """
+    plan = DeployPlan(against="agente" if live is not None else "estado")
+    for kind in KINDS:
+        section: ResourceChanges = getattr(plan, kind)
+        applied = state.get(kind, {})
+        existing = live[kind] if live is not None else applied
+        desired = {
+            item["display_name"]: resource_hash(item) for item in config.get(kind, [])
+        }
+        plan.hashes[kind] = desired
+
+        for display_name, digest in desired.items():
+            if display_name not in existing:
+                section.create.append(display_name)
+            elif applied.get(display_name, {}).get("hash") != digest:
+                section.update.append(display_name)
+            else:
+                section.unchanged += 1
+
+        for display_name, entry in applied.items():
+            if display_name in desired or display_name not in existing:
+                continue
+            section.delete[display_name] = (
+                live[kind][display_name] if live is not None else entry.get("name")
+            )
+    return plan
@@ -0,0 +1,151 @@
+import itertools
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+
+
+class InMemoryAgent:
+    """
+    Stand-in local de um agente do Dialogflow ES (intents e entity types) para
+    testes e benchmarks do DialogflowManager: latência de rede simulada por
+    chamada (`latency_ms` ± `jitter_ms`) e contagem de chamadas simultâneas.
+    """
+
+    def __init__(
+        self,
+        project_id: str = "bench",
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+    ):
+        self.parent = f"projects/{project_id}/agent"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.intents: Dict[str, Any] = {}
+        self.entity_types: Dict[str, Any] = {}
+        self.entities: Dict[str, List[Any]] = {}
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.intents_client = InMemoryIntentsClient(self)
+        self.entity_types_client = InMemoryEntityTypesClient(self)
+
+    def call(self, operation: str, action):
+        with self._lock:
+            self.calls.append(operation)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            delay = self.latency_ms + self._random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+        try:
+            if delay > 0:
+                time.sleep(delay / 1000)
+            with self._lock:
+                return action()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def new_name(self, collection: str) -> str:
+        return f"{self.parent}/{collection}/{next(self._ids)}"
+
+    @staticmethod
+    def find(resources: Dict[str, Any], display_name: str) -> Optional[Any]:
+        return next(
+            (r for r in resources.values() if r.display_name == display_name), None
+        )
+
+
+def _lightweight(resource: Any) -> SimpleNamespace:
+    return SimpleNamespace(display_name=resource.display_name, name=resource.name)
+
+
+class InMemoryIntentsClient:
+    def __init__(self, agent: InMemoryAgent):
+        self.agent = agent
+
+    def list_intents(self, request: Optional[Dict] = None, **kwargs) -> List[Any]:
+        return self.agent.call(
+            "list_intents",
+            lambda: [_lightweight(i) for i in self.agent.intents.values()],
+        )
+
+    def create_intent(self, parent: str, intent: Any, **kwargs) -> Any:
+        def action():
+            if self.agent.find(self.agent.intents, intent.display_name):
+                raise AlreadyExists(f"Intent {intent.display_name} já existe")
+            intent.name = self.agent.new_name("intents")
+            self.agent.intents[intent.name] = intent
+            return intent
+
+        return self.agent.call("create_intent", action)
+
+    def update_intent(self, intent: Any, **kwargs) -> Any:
+        def action():
+            if intent.name not in self.agent.intents:
+                raise NotFound(f"Intent {intent.name} não encontrada")
+            self.agent.intents[intent.name] = intent
+            return intent
+
+        return self.agent.call("update_intent", action)
+
+    def delete_intent(self, name: str, **kwargs) -> None:
+        def action():
+            if self.agent.intents.pop(name, None) is None:
+                raise NotFound(f"Intent {name} não encontrada")
+
+        return self.agent.call("delete_intent", action)
+
+
+class InMemoryEntityTypesClient:
+    def __init__(self, agent: InMemoryAgent):
+        self.agent = agent
+
+    def list_entity_types(self, request: Optional[Dict] = None, **kwargs) -> List[Any]:
+        return self.agent.call(
+            "list_entity_types",
+            lambda: [_lightweight(e) for e in self.agent.entity_types.values()],
+        )
+
+    def create_entity_type(self, parent: str, entity_type: Any, **kwargs) -> Any:
+        def action():
+            if self.agent.find(self.agent.entity_types, entity_type.display_name):
+                raise AlreadyExists(f"Entidade {entity_type.display_name} já existe")
+            entity_type.name = self.agent.new_name("entityTypes")
+            self.agent.entity_types[entity_type.name] = entity_type
+            return entity_type
+
+        return self.agent.call("create_entity_type", action)
+
+    def update_entity_type(self, entity_type: Any, **kwargs) -> Any:
+        def action():
+            if entity_type.name not in self.agent.entity_types:
+                raise NotFound(f"Entidade {entity_type.name} não encontrada")
+            self.agent.entity_types[entity_type.name] = entity_type
+            return entity_type
+
+        return self.agent.call("update_entity_type", action)
+
+    def batch_update_entities(self, parent: str, entities: List[Any], **kwargs):
+        def action():
+            if parent not in self.agent.entity_types:
+                raise NotFound(f"Entidade {parent} não encontrada")
+            self.agent.entities[parent] = list(entities)
+
+        return self.agent.call("batch_update_entities", action)
+
+    def delete_entity_type(self, name: str, **kwargs) -> None:
+        def action():
+            if self.agent.entity_types.pop(name, None) is None:
+                raise NotFound(f"Entidade {name} não encontrada")
+            self.agent.entities.pop(name, None)
+
+        return self.agent.call("delete_entity_type", action)
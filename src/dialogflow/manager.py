@@ -1,14 +1,32 @@
 import json
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
 
 from google.api_core import retry
-from google.api_core.exceptions import AlreadyExists, GoogleAPICallError, RetryError
+from google.api_core.exceptions import (
+    AlreadyExists,
+    GoogleAPICallError,
+    NotFound,
+    RetryError,
+)
 from google.auth.exceptions import DefaultCredentialsError
 from google.cloud import dialogflow_v2 as dialogflow
 
+from src.dialogflow.deploy_plan import (
+    KINDS,
+    LABELS,
+    DeployPlan,
+    compute_plan,
+    load_state,
+    save_state,
+)
+from src.dialogflow.rate_limiter import TokenBucket
+
 # Fix for Python 3.14 + Protobuf compatibility issues
 # Must be set before importing ANY google library
 os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
@@ -22,24 +40,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger("DialogflowAutomation")
 
+# Limites superiores (ms) dos buckets do histograma de latência por RPC
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500)
+
 
 class DialogflowManager:
-    def __init__(self, project_id: str, credentials_path: str = None):
+    def __init__(
+        self,
+        project_id: str,
+        credentials_path: str = None,
+        max_workers: int = 1,
+        requests_per_minute: Optional[float] = None,
+        intents_client: Any = None,
+        entity_types_client: Any = None,
+    ):
         """
         Gerenciador de automação robusto para Dialogflow ES.
 
         Args:
             project_id: ID do projeto GCP.
             credentials_path: Caminho para o JSON de credenciais (opcional se usar env var).
+            max_workers: Chamadas simultâneas na sincronização (1 = serial).
+            requests_per_minute: Teto de chamadas à API por minuto (cota do projeto).
+            intents_client/entity_types_client: Clientes injetados (testes e benchmarks).
         """
         self.project_id = project_id
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = (
+            TokenBucket.per_minute(requests_per_minute, burst=self.max_workers)
+            if requests_per_minute
+            else None
+        )
         if credentials_path:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
             logger.info(f"Credenciais configuradas a partir de: {credentials_path}")
 
         try:
-            self.intents_client = dialogflow.IntentsClient()
-            self.entity_types_client = dialogflow.EntityTypesClient()
+            self.intents_client = intents_client or dialogflow.IntentsClient()
+            self.entity_types_client = (
+                entity_types_client or dialogflow.EntityTypesClient()
+            )
             self.parent = f"projects/{project_id}/agent"
             logger.info(f"Cliente Dialogflow inicializado para projeto: {project_id}")
         except (DefaultCredentialsError, ValueError) as e:
@@ -81,18 +121,84 @@ class DialogflowManager:
             "entities_created": 0,
             "entities_updated": 0,
             "entities_failed": 0,
+            "intents_deleted": 0,
+            "entities_deleted": 0,
         }
+        # Chamadas à API por método e latências (ms) para o relatório
+        self.rpc_counts: Counter = Counter()
+        self.rpc_latencies: Dict[str, List[float]] = defaultdict(list)
+        # Protege stats, contadores e índices na sincronização concorrente
+        self._lock = threading.RLock()
+
+        # Índices display_name -> resource name (None = ainda não listados)
+        self._intent_index: Optional[Dict[str, str]] = None
+        self._entity_type_index: Optional[Dict[str, str]] = None
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _rpc(self, method: str, call: Callable, **kwargs) -> Any:
+        """Executa uma chamada à API respeitando o limitador e medindo a latência."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self._lock:
+            self.rpc_counts[method] += 1
+        start = time.perf_counter()
+        try:
+            return call(**kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.rpc_latencies[method].append(elapsed_ms)
+
+    def _load_intent_index(self) -> Dict[str, str]:
+        """
+        Lista as intents uma vez (visão leve, sem frases de treino). A listagem
+        (rede + limitador) roda fora do lock; só a troca do índice o segura.
+        """
+        intents = self._rpc(
+            "list_intents",
+            self.intents_client.list_intents,
+            request={"parent": self.parent, "page_size": 1000},
+        )
+        index = {i.display_name: i.name for i in intents}
+        with self._lock:
+            self._intent_index = index
+        return index
+
+    def _load_entity_type_index(self) -> Dict[str, str]:
+        entity_types = self._rpc(
+            "list_entity_types",
+            self.entity_types_client.list_entity_types,
+            request={"parent": self.parent, "page_size": 1000},
+        )
+        index = {et.display_name: et.name for et in entity_types}
+        with self._lock:
+            self._entity_type_index = index
+        return index
+
+    def load_index(self):
+        """Monta os índices de intents e entidades do agente (2 listagens por sync)."""
+        try:
+            self._load_entity_type_index()
+            self._load_intent_index()
+            logger.info(
+                f"Índice do agente: {len(self._intent_index)} intents, "
+                f"{len(self._entity_type_index)} entidades"
+            )
+        except Exception as e:
+            # Sem índice, cada item volta ao fluxo create -> AlreadyExists
+            logger.error(f"Erro ao listar recursos do agente: {e}")
+            self._intent_index = self._entity_type_index = None
 
     def _get_entity_type_id(self, display_name: str) -> Optional[str]:
         """Busca ID de uma entidade pelo nome (helper para update)."""
         try:
-            # Em produção, usar filtro seria melhor, mas listagem é segura para volumes menores
-            entity_types = self.entity_types_client.list_entity_types(
-                parent=self.parent
-            )
-            for et in entity_types:
-                if et.display_name == display_name:
-                    return et.name
+            index = self._entity_type_index
+            if index is None:
+                index = self._load_entity_type_index()
+            return index.get(display_name)
         except Exception as e:
             logger.error(f"Erro ao buscar entidade {display_name}: {e}")
         return None
@@ -100,18 +206,18 @@ class DialogflowManager:
     def _get_intent_id(self, display_name: str) -> Optional[str]:
         """Busca ID de uma intent pelo nome."""
         try:
-            intents = self.intents_client.list_intents(
-                parent=self.parent, intent_view=dialogflow.IntentView.INTENT_VIEW_FULL
-            )
-            for i in intents:
-                if i.display_name == display_name:
-                    return i.name
+            index = self._intent_index
+            if index is None:
+                index = self._load_intent_index()
+            return index.get(display_name)
         except Exception as e:
             logger.error(f"Erro ao buscar intent {display_name}: {e}")
         return None
 
-    def create_entity_type(self, display_name: str, kind: str, entries: List[Dict]):
-        """Cria ou atualiza entidade com retry e validação."""
+    def create_entity_type(
+        self, display_name: str, kind: str, entries: List[Dict]
+    ) -> Optional[str]:
+        """Cria ou atualiza entidade com retry e validação (resource name ou None)."""
         logger.info(f"Processando entidade: {display_name}...")
 
         entity_type = dialogflow.EntityType(
@@ -126,55 +232,84 @@ class DialogflowManager:
             for e in entries
         ]
 
+        # Com o índice carregado, create x update é decidido sem exceções
+        index = self._entity_type_index
+        name = index.get(display_name) if index is not None else None
+        created = False
         try:
-            # Tentativa de Criação
-            created_entity = self.entity_types_client.create_entity_type(
-                parent=self.parent, entity_type=entity_type, retry=self.retry_policy
-            )
-            logger.info(f"✅ Entidade CRIADA: {display_name}")
-            self.stats["entities_created"] += 1
-
-            # Recuperar ID para batch update
-            name = created_entity.name
-
-        except AlreadyExists:
-            logger.info(
-                f"⚠️ Entidade {display_name} já existe. Iniciando atualização..."
-            )
-            name = self._get_entity_type_id(display_name)
-            if name:
+            if name is None:
+                try:
+                    created_entity = self._rpc(
+                        "create_entity_type",
+                        self.entity_types_client.create_entity_type,
+                        parent=self.parent,
+                        entity_type=entity_type,
+                        retry=self.retry_policy,
+                    )
+                    logger.info(f"✅ Entidade CRIADA: {display_name}")
+                    self._count("entities_created")
+
+                    # Recuperar ID para batch update
+                    name = created_entity.name
+                    if index is not None:
+                        with self._lock:
+                            index[display_name] = name
+                    created = True
+                except AlreadyExists:
+                    logger.info(
+                        f"⚠️ Entidade {display_name} já existe. Iniciando atualização..."
+                    )
+                    # Índice ausente ou desatualizado: lista de novo (uma vez)
+                    with self._lock:
+                        if self._entity_type_index is index:
+                            self._entity_type_index = None
+                    name = self._get_entity_type_id(display_name)
+                    if not name:
+                        logger.error(
+                            f"❌ Erro de integridade: {display_name} existe mas não foi encontrada."
+                        )
+                        self._count("entities_failed")
+                        return
+
+            if not created:
                 entity_type.name = name
-                self.entity_types_client.update_entity_type(
-                    entity_type=entity_type, retry=self.retry_policy
+                self._rpc(
+                    "update_entity_type",
+                    self.entity_types_client.update_entity_type,
+                    entity_type=entity_type,
+                    retry=self.retry_policy,
                 )
                 logger.info(f"✅ Entidade ATUALIZADA: {display_name}")
-                self.stats["entities_updated"] += 1
-            else:
-                logger.error(
-                    f"❌ Erro de integridade: {display_name} existe mas não foi encontrada."
-                )
-                self.stats["entities_failed"] += 1
-                return
+                self._count("entities_updated")
 
         except Exception as e:
             logger.error(f"❌ Falha crítica ao processar entidade {display_name}: {e}")
-            self.stats["entities_failed"] += 1
+            self._count("entities_failed")
             return
 
         # Sincronização de Entradas (Batch Update)
         if name:
             try:
-                self.entity_types_client.batch_update_entities(
-                    parent=name, entities=batch_entries, retry=self.retry_policy
+                self._rpc(
+                    "batch_update_entities",
+                    self.entity_types_client.batch_update_entities,
+                    parent=name,
+                    entities=batch_entries,
+                    retry=self.retry_policy,
                 )
                 logger.info(f"   ↳ Entradas sincronizadas para {display_name}")
             except Exception as e:
                 logger.error(
                     f"   ❌ Falha ao sincronizar entradas para {display_name}: {e}"
                 )
+                return None
+        return name
 
-    def create_intent(self, intent_data: Dict[str, Any]):
-        """Cria ou atualiza Intent com retry, validação e suporte a parâmetros."""
+    def create_intent(self, intent_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Cria ou atualiza Intent com retry, validação e suporte a parâmetros
+        (resource name ou None).
+        """
         display_name = intent_data.get("display_name")
         logger.info(f"Processando intent: {display_name}...")
 
@@ -231,64 +366,332 @@ class DialogflowManager:
             ),
         )
 
+        index = self._intent_index
+        name = index.get(display_name) if index is not None else None
         try:
-            self.intents_client.create_intent(
-                parent=self.parent, intent=intent, retry=self.retry_policy
+            if name is None:
+                try:
+                    created_intent = self._rpc(
+                        "create_intent",
+                        self.intents_client.create_intent,
+                        parent=self.parent,
+                        intent=intent,
+                        retry=self.retry_policy,
+                    )
+                    logger.info(f"✅ Intent CRIADA: {display_name}")
+                    self._count("intents_created")
+                    if index is not None:
+                        with self._lock:
+                            index[display_name] = created_intent.name
+                    return created_intent.name
+                except AlreadyExists:
+                    logger.info(
+                        f"⚠️ Intent {display_name} já existe. Iniciando atualização..."
+                    )
+                    with self._lock:
+                        if self._intent_index is index:
+                            self._intent_index = None
+                    name = self._get_intent_id(display_name)
+                    if not name:
+                        logger.error(
+                            f"❌ Erro de integridade: {display_name} existe mas não foi encontrada."
+                        )
+                        self._count("intents_failed")
+                        return
+
+            intent.name = name
+            # Sem intent_view: a resposta vem na visão leve (sem frases de treino)
+            self._rpc(
+                "update_intent",
+                self.intents_client.update_intent,
+                intent=intent,
+                retry=self.retry_policy,
             )
-            logger.info(f"✅ Intent CRIADA: {display_name}")
-            self.stats["intents_created"] += 1
-
-        except AlreadyExists:
-            logger.info(f"⚠️ Intent {display_name} já existe. Iniciando atualização...")
-            name = self._get_intent_id(display_name)
-            if name:
-                intent.name = name
-                self.intents_client.update_intent(
-                    intent=intent,
-                    intent_view=dialogflow.IntentView.INTENT_VIEW_FULL,
-                    retry=self.retry_policy,
-                )
-                logger.info(f"✅ Intent ATUALIZADA: {display_name}")
-                self.stats["intents_updated"] += 1
-            else:
-                logger.error(
-                    f"❌ Erro de integridade: {display_name} existe mas não foi encontrada."
-                )
-                self.stats["intents_failed"] += 1
+            logger.info(f"✅ Intent ATUALIZADA: {display_name}")
+            self._count("intents_updated")
+            return name
 
         except Exception as e:
             logger.error(f"❌ Falha crítica ao processar intent {display_name}: {e}")
-            self.stats["intents_failed"] += 1
-
-    def sync_from_json(self, json_path: str):
-        """Executa o processo completo de sincronização."""
-        logger.info(">>> INICIANDO AUTOMAÇÃO COMPLETA <<<")
-        start_time = time.time()
+            self._count("intents_failed")
 
+    @staticmethod
+    def _read_config(json_path: str) -> Optional[Dict[str, Any]]:
         try:
             with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                return json.load(f)
         except Exception as e:
             logger.critical(f"Erro ao ler arquivo de configuração {json_path}: {e}")
+            return None
+
+    def sync_from_json(self, json_path: str, state_path: Optional[str] = None):
+        """
+        Executa o processo completo de sincronização (reenvia tudo). Com
+        `state_path`, grava o estado para os próximos `apply` incrementais.
+        """
+        logger.info(">>> INICIANDO AUTOMAÇÃO COMPLETA <<<")
+        start_time = time.time()
+
+        data = self._read_config(json_path)
+        if data is None:
             return
 
+        # 0. Índice nome -> recurso: create x update decidido antes de cada chamada
+        self.rpc_counts.clear()
+        self.rpc_latencies.clear()
+        self.load_index()
+
+        entities = data.get("entities", [])
+        intents = data.get("intents", [])
+        results = self._sync(entities, intents)
+
+        if state_path:
+            plan = compute_plan(data, load_state(state_path, self.project_id))
+            self._save_applied_state(state_path, plan, results, {})
+
+        duration = time.time() - start_time
+        self._print_report(duration)
+
+    def plan(
+        self, json_path: str, state_path: str, offline: bool = False
+    ) -> DeployPlan:
+        """
+        Calcula o diff entre o config e o agente: hashes do último apply
+        (`state_path`) + listagem do agente (2 chamadas). `offline` compara só
+        com o estado, sem chamar a API.
+        """
+        data = self._read_config(json_path)
+        if data is None:
+            raise ValueError(f"Configuração inválida: {json_path}")
+        return self._plan(data, state_path, offline)
+
+    def _plan(self, data: Dict[str, Any], state_path: str, offline: bool) -> DeployPlan:
+        live = None
+        if not offline:
+            live = {
+                "entities": dict(self._load_entity_type_index()),
+                "intents": dict(self._load_intent_index()),
+            }
+        return compute_plan(data, load_state(state_path, self.project_id), live)
+
+    def apply(
+        self, json_path: str, state_path: str, offline: bool = False
+    ) -> Optional[DeployPlan]:
+        """
+        Envia só o diff do plano (creates/updates de entidades, depois intents,
+        e por fim as remoções) e atualiza o estado com o que deu certo: o tempo
+        de deploy acompanha o tamanho da mudança, não o tamanho do agente.
+        """
+        logger.info(">>> INICIANDO DEPLOY INCREMENTAL <<<")
+        start_time = time.time()
+        self.rpc_counts.clear()
+        self.rpc_latencies.clear()
+
+        data = self._read_config(json_path)
+        if data is None:
+            return None
+        try:
+            plan = self._plan(data, state_path, offline)
+        except Exception as e:
+            logger.critical(f"Falha ao calcular o plano de deploy: {e}")
+            return None
+        logger.info(plan.format())
+
+        pending = {}
+        for kind in KINDS:
+            changed = set(getattr(plan, kind).create + getattr(plan, kind).update)
+            pending[kind] = [
+                item for item in data.get(kind, []) if item["display_name"] in changed
+            ]
+        results = self._sync(pending["entities"], pending["intents"])
+
+        # Intents antes das entidades: uma entidade em uso não pode ser removida
+        deleted = {}
+        for kind in reversed(KINDS):
+            targets = getattr(plan, kind).delete
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                oks = list(
+                    executor.map(
+                        lambda item, kind=kind: self._delete(kind, *item),
+                        targets.items(),
+                    )
+                )
+            deleted[kind] = {name for name, ok in zip(targets, oks) if ok}
+
+        self._save_applied_state(state_path, plan, results, deleted)
+        duration = time.time() - start_time
+        self._print_report(duration)
+        return plan
+
+    def _save_applied_state(
+        self,
+        state_path: str,
+        plan: DeployPlan,
+        results: Dict[str, Dict[str, Optional[str]]],
+        deleted: Dict[str, set],
+    ):
+        """Registra o hash dos recursos aplicados; falhas ficam para o próximo apply."""
+        state = load_state(state_path, self.project_id)
+        for kind in KINDS:
+            section = state.setdefault(kind, {})
+            for display_name, name in results.get(kind, {}).items():
+                if name:
+                    section[display_name] = {
+                        "hash": plan.hashes[kind][display_name],
+                        "name": name,
+                    }
+            for display_name in deleted.get(kind, ()):
+                section.pop(display_name, None)
+        save_state(state, state_path)
+        logger.info(f"Estado do deploy salvo em {state_path}")
+
+    def _delete(self, kind: str, display_name: str, name: str) -> bool:
+        """Remove uma intent/entidade; já ausente no agente conta como removida."""
+        client, method = (
+            (self.intents_client, "delete_intent")
+            if kind == "intents"
+            else (self.entity_types_client, "delete_entity_type")
+        )
+        try:
+            self._rpc(
+                method, getattr(client, method), name=name, retry=self.retry_policy
+            )
+            logger.info(f"🗑️ {LABELS[kind].capitalize()} REMOVIDA: {display_name}")
+        except NotFound:
+            logger.info(f"⚠️ {display_name} já não existe no agente")
+        except Exception as e:
+            logger.error(f"❌ Falha ao remover {display_name}: {e}")
+            self._count(f"{kind}_failed")
+            return False
+        self._count(f"{kind}_deleted")
+        return True
+
+    def _sync(
+        self, entities: List[Dict], intents: List[Dict]
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """Upsert de entidades e intents; resource name (ou None) por display_name."""
+        if self.max_workers > 1:
+            return self._sync_concurrently(entities, intents)
+
+        results: Dict[str, Dict[str, Optional[str]]] = {kind: {} for kind in KINDS}
         # 1. Sync Entities (Dependência para Intents)
         logger.info("--- Fase 1: Sincronização de Entidades ---")
-        for entity in data.get("entities", []):
-            self.create_entity_type(
+        for entity in entities:
+            results["entities"][entity["display_name"]] = self.create_entity_type(
                 entity["display_name"], entity["kind"], entity["entries"]
             )
 
         # 2. Sync Intents
         logger.info("--- Fase 2: Sincronização de Intents ---")
-        for intent in data.get("intents", []):
-            self.create_intent(intent)
+        for intent in intents:
+            results["intents"][intent["display_name"]] = self.create_intent(intent)
+        return results
+
+    @staticmethod
+    def _referenced_entity_types(intent_data: Dict[str, Any]) -> set:
+        return {
+            param.get("entity_type_display_name", "").lstrip("@")
+            for param in intent_data.get("parameters", [])
+        }
 
-        duration = time.time() - start_time
-        self._print_report(duration)
+    def _sync_concurrently(
+        self, entities: List[Dict], intents: List[Dict]
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Sincroniza com até `max_workers` chamadas em voo (limitadas pelo token
+        bucket). Intents que usam entidades do config só começam depois que
+        todas as entidades terminam; as demais rodam junto com as entidades.
+        """
+        entity_names = {entity["display_name"] for entity in entities}
+        dependent = [
+            intent
+            for intent in intents
+            if self._referenced_entity_types(intent) & entity_names
+        ]
+        independent = [intent for intent in intents if intent not in dependent]
+        logger.info(
+            f"--- Sincronização concorrente ({self.max_workers} workers): "
+            f"{len(entities)} entidades, {len(independent)} intents independentes, "
+            f"{len(dependent)} intents dependentes ---"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            entity_futures = [
+                executor.submit(
+                    self.create_entity_type,
+                    entity["display_name"],
+                    entity["kind"],
+                    entity["entries"],
+                )
+                for entity in entities
+            ]
+            intent_futures = [
+                executor.submit(self.create_intent, intent) for intent in independent
+            ]
+            wait(entity_futures)
+            intent_futures += [
+                executor.submit(self.create_intent, intent) for intent in dependent
+            ]
+            return {
+                "entities": {
+                    entity["display_name"]: future.result()
+                    for entity, future in zip(entities, entity_futures)
+                },
+                "intents": {
+                    intent["display_name"]: future.result()
+                    for intent, future in zip(independent + dependent, intent_futures)
+                },
+            }
+
+    def _legacy_rpc_estimate(self) -> Dict[str, int]:
+        """
+        Chamadas que o fluxo anterior (create -> AlreadyExists -> listagem
+        completa -> update) faria para o mesmo resultado.
+        """
+        stats = self.stats
+        listings = stats["entities_updated"] + stats["intents_updated"]
+        total = (
+            2 * stats["entities_created"]
+            + 4 * stats["entities_updated"]
+            + stats["intents_created"]
+            + 3 * stats["intents_updated"]
+        )
+        return {"total": total, "listings": listings}
+
+    def _latency_report(self) -> str:
+        """Histograma de latência (ms) por método: percentis e buckets."""
+        lines = []
+        labels = [f"<{b}" for b in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}"]
+        for method, samples in sorted(self.rpc_latencies.items()):
+            ordered = sorted(samples)
+
+            def pct(p: float) -> float:
+                return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+            counts = [0] * len(labels)
+            for sample in ordered:
+                counts[
+                    next(
+                        (i for i, b in enumerate(LATENCY_BUCKETS_MS) if sample < b),
+                        len(LATENCY_BUCKETS_MS),
+                    )
+                ] += 1
+            buckets = " ".join(f"{label}:{n}" for label, n in zip(labels, counts) if n)
+            lines.append(
+                f"          - {method}: n={len(ordered)} p50={pct(0.5):.0f} "
+                f"p90={pct(0.9):.0f} p99={pct(0.99):.0f} max={ordered[-1]:.0f} "
+                f"| {buckets}"
+            )
+        return "\n".join(lines) or "          - (nenhuma chamada)"
 
     def _print_report(self, duration: float):
         """Gera relatório final."""
+        legacy = self._legacy_rpc_estimate()
+        listings = (
+            self.rpc_counts["list_intents"] + self.rpc_counts["list_entity_types"]
+        )
+        calls = ", ".join(f"{k}={v}" for k, v in sorted(self.rpc_counts.items()))
+        waited = self.rate_limiter.waited if self.rate_limiter is not None else 0.0
         report = f"""
         =============================================
         RELATÓRIO FINAL DE AUTOMAÇÃO
@@ -298,12 +701,23 @@ class DialogflowManager:
         RESUMO DE INTENTS:
           - Criadas:   {self.stats['intents_created']}
           - Atualizadas: {self.stats['intents_updated']}
+          - Removidas: {self.stats['intents_deleted']}
           - Falhas:    {self.stats['intents_failed']}
 
         RESUMO DE ENTIDADES:
           - Criadas:   {self.stats['entities_created']}
           - Atualizadas: {self.stats['entities_updated']}
+          - Removidas: {self.stats['entities_deleted']}
           - Falhas:    {self.stats['entities_failed']}
+
+        CHAMADAS À API:
+          - Total:     {sum(self.rpc_counts.values())} (antes: ~{legacy['total']})
+          - Listagens: {listings} (antes: ~{legacy['listings']})
+          - Por método: {calls or '-'}
+          - Workers:   {self.max_workers} (espera no limitador: {waited:.1f}s)
+
+        LATÊNCIA POR RPC (ms):
+{self._latency_report()}
         =============================================
         Verifique 'automation_report.log' para detalhes.
         """
@@ -312,6 +726,8 @@ class DialogflowManager:
 
 
 if __name__ == "__main__":
+    import argparse
+
     # Load environment variables
     try:
         from dotenv import load_dotenv
@@ -320,6 +736,31 @@ if __name__ == "__main__":
     except ImportError:
         pass
 
+    data_dir = os.path.join(os.path.dirname(__file__), "data")
+    parser = argparse.ArgumentParser(description="Deploy do agente Dialogflow ES")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="apply",
+        choices=["plan", "apply", "sync"],
+        help="plan: mostra o diff; apply: envia só o diff; sync: reenvia tudo",
+    )
+    parser.add_argument(
+        "--config", default=os.path.join(data_dir, "initial_config.json")
+    )
+    parser.add_argument(
+        "--state",
+        default=os.getenv(
+            "DIALOGFLOW_STATE_PATH", os.path.join(data_dir, "deploy_state.json")
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Compara só com o estado do último apply (sem listar o agente)",
+    )
+    args = parser.parse_args()
+
     # Validação de Ambiente
     project_id = os.getenv("GCP_PROJECT_ID")
     if not project_id:
@@ -332,12 +773,24 @@ if __name__ == "__main__":
             "AVISO: GOOGLE_APPLICATION_CREDENTIALS não definido. Tentando credenciais default..."
         )
 
-    manager = DialogflowManager(project_id)
+    # Concorrência e teto de chamadas/minuto (ajuste à cota do projeto no GCP)
+    manager = DialogflowManager(
+        project_id,
+        max_workers=int(os.getenv("DIALOGFLOW_SYNC_WORKERS", "4")),
+        requests_per_minute=float(os.getenv("DIALOGFLOW_MAX_RPM", "180")),
+    )
 
-    # Caminho do Config
-    config_path = os.path.join(os.path.dirname(__file__), "data", "initial_config.json")
+    if not os.path.exists(args.config):
+        logger.error(f"Arquivo de configuração não encontrado: {args.config}")
+        exit(1)
 
-    if os.path.exists(config_path):
-        manager.sync_from_json(config_path)
-    else:
-        logger.error(f"Arquivo de configuração não encontrado: {config_path}")
+    if args.command == "plan":
+        print(manager.plan(args.config, args.state, offline=args.offline).format())
+    elif args.command == "sync":
+        manager.sync_from_json(args.config, state_path=args.state)
+    elif manager.apply(args.config, args.state, offline=args.offline) is None:
+        exit(1)
+
+    # Falhas ficam fora do estado: a próxima execução tenta só elas de novo
+    if manager.stats["intents_failed"] or manager.stats["entities_failed"]:
+        exit(1)
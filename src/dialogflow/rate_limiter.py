@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Limitador token bucket thread-safe: `rate` fichas por segundo, acumulando
+    até `capacity` (rajada). `acquire` bloqueia até haver ficha disponível.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate deve ser positivo")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None, **kwargs):
+        return cls(requests / 60.0, capacity=burst, **kwargs)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Consome `tokens`; devolve o tempo (s) esperado."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
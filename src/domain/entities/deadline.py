@@ -0,0 +1,21 @@
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute request deadline on the monotonic clock."""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + max(seconds, 0.0))
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
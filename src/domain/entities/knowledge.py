@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RetrievedChunk:
+    chunk_id: str
+    text: str
+    score: float
+    metadata: Optional[dict] = None
+
+
+@dataclass
+class Document:
+    source: str
+    text: str
+
+
+@dataclass
+class DocumentChunk:
+    chunk_id: str
+    source: str
+    text: str
+    heading: Optional[str] = None
@@ -1,15 +1,142 @@
+import asyncio
+import math
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
+from src.domain.entities.knowledge import DocumentChunk, RetrievedChunk
 from src.domain.entities.session import Session
 
+# Os adapters devolvem um pedido de desculpas em caso de falha (nunca deve ir a caches/resumos)
+PROVIDER_ERROR_PREFIX = "Desculpe, estou tendo dificuldades"
+
+
+# Ativo durante chamadas feitas por quem trata as falhas (ex: ResilientLLMProvider):
+# por contexto (thread/task), sem alterar o adapter, que pode ser compartilhado
+_RAISE_PROVIDER_ERRORS: ContextVar[bool] = ContextVar(
+    "raise_provider_errors", default=False
+)
+
+
+@contextmanager
+def raising_provider_errors() -> Iterator[None]:
+    """Adapters called inside the block re-raise failures instead of apologizing."""
+    token = _RAISE_PROVIDER_ERRORS.set(True)
+    try:
+        yield
+    finally:
+        _RAISE_PROVIDER_ERRORS.reset(token)
+
+
+def timeout_kwargs(timeout: Optional[float]) -> Dict[str, float]:
+    """Keyword arguments for LLMProvider calls: `timeout` only when there is a deadline."""
+    return {"timeout": timeout} if timeout is not None else {}
+
 
 class LLMProvider(ABC):
+    # Identificadores usados em chaves de cache (mudanças invalidam entradas antigas)
+    model_id: str = "unknown"
+    prompt_version: str = "1"
+    # Média de caracteres por token do tokenizer do modelo (texto em português)
+    chars_per_token: float = 4.0
+
+    # Com raise_errors=True (ou dentro de raising_provider_errors), a exceção
+    # original é propagada em vez do pedido de desculpas, para retry/circuit breaker
+    raise_errors: bool = False
+
+    _TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
     @abstractmethod
-    def invoke(self, prompt: str, context: Dict[str, Any] = None) -> str:
-        """Invokes the LLM to generate a response."""
+    def invoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Invokes the LLM to generate a response.
+        `timeout` is the time (seconds) left before the request deadline;
+        adapters bound the provider call by it when given.
+        """
         pass
 
+    def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Streams the response as text chunks.
+        Default fallback yields the full response at once; adapters override
+        with the provider's native streaming call.
+        """
+        yield self._invoke(prompt, context, timeout)
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Async variant of invoke.
+        Default fallback runs invoke in a worker thread; adapters override
+        with the provider's native async client.
+        """
+        return await asyncio.to_thread(self._invoke, prompt, context, timeout)
+
+    def _invoke(self, prompt: str, context: Any, timeout: Optional[float]) -> str:
+        # Only forwards `timeout` when set (subclasses written before it existed)
+        return self.invoke(prompt, context, **timeout_kwargs(timeout))
+
+    def _provider_error(self, error: Exception, message: str) -> str:
+        """
+        Failure handling shared by adapters: returns the apology `message`,
+        or re-raises `error` when the caller handles failures (raise_errors
+        or raising_provider_errors).
+        """
+        if self.raise_errors or _RAISE_PROVIDER_ERRORS.get():
+            raise error
+        return message
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Estimates how many input tokens `text` costs for this model.
+        Words are split into ~chars_per_token pieces; punctuation counts as one.
+        """
+        return sum(
+            math.ceil(len(piece) / self.chars_per_token) if piece[0].isalnum() else 1
+            for piece in self._TOKEN_PIECES.findall(text or "")
+        )
+
+    @staticmethod
+    def render_context(context: Any) -> str:
+        """
+        Returns the text placed in the prompt's reference section: the RAG
+        content plus, when present, the (compacted) conversation history.
+        """
+        if not isinstance(context, dict):
+            return context or ""
+        rag_content = context.get("rag_content") or ""
+        history = context.get("history")
+        if not history:
+            return rag_content
+        return f"{rag_content}\n\nHistórico da conversa:\n{history}".strip()
+
+    @staticmethod
+    def instructions(context: Any) -> Optional[str]:
+        """
+        Returns call-specific system instructions (context["instructions"],
+        e.g. history summarization) that replace the adapter's default
+        psychoeducation prompt, or None.
+        """
+        if not isinstance(context, dict):
+            return None
+        return context.get("instructions") or None
+
 
 class SessionRepository(ABC):
     @abstractmethod
@@ -20,8 +147,113 @@ class SessionRepository(ABC):
     def save_session(self, session: Session) -> None:
         pass
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for buffered writes (no-op for stores that write immediately)."""
+        return True
+
 
 class ContextRepository(ABC):
     @abstractmethod
     def retrieve_context(self, query: str) -> str:
         pass
+
+    async def aretrieve_context(self, query: str) -> str:
+        """
+        Async variant of retrieve_context.
+        Default fallback runs retrieve_context in a worker thread.
+        """
+        return await asyncio.to_thread(self.retrieve_context, query)
+
+
+class RankedContextRepository(ContextRepository):
+    """ContextRepository that exposes the ranked chunks behind the context string."""
+
+    separator: str = "\n\n"
+    # Busca em processo e barata (CPU, sem rede): o híbrido a executa inline
+    in_process: bool = False
+
+    @abstractmethod
+    def search(self, query: str, top_k: int = None) -> List[RetrievedChunk]:
+        pass
+
+    def retrieve_context(self, query: str) -> str:
+        return self.separator.join(chunk.text for chunk in self.search(query))
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        Async variant of get.
+        Default fallback runs get in a worker thread (remote stores block on I/O).
+        """
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        """Async variant of set (worker thread by default)."""
+        await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters exposed in the response metadata."""
+        return {}
+
+
+class EmbeddingProvider(ABC):
+    # Quantidade de textos que o provedor processa bem numa única chamada a embed
+    max_batch_size: int = 64
+    # Embedding calculado em processo (sem rede)
+    in_process: bool = False
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> Sequence[Sequence[float]]:
+        """Returns one embedding vector per input text."""
+        pass
+
+
+class SemanticCache(ABC):
+    @abstractmethod
+    def lookup(self, text: str) -> Optional[str]:
+        """Returns a stored answer for a sufficiently similar past query."""
+        pass
+
+    @abstractmethod
+    def store(self, text: str, answer: str) -> None:
+        pass
+
+    async def alookup(self, text: str) -> Optional[str]:
+        """
+        Async variant of lookup.
+        Default fallback runs lookup (query embedding included) in a worker thread.
+        """
+        return await asyncio.to_thread(self.lookup, text)
+
+    async def astore(self, text: str, answer: str) -> None:
+        """Async variant of store (worker thread by default)."""
+        await asyncio.to_thread(self.store, text, answer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class VectorStoreWriter(ABC):
+    @abstractmethod
+    def upsert(
+        self, chunks: List[DocumentChunk], vectors: Sequence[Sequence[float]]
+    ) -> List[str]:
+        """Writes the chunks; returns the ids of the ones the store rejected."""
+        pass
+
+    @abstractmethod
+    def delete(self, chunk_ids: List[str]) -> None:
+        pass
+
+    def flush(self) -> None:
+        """Persists buffered writes (no-op for stores that write immediately)."""
+        pass
@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.domain.interfaces.repositories import ResponseCache
+from src.infrastructure.client_factory import get_client_factory
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    Cache em processo com despejo LRU + TTL e limites de entradas/bytes.
+    Instanciado no Composition Root, sobrevive entre invocações "quentes" da Lambda.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (value, expires_at, size_bytes); ordem = recência de uso
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Sem I/O: no event loop direto, sem o custo de uma thread
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str) -> None:
+        self.set(key, value)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.info(f"Resposta de {size} bytes excede o limite do cache, ignorada.")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self._total_bytes += size
+
+            while (
+                len(self._entries) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
+
+
+class DynamoDBResponseCache(ResponseCache):
+    """
+    Cache compartilhado entre instâncias da Lambda, persistido em DynamoDB.
+    A expiração usa o atributo TTL nativo (`expires_at`) e é checada também na
+    leitura, pois a remoção do DynamoDB é assíncrona.
+    """
+
+    # Limite de item do DynamoDB é 400 KB; mantemos folga para chave e atributos
+    MAX_ITEM_BYTES = 350 * 1024
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: int = 24 * 3600,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        table: Any = None,
+    ):
+        """
+        Args:
+            table_name: Nome da tabela (chave de partição `cache_key`).
+            ttl_seconds: Tempo de vida das entradas.
+            endpoint_url: Endpoint alternativo (ex: DynamoDB Local).
+            table: Objeto Table já construído (injeção para testes/stand-ins locais).
+        """
+        self.ttl_seconds = ttl_seconds
+        self.table = table or get_client_factory().aws_resource(
+            "dynamodb", region_name=region_name, endpoint_url=endpoint_url
+        ).Table(table_name)
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            item = self.table.get_item(Key={"cache_key": key}).get("Item")
+        except Exception as e:
+            logger.error(f"Erro ao ler cache DynamoDB: {str(e)}")
+            self.errors += 1
+            self.misses += 1
+            return None
+
+        if not item or int(item.get("expires_at", 0)) <= int(time.time()):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return item.get("response")
+
+    def set(self, key: str, value: str) -> None:
+        if len(value.encode("utf-8")) > self.MAX_ITEM_BYTES:
+            return
+
+        try:
+            self.table.put_item(
+                Item={
+                    "cache_key": key,
+                    "response": value,
+                    "expires_at": int(time.time()) + self.ttl_seconds,
+                }
+            )
+        except Exception as e:
+            logger.error(f"Erro ao gravar cache DynamoDB: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+class TieredResponseCache(ResponseCache):
+    """
+    Composição L1 (memória) + L2 (compartilhado). Acertos no L2 promovem a entrada ao L1.
+    """
+
+    def __init__(self, l1: ResponseCache, l2: ResponseCache):
+        self.l1 = l1
+        self.l2 = l2
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.l1.get(key)
+        if value is None:
+            value = self.l2.get(key)
+            if value is not None:
+                self.l1.set(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.l1.set(key, value)
+        self.l2.set(key, value)
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = await self.l1.aget(key)
+        if value is None:
+            value = await self.l2.aget(key)
+            if value is not None:
+                await self.l1.aset(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def aset(self, key: str, value: str) -> None:
+        await self.l1.aset(key, value)
+        await self.l2.aset(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "l1_hits": self.l1.stats().get("hits", 0),
+            "l2_hits": self.l2.stats().get("hits", 0),
+        }
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.domain.interfaces.repositories import EmbeddingProvider, SemanticCache
+from src.utils.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class InMemorySemanticCache(SemanticCache):
+    """
+    Cache semântico: reaproveita respostas de perguntas parafraseadas.
+
+    Os embeddings das perguntas já respondidas ficam numa matriz float32
+    pré-alocada (memória limitada a max_entries x dimensões). A busca é um único
+    produto matricial; o despejo remove a entrada expirada ou a menos usada (LRU).
+    """
+
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+    ):
+        self.embedding_provider = embedding_provider
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._vectors: Optional[np.ndarray] = None
+        self._answers: List[Optional[str]] = [None] * max_entries
+        self._queries: List[Optional[str]] = [None] * max_entries
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._lock = threading.Lock()
+
+        # Último embedding calculado por texto (evita embed duplo em lookup + store)
+        self._recent_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.total_lookup_ms = 0.0
+        self.last_lookup_ms = 0.0
+        self.last_similarity = 0.0
+
+    def _embed(self, text: str) -> np.ndarray:
+        key = normalize_text(text)
+        with self._lock:
+            vector = self._recent_vectors.get(key)
+        if vector is not None:
+            return vector
+
+        # Chamada ao provedor fora do lock (pode envolver rede)
+        vector = np.asarray(self.embedding_provider.embed([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+
+        with self._lock:
+            self._recent_vectors[key] = vector
+            if len(self._recent_vectors) > 64:
+                self._recent_vectors.popitem(last=False)
+        return vector
+
+    def lookup(self, text: str) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            query = self._embed(text)
+            with self._lock:
+                self.lookups += 1
+                self.last_similarity = 0.0
+                if self._vectors is None or not self._occupied.any():
+                    return None
+
+                now = time.monotonic()
+                valid = self._occupied & (self._expires_at > now)
+                similarities = self._vectors @ query
+                similarities[~valid] = -1.0
+
+                best = int(np.argmax(similarities))
+                self.last_similarity = float(similarities[best])
+                if self.last_similarity < self.similarity_threshold:
+                    return None
+
+                self._last_used[best] = now
+                self.hits += 1
+                return self._answers[best]
+        except Exception as e:
+            logger.error(f"Erro no cache semântico: {str(e)}")
+            return None
+        finally:
+            self.last_lookup_ms = (time.perf_counter() - start) * 1000
+            self.total_lookup_ms += self.last_lookup_ms
+
+    def store(self, text: str, answer: str) -> None:
+        try:
+            vector = self._embed(text)
+        except Exception as e:
+            logger.error(f"Erro ao gerar embedding para o cache semântico: {str(e)}")
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+
+            slot = self._free_slot()
+            now = time.monotonic()
+            self._vectors[slot] = vector
+            self._answers[slot] = answer
+            self._queries[slot] = text
+            self._expires_at[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+            self._occupied[slot] = True
+
+    def _free_slot(self) -> int:
+        """Primeiro slot livre; senão um expirado; senão o menos usado recentemente."""
+        free = np.flatnonzero(~self._occupied)
+        if free.size:
+            return int(free[0])
+
+        self.evictions += 1
+        expired = np.flatnonzero(self._expires_at <= time.monotonic())
+        if expired.size:
+            return int(expired[0])
+        return int(np.argmin(self._last_used))
+
+    def __len__(self) -> int:
+        return int(self._occupied.sum())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "similarity": round(self.last_similarity, 4),
+            "lookup_ms": round(self.last_lookup_ms, 3),
+            "avg_lookup_ms": (
+                round(self.total_lookup_ms / self.lookups, 3) if self.lookups else 0.0
+            ),
+            "entries": len(self),
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,294 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Timeout (s) das chamadas boto3 da thread corrente (ver call_timeout)
+_CALL_TIMEOUT = threading.local()
+
+
+@contextmanager
+def call_timeout(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Limita connect/read das chamadas boto3 feitas nesta thread dentro do bloco
+    (clientes criados com per_call_timeout=True). None mantém o da configuração.
+    """
+    previous = getattr(_CALL_TIMEOUT, "seconds", None)
+    _CALL_TIMEOUT.seconds = seconds
+    try:
+        yield
+    finally:
+        _CALL_TIMEOUT.seconds = previous
+
+
+def _enable_call_timeout(client: Any) -> None:
+    """
+    O botocore fixa o timeout no pool urllib3 do cliente, copiado (clone) a cada
+    requisição. Troca-o por um cuja cópia usa o call_timeout() da thread: um
+    único cliente (e pool) atende qualquer deadline.
+    """
+    from urllib3.util.timeout import Timeout
+
+    http_session = getattr(getattr(client, "_endpoint", None), "http_session", None)
+    configured = getattr(http_session, "_timeout", None)
+    if not isinstance(configured, Timeout):
+        logger.warning("Cliente sem pool urllib3: timeout por chamada ignorado")
+        return
+
+    class CallTimeout(Timeout):
+        def clone(self) -> Timeout:
+            seconds = getattr(_CALL_TIMEOUT, "seconds", None)
+            if seconds is None:
+                return super().clone()
+            seconds = max(seconds, 0.001)
+            return Timeout(connect=min(self.connect_timeout, seconds), read=seconds)
+
+    timeout = CallTimeout(
+        connect=configured.connect_timeout, read=configured.read_timeout
+    )
+    http_session._timeout = timeout
+    http_session._manager.connection_pool_kw["timeout"] = timeout
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """Parâmetros de conexão comuns a todos os clientes HTTP/AWS do projeto."""
+
+    region_name: str = "us-east-1"
+    # Conexões mantidas por cliente (boto3 usa 10 por padrão: falta sob concorrência)
+    max_pool_connections: int = 50
+    connect_timeout: float = 2.0
+    read_timeout: float = 60.0
+    # Tentativas totais do botocore (modo "standard"); LLMs usam 1 (retry no ResilientLLMProvider)
+    max_attempts: int = 3
+    tcp_keepalive: bool = True
+    # Tempo (s) que uma conexão ociosa fica no pool (httpx/aiohttp)
+    keepalive_expiry: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "ClientSettings":
+        return cls(
+            region_name=os.getenv("AWS_REGION", "us-east-1"),
+            max_pool_connections=int(os.getenv("CLIENT_MAX_POOL_CONNECTIONS", "50")),
+            connect_timeout=float(os.getenv("CLIENT_CONNECT_TIMEOUT_SECONDS", "2")),
+            read_timeout=float(os.getenv("CLIENT_READ_TIMEOUT_SECONDS", "60")),
+            max_attempts=int(os.getenv("CLIENT_MAX_ATTEMPTS", "3")),
+            tcp_keepalive=os.getenv("CLIENT_TCP_KEEPALIVE", "true").lower() == "true",
+            keepalive_expiry=float(os.getenv("CLIENT_KEEPALIVE_EXPIRY_SECONDS", "60")),
+        )
+
+
+def _env_prefix(service: str) -> str:
+    # "bedrock-runtime" -> BEDROCK_RUNTIME (BEDROCK_RUNTIME_REGION, ..._ENDPOINT_URL)
+    return service.upper().replace("-", "_")
+
+
+class ClientFactory:
+    """
+    Fábrica compartilhada de clientes: boto3 (clients/resources), httpx (OpenAI)
+    e aiohttp (Bedrock assíncrono) com pool dimensionado, keep-alive, timeouts
+    de conexão/leitura e região/endpoint por serviço. Clientes boto3 e httpx são
+    criados uma vez por configuração e reutilizados entre invocações "quentes".
+    Os SDKs só são importados quando um cliente do tipo é pedido.
+    """
+
+    def __init__(self, settings: Optional[ClientSettings] = None):
+        self.settings = settings or ClientSettings.from_env()
+        self._clients: Dict[tuple, Any] = {}
+        self._credentials = None
+        self._lock = threading.Lock()
+
+    def region_for(self, service: str) -> str:
+        """Região do serviço: <SERVIÇO>_REGION (ex: BEDROCK_RUNTIME_REGION) ou AWS_REGION."""
+        return os.getenv(f"{_env_prefix(service)}_REGION") or self.settings.region_name
+
+    def endpoint_for(self, service: str) -> Optional[str]:
+        """Endpoint alternativo: <SERVIÇO>_ENDPOINT_URL (ex: DYNAMODB_ENDPOINT_URL)."""
+        return os.getenv(f"{_env_prefix(service)}_ENDPOINT_URL") or None
+
+    def botocore_config(
+        self,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        max_pool_connections: Optional[int] = None,
+    ):
+        from botocore.config import Config
+
+        settings = self.settings
+        return Config(
+            connect_timeout=(
+                settings.connect_timeout if connect_timeout is None else connect_timeout
+            ),
+            read_timeout=(
+                settings.read_timeout if read_timeout is None else read_timeout
+            ),
+            retries={
+                "max_attempts": max_attempts or settings.max_attempts,
+                "mode": "standard",
+            },
+            max_pool_connections=max_pool_connections or settings.max_pool_connections,
+            tcp_keepalive=settings.tcp_keepalive,
+        )
+
+    def _cached(self, key: tuple, build) -> Any:
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = build()
+                    self._clients[key] = client
+                    logger.info(f"Cliente criado: {key[0]}:{key[1]} ({key[2]})")
+        return client
+
+    def aws_client(
+        self,
+        service: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        **config: Any,
+    ) -> Any:
+        """
+        Client boto3 compartilhado por (serviço, região, endpoint, config).
+        `config`: connect_timeout, read_timeout, max_attempts, max_pool_connections.
+        Com per_call_timeout=True, o timeout de cada chamada vem de call_timeout().
+        """
+        import boto3
+
+        region_name = region_name or self.region_for(service)
+        endpoint_url = endpoint_url or self.endpoint_for(service)
+        per_call_timeout = config.pop("per_call_timeout", False)
+        key = (
+            "client",
+            service,
+            region_name,
+            endpoint_url,
+            tuple(sorted(config.items())) + (("per_call_timeout", per_call_timeout),),
+        )
+
+        def build() -> Any:
+            client = boto3.client(
+                service_name=service,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=self.botocore_config(**config),
+            )
+            if per_call_timeout:
+                _enable_call_timeout(client)
+            return client
+
+        return self._cached(key, build)
+
+    def aws_resource(
+        self,
+        service: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        **config: Any,
+    ) -> Any:
+        """Resource boto3 (ex: tabelas do DynamoDB) com a mesma configuração de pool."""
+        import boto3
+
+        region_name = region_name or self.region_for(service)
+        endpoint_url = endpoint_url or self.endpoint_for(service)
+        key = (
+            "resource",
+            service,
+            region_name,
+            endpoint_url,
+            tuple(sorted(config.items())),
+        )
+        return self._cached(
+            key,
+            lambda: boto3.resource(
+                service,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=self.botocore_config(**config),
+            ),
+        )
+
+    def aws_credentials(self) -> Any:
+        """Credenciais da cadeia padrão (assinatura SigV4 fora do boto3)."""
+        if self._credentials is None:
+            import boto3
+
+            self._credentials = boto3.Session().get_credentials()
+        return self._credentials
+
+    def _httpx_options(self) -> Dict[str, Any]:
+        import httpx
+
+        settings = self.settings
+        return {
+            "limits": httpx.Limits(
+                max_connections=settings.max_pool_connections,
+                max_keepalive_connections=settings.max_pool_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(
+                settings.read_timeout, connect=settings.connect_timeout
+            ),
+        }
+
+    def http_client(self) -> Any:
+        """httpx.Client compartilhado (SDK da OpenAI: `http_client=`)."""
+        import httpx
+
+        return self._cached(
+            ("httpx", "sync", None), lambda: httpx.Client(**self._httpx_options())
+        )
+
+    def async_http_client(self) -> Any:
+        """
+        httpx.AsyncClient novo (o pool fica preso ao event loop em que é usado;
+        quem chama guarda a instância).
+        """
+        import httpx
+
+        return httpx.AsyncClient(**self._httpx_options())
+
+    def aiohttp_session(self) -> Any:
+        """aiohttp.ClientSession com pool e keep-alive (criar dentro do event loop)."""
+        import aiohttp
+
+        settings = self.settings
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.max_pool_connections,
+                keepalive_timeout=settings.keepalive_expiry,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=settings.read_timeout, sock_connect=settings.connect_timeout
+            ),
+        )
+
+    def clear(self) -> None:
+        """Descarta os clientes em cache (ex: rotação de credenciais, testes)."""
+        with self._lock:
+            self._clients.clear()
+            self._credentials = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"clients": len(self._clients)}
+
+
+_FACTORY: Optional[ClientFactory] = None
+_FACTORY_LOCK = threading.Lock()
+
+
+def get_client_factory() -> ClientFactory:
+    """Fábrica do processo (configurada por variáveis de ambiente na 1ª chamada)."""
+    global _FACTORY
+    if _FACTORY is None:
+        with _FACTORY_LOCK:
+            if _FACTORY is None:
+                _FACTORY = ClientFactory()
+    return _FACTORY
@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from src.domain.interfaces.repositories import EmbeddingProvider
+from src.infrastructure.client_factory import ClientFactory, get_client_factory
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockEmbeddings(EmbeddingProvider):
+    """
+    Implementação de embeddings via AWS Bedrock (Amazon Titan Text Embeddings V2).
+    """
+
+    # O Titan aceita um texto por chamada; um lote vira chamadas concorrentes
+    max_batch_size = 16
+
+    def __init__(
+        self,
+        region_name: Optional[str] = None,
+        dimensions: int = 512,
+        max_concurrency: int = 8,
+        client_factory: Optional[ClientFactory] = None,
+    ):
+        """
+        Inicializa o cliente Bedrock (pool compartilhado via ClientFactory).
+        """
+        self.client = (client_factory or get_client_factory()).aws_client(
+            "bedrock-runtime", region_name=region_name
+        )
+        self.model_id = os.getenv(
+            "BEDROCK_EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0"
+        )
+        self.dimensions = dimensions
+        self.max_concurrency = max_concurrency
+
+    def _embed_one(self, text: str) -> List[float]:
+        body = json.dumps(
+            {"inputText": text, "dimensions": self.dimensions, "normalize": True}
+        )
+        response = self.client.invoke_model(modelId=self.model_id, body=body)
+        return json.loads(response.get("body").read())["embedding"]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Gera embeddings normalizados. Lotes com mais de um texto são enviados
+        em chamadas concorrentes (até max_concurrency).
+        """
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if len(texts) <= 1:
+            for i, text in enumerate(texts):
+                vectors[i] = self._embed_one(text)
+            return vectors
+
+        workers = min(self.max_concurrency, len(texts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for i, embedding in enumerate(executor.map(self._embed_one, texts)):
+                vectors[i] = embedding
+        return vectors
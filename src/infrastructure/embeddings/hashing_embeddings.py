@@ -0,0 +1,48 @@
+import zlib
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from src.domain.interfaces.repositories import EmbeddingProvider
+from src.utils.text_normalization import normalize_text
+
+
+@lru_cache(maxsize=4096)
+def _ngram_buckets(text: str, dimensions: int, ngram_range: Tuple[int, int]) -> tuple:
+    """Índices (hash estável crc32) dos n-gramas de caracteres do texto normalizado."""
+    buckets = []
+    for word in normalize_text(text).split():
+        padded = f" {word} "
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            for i in range(max(len(padded) - n + 1, 1)):
+                buckets.append(
+                    zlib.crc32(padded[i : i + n].encode("utf-8")) % dimensions
+                )
+    return tuple(buckets)
+
+
+class HashingEmbeddings(EmbeddingProvider):
+    """
+    Embeddings locais por hashing de n-gramas de caracteres.
+    Sem rede e determinístico: útil offline, em testes e como fallback barato.
+    Captura similaridade lexical (variações de escrita), não semântica profunda.
+    """
+
+    max_batch_size = 256
+    in_process = True
+
+    def __init__(self, dimensions: int = 512, ngram_range: Tuple[int, int] = (3, 4)):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for i, text in enumerate(texts):
+            buckets = _ngram_buckets(text, self.dimensions, self.ngram_range)
+            if buckets:
+                np.add.at(vectors[i], list(buckets), 1.0)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
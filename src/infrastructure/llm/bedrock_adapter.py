@@ -1,46 +1,85 @@
+import asyncio
 import json
 import logging
 import os
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote
 
-import boto3
+import aiohttp
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from yarl import URL
 
 from src.domain.interfaces.repositories import LLMProvider
+from src.infrastructure.client_factory import (
+    ClientFactory,
+    call_timeout,
+    get_client_factory,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SYSTEM_PROMPT = """\
+Você é um assistente de saúde mental empático, especializado em TDAH, ansiedade e depressão.
+Sua missão é fornecer apoio psicoeducativo com base APENAS no contexto fornecido.
+
+Regras de Resposta:
+- Use linguagem simples, direta e acolhedora.
+- Formate a resposta com bullet points para facilitar a leitura.
+- Use negrito em palavras-chave importantes.
+- Limite sua resposta a no máximo 3 parágrafos curtos.
+- Se a informação não estiver no contexto, diga que não sabe, não invente."""
+
 
 class BedrockLLM(LLMProvider):
     """
     Implementação do provedor AWS Bedrock (Llama 3).
     """
 
-    def __init__(self, region_name: str = "us-east-1"):
+    # Tokenizer do Llama 3 (vocabulário de 128k) rende ~3,5 caracteres/token em PT-BR
+    chars_per_token = 3.5
+
+    def __init__(
+        self,
+        region_name: Optional[str] = None,
+        client_factory: Optional[ClientFactory] = None,
+    ):
         """
         Inicializa o cliente Bedrock.
+
+        Args:
+            region_name: Região do Bedrock (padrão: BEDROCK_RUNTIME_REGION/AWS_REGION).
+            client_factory: Fábrica de clientes (padrão: a compartilhada do processo).
         """
-        self.client = boto3.client(
-            service_name="bedrock-runtime", region_name=region_name
+        self.client_factory = client_factory or get_client_factory()
+        self.region_name = region_name or self.client_factory.region_for(
+            "bedrock-runtime"
+        )
+        # Sem retries do botocore (ficam no ResilientLLMProvider); o deadline de
+        # cada chamada vira o timeout dela, no mesmo cliente e pool de conexões
+        self.client = self.client_factory.aws_client(
+            "bedrock-runtime",
+            region_name=self.region_name,
+            max_attempts=1,
+            per_call_timeout=True,
         )
         self.model_id = os.getenv("BEDROCK_MODEL_ID", "meta.llama3-8b-instruct-v1:0")
 
-    def invoke(self, prompt: str, context: str = "") -> str:
+        # Sessão HTTP assíncrona (aiohttp) criada sob demanda no event loop corrente
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _build_body(self, prompt: str, context: str = "") -> str:
         """
-        Invoca o modelo Llama 3 no AWS Bedrock.
+        Monta o corpo da requisição (prompt Llama 3 + parâmetros de geração).
         """
-        try:
-            # Construção do Prompt seguindo boas práticas para Llama 3
-            formatted_prompt = f"""
+        instructions = self.instructions(context) or DEFAULT_SYSTEM_PROMPT
+        context = self.render_context(context)
+        # Construção do Prompt seguindo boas práticas para Llama 3
+        formatted_prompt = f"""
 <|begin_of_text|><|start_header_id|>system<|end_header_id|>
 
-Você é um assistente de saúde mental empático, especializado em TDAH, ansiedade e depressão.
-Sua missão é fornecer apoio psicoeducativo com base APENAS no contexto fornecido.
-
-Regras de Resposta:
-- Use linguagem simples, direta e acolhedora.
-- Formate a resposta com bullet points para facilitar a leitura.
-- Use negrito em palavras-chave importantes.
-- Limite sua resposta a no máximo 3 parágrafos curtos.
-- Se a informação não estiver no contexto, diga que não sabe, não invente.
+{instructions}
 
 Contexto de Referência:
 {context}
@@ -52,16 +91,25 @@ Contexto de Referência:
 <|eot_id|><|start_header_id|>assistant<|end_header_id|>
 """
 
-            body = json.dumps(
-                {
-                    "prompt": formatted_prompt,
-                    "max_gen_len": 512,
-                    "temperature": 0.2,
-                    "top_p": 0.9,
-                }
-            )
+        return json.dumps(
+            {
+                "prompt": formatted_prompt,
+                "max_gen_len": 512,
+                "temperature": 0.2,
+                "top_p": 0.9,
+            }
+        )
 
-            response = self.client.invoke_model(modelId=self.model_id, body=body)
+    def invoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo Llama 3 no AWS Bedrock.
+        """
+        try:
+            body = self._build_body(prompt, context)
+            with call_timeout(timeout):
+                response = self.client.invoke_model(modelId=self.model_id, body=body)
 
             response_body = json.loads(response.get("body").read())
             generation = response_body.get("generation", "")
@@ -70,4 +118,103 @@ Contexto de Referência:
 
         except Exception as e:
             logger.error(f"Erro ao invocar Bedrock: {str(e)}")
-            return "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Bedrock)."
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Bedrock).",
+            )
+
+    def stream(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo com streaming (InvokeModelWithResponseStream),
+        emitindo cada fragmento gerado assim que chega.
+        """
+        try:
+            body = self._build_body(prompt, context)
+            # O read timeout fica no socket: vale também para a leitura dos eventos
+            with call_timeout(timeout):
+                response = self.client.invoke_model_with_response_stream(
+                    modelId=self.model_id, body=body
+                )
+
+            for event in response.get("body"):
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+                generation = json.loads(chunk.get("bytes")).get("generation", "")
+                if generation:
+                    yield generation
+
+        except Exception as e:
+            logger.error(f"Erro no streaming do Bedrock: {str(e)}")
+            yield self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Bedrock).",
+            )
+
+    def _sign_request(self, url: str, body: str) -> Dict[str, str]:
+        """
+        Assina a requisição com SigV4 (mesmo esquema usado pelo boto3).
+        """
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=body,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        SigV4Auth(
+            self.client_factory.aws_credentials().get_frozen_credentials(),
+            "bedrock",
+            self.region_name,
+        ).add_auth(request)
+        return dict(request.headers.items())
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """
+        Reutiliza a sessão aiohttp (pool keep-alive) enquanto o event loop for o mesmo.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._http_session is None
+            or self._http_session.closed
+            or self._http_loop is not loop
+        ):
+            self._http_session = self.client_factory.aiohttp_session()
+            self._http_loop = loop
+        return self._http_session
+
+    async def ainvoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo de forma assíncrona (aiohttp + SigV4), sem bloquear o event loop.
+        """
+        try:
+            body = self._build_body(prompt, context)
+            url = (
+                f"{self.client.meta.endpoint_url}"
+                f"/model/{quote(self.model_id, safe='')}/invoke"
+            )
+            headers = self._sign_request(url, body)
+
+            session = await self._get_http_session()
+            # Sem deadline vale o timeout da sessão (ClientFactory); passar
+            # timeout=None ao aiohttp removeria qualquer limite
+            request_timeout = (
+                {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+            )
+            async with session.post(
+                URL(url, encoded=True), data=body, headers=headers, **request_timeout
+            ) as response:
+                response.raise_for_status()
+                response_body = await response.json(content_type=None)
+
+            return response_body.get("generation", "").strip()
+
+        except Exception as e:
+            logger.error(f"Erro ao invocar Bedrock (async): {str(e)}")
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Bedrock).",
+            )
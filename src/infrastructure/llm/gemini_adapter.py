@@ -1,9 +1,11 @@
 import logging
 import os
+from typing import Any, Dict, Iterator, Optional
 
 import google.generativeai as genai
 
 from src.domain.interfaces.repositories import LLMProvider
+from src.infrastructure.client_factory import ClientFactory, get_client_factory
 
 logger = logging.getLogger(__name__)
 
@@ -13,24 +15,33 @@ class GeminiLLM(LLMProvider):
     Implementação do provedor Google Gemini.
     """
 
-    def __init__(self):
+    def __init__(self, client_factory: Optional[ClientFactory] = None):
         """
-        Inicializa o cliente Gemini.
+        Inicializa o cliente Gemini. O transporte gRPC já mantém um único canal
+        HTTP/2 (multiplexado e keep-alive); da fábrica vem só o endpoint
+        alternativo/regional (GEMINI_ENDPOINT_URL).
         """
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             logger.warning("GEMINI_API_KEY não configurada.")
 
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-pro")
+        endpoint = (client_factory or get_client_factory()).endpoint_for("gemini")
+        genai.configure(
+            api_key=api_key,
+            client_options={"api_endpoint": endpoint} if endpoint else None,
+        )
+        self.model_id = "gemini-pro"
+        self.model = genai.GenerativeModel(self.model_id)
 
-    def invoke(self, prompt: str, context: str = "") -> str:
+    def _build_prompt(self, prompt: str, context: str = "") -> str:
         """
-        Invoca o modelo Google Gemini.
+        Monta o prompt completo (instruções + contexto + pergunta).
         """
-        try:
-            # Construção do Prompt
-            formatted_prompt = f"""
+        instructions = self.instructions(context)
+        context = self.render_context(context)
+        if instructions:
+            return f"{instructions}\n\nContexto de Referência:\n{context}\n\n{prompt}"
+        return f"""
 Você é um assistente de saúde mental empático, especializado em TDAH, ansiedade e depressão.
 Sua missão é fornecer apoio psicoeducativo com base APENAS no contexto fornecido abaixo.
 
@@ -48,9 +59,72 @@ Pergunta do Usuário:
 {prompt}
 """
 
-            response = self.model.generate_content(formatted_prompt)
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+        """Timeout por requisição do SDK (somente quando há deadline)."""
+        return {"request_options": {"timeout": timeout}} if timeout is not None else {}
+
+    def invoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo Google Gemini.
+        """
+        try:
+            formatted_prompt = self._build_prompt(prompt, context)
+
+            response = self.model.generate_content(
+                formatted_prompt, **self._request_options(timeout)
+            )
             return response.text.strip()
 
         except Exception as e:
             logger.error(f"Erro ao invocar Gemini: {str(e)}")
-            return "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Gemini)."
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Gemini).",
+            )
+
+    def stream(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo Google Gemini com streaming (stream=True).
+        """
+        try:
+            formatted_prompt = self._build_prompt(prompt, context)
+
+            response = self.model.generate_content(
+                formatted_prompt, stream=True, **self._request_options(timeout)
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error(f"Erro no streaming do Gemini: {str(e)}")
+            yield self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Gemini).",
+            )
+
+    async def ainvoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo Google Gemini de forma assíncrona (generate_content_async).
+        """
+        try:
+            formatted_prompt = self._build_prompt(prompt, context)
+
+            response = await self.model.generate_content_async(
+                formatted_prompt, **self._request_options(timeout)
+            )
+            return response.text.strip()
+
+        except Exception as e:
+            logger.error(f"Erro ao invocar Gemini (async): {str(e)}")
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro Gemini).",
+            )
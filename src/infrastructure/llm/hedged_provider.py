@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional
+
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    LLMProvider,
+    timeout_kwargs,
+)
+
+logger = logging.getLogger(__name__)
+
+_NO_ANSWER = f"{PROVIDER_ERROR_PREFIX} para processar sua solicitação no momento."
+
+
+class HedgedLLMProvider(LLMProvider):
+    """
+    Requisições "hedged": se o provedor principal não responder dentro do
+    percentil `hedge_percentile` das suas latências recentes, o mesmo pedido é
+    disparado no provedor secundário e vale a primeira resposta válida. Assim
+    só a cauda lenta paga uma segunda chamada. Cada chamada leva como timeout
+    do SDK o que resta do prazo ao começar: a perdedora, abandonada, termina
+    no deadline em vez de ocupar uma thread até o timeout padrão do SDK. O streaming não é duplicado
+    (fragmentos de modelos diferentes não se misturam) e usa o principal.
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        hedge: LLMProvider,
+        hedge_percentile: float = 0.9,
+        initial_delay: float = 1.5,
+        min_delay: float = 0.05,
+        window: int = 100,
+        min_samples: int = 10,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            hedge_percentile: Percentil da latência do principal que dispara o hedge.
+            initial_delay: Espera (s) antes do hedge enquanto há menos de
+                `min_samples` latências medidas.
+            window: Quantas latências recentes do principal considerar.
+        """
+        self.primary = primary
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.model_id = getattr(primary, "model_id", "unknown")
+        self.prompt_version = getattr(primary, "prompt_version", "1")
+        self.chars_per_token = min(primary.chars_per_token, hedge.chars_per_token)
+
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        index = min(int(len(samples) * self.hedge_percentile), len(samples) - 1)
+        return max(samples[index], self.min_delay)
+
+    @staticmethod
+    def _ok(response: Optional[str]) -> bool:
+        return bool(response) and not response.startswith(PROVIDER_ERROR_PREFIX)
+
+    def _observe(self, started: float, response: Optional[str]) -> None:
+        # Só respostas válidas: falhas rápidas distorceriam o percentil para baixo
+        if self._ok(response):
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+
+    def _call(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        context: Any,
+        deadline: Optional[float],
+    ) -> str:
+        started = time.monotonic()
+        timeout = None if deadline is None else deadline - started
+        if timeout is not None and timeout <= 0:
+            return ""
+        try:
+            response = provider.invoke(prompt, context, **timeout_kwargs(timeout))
+        except Exception as e:
+            logger.error(f"Erro no provedor ({type(provider).__name__}): {str(e)}")
+            response = ""
+        if provider is self.primary:
+            self._observe(started, response)
+        return response
+
+    @staticmethod
+    def _left(timeout: Optional[float], started: float) -> Optional[float]:
+        if timeout is None:
+            return None
+        return max(timeout - (time.monotonic() - started), 0.0)
+
+    def invoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        started = time.monotonic()
+        self.requests += 1
+        deadline = None if timeout is None else started + timeout
+        primary = self._executor.submit(
+            self._call, self.primary, prompt, context, deadline
+        )
+        delay = self.hedge_delay()
+        if timeout is not None:
+            delay = min(delay, timeout)
+
+        done, _ = wait([primary], timeout=delay)
+        if done and self._ok(primary.result()):
+            return primary.result()
+
+        left = self._left(timeout, started)
+        if left == 0.0:
+            primary.cancel()
+            return primary.result() if done else _NO_ANSWER
+
+        self.hedged += 1
+        logger.info(f"Hedge disparado após {delay * 1000:.0f} ms")
+        hedge = self._executor.submit(self._call, self.hedge, prompt, context, deadline)
+        pending = {hedge} if done else {primary, hedge}
+        response = primary.result() if done else ""
+        try:
+            while pending:
+                finished, pending = wait(
+                    pending,
+                    timeout=self._left(timeout, started),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not finished:
+                    break
+                for future in finished:
+                    response = future.result() or response
+                    if self._ok(future.result()):
+                        if future is hedge:
+                            self.hedge_wins += 1
+                        return future.result()
+            return response or _NO_ANSWER
+        finally:
+            # Ainda na fila do pool: a chamada perdedora nem chega a começar
+            for future in pending:
+                future.cancel()
+
+    async def _acall(
+        self, provider: LLMProvider, prompt: str, context: Any, timeout: Optional[float]
+    ) -> str:
+        started = time.monotonic()
+        try:
+            response = await provider.ainvoke(
+                prompt, context, **timeout_kwargs(timeout)
+            )
+        except Exception as e:
+            logger.error(f"Erro no provedor ({type(provider).__name__}): {str(e)}")
+            response = ""
+        if provider is self.primary:
+            self._observe(started, response)
+        return response
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        started = time.monotonic()
+        self.requests += 1
+        primary = asyncio.ensure_future(
+            self._acall(self.primary, prompt, context, timeout)
+        )
+        delay = self.hedge_delay()
+        if timeout is not None:
+            delay = min(delay, timeout)
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done and self._ok(primary.result()):
+            return primary.result()
+
+        left = self._left(timeout, started)
+        if left == 0.0:
+            primary.cancel()
+            return primary.result() if done else _NO_ANSWER
+
+        self.hedged += 1
+        hedge = asyncio.ensure_future(self._acall(self.hedge, prompt, context, left))
+        pending = {hedge} if done else {primary, hedge}
+        response = primary.result() if done else ""
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._left(timeout, started),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not finished:
+                    break
+                for task in finished:
+                    response = task.result() or response
+                    if self._ok(task.result()):
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            return response or _NO_ANSWER
+        finally:
+            # No caminho assíncrono, a chamada perdedora é de fato cancelada
+            for task in pending:
+                task.cancel()
+
+    def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        return self.primary.stream(prompt, context, **timeout_kwargs(timeout))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+        }
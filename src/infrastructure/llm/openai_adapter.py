@@ -1,9 +1,11 @@
 import logging
 import os
+from typing import Any, Dict, Iterator, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from src.domain.interfaces.repositories import LLMProvider
+from src.infrastructure.client_factory import ClientFactory, get_client_factory
 
 logger = logging.getLogger(__name__)
 
@@ -13,22 +15,37 @@ class OpenAILLM(LLMProvider):
     Implementação do provedor OpenAI (GPT).
     """
 
-    def __init__(self):
+    # cl100k_base rende ~3,5 caracteres/token em PT-BR
+    chars_per_token = 3.5
+
+    def __init__(self, client_factory: Optional[ClientFactory] = None):
         """
-        Inicializa o cliente OpenAI.
+        Inicializa o cliente OpenAI (pool httpx compartilhado via ClientFactory;
+        endpoint alternativo/regional via OPENAI_BASE_URL, lido pelo SDK).
         """
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             logger.warning("OPENAI_API_KEY não configurada.")
 
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client_factory = client_factory or get_client_factory()
+        self.client = OpenAI(
+            api_key=api_key, http_client=self.client_factory.http_client()
+        )
+        # Cliente assíncrono criado sob demanda (apenas quem usa ainvoke paga o custo)
+        self._async_client = None
         self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        self.model_id = self.model
 
-    def invoke(self, prompt: str, context: str = "") -> str:
+    def _build_messages(self, prompt: str, context: str = "") -> List[Dict[str, str]]:
         """
-        Invoca o modelo GPT da OpenAI.
+        Monta as mensagens (system + user) enviadas ao Chat Completions.
         """
-        try:
+        instructions = self.instructions(context)
+        context = self.render_context(context)
+        if instructions:
+            system_prompt = f"{instructions}\n\nContexto de Referência:\n{context}"
+        else:
             system_prompt = f"""
 Você é um assistente de saúde mental empático, especializado em TDAH, ansiedade e depressão.
 Sua missão é fornecer apoio psicoeducativo com base APENAS no contexto fornecido.
@@ -44,18 +61,99 @@ Regras de Resposta:
 - Se a informação não estiver no contexto, diga que não sabe, não invente.
 """
 
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+        """Timeout por requisição do SDK (somente quando há deadline)."""
+        return {"timeout": timeout} if timeout is not None else {}
+
+    def invoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo GPT da OpenAI.
+        """
+        try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
+                messages=self._build_messages(prompt, context),
                 temperature=0.2,
                 max_tokens=512,
+                **self._request_options(timeout),
             )
 
             return response.choices[0].message.content.strip()
 
         except Exception as e:
             logger.error(f"Erro ao invocar OpenAI: {str(e)}")
-            return "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro OpenAI)."
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro OpenAI).",
+            )
+
+    def stream(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo GPT com streaming (stream=True), emitindo os deltas.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, context),
+                temperature=0.2,
+                max_tokens=512,
+                **self._request_options(timeout),
+                stream=True,
+            )
+
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"Erro no streaming da OpenAI: {str(e)}")
+            yield self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro OpenAI).",
+            )
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=self.client_factory.async_http_client(),
+            )
+        return self._async_client
+
+    async def ainvoke(
+        self, prompt: str, context: str = "", timeout: Optional[float] = None
+    ) -> str:
+        """
+        Invoca o modelo GPT de forma assíncrona (AsyncOpenAI).
+        """
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, context),
+                temperature=0.2,
+                max_tokens=512,
+                **self._request_options(timeout),
+            )
+
+            return response.choices[0].message.content.strip()
+
+        except Exception as e:
+            logger.error(f"Erro ao invocar OpenAI (async): {str(e)}")
+            return self._provider_error(
+                e,
+                "Desculpe, estou tendo dificuldades para processar sua solicitação no momento (Erro OpenAI).",
+            )
@@ -0,0 +1,150 @@
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.domain.interfaces.repositories import LLMProvider, timeout_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Adapters por nome ("módulo:classe"): o SDK só é importado quando o nome é usado
+LLM_PROVIDERS: Dict[str, str] = {
+    "bedrock": "src.infrastructure.llm.bedrock_adapter:BedrockLLM",
+    "openai": "src.infrastructure.llm.openai_adapter:OpenAILLM",
+    "gemini": "src.infrastructure.llm.gemini_adapter:GeminiLLM",
+}
+
+
+class ProviderRegistry:
+    """
+    Registro de provedores por nome com importação sob demanda: cada adapter é
+    importado e instanciado no primeiro `get` e reutilizado nas invocações
+    "quentes" seguintes (os clientes HTTP/SDK ficam no objeto).
+    """
+
+    def __init__(self, specs: Optional[Dict[str, str]] = None):
+        self._specs: Dict[str, Any] = dict(LLM_PROVIDERS if specs is None else specs)
+        self._instances: Dict[str, LLMProvider] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, spec: Any) -> None:
+        """`spec`: "módulo:classe" ou uma fábrica sem argumentos."""
+        with self._lock:
+            self._specs[name] = spec
+            self._instances.pop(name, None)
+
+    def names(self):
+        return sorted(self._specs)
+
+    def load(self, name: str) -> Callable[[], LLMProvider]:
+        """Importa (uma vez) e devolve a classe/fábrica do provedor."""
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(
+                f"Provedor LLM desconhecido: {name!r} (disponíveis: {self.names()})"
+            )
+        if not isinstance(spec, str):
+            return spec
+        module_name, _, attr = spec.partition(":")
+        started = time.perf_counter()
+        factory = getattr(importlib.import_module(module_name), attr)
+        self._timings.setdefault(name, {})["import_ms"] = (
+            time.perf_counter() - started
+        ) * 1000
+        return factory
+
+    def get(self, name: str) -> LLMProvider:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                factory = self.load(name)
+                started = time.perf_counter()
+                instance = factory()
+                self._timings.setdefault(name, {})["init_ms"] = (
+                    time.perf_counter() - started
+                ) * 1000
+                self._instances[name] = instance
+                logger.info(f"Provedor LLM carregado: {name} {self._timings[name]}")
+        return instance
+
+    def loaded(self) -> Dict[str, Dict[str, float]]:
+        """Tempos de importação e construção dos provedores já carregados."""
+        return {
+            name: {k: round(v, 3) for k, v in timings.items()}
+            for name, timings in self._timings.items()
+        }
+
+
+class LazyLLMProvider(LLMProvider):
+    """
+    Proxy que só constrói o provedor real (e importa o SDK) no primeiro uso.
+    `warm_up()` antecipa a construção (concorrência provisionada ou ping).
+    """
+
+    def __init__(self, factory: Callable[[], LLMProvider]):
+        self._factory = factory
+        self._provider: Optional[LLMProvider] = None
+        self._lock = threading.Lock()
+
+    @property
+    def provider(self) -> LLMProvider:
+        if self._provider is None:
+            with self._lock:
+                if self._provider is None:
+                    self._provider = self._factory()
+        return self._provider
+
+    @property
+    def loaded(self) -> bool:
+        return self._provider is not None
+
+    def warm_up(self) -> float:
+        """Constrói o provedor, se ainda não existir; devolve o tempo gasto (ms)."""
+        started = time.perf_counter()
+        provider = self.provider
+        logger.info(f"Provedor LLM aquecido: {getattr(provider, 'model_id', '?')}")
+        return (time.perf_counter() - started) * 1000
+
+    @property
+    def model_id(self) -> str:
+        return getattr(self.provider, "model_id", "unknown")
+
+    @property
+    def prompt_version(self) -> str:
+        return getattr(self.provider, "prompt_version", "1")
+
+    @property
+    def chars_per_token(self) -> float:
+        return self.provider.chars_per_token
+
+    def invoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        return self.provider._invoke(prompt, context, timeout)
+
+    def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        return self.provider.stream(prompt, context, **timeout_kwargs(timeout))
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        return await self.provider.ainvoke(prompt, context, **timeout_kwargs(timeout))
+
+    def count_tokens(self, text: str) -> int:
+        return self.provider.count_tokens(text)
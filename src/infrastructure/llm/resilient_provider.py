@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    LLMProvider,
+    raising_provider_errors,
+    timeout_kwargs,
+)
+
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE = f"{PROVIDER_ERROR_PREFIX} para processar sua solicitação no momento."
+
+# Códigos HTTP e de erro (botocore) de falhas transitórias e rápidas
+_RETRYABLE_STATUS = {425, 429, 500, 502, 503, 529}
+_RETRYABLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+}
+# Nomes de exceções de rede/limite nos SDKs (openai, google-api-core, aiohttp)
+_RETRYABLE_NAMES = (
+    "Connection",
+    "RateLimit",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "ResourceExhausted",
+)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Falhas transitórias e rápidas (throttling, 5xx, conexão recusada) valem
+    nova tentativa; erros de requisição (4xx, credenciais, validação) não.
+    Timeouts também não: a nova tentativa dobraria a cauda de latência (o
+    circuit breaker os contabiliza).
+    """
+    if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__:
+        return False
+    if isinstance(error, ConnectionError):
+        return True
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        if code in _RETRYABLE_CODES:
+            return True
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    else:
+        status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if isinstance(status, int):
+        return status in _RETRYABLE_STATUS
+    name = type(error).__name__
+    return any(part in name for part in _RETRYABLE_NAMES)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por provedor: após `failure_threshold` falhas seguidas o
+    circuito abre e as chamadas falham na hora (sem rede) por `reset_timeout`
+    segundos; depois, até `half_open_max_calls` chamadas de teste decidem se
+    fecha (sucesso) ou reabre (falha).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        if (
+            self._state == self.OPEN
+            and self.clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+    def allow(self) -> bool:
+        """Reserva uma chamada; False quando o circuito está aberto."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if (
+                self._state == self.HALF_OPEN
+                and self._probes < self.half_open_max_calls
+            ):
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self) -> None:
+        """
+        Devolve a reserva de uma chamada que terminou sem resultado (cancelada
+        ou abandonada): em meia-abertura, a vaga de teste fica livre de novo.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit breaker fechado: provedor recuperado.")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuit breaker aberto após {self._failures} falhas "
+                    f"(nova tentativa em {self.reset_timeout:.0f} s)."
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class ResilientLLMProvider(LLMProvider):
+    """
+    Envolve um provedor com novas tentativas (backoff exponencial com jitter,
+    somente para erros transitórios) e um circuit breaker. Com o circuito
+    aberto, devolve na hora o pedido de desculpas padrão, que o roteador trata
+    como falha (failover) e o caso de uso como gatilho da resposta degradada.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        name: Optional[str] = None,
+        max_retries: int = 2,
+        base_delay: float = 0.1,
+        max_delay: float = 1.0,
+        breaker: Optional[CircuitBreaker] = None,
+        retryable: Callable[[BaseException], bool] = is_retryable_error,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            provider: Adapter envolvido. Não é alterado: só as chamadas feitas
+                por aqui propagam exceções (raising_provider_errors).
+            max_retries: Tentativas extras por chamada (além da primeira).
+            base_delay: Espera (s) antes da 1ª nova tentativa; dobra a cada uma,
+                até `max_delay`, com jitter total (uniforme entre 0 e o teto).
+            retryable: Classifica se uma exceção vale nova tentativa.
+        """
+        self.provider = provider
+        self.name = name or type(provider).__name__
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.retryable = retryable
+        self.sleep = sleep
+        self.clock = clock
+        self.model_id = getattr(provider, "model_id", "unknown")
+        self.prompt_version = getattr(provider, "prompt_version", "1")
+        self.chars_per_token = provider.chars_per_token
+
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "failures": 0, "retries": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _next_delay(
+        self, error: Exception, attempt: int, deadline: Optional[float]
+    ) -> Optional[float]:
+        """Espera antes da próxima tentativa; None quando não vale tentar de novo."""
+        logger.error(f"Erro no provedor {self.name}: {str(error)}")
+        if attempt >= self.max_retries or not self.retryable(error):
+            return None
+        delay = self._backoff(attempt)
+        # Sem tempo para esperar e ainda chamar o provedor: desiste já
+        if deadline is not None and self.clock() + delay >= deadline:
+            return None
+        self._count("retries")
+        return delay
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else deadline - self.clock()
+
+    def _unavailable(self) -> str:
+        logger.warning(f"Circuito aberto para {self.name}: chamada recusada.")
+        return _UNAVAILABLE
+
+    def invoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        deadline = None if timeout is None else self.clock() + timeout
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                return self._unavailable()
+            self._count("calls")
+            try:
+                with raising_provider_errors():
+                    response = self.provider.invoke(
+                        prompt, context, **timeout_kwargs(self._remaining(deadline))
+                    )
+            except Exception as e:
+                self._count("failures")
+                self.breaker.record_failure()
+                delay = self._next_delay(e, attempt, deadline)
+                if delay is None:
+                    break
+                self.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return response
+        return _UNAVAILABLE
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        deadline = None if timeout is None else self.clock() + timeout
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                return self._unavailable()
+            self._count("calls")
+            try:
+                with raising_provider_errors():
+                    response = await self.provider.ainvoke(
+                        prompt, context, **timeout_kwargs(self._remaining(deadline))
+                    )
+            except Exception as e:
+                self._count("failures")
+                self.breaker.record_failure()
+                delay = self._next_delay(e, attempt, deadline)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelada (hedge perdedor, wait_for): sem resultado, libera a vaga
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return response
+        return _UNAVAILABLE
+
+    def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Novas tentativas só antes do primeiro fragmento ter sido repassado."""
+        deadline = None if timeout is None else self.clock() + timeout
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                yield self._unavailable()
+                return
+            self._count("calls")
+            started = False
+            chunks: Iterator[str] = iter(())
+            try:
+                chunks = self.provider.stream(
+                    prompt, context, **timeout_kwargs(self._remaining(deadline))
+                )
+                while True:
+                    # Só durante o next(): entre fragmentos o contexto é de quem consome
+                    with raising_provider_errors():
+                        chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._count("failures")
+                self.breaker.record_failure()
+                # Com fragmentos já repassados, não há como repetir a chamada
+                delay = self._next_delay(
+                    e, self.max_retries if started else attempt, deadline
+                )
+                if delay is None:
+                    yield ("\n\n" if started else "") + _UNAVAILABLE
+                    return
+                self.sleep(delay)
+                continue
+            except BaseException:
+                # Stream fechado pelo consumidor (GeneratorExit): os fragmentos já
+                # entregues mostram que o provedor respondeu; encerra o upstream
+                getattr(chunks, "close", lambda: None)()
+                if started:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {"provider": self.name, **counters, **self.breaker.stats()}
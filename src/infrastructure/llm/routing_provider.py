@@ -0,0 +1,361 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.domain.interfaces.repositories import (
+    PROVIDER_ERROR_PREFIX,
+    LLMProvider,
+    timeout_kwargs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderHealth:
+    """Estatísticas de um provedor: EWMA de latência e de taxa de erro."""
+
+    name: str
+    weight: float = 1.0
+    latency_ms: Optional[float] = None
+    error_rate: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    last_error_at: Optional[float] = None
+    last_used_at: float = 0.0
+    # Início da requisição de teste em andamento (meia-abertura), se houver
+    probing_since: Optional[float] = None
+
+    def as_metadata(self) -> Dict[str, Any]:
+        return {
+            "weight": self.weight,
+            "latency_ms": (
+                round(self.latency_ms, 3) if self.latency_ms is not None else None
+            ),
+            "error_rate": round(self.error_rate, 4),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class RoutingDecision:
+    """Registro de uma decisão de roteamento (para auditoria e depuração)."""
+
+    request: int
+    provider: str
+    reason: str
+    scores: Dict[str, Optional[float]] = field(default_factory=dict)
+    latency_ms: Optional[float] = None
+    ok: Optional[bool] = None
+    # Ordem de tentativa (o primeiro é o escolhido; os demais, failover)
+    order: List[str] = field(default_factory=list, repr=False)
+    # Provedor degradado que recebe esta requisição como teste
+    probe: Optional[str] = None
+
+
+class RoutingLLMProvider(LLMProvider):
+    """
+    Roteia cada requisição para o provedor saudável mais rápido.
+
+    Cada provedor tem uma EWMA da latência (só das respostas bem-sucedidas) e
+    da taxa de erro; o score é a latência dividida pelo peso configurado (peso
+    maior = preferido) e pela taxa de acerto, de modo que falhar rápido não
+    torna um provedor "o mais rápido". Provedores com taxa de erro acima do
+    limite ficam fora até o fim do `cooldown`, quando recebem uma única
+    requisição de teste por vez. A cada `explore_every` requisições, o provedor
+    há mais tempo sem uso é reavaliado. Em falha, tenta o próximo.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, LLMProvider],
+        weights: Optional[Dict[str, float]] = None,
+        alpha: float = 0.3,
+        error_threshold: float = 0.5,
+        cooldown_seconds: float = 30.0,
+        explore_every: int = 20,
+        failover: bool = True,
+        decision_log_size: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            providers: Provedores por nome, na ordem de preferência inicial.
+            weights: Peso por provedor (padrão 1.0).
+            alpha: Suavização das EWMAs (maior = reage mais rápido).
+            error_threshold: Taxa de erro (EWMA) a partir da qual o provedor
+                é considerado degradado.
+            explore_every: Frequência da reavaliação de provedores ociosos
+                (0 desativa).
+            clock: Relógio em segundos (injetável nos testes/simulações).
+        """
+        if not providers:
+            raise ValueError("RoutingLLMProvider requer ao menos um provedor.")
+
+        weights = weights or {}
+        self.providers = dict(providers)
+        self.health = {
+            name: ProviderHealth(name, weight=float(weights.get(name, 1.0)))
+            for name in self.providers
+        }
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.explore_every = explore_every
+        self.failover = failover
+        self.clock = clock
+        self.decision_log: "deque[RoutingDecision]" = deque(maxlen=decision_log_size)
+
+        self.model_id = "router:" + "+".join(
+            str(getattr(p, "model_id", name)) for name, p in self.providers.items()
+        )
+        # Orçamento de contexto conservador: o tokenizer mais "caro" entre os provedores
+        self.chars_per_token = min(p.chars_per_token for p in self.providers.values())
+
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def _healthy(self, health: ProviderHealth) -> bool:
+        return health.error_rate < self.error_threshold
+
+    def _probe_due(self, health: ProviderHealth, now: float) -> bool:
+        """Meia-abertura: degradado, cooldown cumprido e nenhum teste em andamento."""
+        if self._healthy(health):
+            return False
+        # Um teste sem resultado (requisição abandonada) expira após o cooldown
+        if (
+            health.probing_since is not None
+            and now - health.probing_since < self.cooldown_seconds
+        ):
+            return False
+        return (
+            health.last_error_at is None
+            or now - health.last_error_at >= self.cooldown_seconds
+        )
+
+    def _score(self, health: ProviderHealth) -> float:
+        # Sem medições ainda: prioridade máxima para aprender a latência
+        if health.latency_ms is None:
+            return 0.0
+        success_rate = max(1.0 - health.error_rate, 1e-9)
+        return health.latency_ms / max(health.weight, 1e-9) / success_rate
+
+    def _plan(self) -> RoutingDecision:
+        """Ordem de tentativa para a próxima requisição (o primeiro é o escolhido)."""
+        with self._lock:
+            self._requests += 1
+            now = self.clock()
+            scores = {name: self._score(h) for name, h in self.health.items()}
+            healthy = [n for n, h in self.health.items() if self._healthy(h)]
+            probe = next(
+                (n for n, h in self.health.items() if self._probe_due(h, now)), None
+            )
+
+            if probe is not None:
+                # Só esta requisição testa o provedor; as concorrentes seguem a rota
+                self.health[probe].probing_since = now
+                order = [probe] + sorted(
+                    (n for n in self.health if n != probe),
+                    key=lambda n: (n not in healthy, scores[n]),
+                )
+                reason = "teste após cooldown"
+            elif not healthy:
+                order = sorted(self.health, key=lambda n: self.health[n].error_rate)
+                reason = "todos degradados: menor taxa de erro"
+            elif (
+                self.explore_every
+                and len(healthy) > 1
+                and self._requests % self.explore_every == 0
+            ):
+                stale = min(healthy, key=lambda n: self.health[n].last_used_at)
+                order = [stale] + sorted(
+                    (n for n in self.health if n != stale), key=scores.get
+                )
+                reason = "exploração"
+            else:
+                order = sorted(healthy, key=scores.get) + sorted(
+                    (n for n in self.health if n not in healthy), key=scores.get
+                )
+                reason = "menor latência ponderada"
+
+            decision = RoutingDecision(
+                request=self._requests,
+                provider=order[0],
+                reason=reason,
+                scores={n: round(s, 3) for n, s in scores.items()},
+                order=order,
+                probe=probe,
+            )
+            return decision
+
+    def _record(
+        self, name: str, elapsed_ms: float, ok: bool, probe: bool = False
+    ) -> None:
+        with self._lock:
+            health = self.health[name]
+            health.requests += 1
+            health.last_used_at = self.clock()
+            if probe:
+                health.probing_since = None
+            # Falhas (inclusive recusas instantâneas do circuit breaker) não
+            # entram na latência: só o custo de uma resposta útil conta
+            if ok:
+                health.latency_ms = (
+                    elapsed_ms
+                    if health.latency_ms is None
+                    else self.alpha * elapsed_ms + (1 - self.alpha) * health.latency_ms
+                )
+            health.error_rate = (
+                self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * health.error_rate
+            )
+            if not ok:
+                health.errors += 1
+                health.last_error_at = health.last_used_at
+
+    def _log(self, decision: RoutingDecision, name: str, elapsed_ms: float, ok: bool):
+        decision.provider = name
+        decision.latency_ms = round(elapsed_ms, 3)
+        decision.ok = ok
+        with self._lock:
+            self.decision_log.append(decision)
+        logger.debug(
+            f"Roteamento #{decision.request}: {name} ({decision.reason}) "
+            f"{elapsed_ms:.1f} ms ok={ok}"
+        )
+
+    @staticmethod
+    def _failed(response: Optional[str]) -> bool:
+        return not response or response.startswith(PROVIDER_ERROR_PREFIX)
+
+    def _candidates(self, decision: RoutingDecision) -> List[str]:
+        return decision.order if self.failover else decision.order[:1]
+
+    def _remaining(self, timeout: Optional[float], started: float) -> Optional[float]:
+        """Tempo restante do deadline para a próxima tentativa (None = sem deadline)."""
+        if timeout is None:
+            return None
+        return timeout - (self.clock() - started)
+
+    def invoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        decision = self._plan()
+        response = ""
+        started = self.clock()
+        for attempt, name in enumerate(self._candidates(decision)):
+            remaining = self._remaining(timeout, started)
+            if remaining is not None and remaining <= 0:
+                break
+            if attempt:
+                decision = self._retry(decision, name)
+            start = self.clock()
+            try:
+                response = self.providers[name].invoke(
+                    prompt, context, **timeout_kwargs(remaining)
+                )
+                ok = not self._failed(response)
+            except Exception as e:
+                logger.error(f"Erro no provedor {name}: {str(e)}")
+                ok = False
+            elapsed_ms = (self.clock() - start) * 1000
+            self._record(name, elapsed_ms, ok, probe=name == decision.probe)
+            self._log(decision, name, elapsed_ms, ok)
+            if ok:
+                return response
+        return response or f"{PROVIDER_ERROR_PREFIX} para processar sua solicitação."
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        decision = self._plan()
+        response = ""
+        started = self.clock()
+        for attempt, name in enumerate(self._candidates(decision)):
+            remaining = self._remaining(timeout, started)
+            if remaining is not None and remaining <= 0:
+                break
+            if attempt:
+                decision = self._retry(decision, name)
+            start = self.clock()
+            try:
+                response = await self.providers[name].ainvoke(
+                    prompt, context, **timeout_kwargs(remaining)
+                )
+                ok = not self._failed(response)
+            except Exception as e:
+                logger.error(f"Erro no provedor {name} (async): {str(e)}")
+                ok = False
+            elapsed_ms = (self.clock() - start) * 1000
+            self._record(name, elapsed_ms, ok, probe=name == decision.probe)
+            self._log(decision, name, elapsed_ms, ok)
+            if ok:
+                return response
+        return response or f"{PROVIDER_ERROR_PREFIX} para processar sua solicitação."
+
+    def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        A latência considerada é a do primeiro fragmento; o failover só é
+        possível antes de qualquer fragmento ter sido repassado.
+        """
+        decision = self._plan()
+        first = ""
+        started = self.clock()
+        for attempt, name in enumerate(self._candidates(decision)):
+            remaining = self._remaining(timeout, started)
+            if remaining is not None and remaining <= 0:
+                break
+            if attempt:
+                decision = self._retry(decision, name)
+            start = self.clock()
+            chunks = iter(
+                self.providers[name].stream(
+                    prompt, context, **timeout_kwargs(remaining)
+                )
+            )
+            try:
+                first = next(chunks, "")
+                ok = not self._failed(first)
+            except Exception as e:
+                logger.error(f"Erro no streaming do provedor {name}: {str(e)}")
+                ok = False
+            elapsed_ms = (self.clock() - start) * 1000
+            self._record(name, elapsed_ms, ok, probe=name == decision.probe)
+            self._log(decision, name, elapsed_ms, ok)
+            if ok:
+                yield first
+                yield from chunks
+                return
+        yield first or f"{PROVIDER_ERROR_PREFIX} para processar sua solicitação."
+
+    @staticmethod
+    def _retry(previous: RoutingDecision, name: str) -> RoutingDecision:
+        return RoutingDecision(
+            request=previous.request,
+            provider=name,
+            reason=f"failover após {previous.provider}",
+            scores=previous.scores,
+            order=previous.order,
+        )
+
+    def decisions(self) -> List[RoutingDecision]:
+        with self._lock:
+            return list(self.decision_log)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: h.as_metadata() for name, h in self.health.items()}
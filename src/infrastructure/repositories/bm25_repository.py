@@ -0,0 +1,112 @@
+import logging
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities.knowledge import RetrievedChunk
+from src.domain.interfaces.repositories import RankedContextRepository
+from src.utils.text_normalization import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class BM25ContextRepository(RankedContextRepository):
+    """
+    Recuperação lexical (BM25) sobre os mesmos chunks do índice vetorial.
+
+    O índice invertido é compacto: para cada termo, um array de ids de chunk e
+    o peso BM25 já pré-calculado de cada ocorrência. Uma consulta soma as
+    listas dos seus termos num vetor de scores (sem percorrer o corpus).
+    """
+
+    in_process = True
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        sources: Optional[Sequence[str]] = None,
+        top_k: int = 4,
+        min_score: Optional[float] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.sources = list(sources) if sources is not None else None
+        self.top_k = top_k
+        self.min_score = min_score
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = np.zeros(len(self.ids), dtype=np.float32)
+        for doc, text in enumerate(self.texts):
+            counts = Counter(tokenize(text))
+            lengths[doc] = sum(counts.values())
+            for term, tf in counts.items():
+                postings[term].append((doc, tf))
+
+        n_docs = len(self.ids)
+        avg_length = float(lengths.mean()) if n_docs else 0.0
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, entries in postings.items():
+            docs = np.fromiter((d for d, _ in entries), dtype=np.int32)
+            tfs = np.fromiter((tf for _, tf in entries), dtype=np.float32)
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = k1 * (1 - b + b * lengths[docs] / (avg_length or 1.0))
+            weights = (idf * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+            self._postings[term] = (docs, weights)
+
+        logger.info(
+            f"Índice BM25 construído: {n_docs} chunks, {len(self._postings)} termos"
+        )
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "BM25ContextRepository":
+        """Constrói o índice a partir do .npz gravado por save_vector_index."""
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            ids=data["ids"].tolist(),
+            texts=data["texts"].tolist(),
+            sources=data["sources"].tolist() if "sources" in data.files else None,
+            **kwargs,
+        )
+
+    def search(
+        self, query: str, top_k: int = None, min_score: Optional[float] = None
+    ) -> List[RetrievedChunk]:
+        top_k = top_k or self.top_k
+        min_score = self.min_score if min_score is None else min_score
+
+        matched = [
+            self._postings[t] for t in set(tokenize(query)) if t in self._postings
+        ]
+        if not matched:
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for docs, weights in matched:
+            scores[docs] += weights
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[
+                np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            ]
+        ranked = candidates[np.argsort(-scores[candidates])]
+
+        chunks = []
+        for idx in ranked.tolist():
+            score = float(scores[idx])
+            if min_score is not None and score < min_score:
+                continue
+            chunks.append(
+                RetrievedChunk(
+                    chunk_id=self.ids[idx],
+                    text=self.texts[idx],
+                    score=score,
+                    metadata={"source": self.sources[idx]} if self.sources else None,
+                )
+            )
+        return chunks
@@ -0,0 +1,43 @@
+import glob
+import logging
+import os
+from typing import Any, Iterator, Optional, Sequence
+
+from src.domain.entities.knowledge import Document
+from src.infrastructure.client_factory import get_client_factory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTENSIONS = (".md", ".txt")
+
+
+def iter_local_documents(
+    paths: Sequence[str], extensions: Sequence[str] = DEFAULT_EXTENSIONS
+) -> Iterator[Document]:
+    """Lê arquivos (ou diretórios/globs, recursivamente) um a um."""
+    for pattern in paths:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if not os.path.isfile(path) or not path.endswith(tuple(extensions)):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                yield Document(source=os.path.relpath(path), text=f.read())
+
+
+def iter_s3_documents(
+    bucket: str,
+    prefix: str = "",
+    extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+    client: Optional[Any] = None,
+) -> Iterator[Document]:
+    """Percorre o bucket paginando list_objects_v2; baixa um objeto por vez."""
+    client = client or get_client_factory().aws_client("s3")
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            if not key.endswith(tuple(extensions)):
+                continue
+            body = client.get_object(Bucket=bucket, Key=key)["Body"].read()
+            yield Document(source=f"s3://{bucket}/{key}", text=body.decode("utf-8"))
@@ -0,0 +1,326 @@
+import atexit
+import copy
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from src.domain.entities.session import Message, Session
+from src.domain.interfaces.repositories import SessionRepository
+from src.infrastructure.client_factory import get_client_factory
+
+logger = logging.getLogger(__name__)
+
+
+def _serialize(session: Session, version: int, expires_at: int) -> Dict[str, Any]:
+    return {
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "messages": [
+            {
+                "content": m.content,
+                "role": m.role,
+                "created_at": m.created_at.isoformat(),
+            }
+            for m in session.messages
+        ],
+        # JSON evita a conversão de floats para Decimal do boto3
+        "context": json.dumps(session.context or {}, ensure_ascii=False),
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "version": version,
+        "expires_at": expires_at,
+    }
+
+
+def _deserialize(item: Dict[str, Any]) -> Session:
+    return Session(
+        session_id=item["session_id"],
+        user_id=item.get("user_id", "anonymous"),
+        messages=[
+            Message(
+                content=m["content"],
+                role=m["role"],
+                created_at=datetime.fromisoformat(m["created_at"]),
+            )
+            for m in item.get("messages", [])
+        ],
+        context=json.loads(item.get("context") or "{}") or None,
+        created_at=datetime.fromisoformat(item["created_at"]),
+        updated_at=datetime.fromisoformat(item["updated_at"]),
+    )
+
+
+def _message_key(message: Message) -> Tuple[str, str, str]:
+    return message.role, message.content, message.created_at.isoformat()
+
+
+def _merge(remote: Session, local: Session) -> Session:
+    """
+    Junta à versão remota (mais nova) os turnos locais que ela ainda não tem,
+    em ordem cronológica. No contexto, as chaves remotas prevalecem.
+    """
+    known = {_message_key(m) for m in remote.messages}
+    merged = copy.deepcopy(remote)
+    merged.messages = sorted(
+        remote.messages
+        + [copy.deepcopy(m) for m in local.messages if _message_key(m) not in known],
+        key=lambda m: m.created_at,
+    )
+    merged.context = {**(local.context or {}), **(remote.context or {})} or None
+    merged.updated_at = max(remote.updated_at, local.updated_at)
+    return merged
+
+
+class DynamoDBSessionRepository(SessionRepository):
+    """
+    Sessões persistidas em DynamoDB com duas otimizações de latência:
+
+    - LRU em memória das sessões quentes, que sobrevive entre invocações "quentes"
+      da Lambda; cada entrada vale `cache_ttl_seconds`, limitando por quanto tempo
+      um turno gravado por outra instância pode ficar invisível aqui;
+    - write-behind: save_session só atualiza o LRU e agenda a escrita, feita em
+      lote por uma thread em segundo plano (gravações repetidas da mesma sessão
+      dentro da janela viram uma só).
+
+    Cada item carrega `version`; a escrita é condicional (só grava se a versão
+    no DynamoDB for menor). Em conflito, a versão vencedora é relida, o turno
+    local é mesclado a ela e a escrita é refeita (até `max_conflict_retries`).
+    O histórico é limitado a `max_messages` e o item expira via TTL (`expires_at`).
+    """
+
+    def __init__(
+        self,
+        table_name: str = "chatbot-sessions",
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        table: Any = None,
+        max_messages: int = 20,
+        ttl_seconds: int = 7 * 24 * 3600,
+        cache_size: int = 1024,
+        write_behind: bool = True,
+        flush_interval: float = 0.05,
+        cache_ttl_seconds: float = 30.0,
+        max_conflict_retries: int = 3,
+    ):
+        """
+        Args:
+            table: Objeto Table já construído (injeção para testes/stand-ins locais).
+            max_messages: Quantidade máxima de mensagens mantidas por sessão.
+            ttl_seconds: Tempo de vida da sessão sem atividade.
+            write_behind: Se False, grava de forma síncrona em save_session.
+            flush_interval: Janela (segundos) de acúmulo das escritas em lote.
+            cache_ttl_seconds: Validade de uma sessão no LRU antes de reler do DynamoDB.
+            max_conflict_retries: Tentativas de mesclar e regravar após conflito de versão.
+        """
+        self.table = table or get_client_factory().aws_resource(
+            "dynamodb", region_name=region_name, endpoint_url=endpoint_url
+        ).Table(table_name)
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_conflict_retries = max_conflict_retries
+
+        self._cache: "OrderedDict[str, Tuple[Session, float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._pending: Dict[str, Session] = {}
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._atexit_registered = False
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.conflicts = 0
+        self.merges = 0
+        self.errors = 0
+
+    def _cache_put(self, session: Session) -> None:
+        self._cache[session.session_id] = (
+            session,
+            time.time() + min(self.cache_ttl_seconds, self.ttl_seconds),
+        )
+        self._cache.move_to_end(session.session_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        with self._condition:
+            # Escrita ainda não enviada é a versão mais nova que esta instância conhece
+            pending = self._pending.get(session_id)
+            if pending is not None:
+                self.cache_hits += 1
+                return copy.deepcopy(pending)
+            cached = self._cache.get(session_id)
+            if cached is not None and cached[1] > time.time():
+                self._cache.move_to_end(session_id)
+                self.cache_hits += 1
+                return copy.deepcopy(cached[0])
+            self.cache_misses += 1
+
+        stored = self._read(session_id)
+        if stored is None:
+            return None
+
+        session, version = stored
+        with self._condition:
+            self._versions[session_id] = version
+            self._cache_put(session)
+        return copy.deepcopy(session)
+
+    def _read(self, session_id: str) -> Optional[Tuple[Session, int]]:
+        """GetItem consistente: (sessão, versão), ou None se ausente/expirada/erro."""
+        try:
+            item = self.table.get_item(
+                Key={"session_id": session_id}, ConsistentRead=True
+            ).get("Item")
+        except Exception as e:
+            logger.error(f"Erro ao ler sessão no DynamoDB: {str(e)}")
+            with self._condition:
+                self.errors += 1
+            return None
+
+        if not item or int(item.get("expires_at", 0)) <= int(time.time()):
+            return None
+        return _deserialize(item), int(item.get("version", 0))
+
+    def save_session(self, session: Session) -> None:
+        session = copy.deepcopy(session)
+        session.messages = session.messages[-self.max_messages :]
+        session.updated_at = datetime.now()
+
+        with self._condition:
+            self._cache_put(session)
+            if not self.write_behind:
+                self._pending.pop(session.session_id, None)
+            else:
+                if session.session_id in self._pending:
+                    self.coalesced += 1
+                self._pending[session.session_id] = session
+                self._ensure_writer()
+                self._condition.notify_all()
+                return
+
+        self._write(session)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="session-write-behind", daemon=True
+            )
+            self._writer.start()
+        if not self._atexit_registered:
+            atexit.register(self.flush, 5.0)
+            self._atexit_registered = True
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                # Janela curta para acumular escritas de outros turnos
+                self._condition.wait(timeout=self.flush_interval)
+                batch, self._pending = list(self._pending.values()), {}
+                self._in_flight = len(batch)
+
+            for session in batch:
+                self._write(session)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _write(self, session: Session) -> None:
+        """
+        PutItem condicional: só grava se a versão persistida for anterior.
+        Em conflito, mescla o turno local à versão vencedora e tenta de novo.
+        """
+        session_id = session.session_id
+        for _ in range(self.max_conflict_retries + 1):
+            with self._condition:
+                version = self._versions.get(session_id, 0) + 1
+            try:
+                self.table.put_item(
+                    Item=_serialize(
+                        session, version, int(time.time()) + self.ttl_seconds
+                    ),
+                    ConditionExpression="attribute_not_exists(session_id) OR #v < :v",
+                    ExpressionAttributeNames={"#v": "version"},
+                    ExpressionAttributeValues={":v": version},
+                )
+            except Exception as e:
+                code = getattr(e, "response", {}).get("Error", {}).get("Code")
+                if code != "ConditionalCheckFailedException":
+                    with self._condition:
+                        self.errors += 1
+                    logger.error(f"Erro ao gravar sessão no DynamoDB: {str(e)}")
+                    return
+                logger.warning(f"Conflito de versão na sessão {session_id}")
+                with self._condition:
+                    self.conflicts += 1
+                remote = self._read(session_id)
+                if remote is None:
+                    break
+                session = self._rebase(session, *remote)
+                continue
+
+            with self._condition:
+                self._versions[session_id] = version
+                self.writes += 1
+                if session_id not in self._pending:
+                    self._cache_put(session)
+            return
+
+        # Sem mesclar (leitura falhou ou conflitos seguidos): relê na próxima vez
+        with self._condition:
+            self.errors += 1
+            self._cache.pop(session_id, None)
+            self._versions.pop(session_id, None)
+        logger.error(f"Turno da sessão {session_id} não gravado após conflitos")
+
+    def _rebase(self, session: Session, remote: Session, version: int) -> Session:
+        """Mescla o turno local à versão remota; uma escrita pendente também."""
+        merged = _merge(remote, session)
+        merged.messages = merged.messages[-self.max_messages :]
+        with self._condition:
+            self.merges += 1
+            self._versions[session.session_id] = version
+            pending = self._pending.get(session.session_id)
+            if pending is not None:
+                # Gravada depois a partir da versão antiga: precisa dos turnos remotos
+                pending = _merge(merged, pending)
+                pending.messages = pending.messages[-self.max_messages :]
+                self._pending[session.session_id] = pending
+                self._cache_put(pending)
+            else:
+                self._cache_put(merged)
+        return merged
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda as escritas pendentes. Retorna False se o timeout expirar."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout=timeout
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cached_sessions": len(self._cache),
+                "pending_writes": len(self._pending) + self._in_flight,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "conflicts": self.conflicts,
+                "merges": self.merges,
+                "errors": self.errors,
+            }
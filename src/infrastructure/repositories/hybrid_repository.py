@@ -0,0 +1,119 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence
+
+from src.domain.entities.knowledge import RetrievedChunk
+from src.domain.interfaces.repositories import RankedContextRepository
+
+logger = logging.getLogger(__name__)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[RetrievedChunk]], k: int = 60
+) -> List[RetrievedChunk]:
+    """
+    Funde rankings por RRF: score(d) = soma de 1 / (k + posição de d em cada lista).
+    Não depende da escala dos scores originais (BM25 x similaridade de cosseno).
+    """
+    fused: Dict[str, float] = {}
+    chunks: Dict[str, RetrievedChunk] = {}
+    for ranking in rankings:
+        for position, chunk in enumerate(ranking, start=1):
+            fused[chunk.chunk_id] = fused.get(chunk.chunk_id, 0.0) + 1.0 / (
+                k + position
+            )
+            chunks.setdefault(chunk.chunk_id, chunk)
+
+    ordered = sorted(fused, key=fused.get, reverse=True)
+    return [
+        RetrievedChunk(
+            chunk_id=chunk_id,
+            text=chunks[chunk_id].text,
+            score=fused[chunk_id],
+            metadata=chunks[chunk_id].metadata,
+        )
+        for chunk_id in ordered
+    ]
+
+
+class HybridContextRepository(RankedContextRepository):
+    """
+    Recuperação híbrida: consulta os repositórios (ex: BM25 + vetorial) e
+    funde os resultados com reciprocal rank fusion. Os remotos (ex: OpenSearch)
+    vão para um pool e rodam em paralelo; os em processo (`in_process`, sub-ms)
+    rodam inline enquanto isso, pois uma thread custaria mais que a busca. A
+    latência fica limitada à do remoto mais lento (ou ao `timeout`).
+    """
+
+    def __init__(
+        self,
+        repositories: Sequence[RankedContextRepository],
+        top_k: int = 4,
+        candidates: int = 20,
+        rrf_k: int = 60,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            candidates: Quantos resultados pedir a cada recuperador antes da fusão.
+            timeout: Tempo máximo (segundos) de espera pelos remotos; os que não
+                responderem a tempo ficam de fora da fusão.
+        """
+        self.repositories = list(repositories)
+        self.top_k = top_k
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.timeout = timeout
+        remote = [repo for repo in self.repositories if not repo.in_process]
+        # Pool persistente, só para os remotos: evita criar threads a cada consulta
+        self._executor = (
+            ThreadPoolExecutor(
+                max_workers=2 * len(remote), thread_name_prefix="hybrid-search"
+            )
+            if remote
+            else None
+        )
+
+    def _search_inline(
+        self, repo: RankedContextRepository, query: str
+    ) -> Optional[List[RetrievedChunk]]:
+        try:
+            return repo.search(query, self.candidates)
+        except Exception as e:
+            logger.error(f"Erro em {type(repo).__name__}: {str(e)}")
+            return None
+
+    def search(self, query: str, top_k: int = None) -> List[RetrievedChunk]:
+        top_k = top_k or self.top_k
+        started = time.perf_counter()
+        # Remotos primeiro: a rede corre enquanto os em processo rodam aqui
+        futures = {
+            i: self._executor.submit(repo.search, query, self.candidates)
+            for i, repo in enumerate(self.repositories)
+            if not repo.in_process
+        }
+        results = {
+            i: self._search_inline(repo, query)
+            for i, repo in enumerate(self.repositories)
+            if repo.in_process
+        }
+
+        if futures:
+            timeout = self.timeout
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.perf_counter() - started))
+            done, _ = wait(futures.values(), timeout=timeout)
+            for i, future in futures.items():
+                repo_name = type(self.repositories[i]).__name__
+                if future not in done:
+                    logger.warning(f"{repo_name} excedeu o timeout; ignorado")
+                    continue
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"Erro em {repo_name}: {str(e)}")
+
+        # Mesma ordem dos repositórios: desempates do RRF não dependem de quem terminou antes
+        rankings = [results[i] for i in sorted(results) if results[i] is not None]
+        return reciprocal_rank_fusion(rankings, k=self.rrf_k)[:top_k]
@@ -0,0 +1,114 @@
+import copy
+import operator
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+_COMPARISONS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<>": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "=": operator.eq,
+}
+_FUNCTION_RE = re.compile(r"^(attribute_exists|attribute_not_exists)\((\S+)\)$")
+_COMPARISON_RE = re.compile(r"^(\S+)\s*(<=|>=|<>|<|>|=)\s*(\S+)$")
+
+
+class InMemoryDynamoDBTable:
+    """
+    Stand-in local (em memória) de uma Table do DynamoDB (boto3 resource) para
+    testes, benchmarks e desenvolvimento offline: get_item, put_item e
+    delete_item, com ConditionExpression simples (attribute_[not_]exists e
+    comparações unidas por AND/OR) e latência de rede simulada.
+    """
+
+    def __init__(self, key_name: str, latency_ms: float = 0.0):
+        self.key_name = key_name
+        self.latency_ms = latency_ms
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def _simulate_network(self, operation: str) -> None:
+        self.calls.append(operation)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    @staticmethod
+    def _resolve(token: str, names: Dict[str, str], values: Dict[str, Any]):
+        if token.startswith(":"):
+            return values[token]
+        return names.get(token, token)
+
+    def _check(
+        self,
+        current: Optional[Dict[str, Any]],
+        expression: str,
+        names: Dict[str, str],
+        values: Dict[str, Any],
+    ) -> bool:
+        item = current or {}
+        for alternative in re.split(r"\s+OR\s+", expression.strip()):
+            results = []
+            for clause in re.split(r"\s+AND\s+", alternative.strip()):
+                clause = clause.strip()
+                function = _FUNCTION_RE.match(clause)
+                if function:
+                    exists = self._resolve(function.group(2), names, values) in item
+                    results.append(exists == (function.group(1) == "attribute_exists"))
+                    continue
+                left, op, right = _COMPARISON_RE.match(clause).groups()
+                attribute = self._resolve(left, names, values)
+                results.append(
+                    attribute in item
+                    and _COMPARISONS[op](item[attribute], values[right])
+                )
+            if all(results):
+                return True
+        return False
+
+    def get_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._simulate_network("get_item")
+        with self._lock:
+            item = self.items.get(Key[self.key_name])
+            return {"Item": copy.deepcopy(item)} if item else {}
+
+    def put_item(
+        self,
+        Item: Dict[str, Any],
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        self._simulate_network("put_item")
+        with self._lock:
+            key = Item[self.key_name]
+            if ConditionExpression and not self._check(
+                self.items.get(key),
+                ConditionExpression,
+                ExpressionAttributeNames or {},
+                ExpressionAttributeValues or {},
+            ):
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ConditionalCheckFailedException",
+                            "Message": "The conditional request failed",
+                        }
+                    },
+                    "PutItem",
+                )
+            self.items[key] = copy.deepcopy(Item)
+        return {}
+
+    def delete_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._simulate_network("delete_item")
+        with self._lock:
+            self.items.pop(Key[self.key_name], None)
+        return {}
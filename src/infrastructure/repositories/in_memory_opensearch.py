@@ -0,0 +1,144 @@
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from opensearchpy.serializer import JSONSerializer
+
+
+class _InMemoryIndices:
+    def __init__(self, owner: "InMemoryOpenSearchClient"):
+        self._owner = owner
+
+    def exists(self, index: str, **kwargs) -> bool:
+        return index in self._owner.indices_store
+
+    def create(self, index: str, body: Optional[Dict[str, Any]] = None, **kwargs):
+        self._owner.indices_store[index] = {"body": body or {}, "docs": {}}
+        return {"acknowledged": True, "index": index}
+
+    def delete(self, index: str, **kwargs):
+        self._owner.indices_store.pop(index, None)
+        return {"acknowledged": True}
+
+    def refresh(self, index: str = None, **kwargs):
+        return {}
+
+
+class InMemoryOpenSearchClient:
+    """
+    Stand-in local (em memória) do cliente OpenSearch para testes, benchmarks e
+    desenvolvimento offline. Implementa o subconjunto usado pelo projeto:
+    indices.exists/create, index, delete, bulk e search com consulta k-NN
+    (força bruta, score no padrão cosinesimil do nmslib).
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        """
+        Args:
+            latency_ms: Latência artificial por chamada (simula a ida e volta na rede).
+        """
+        self.latency_ms = latency_ms
+        self.indices_store: Dict[str, Dict[str, Any]] = {}
+        self.indices = _InMemoryIndices(self)
+        # opensearchpy.helpers.bulk serializa as ações com o serializer do transport
+        self.transport = SimpleNamespace(serializer=JSONSerializer())
+        self.calls: List[str] = []
+        self._matrix_cache: Dict[tuple, tuple] = {}
+        self._writes = 0
+
+    def _simulate_network(self, operation: str) -> None:
+        self.calls.append(operation)
+        if operation != "search":
+            self._writes += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _docs(self, index: str) -> Dict[str, Dict[str, Any]]:
+        if index not in self.indices_store:
+            self.indices.create(index)
+        return self.indices_store[index]["docs"]
+
+    def index(self, index: str, body: Dict[str, Any], id: str = None, **kwargs):
+        self._simulate_network("index")
+        self._docs(index)[id] = dict(body)
+        return {"_id": id, "result": "created"}
+
+    def delete(self, index: str, id: str, **kwargs):
+        self._simulate_network("delete")
+        self._docs(index).pop(id, None)
+        return {"_id": id, "result": "deleted"}
+
+    def bulk(self, body: Any, index: str = None, **kwargs):
+        """Aceita o corpo NDJSON gerado por opensearchpy.helpers.bulk."""
+        self._simulate_network("bulk")
+        if isinstance(body, (bytes, str)):
+            text = body.decode("utf-8") if isinstance(body, bytes) else body
+            lines = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            lines = list(body)
+
+        items = []
+        i = 0
+        while i < len(lines):
+            action, meta = next(iter(lines[i].items()))
+            target = meta.get("_index", index)
+            if action == "delete":
+                self._docs(target).pop(meta["_id"], None)
+                i += 1
+            else:
+                self._docs(target)[meta["_id"]] = dict(lines[i + 1])
+                i += 2
+            items.append({action: {"_id": meta["_id"], "status": 200}})
+        return {"errors": False, "items": items}
+
+    def _matrix(self, index: str, field: str):
+        """Matriz normalizada dos vetores do índice (recalculada após escritas)."""
+        docs = self._docs(index)
+        cached = self._matrix_cache.get((index, field))
+        if cached is None or cached[0] != len(docs) or cached[3] != self._writes:
+            ids = list(docs)
+            matrix = np.asarray([docs[i][field] for i in ids], dtype=np.float32)
+            if len(ids):
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms == 0, 1.0, norms)
+            cached = (len(docs), ids, matrix, self._writes)
+            self._matrix_cache[(index, field)] = cached
+        return cached[1], cached[2]
+
+    def search(self, index: str, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._simulate_network("search")
+        docs = self._docs(index)
+        knn = body["query"]["knn"]
+        field, params = next(iter(knn.items()))
+        query = np.asarray(params["vector"], dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        ids, matrix = self._matrix(index, field)
+        if not ids:
+            return {"hits": {"hits": []}}
+
+        scores = 1.0 / (2.0 - matrix @ query)
+        size = min(params["k"], body["size"])
+        ranked = np.argsort(-scores)[:size]
+        source_fields = body.get("_source")
+
+        hits = []
+        for position in ranked.tolist():
+            score = float(scores[position])
+            if score < body.get("min_score", 0.0):
+                continue
+            doc = docs[ids[position]]
+            hits.append(
+                {
+                    "_id": ids[position],
+                    "_score": score,
+                    "_source": {
+                        k: v
+                        for k, v in doc.items()
+                        if source_fields is None or k in source_fields
+                    },
+                }
+            )
+        return {"hits": {"hits": hits}}
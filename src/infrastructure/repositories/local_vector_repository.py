@@ -0,0 +1,238 @@
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities.knowledge import DocumentChunk, RetrievedChunk
+from src.domain.interfaces.repositories import (
+    EmbeddingProvider,
+    RankedContextRepository,
+    VectorStoreWriter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def save_vector_index(
+    path: str,
+    ids: Sequence[str],
+    texts: Sequence[str],
+    embeddings: np.ndarray,
+    sources: Optional[Sequence[str]] = None,
+) -> None:
+    """
+    Grava o índice pré-computado (.npz) lido por LocalVectorContextRepository.
+    """
+    np.savez(
+        path,
+        ids=np.asarray(ids, dtype=str),
+        texts=np.asarray(texts, dtype=str),
+        sources=np.asarray(
+            sources if sources is not None else [""] * len(ids), dtype=str
+        ),
+        embeddings=np.asarray(embeddings, dtype=np.float32),
+    )
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos k maiores scores (argpartition + ordenação só dos k)."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class IVFIndex:
+    """
+    Índice aproximado IVF (inverted file): k-means agrupa os vetores em `n_lists`
+    listas; a busca visita apenas as `n_probe` listas mais próximas da consulta.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 4,
+        iterations: int = 10,
+        seed: int = 42,
+    ):
+        self.embeddings = embeddings
+        self.n_lists = n_lists or max(1, int(np.sqrt(embeddings.shape[0])))
+        self.n_probe = min(n_probe, self.n_lists)
+
+        rng = np.random.default_rng(seed)
+        initial = rng.choice(embeddings.shape[0], self.n_lists, replace=False)
+        centroids = embeddings[initial].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(embeddings @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = embeddings[assignments == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+
+        self.centroids = centroids
+        assignments = np.argmax(embeddings @ centroids.T, axis=1)
+        self.lists = [np.flatnonzero(assignments == c) for c in range(self.n_lists)]
+
+    def search(self, query: np.ndarray, k: int):
+        probes = _top_k(self.centroids @ query, self.n_probe)
+        candidates = np.concatenate([self.lists[p] for p in probes])
+        scores = self.embeddings[candidates] @ query
+        best = _top_k(scores, k)
+        return candidates[best], scores[best]
+
+
+class LocalVectorContextRepository(RankedContextRepository):
+    """
+    Recuperação de contexto em processo: a matriz de embeddings pré-computada
+    fica em memória (NumPy) e o top-k é um produto matricial vetorizado, sem
+    ida e volta na rede. Para corpora maiores, usa opcionalmente o IVFIndex.
+    """
+
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        embeddings: np.ndarray,
+        sources: Optional[Sequence[str]] = None,
+        top_k: int = 4,
+        min_score: Optional[float] = None,
+        approximate: Optional[bool] = None,
+        approximate_threshold: int = 20000,
+        n_probe: int = 4,
+    ):
+        """
+        Args:
+            approximate: Força (True) ou desliga (False) o índice IVF. Se None,
+                ativa automaticamente a partir de `approximate_threshold` vetores.
+        """
+        self.embedding_provider = embedding_provider
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.sources = list(sources) if sources is not None else None
+        self.embeddings = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        self.top_k = top_k
+        self.min_score = min_score
+
+        if approximate is None:
+            approximate = len(self.ids) >= approximate_threshold
+        self.ann_index = (
+            IVFIndex(self.embeddings, n_probe=n_probe)
+            if approximate and len(self.ids)
+            else None
+        )
+
+    @property
+    def in_process(self) -> bool:
+        # A busca é local; o embedding da consulta pode ir à rede (ex: Bedrock)
+        return self.embedding_provider.in_process
+
+    @classmethod
+    def from_file(
+        cls, path: str, embedding_provider: EmbeddingProvider, **kwargs
+    ) -> "LocalVectorContextRepository":
+        """Carrega o índice gravado por save_vector_index."""
+        data = np.load(path, allow_pickle=False)
+        logger.info(
+            f"Índice vetorial local carregado: {path} ({data['embeddings'].shape})"
+        )
+        return cls(
+            embedding_provider,
+            ids=data["ids"].tolist(),
+            texts=data["texts"].tolist(),
+            embeddings=data["embeddings"],
+            sources=data["sources"].tolist() if "sources" in data.files else None,
+            **kwargs,
+        )
+
+    def search(
+        self, query: str, top_k: int = None, min_score: Optional[float] = None
+    ) -> List[RetrievedChunk]:
+        top_k = top_k or self.top_k
+        min_score = self.min_score if min_score is None else min_score
+        if not self.ids:
+            return []
+
+        vector = np.asarray(self.embedding_provider.embed([query])[0], dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) or 1.0)
+
+        if self.ann_index is not None:
+            indices, scores = self.ann_index.search(vector, top_k)
+        else:
+            all_scores = self.embeddings @ vector
+            indices = _top_k(all_scores, top_k)
+            scores = all_scores[indices]
+
+        chunks = []
+        for idx, score in zip(indices.tolist(), scores.tolist()):
+            if min_score is not None and score < min_score:
+                continue
+            chunks.append(
+                RetrievedChunk(
+                    chunk_id=self.ids[idx],
+                    text=self.texts[idx],
+                    score=float(score),
+                    metadata={"source": self.sources[idx]} if self.sources else None,
+                )
+            )
+        return chunks
+
+
+class LocalVectorStoreWriter(VectorStoreWriter):
+    """
+    Mantém o arquivo .npz do índice local: aplica upserts/deletes em memória e
+    regrava o arquivo uma única vez em flush().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._rows: Dict[str, Tuple[str, str, np.ndarray]] = {}
+        if os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            for chunk_id, text, source, vector in zip(
+                data["ids"].tolist(),
+                data["texts"].tolist(),
+                data["sources"].tolist(),
+                data["embeddings"],
+            ):
+                self._rows[chunk_id] = (text, source, vector)
+
+    def upsert(
+        self, chunks: List[DocumentChunk], vectors: Sequence[Sequence[float]]
+    ) -> List[str]:
+        for chunk, vector in zip(chunks, vectors):
+            self._rows[chunk.chunk_id] = (
+                chunk.text,
+                chunk.source,
+                np.asarray(vector, dtype=np.float32),
+            )
+        return []
+
+    def delete(self, chunk_ids: List[str]) -> None:
+        for chunk_id in chunk_ids:
+            self._rows.pop(chunk_id, None)
+
+    def flush(self) -> None:
+        ids = list(self._rows)
+        embeddings = (
+            np.stack([self._rows[i][2] for i in ids])
+            if ids
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        save_vector_index(
+            self.path,
+            ids,
+            [self._rows[i][0] for i in ids],
+            embeddings,
+            [self._rows[i][1] for i in ids],
+        )
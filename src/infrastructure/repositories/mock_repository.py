@@ -0,0 +1,17 @@
+import logging
+
+from src.domain.interfaces.repositories import ContextRepository
+
+
+class MockOpenSearchRepository(ContextRepository):
+    """
+    Contexto fixo para testes e desenvolvimento (sem opensearch-py/boto3:
+    importá-lo não pesa no cold start).
+    """
+
+    def retrieve_context(self, query: str) -> str:
+        logging.info(f"Mock retrieving context for: {query}")
+        return "Este é um contexto simulado sobre TDAH para testes."
+
+    async def aretrieve_context(self, query: str) -> str:
+        return self.retrieve_context(query)
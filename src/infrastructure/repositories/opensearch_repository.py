@@ -1,9 +1,277 @@
 import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
 
-from src.domain.interfaces.repositories import ContextRepository
+from opensearchpy import (
+    OpenSearch,
+    Urllib3AWSV4SignerAuth,
+    Urllib3HttpConnection,
+    helpers,
+)
 
+from src.domain.entities.knowledge import DocumentChunk, RetrievedChunk
+from src.domain.interfaces.repositories import (
+    EmbeddingProvider,
+    RankedContextRepository,
+    VectorStoreWriter,
+)
+from src.infrastructure.client_factory import get_client_factory
+from src.infrastructure.repositories.mock_repository import (  # noqa: F401
+    MockOpenSearchRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Clientes reutilizados entre invocações "quentes" (um pool keep-alive por endpoint)
+_CLIENTS: Dict[tuple, OpenSearch] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_opensearch_client(
+    host: str,
+    port: int = 443,
+    region_name: str = "us-east-1",
+    service: str = "aoss",
+    http_auth: Optional[tuple] = None,
+    use_ssl: bool = True,
+    pool_maxsize: int = 10,
+    timeout: float = 2.0,
+) -> OpenSearch:
+    """
+    Retorna um cliente OpenSearch com pool de conexões keep-alive, criado uma
+    única vez por endpoint. Sem `http_auth`, assina as requisições com SigV4
+    (OpenSearch Serverless usa o serviço "aoss").
+    """
+    key = (host, port, service, http_auth, use_ssl)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            auth = http_auth or Urllib3AWSV4SignerAuth(
+                get_client_factory().aws_credentials(), region_name, service
+            )
+            client = OpenSearch(
+                hosts=[{"host": host, "port": port}],
+                http_auth=auth,
+                use_ssl=use_ssl,
+                verify_certs=use_ssl and not os.getenv("IS_LOCAL"),
+                ssl_show_warn=False,
+                connection_class=Urllib3HttpConnection,
+                pool_maxsize=pool_maxsize,
+                timeout=timeout,
+                http_compress=True,
+            )
+            _CLIENTS[key] = client
+            logger.info(f"Cliente OpenSearch criado para {host}:{port}")
+        return client
+
+
+def build_knn_index_body(
+    dimension: int,
+    vector_field: str = "embedding",
+    text_field: str = "text",
+    engine: str = "nmslib",
+    space_type: str = "cosinesimil",
+    ef_construction: int = 128,
+    m: int = 16,
+    ef_search: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Mapping do índice vetorial (HNSW). `m` e `ef_construction` controlam o grafo
+    (qualidade x memória/tempo de indexação); `ef_search` a precisão da busca.
+    """
+    settings: Dict[str, Any] = {"index": {"knn": True}}
+    if ef_search:
+        settings["index"]["knn.algo_param.ef_search"] = ef_search
+
+    return {
+        "settings": settings,
+        "mappings": {
+            "properties": {
+                text_field: {"type": "text"},
+                "source": {"type": "keyword"},
+                "content_hash": {"type": "keyword"},
+                vector_field: {
+                    "type": "knn_vector",
+                    "dimension": dimension,
+                    "method": {
+                        "name": "hnsw",
+                        "engine": engine,
+                        "space_type": space_type,
+                        "parameters": {"ef_construction": ef_construction, "m": m},
+                    },
+                },
+            }
+        },
+    }
+
+
+class OpenSearchContextRepository(RankedContextRepository):
+    """
+    Recuperação de contexto (RAG) via consulta k-NN no OpenSearch.
+    Retorna apenas o texto dos chunks (projeção de campos + filter_path).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        embedding_provider: EmbeddingProvider,
+        index_name: str = "kb-chunks",
+        top_k: int = 4,
+        min_score: Optional[float] = None,
+        timeout: float = 1.5,
+        vector_field: str = "embedding",
+        text_field: str = "text",
+        source_fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            client: Cliente OpenSearch (ou stand-in com a mesma interface).
+            min_score: Descarta resultados abaixo desse score.
+            timeout: Timeout por chamada (segundos).
+            source_fields: Campos do _source devolvidos (padrão: somente o texto).
+        """
+        self.client = client
+        self.embedding_provider = embedding_provider
+        self.index_name = index_name
+        self.top_k = top_k
+        self.min_score = min_score
+        self.timeout = timeout
+        self.vector_field = vector_field
+        self.text_field = text_field
+        self.source_fields = list(source_fields or [text_field])
+
+    def ensure_index(self, dimension: int, **hnsw_params) -> bool:
+        """Cria o índice k-NN caso não exista. Retorna True se criou."""
+        if self.client.indices.exists(index=self.index_name):
+            return False
+
+        self.client.indices.create(
+            index=self.index_name,
+            body=build_knn_index_body(
+                dimension,
+                vector_field=self.vector_field,
+                text_field=self.text_field,
+                **hnsw_params,
+            ),
+        )
+        logger.info(f"Índice k-NN criado: {self.index_name} (dim={dimension})")
+        return True
+
+    def build_query(
+        self, vector: Sequence[float], top_k: int, min_score: Optional[float]
+    ) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "size": top_k,
+            "_source": self.source_fields,
+            "query": {"knn": {self.vector_field: {"vector": list(vector), "k": top_k}}},
+        }
+        if min_score is not None:
+            body["min_score"] = min_score
+        return body
+
+    def search(
+        self,
+        query: str,
+        top_k: int = None,
+        min_score: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RetrievedChunk]:
+        top_k = top_k or self.top_k
+        min_score = self.min_score if min_score is None else min_score
+
+        vector = [float(v) for v in self.embedding_provider.embed([query])[0]]
+        response = self.client.search(
+            index=self.index_name,
+            body=self.build_query(vector, top_k, min_score),
+            request_timeout=timeout or self.timeout,
+            filter_path=["hits.hits._id", "hits.hits._score", "hits.hits._source"],
+        )
+
+        chunks = []
+        for hit in response.get("hits", {}).get("hits", []):
+            source = hit.get("_source", {})
+            chunks.append(
+                RetrievedChunk(
+                    chunk_id=hit.get("_id"),
+                    text=source.get(self.text_field, ""),
+                    score=float(hit.get("_score", 0.0)),
+                    metadata={k: v for k, v in source.items() if k != self.text_field}
+                    or None,
+                )
+            )
+        return chunks
 
-class MockOpenSearchRepository(ContextRepository):
     def retrieve_context(self, query: str) -> str:
-        logging.info(f"Mock retrieving context for: {query}")
-        return "Este é um contexto simulado sobre TDAH para testes."
+        try:
+            return super().retrieve_context(query)
+        except Exception as e:
+            logger.error(f"Erro ao consultar OpenSearch: {str(e)}")
+            return ""
+
+
+class OpenSearchVectorStoreWriter(VectorStoreWriter):
+    """
+    Escrita de chunks no índice k-NN via Bulk API (lotes de `batch_size` ações).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        index_name: str = "kb-chunks",
+        batch_size: int = 500,
+        vector_field: str = "embedding",
+        text_field: str = "text",
+        timeout: float = 60.0,
+    ):
+        self.client = client
+        self.index_name = index_name
+        self.batch_size = batch_size
+        self.vector_field = vector_field
+        self.text_field = text_field
+        self.timeout = timeout
+
+    def _bulk(self, actions: List[Dict[str, Any]]) -> List[str]:
+        """Executa as ações; devolve os ids dos documentos que falharam."""
+        if not actions:
+            return []
+        success, errors = helpers.bulk(
+            self.client,
+            actions,
+            chunk_size=self.batch_size,
+            raise_on_error=False,
+            request_timeout=self.timeout,
+        )
+        if not errors:
+            return []
+        logger.warning(f"Bulk com {len(errors)} falhas (sucesso: {success}).")
+        # Cada item de erro: {"index" | "delete": {"_id", "status", "error"}}
+        return [next(iter(item.values())).get("_id") for item in errors]
+
+    def upsert(
+        self, chunks: List[DocumentChunk], vectors: Sequence[Sequence[float]]
+    ) -> List[str]:
+        return self._bulk(
+            [
+                {
+                    "_op_type": "index",
+                    "_index": self.index_name,
+                    "_id": chunk.chunk_id,
+                    "_source": {
+                        self.text_field: chunk.text,
+                        "source": chunk.source,
+                        "content_hash": chunk.chunk_id,
+                        self.vector_field: [float(v) for v in vector],
+                    },
+                }
+                for chunk, vector in zip(chunks, vectors)
+            ]
+        )
+
+    def delete(self, chunk_ids: List[str]) -> None:
+        self._bulk(
+            [
+                {"_op_type": "delete", "_index": self.index_name, "_id": chunk_id}
+                for chunk_id in chunk_ids
+            ]
+        )
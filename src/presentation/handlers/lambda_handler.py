@@ -1,23 +1,611 @@
+import asyncio
 import json
 import logging
-from typing import Any, Dict
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from src.application.dtos.message_dto import ProcessMessageInput
+from src.application.dtos.message_dto import ProcessMessageInput, ProcessMessageOutput
+from src.application.services.context_compressor import ContextCompressor
+from src.application.services.fallback_responder import (
+    CannedResponse,
+    FallbackResponder,
+    load_canned_responses,
+)
+from src.application.services.history_compactor import HistoryCompactor
+from src.application.services.intent_matcher import IntentMatcher
+from src.application.services.output_safety import OutputSafetyGuard
+from src.application.services.precomputed_answers import PrecomputedAnswerStore
 from src.application.use_cases.process_message import ProcessUserMessage
-from src.infrastructure.llm.bedrock_adapter import BedrockLLM
-from src.infrastructure.repositories.opensearch_repository import (
-    MockOpenSearchRepository,
+from src.domain.entities.deadline import Deadline
+from src.domain.interfaces.repositories import (
+    ContextRepository,
+    EmbeddingProvider,
+    LLMProvider,
+    ResponseCache,
+    SemanticCache,
+    SessionRepository,
+)
+from src.infrastructure.cache.response_cache import (
+    DynamoDBResponseCache,
+    InMemoryResponseCache,
+    TieredResponseCache,
+)
+from src.infrastructure.llm.hedged_provider import HedgedLLMProvider
+from src.infrastructure.llm.provider_registry import LazyLLMProvider, ProviderRegistry
+from src.infrastructure.llm.resilient_provider import (
+    CircuitBreaker,
+    ResilientLLMProvider,
 )
+from src.infrastructure.llm.routing_provider import RoutingLLMProvider
+from src.infrastructure.repositories.mock_repository import MockOpenSearchRepository
+from src.utils.safety_filters import RISK_DETECTOR
+
+# Backends opcionais (boto3, opensearch-py, SDKs de LLM) e os que dependem do
+# NumPy (índices locais, embeddings por hashing, cache semântico) são importados
+# dentro dos _build_* apenas quando configurados: menos tempo de import no cold start.
 
 # Configuração de Logs
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+
+def _build_response_cache() -> Optional[ResponseCache]:
+    """
+    Seleciona o backend do cache de respostas via RESPONSE_CACHE_BACKEND
+    (memory | dynamodb | tiered | none).
+    """
+    backend = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+    if backend == "none":
+        return None
+
+    ttl_seconds = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    memory_cache = InMemoryResponseCache(
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=ttl_seconds,
+    )
+    if backend == "memory":
+        return memory_cache
+
+    dynamodb_cache = DynamoDBResponseCache(
+        table_name=os.getenv("RESPONSE_CACHE_TABLE", "chatbot-response-cache"),
+        ttl_seconds=ttl_seconds,
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        endpoint_url=os.getenv("DYNAMODB_ENDPOINT_URL"),
+    )
+    if backend == "dynamodb":
+        return dynamodb_cache
+    return TieredResponseCache(memory_cache, dynamodb_cache)
+
+
+_embedding_provider: Optional[EmbeddingProvider] = None
+
+
+def _get_embedding_provider() -> EmbeddingProvider:
+    """
+    Provedor de embeddings compartilhado (EMBEDDING_PROVIDER = bedrock | hashing),
+    criado uma única vez.
+    """
+    global _embedding_provider
+    if _embedding_provider is None:
+        if os.getenv("EMBEDDING_PROVIDER", "bedrock").lower() == "hashing":
+            from src.infrastructure.embeddings.hashing_embeddings import (
+                HashingEmbeddings,
+            )
+
+            _embedding_provider = HashingEmbeddings()
+        else:
+            from src.infrastructure.embeddings.bedrock_embeddings import (
+                BedrockEmbeddings,
+            )
+
+            _embedding_provider = BedrockEmbeddings(
+                region_name=os.getenv("AWS_REGION", "us-east-1")
+            )
+    return _embedding_provider
+
+
+def _build_context_repository(backend: Optional[str] = None) -> ContextRepository:
+    """
+    Seleciona o repositório de contexto via CONTEXT_REPOSITORY
+    (mock | opensearch | local | bm25 | hybrid).
+    """
+    backend = backend or os.getenv("CONTEXT_REPOSITORY", "mock").lower()
+    if backend in ("bm25", "hybrid"):
+        from src.infrastructure.repositories.bm25_repository import (
+            BM25ContextRepository,
+        )
+        from src.infrastructure.repositories.hybrid_repository import (
+            HybridContextRepository,
+        )
+
+        top_k = int(os.getenv("LOCAL_VECTOR_TOP_K", "4"))
+        lexical = BM25ContextRepository.from_file(
+            os.getenv("LOCAL_VECTOR_INDEX_PATH", "data/kb_index.npz"), top_k=top_k
+        )
+        if backend == "bm25":
+            return lexical
+        timeout = os.getenv("HYBRID_TIMEOUT_SECONDS")
+        return HybridContextRepository(
+            [
+                lexical,
+                _build_context_repository(
+                    os.getenv("HYBRID_VECTOR_REPOSITORY", "local").lower()
+                ),
+            ],
+            top_k=top_k,
+            timeout=float(timeout) if timeout else None,
+        )
+    if backend == "local":
+        from src.infrastructure.repositories.local_vector_repository import (
+            LocalVectorContextRepository,
+        )
+
+        approximate = os.getenv("LOCAL_VECTOR_APPROXIMATE")
+        return LocalVectorContextRepository.from_file(
+            os.getenv("LOCAL_VECTOR_INDEX_PATH", "data/kb_index.npz"),
+            _get_embedding_provider(),
+            top_k=int(os.getenv("LOCAL_VECTOR_TOP_K", "4")),
+            approximate=approximate.lower() == "true" if approximate else None,
+        )
+    if backend != "opensearch":
+        return MockOpenSearchRepository()
+
+    from src.infrastructure.repositories.opensearch_repository import (
+        OpenSearchContextRepository,
+        get_opensearch_client,
+    )
+
+    username = os.getenv("OPENSEARCH_USER") or os.getenv("OPENSEARCH_USERNAME")
+    client = get_opensearch_client(
+        host=os.getenv("OPENSEARCH_HOST", "localhost"),
+        port=int(os.getenv("OPENSEARCH_PORT", "443")),
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        http_auth=(username, os.getenv("OPENSEARCH_PASSWORD")) if username else None,
+        use_ssl=os.getenv("OPENSEARCH_USE_SSL", "true").lower() == "true",
+        pool_maxsize=int(os.getenv("OPENSEARCH_POOL_MAXSIZE", "10")),
+    )
+    min_score = os.getenv("OPENSEARCH_MIN_SCORE")
+    return OpenSearchContextRepository(
+        client,
+        _get_embedding_provider(),
+        index_name=os.getenv("OPENSEARCH_INDEX", "kb-chunks"),
+        top_k=int(os.getenv("OPENSEARCH_TOP_K", "4")),
+        min_score=float(min_score) if min_score else None,
+        timeout=float(os.getenv("OPENSEARCH_TIMEOUT_SECONDS", "1.5")),
+    )
+
+
+def _build_semantic_cache() -> Optional[SemanticCache]:
+    """Cache semântico opcional (SEMANTIC_CACHE_ENABLED=true)."""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() != "true":
+        return None
+
+    from src.infrastructure.cache.semantic_cache import InMemorySemanticCache
+
+    return InMemorySemanticCache(
+        _get_embedding_provider(),
+        similarity_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512")),
+        ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600")),
+    )
+
+
+def _build_context_compressor() -> Optional[ContextCompressor]:
+    """
+    Compressão do contexto RAG por orçamento de tokens (CONTEXT_COMPRESSION_ENABLED).
+    CONTEXT_TOKEN_BUDGETS define orçamentos por modelo: "modelo=tokens,modelo=tokens".
+    """
+    if os.getenv("CONTEXT_COMPRESSION_ENABLED", "true").lower() != "true":
+        return None
+
+    budgets = {}
+    for item in os.getenv("CONTEXT_TOKEN_BUDGETS", "").split(","):
+        model_id, _, budget = item.strip().rpartition("=")
+        if model_id and budget:
+            budgets[model_id] = int(budget)
+    return ContextCompressor(
+        default_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200")),
+        budgets=budgets,
+    )
+
+
+def _build_session_repository() -> Optional[SessionRepository]:
+    """
+    Histórico de conversas via SESSION_STORE (dynamodb | memory | none).
+    "memory" usa o stand-in local do DynamoDB (desenvolvimento/benchmarks).
+    """
+    backend = os.getenv("SESSION_STORE", "none").lower()
+    if backend not in ("dynamodb", "memory"):
+        return None
+
+    from src.infrastructure.repositories.dynamodb_session_repository import (
+        DynamoDBSessionRepository,
+    )
+    from src.infrastructure.repositories.in_memory_dynamodb import InMemoryDynamoDBTable
+
+    return DynamoDBSessionRepository(
+        table_name=os.getenv("SESSION_TABLE", "chatbot-sessions"),
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        endpoint_url=os.getenv("DYNAMODB_ENDPOINT_URL") or None,
+        table=InMemoryDynamoDBTable("session_id") if backend == "memory" else None,
+        max_messages=int(os.getenv("SESSION_MAX_MESSAGES", "20")),
+        ttl_seconds=int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600))),
+        cache_size=int(os.getenv("SESSION_CACHE_SIZE", "1024")),
+        cache_ttl_seconds=float(os.getenv("SESSION_CACHE_TTL_SECONDS", "30")),
+    )
+
+
+def _build_history_compactor(
+    summarizer: LLMProvider, session_repo: Optional[SessionRepository]
+) -> Optional[HistoryCompactor]:
+    """Histórico compactado nos prompts (requer SESSION_STORE configurado)."""
+    if (
+        session_repo is None
+        or os.getenv("HISTORY_COMPACTION_ENABLED", "true").lower() != "true"
+    ):
+        return None
+
+    return HistoryCompactor(
+        summarizer,
+        session_repo,
+        keep_turns=int(os.getenv("HISTORY_KEEP_TURNS", "4")),
+        compact_every=int(os.getenv("HISTORY_COMPACT_EVERY", "4")),
+        max_summary_words=int(os.getenv("HISTORY_SUMMARY_MAX_WORDS", "150")),
+        timeout=float(os.getenv("HISTORY_COMPACTION_TIMEOUT", "1")),
+        budget_share=float(os.getenv("HISTORY_COMPACTION_BUDGET_SHARE", "0.25")),
+        answer_seconds=float(os.getenv("HISTORY_ANSWER_SECONDS", "2.5")),
+    )
+
+
+# Provedores com retry/circuit breaker, por nome (métricas em llm_resilience_stats)
+LLM_BREAKERS: Dict[str, ResilientLLMProvider] = {}
+
+
+# Adapters por nome: o SDK do provedor só é importado no primeiro uso e a
+# instância (com seus clientes) é reutilizada nas invocações "quentes"
+LLM_REGISTRY = ProviderRegistry()
+
+
+def _create_adapter(name: str) -> LLMProvider:
+    return LLM_REGISTRY.get(name)
+
+
+def _create_llm(name: str) -> LLMProvider:
+    """
+    Adapter envolvido por retry com jitter e circuit breaker próprio
+    (LLM_RESILIENCE_ENABLED=false devolve o adapter puro). Um único breaker
+    por provedor: membro do roteador e hedge compartilham o mesmo estado.
+    """
+    if os.getenv("LLM_RESILIENCE_ENABLED", "true").lower() != "true":
+        return _create_adapter(name)
+    provider = LLM_BREAKERS.get(name)
+    if provider is not None:
+        return provider
+    provider = ResilientLLMProvider(
+        _create_adapter(name),
+        name=name,
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+        ),
+    )
+    LLM_BREAKERS[name] = provider
+    return provider
+
+
+def llm_resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Estado dos circuit breakers e contadores de retry por provedor."""
+    return {name: provider.stats() for name, provider in LLM_BREAKERS.items()}
+
+
+def _build_llm_provider() -> LLMProvider:
+    """
+    Provedor único via LLM_PROVIDER; LLM_ROUTER_PROVIDERS="bedrock,openai,gemini"
+    ativa o roteamento por latência entre eles (pesos em LLM_ROUTER_WEIGHTS).
+    """
+    names = [
+        n.strip().lower()
+        for n in os.getenv("LLM_ROUTER_PROVIDERS", "").split(",")
+        if n.strip()
+    ]
+    if len(names) < 2:
+        return _create_llm(
+            names[0] if names else os.getenv("LLM_PROVIDER", "bedrock").lower()
+        )
+
+    weights = {}
+    for item in os.getenv("LLM_ROUTER_WEIGHTS", "").split(","):
+        name, _, weight = item.strip().rpartition("=")
+        if name and weight:
+            weights[name.lower()] = float(weight)
+    return RoutingLLMProvider(
+        {name: _create_llm(name) for name in names},
+        weights=weights,
+        cooldown_seconds=float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30")),
+    )
+
+
+def _with_hedge(provider: LLMProvider) -> LLMProvider:
+    """
+    LLM_HEDGE_PROVIDER: provedor secundário disparado quando o principal passa
+    do percentil LLM_HEDGE_PERCENTILE das suas latências recentes.
+    """
+    hedge = os.getenv("LLM_HEDGE_PROVIDER", "").strip().lower()
+    if not hedge:
+        return provider
+    return HedgedLLMProvider(
+        provider,
+        _create_llm(hedge),
+        hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.9")),
+        initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY_SECONDS", "1.5")),
+    )
+
+
+def _load_canned_responses() -> List[CannedResponse]:
+    """Respostas prontas dos intents do Dialogflow (FALLBACK_INTENTS_PATH)."""
+    path = os.getenv(
+        "FALLBACK_INTENTS_PATH",
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "..",
+            "dialogflow",
+            "data",
+            "initial_config.json",
+        ),
+    )
+    try:
+        return load_canned_responses(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Respostas prontas indisponíveis ({path}): {str(e)}")
+        return []
+
+
+def _build_fallback_responder(
+    intent_matcher: Optional[IntentMatcher],
+) -> FallbackResponder:
+    """Resposta degradada: respostas prontas dos intents + contexto."""
+    return FallbackResponder(intent_matcher=intent_matcher)
+
+
+def _build_intent_matcher(
+    canned_responses: List[CannedResponse],
+) -> Optional[IntentMatcher]:
+    """
+    Classificador de intents (INTENT_MIN_SCORE), um só para o caminho rápido
+    e para a resposta degradada.
+    """
+    if not canned_responses:
+        return None
+    return IntentMatcher(
+        canned_responses, min_score=float(os.getenv("INTENT_MIN_SCORE", "0.7"))
+    )
+
+
+def _fast_path_matcher(
+    intent_matcher: Optional[IntentMatcher],
+) -> Optional[IntentMatcher]:
+    """Caminho rápido para intents conhecidos, sem RAG nem LLM (INTENT_FAST_PATH_ENABLED)."""
+    if os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() != "true":
+        return None
+    return intent_matcher
+
+
+def _build_precomputed_answers() -> Optional[PrecomputedAnswerStore]:
+    """
+    Respostas geradas offline por ops/precompute_answers.py (PRECOMPUTED_ANSWERS_PATH).
+    Só vale o artefato do namespace atual (RESPONSE_CACHE_VERSION), gerado
+    com o modelo e a versão de prompt do llm_provider.
+    """
+    path = os.getenv("PRECOMPUTED_ANSWERS_PATH")
+    if not path:
+        return None
+    try:
+        store = PrecomputedAnswerStore.from_file(
+            path,
+            namespace=os.getenv("RESPONSE_CACHE_VERSION", "v1"),
+            llm_provider=llm_provider,
+        )
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Respostas pré-computadas indisponíveis ({path}): {str(e)}")
+        return None
+    logger.info(f"Respostas pré-computadas carregadas: {len(store)}")
+    return store
+
+
+def _build_output_guard() -> Optional[OutputSafetyGuard]:
+    """Verificação da resposta do LLM, inclusive em streaming (OUTPUT_SAFETY_ENABLED)."""
+    if os.getenv("OUTPUT_SAFETY_ENABLED", "true").lower() != "true":
+        return None
+    return OutputSafetyGuard()
+
+
 # Injeção de Dependência Manual (Composition Root)
 # Em produção, isso poderia ser feito com um container (Dependency Injector)
-llm_provider = BedrockLLM()
-context_repo = MockOpenSearchRepository()
-process_message_uc = ProcessUserMessage(llm_provider, context_repo)
+# Objetos em escopo de módulo sobrevivem entre invocações "quentes" da Lambda.
+# Construído no primeiro uso (ou em warm_up): o import do SDK sai do cold start
+llm_provider = LazyLLMProvider(lambda: _with_hedge(_build_llm_provider()))
+context_repo = _build_context_repository()
+response_cache = _build_response_cache()
+session_repo = _build_session_repository()
+intent_matcher = _build_intent_matcher(_load_canned_responses())
+process_message_uc = ProcessUserMessage(
+    llm_provider,
+    context_repo,
+    response_cache=response_cache,
+    cache_namespace=os.getenv("RESPONSE_CACHE_VERSION", "v1"),
+    semantic_cache=_build_semantic_cache(),
+    context_compressor=_build_context_compressor(),
+    session_repo=session_repo,
+    history_compactor=_build_history_compactor(llm_provider, session_repo),
+    output_guard=_build_output_guard(),
+    # PIPELINE_MODE=concurrent: RAG especulativo em paralelo com a segurança
+    concurrent=os.getenv("PIPELINE_MODE", "sequential").lower() == "concurrent",
+    safety_timeout=float(os.getenv("PIPELINE_SAFETY_TIMEOUT_SECONDS") or 0) or None,
+    retrieval_timeout=float(os.getenv("PIPELINE_RETRIEVAL_TIMEOUT_SECONDS") or 0)
+    or None,
+    fallback_responder=_build_fallback_responder(intent_matcher),
+    intent_matcher=_fast_path_matcher(intent_matcher),
+    intent_platforms=tuple(
+        p.strip().lower()
+        for p in os.getenv("INTENT_FAST_PATH_PLATFORMS", "api").split(",")
+        if p.strip()
+    ),
+    precomputed_answers=_build_precomputed_answers(),
+)
+
+WARMUP_QUERY = "O que é TDAH?"
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Antecipa o custo do primeiro request: constrói o provedor LLM (import do
+    SDK + clientes), carrega o que o import adia (classificador de risco, índice
+    de intents) e faz uma recuperação de contexto (conexões do RAG e dos
+    embeddings). Usado por eventos de ping e no INIT da concorrência provisionada.
+    """
+    timings = {"llm_ms": llm_provider.warm_up()}
+    timings["risk_classifier_ms"] = RISK_DETECTOR.warm_up()
+    matcher = process_message_uc.fallback_responder.intent_matcher
+    if matcher is not None:
+        timings["intent_index_ms"] = matcher.warm_up()
+    started = time.perf_counter()
+    try:
+        context_repo.retrieve_context(WARMUP_QUERY)
+    except Exception as e:
+        logger.warning(f"Aquecimento da recuperação falhou: {str(e)}")
+    timings["retrieval_ms"] = (time.perf_counter() - started) * 1000
+    return {name: round(ms, 3) for name, ms in timings.items()}
+
+
+# Concorrência provisionada (ou WARMUP_ON_INIT=true): aquece já na fase de INIT
+if (
+    os.getenv("WARMUP_ON_INIT", "false").lower() == "true"
+    or os.getenv("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency"
+):
+    logger.info(f"Aquecimento no INIT: {warm_up()}")
+
+
+def _extract_user_id(event: Dict[str, Any], body: Dict[str, Any]) -> str:
+    """
+    Identifica o usuário: campo `user_id` do corpo (API), claims do authorizer
+    (API Gateway/Cognito) ou payload original do Dialogflow.
+    """
+    authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+    claims = authorizer.get("claims") or (authorizer.get("jwt") or {}).get("claims")
+    payload = (body.get("originalDetectIntentRequest") or {}).get("payload") or {}
+    return str(
+        body.get("user_id")
+        or (claims or {}).get("sub")
+        or payload.get("userId")
+        or "anonymous"
+    )
+
+
+def _parse_event(event: Dict[str, Any]) -> Tuple[Optional[ProcessMessageInput], bool]:
+    """
+    Converte o evento (API Gateway ou Webhook Dialogflow) no DTO de entrada.
+    Retorna (None, is_dialogflow) quando não há mensagem.
+    """
+    # 1. Parse Input (Adaptação Básica)
+    body = (
+        json.loads(event.get("body", "{}"))
+        if isinstance(event.get("body"), str)
+        else event.get("body", {})
+    )
+
+    # Detecta se é Dialogflow (simplificado para este exemplo)
+    is_dialogflow = "queryResult" in body
+    user_message = (
+        body.get("queryResult", {}).get("queryText")
+        if is_dialogflow
+        else body.get("message")
+    )
+    # Sem sessão, nada de histórico: um id padrão juntaria as conversas de
+    # todos os usuários num único histórico (e no prompt de cada um)
+    session_id = body.get("session") or None
+
+    if not user_message:
+        return None, is_dialogflow
+
+    # 2. Criação do DTO
+    input_dto = ProcessMessageInput(
+        user_id=_extract_user_id(event, body),
+        session_id=session_id,
+        message=user_message,
+        platform="dialogflow" if is_dialogflow else "api",
+    )
+    return input_dto, is_dialogflow
+
+
+def _request_deadline(context: Any, is_dialogflow: bool) -> Optional[Deadline]:
+    """
+    Prazo da requisição: tempo restante da Lambda (menos DEADLINE_MARGIN_MS para
+    serializar a resposta) e, no Dialogflow, o timeout do webhook (~5 s).
+    """
+    budgets_ms = []
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if callable(get_remaining):
+        budgets_ms.append(get_remaining() - int(os.getenv("DEADLINE_MARGIN_MS", "300")))
+    if is_dialogflow:
+        budgets_ms.append(int(os.getenv("DIALOGFLOW_DEADLINE_MS", "4500")))
+    if not budgets_ms:
+        return None
+    return Deadline.after(min(budgets_ms) / 1000)
+
+
+def _format_response(
+    output_dto: ProcessMessageOutput, is_dialogflow: bool
+) -> Dict[str, Any]:
+    """Formata a resposta no padrão esperado pela origem do evento."""
+    response_body = (
+        {"fulfillmentText": output_dto.response_text}
+        if is_dialogflow
+        else {
+            "response": output_dto.response_text,
+            "risk_detected": output_dto.risk_detected,
+        }
+    )
+
+    return {"statusCode": 200, "body": json.dumps(response_body)}
+
+
+def _is_warmup_event(event: Dict[str, Any]) -> bool:
+    """Ping de aquecimento: {"warmup": true}, regra agendada do EventBridge ou plugin."""
+    return bool(event.get("warmup")) or event.get("source") in (
+        "aws.events",
+        "serverless-plugin-warmup",
+    )
+
+
+def _warmup_response(stats: Dict[str, float]) -> Dict[str, Any]:
+    return {"statusCode": 200, "body": json.dumps({"warmup": stats})}
+
+
+def _bad_request() -> Dict[str, Any]:
+    return {"statusCode": 400, "body": json.dumps({"error": "Mensagem vazia"})}
+
+
+def _internal_error(e: Exception) -> Dict[str, Any]:
+    logger.error(f"Erro no processamento: {str(e)}", exc_info=True)
+    return {
+        "statusCode": 500,
+        "body": json.dumps({"error": "Erro interno do servidor"}),
+    }
+
+
+def _flush_session_writes() -> None:
+    """
+    A Lambda congela o processo assim que o handler retorna: escritas de sessão
+    em write-behind precisam terminar antes, senão o turno só é gravado na
+    próxima invocação (ou nunca, se o ambiente for reciclado).
+    """
+    if session_repo is None:
+        return
+    if not session_repo.flush(float(os.getenv("SESSION_FLUSH_TIMEOUT_SECONDS", "2"))):
+        logger.warning("Escritas de sessão ainda pendentes ao fim da invocação")
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -26,53 +614,47 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Recebe o evento JSON, converte para DTO, chama a Application Layer e retorna JSON.
     """
     try:
+        if _is_warmup_event(event):
+            return _warmup_response(warm_up())
         logger.info(f"Evento recebido: {json.dumps(event)}")
 
-        # 1. Parse Input (Adaptação Básica)
-        body = (
-            json.loads(event.get("body", "{}"))
-            if isinstance(event.get("body"), str)
-            else event.get("body", {})
-        )
-
-        # Detecta se é Dialogflow (simplificado para este exemplo)
-        is_dialogflow = "queryResult" in body
-        user_message = (
-            body.get("queryResult", {}).get("queryText")
-            if is_dialogflow
-            else body.get("message")
-        )
-        session_id = body.get("session", "unknown_session")
-
-        if not user_message:
-            return {"statusCode": 400, "body": json.dumps({"error": "Mensagem vazia"})}
-
-        # 2. Criação do DTO
-        input_dto = ProcessMessageInput(
-            user_id="anonymous",  # TODO: Extrair do evento
-            session_id=session_id,
-            message=user_message,
-            platform="dialogflow" if is_dialogflow else "api",
-        )
+        input_dto, is_dialogflow = _parse_event(event)
+        if input_dto is None:
+            return _bad_request()
+        input_dto.deadline = _request_deadline(context, is_dialogflow)
 
         # 3. Execução do Use Case
         output_dto = process_message_uc.execute(input_dto)
 
         # 4. Formatação da Resposta
-        response_body = (
-            {"fulfillmentText": output_dto.response_text}
-            if is_dialogflow
-            else {
-                "response": output_dto.response_text,
-                "risk_detected": output_dto.risk_detected,
-            }
-        )
+        return _format_response(output_dto, is_dialogflow)
+
+    except Exception as e:
+        return _internal_error(e)
+
+    finally:
+        _flush_session_writes()
 
-        return {"statusCode": 200, "body": json.dumps(response_body)}
+
+async def alambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Entrypoint assíncrono (mesmo contrato de lambda_handler).
+    Usado por servidores ASGI para não bloquear o event loop durante RAG/LLM.
+    """
+    try:
+        if _is_warmup_event(event):
+            # Carrega classificador/índice e conecta o provedor fora do event loop
+            return _warmup_response(await asyncio.to_thread(warm_up))
+        logger.info(f"Evento recebido: {json.dumps(event)}")
+
+        input_dto, is_dialogflow = _parse_event(event)
+        if input_dto is None:
+            return _bad_request()
+        input_dto.deadline = _request_deadline(context, is_dialogflow)
+
+        output_dto = await process_message_uc.aexecute(input_dto)
+
+        return _format_response(output_dto, is_dialogflow)
 
     except Exception as e:
-        logger.error(f"Erro no processamento: {str(e)}", exc_info=True)
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Erro interno do servidor"}),
-        }
+        return _internal_error(e)
@@ -0,0 +1,144 @@
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.risk_matcher import normalize_for_matching
+
+"""
+Classificador de risco local e leve (tier 2 do filtro de segurança).
+
+Regressão logística sobre n-gramas de caracteres e bigramas de palavras
+com hashing (sem vocabulário), treinada por ops/train_risk_classifier.py e
+serializada num .npz. A pontuação em lote é vetorizada com NumPy.
+"""
+
+
+def extract_features(
+    text: str, dimensions: int, ngram_range: Tuple[int, int] = (3, 5)
+) -> np.ndarray:
+    """Buckets (crc32 % dimensions) dos n-gramas do texto normalizado."""
+    normalized = f" {normalize_for_matching(text).strip()} "
+    grams = [
+        normalized[i : i + n]
+        for n in range(ngram_range[0], ngram_range[1] + 1)
+        for i in range(len(normalized) - n + 1)
+    ]
+    words = normalized.split()
+    grams.extend(f"{a}_{b}" for a, b in zip(words, words[1:]))
+    if not grams:
+        return np.empty(0, dtype=np.int64)
+    return np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) % dimensions for g in grams),
+        dtype=np.int64,
+        count=len(grams),
+    )
+
+
+def featurize_batch(
+    texts: Sequence[str], dimensions: int, ngram_range: Tuple[int, int] = (3, 5)
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Representação esparsa do lote: (índices, valores, offsets por texto).
+    Cada texto é normalizado para norma L2 unitária.
+    """
+    indices = [extract_features(text, dimensions, ngram_range) for text in texts]
+    lengths = np.array([len(i) for i in indices], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    values = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths).astype(
+        np.float32
+    )
+    flat = np.concatenate(indices) if indices else np.empty(0, dtype=np.int64)
+    return flat, values, offsets
+
+
+def sparse_dot(
+    weights: np.ndarray, indices: np.ndarray, values: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """Produto (lote esparso) x pesos, via reduceat."""
+    if not len(offsets):
+        return np.empty(0, dtype=np.float32)
+    contributions = np.append(weights[indices] * values, 0.0)
+    sums = np.add.reduceat(contributions, np.minimum(offsets, len(indices)))
+    # Textos sem features (offset repetido) somam zero
+    lengths = np.diff(np.append(offsets, len(indices)))
+    return np.where(lengths > 0, sums, 0.0).astype(np.float32)
+
+
+class RiskClassifier:
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float,
+        ngram_range: Tuple[int, int] = (3, 5),
+    ):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.dimensions = self.weights.shape[0]
+        self.ngram_range = ngram_range
+
+    @classmethod
+    def from_file(cls, path: str) -> "RiskClassifier":
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            weights=data["weights"],
+            bias=float(data["bias"]),
+            ngram_range=tuple(int(n) for n in data["ngram_range"]),
+        )
+
+    def save(self, path: str, metrics: Dict[str, float] = None) -> None:
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float32),
+            bias=np.float32(self.bias),
+            ngram_range=np.asarray(self.ngram_range, dtype=np.int64),
+            **{k: np.float32(v) for k, v in (metrics or {}).items()},
+        )
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Probabilidade de risco de cada texto (vetorizado)."""
+        indices, values, offsets = featurize_batch(
+            texts, self.dimensions, self.ngram_range
+        )
+        logits = sparse_dot(self.weights, indices, values, offsets) + self.bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def score(self, text: str) -> float:
+        return float(self.score_batch([text])[0])
+
+
+def train_logistic_regression(
+    texts: List[str],
+    labels: Sequence[int],
+    dimensions: int = 2**15,
+    ngram_range: Tuple[int, int] = (3, 5),
+    epochs: int = 800,
+    learning_rate: float = 4.0,
+    l2: float = 1e-4,
+    positive_weight: float = None,
+) -> RiskClassifier:
+    """
+    Treina a regressão logística por gradiente descendente em lote completo
+    sobre a representação esparsa. `positive_weight` compensa o desbalanceamento
+    (padrão: razão negativos/positivos), priorizando o recall.
+    """
+    y = np.asarray(labels, dtype=np.float32)
+    indices, values, offsets = featurize_batch(texts, dimensions, ngram_range)
+    rows = np.repeat(np.arange(len(texts)), np.diff(np.append(offsets, len(indices))))
+    if positive_weight is None:
+        positive_weight = float((y == 0).sum() / max((y == 1).sum(), 1))
+    sample_weight = np.where(y == 1, positive_weight, 1.0).astype(np.float32)
+    sample_weight /= sample_weight.mean()
+
+    weights = np.zeros(dimensions, dtype=np.float32)
+    bias = 0.0
+    for _ in range(epochs):
+        logits = sparse_dot(weights, indices, values, offsets) + bias
+        error = (1.0 / (1.0 + np.exp(-logits)) - y) * sample_weight
+        gradient = np.bincount(
+            indices, weights=error[rows] * values, minlength=dimensions
+        ) / len(texts)
+        weights -= learning_rate * (gradient.astype(np.float32) + l2 * weights)
+        bias -= learning_rate * float(error.mean())
+
+    return RiskClassifier(weights, bias, ngram_range)
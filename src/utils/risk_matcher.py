@@ -0,0 +1,208 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.utils.text_normalization import fold_accents
+
+"""
+Matcher multi-padrão (Aho-Corasick) para termos de risco.
+
+O léxico é compilado uma única vez num autômato; a varredura percorre o texto
+uma só vez, com custo proporcional ao tamanho do texto e praticamente
+independente da quantidade de termos. Variantes com erros de digitação comuns
+são geradas na compilação, não na busca.
+"""
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_REPEATED_RE = re.compile(r"(.)\1+")
+
+# Trocas fonéticas/ortográficas frequentes em português
+_SUBSTITUTIONS = (("s", "z"), ("z", "s"), ("s", "c"), ("c", "s"), ("x", "ch"))
+
+
+def normalize_for_matching(text: str) -> str:
+    """
+    Minúsculas, sem acentos, só letras/dígitos separados por um espaço e
+    letras repetidas colapsadas ("Suicíííídio!!" -> "suicidio").
+    """
+    text = _NON_ALNUM_RE.sub(" ", fold_accents(text.lower()))
+    return _REPEATED_RE.sub(r"\1", text)
+
+
+def typo_variants(term: str, min_length: int = 6) -> List[str]:
+    """
+    Variantes com um erro comum: letra omitida, letras adjacentes trocadas ou
+    troca fonética. A primeira e a última letras são preservadas para conter
+    falsos positivos; termos curtos não geram variantes.
+    """
+    if len(term) < min_length:
+        return []
+
+    variants = set()
+    last = len(term) - 1
+    for i in range(1, last):
+        if term[i] != " ":
+            variants.add(term[:i] + term[i + 1 :])
+        if i + 1 < last and " " not in term[i : i + 2]:
+            variants.add(term[:i] + term[i + 1] + term[i] + term[i + 2 :])
+    for source, target in _SUBSTITUTIONS:
+        start = term.find(source, 1)
+        while start != -1 and start + len(source) <= last:
+            variants.add(term[:start] + target + term[start + len(source) :])
+            start = term.find(source, start + 1)
+
+    variants = {_REPEATED_RE.sub(r"\1", v) for v in variants}
+    variants.discard(term)
+    return sorted(v for v in variants if "  " not in v)
+
+
+@dataclass(frozen=True)
+class RiskMatch:
+    category: str
+    term: str
+
+
+class RiskScanner:
+    """
+    Varredura incremental: mantém o estado do autômato entre fragmentos, então
+    um termo dividido entre dois chunks é encontrado sem reprocessar o texto.
+    """
+
+    def __init__(self, matcher: "RiskMatcher"):
+        self.matcher = matcher
+        self.state = matcher.start_state
+        self._last_char = " "
+        self.match: Optional[RiskMatch] = None
+
+    def feed(self, chunk: str) -> Optional[RiskMatch]:
+        """Processa o próximo fragmento; retorna o primeiro termo encontrado."""
+        if self.match is not None or not chunk:
+            return self.match
+
+        text = normalize_for_matching(chunk)
+        # Continuidade com o fragmento anterior (espaços e letras repetidas)
+        if text and text[0] == self._last_char:
+            text = text[1:]
+        if not text:
+            return None
+        self._last_char = text[-1]
+
+        self.state, self.match = self.matcher.run(self.state, text)
+        return self.match
+
+    @property
+    def partial_length(self) -> int:
+        """
+        Caracteres (normalizados) finais que já formam o início de algum termo;
+        zero quando nada do texto recente pode completar um casamento.
+        """
+        return self.matcher.depth(self.state)
+
+
+class RiskMatcher:
+    def __init__(
+        self,
+        lexicon: Dict[str, Sequence[str]],
+        typos: bool = True,
+        min_typo_length: int = 6,
+    ):
+        """
+        Args:
+            lexicon: Termos por categoria ({"suicidio": ["suicid", ...]}). Os
+                termos casam como prefixo de palavra ("morrer" casa "morreria").
+            typos: Inclui variantes com erros de digitação comuns.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[RiskMatch]] = [None]
+        self._depth: List[int] = [0]
+        self.terms = 0
+        # Maior padrão (normalizado) do autômato; dimensiona o holdback do streaming
+        self.max_pattern_length = 0
+
+        for category, terms in lexicon.items():
+            for term in terms:
+                normalized = normalize_for_matching(term).strip()
+                if not normalized:
+                    continue
+                self.terms += 1
+                match = RiskMatch(category, term)
+                variants = typo_variants(normalized, min_typo_length) if typos else []
+                for pattern in [normalized, *variants]:
+                    # Espaço inicial = início de palavra
+                    self._add(" " + pattern, match)
+                    self.max_pattern_length = max(
+                        self.max_pattern_length, len(pattern) + 1
+                    )
+        self._build_failure_links()
+        # Estado após o "espaço virtual" que precede o texto
+        self.start_state = self._goto[0].get(" ", 0)
+
+    def _add(self, pattern: str, match: RiskMatch) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._depth.append(self._depth[state] + 1)
+            state = next_state
+        if self._output[state] is None:
+            self._output[state] = match
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target
+                # Propaga a saída do sufixo: a busca não precisa seguir falhas
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+
+    def run(self, state: int, text: str) -> Tuple[int, Optional[RiskMatch]]:
+        """Avança o autômato sobre `text` a partir de `state`."""
+        goto, fail, output = self._goto, self._fail, self._output
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] is not None:
+                return state, output[state]
+        return state, None
+
+    def depth(self, state: int) -> int:
+        """Tamanho do prefixo de padrão representado pelo estado."""
+        return self._depth[state]
+
+    def find(self, text: str) -> Optional[RiskMatch]:
+        """Primeiro termo de risco encontrado no texto (ou None)."""
+        if not text:
+            return None
+        return self.run(self.start_state, normalize_for_matching(text))[1]
+
+    def find_all(self, text: str) -> List[RiskMatch]:
+        """Todos os termos encontrados, na ordem em que aparecem."""
+        matches = []
+        state = self.start_state
+        goto, fail, output = self._goto, self._fail, self._output
+        for ch in normalize_for_matching(text or ""):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] is not None and output[state] not in matches:
+                matches.append(output[state])
+        return matches
+
+    def scanner(self) -> RiskScanner:
+        return RiskScanner(self)
@@ -1,23 +1,45 @@
-import re
-from typing import Optional, Tuple
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+from src.utils.risk_matcher import RiskMatch, RiskMatcher
+
+if TYPE_CHECKING:
+    from src.utils.risk_classifier import RiskClassifier
 
 """
 Módulo de filtros de segurança para o Chatbot de Saúde Mental.
 Responsável por identificar intenções de risco (RF02).
 """
 
-# Lista de palavras-chave e padrões de risco (Exemplo simplificado)
-# Em produção, isso deve ser mais robusto ou usar um modelo classificador.
-RISK_KEYWORDS = [
-    r"\bsuic[ií]d",
-    r"\bmorrer",
-    r"\bmatar",
-    r"\bacabar com tudo",
-    r"\bautomutila",
-    r"\bcortar os pulsos",
-    r"\bdesaparecer",
-    r"\bnão aguento mais viver",
-]
+logger = logging.getLogger(__name__)
+
+# Léxico de risco por categoria. Termos casam como início de palavra, sem
+# diferenciar acentos/maiúsculas, incluindo erros de digitação comuns.
+# Frases indiretas que escapam do léxico ficam a cargo do RiskClassifier (tier 2).
+RISK_LEXICON = {
+    "suicidio": [
+        "suicid",
+        "morrer",
+        "matar",
+        "acabar com tudo",
+        "desaparecer",
+        "não aguento mais viver",
+        "tirar a minha vida",
+        "tirar a própria vida",
+    ],
+    "autolesao": [
+        "automutila",
+        "cortar os pulsos",
+        "me machucar",
+    ],
+}
+
+# Lista plana mantida para consumidores existentes
+RISK_KEYWORDS = [term for terms in RISK_LEXICON.values() for term in terms]
 
 EMERGENCY_MESSAGE = (
     "Sinto muito que você esteja se sentindo assim. "
@@ -27,6 +49,194 @@ EMERGENCY_MESSAGE = (
     "ou procure o serviço de emergência mais próximo."
 )
 
+# Resposta neutra quando a saída do modelo é bloqueada fora do contexto de crise
+SAFE_FALLBACK_MESSAGE = (
+    "Não consigo ajudar com isso por aqui. "
+    "Para orientações sobre medicação ou tratamento, converse com um profissional de saúde."
+)
+
+# Léxico da saída do LLM: não basta mencionar o tema (a resposta pode falar de
+# suicídio para acolher ou alertar); bloqueia instruções, métodos e incentivo.
+OUTPUT_RISK_LEXICON = {
+    "metodo_autolesao": [
+        "como se matar",
+        "formas de se matar",
+        "maneiras de se matar",
+        "dose letal",
+        "cortar os pulsos",
+        "tirar sua vida",
+        "tirar a sua vida",
+    ],
+    "incentivo_autolesao": [
+        "você deveria se matar",
+        "ninguém sentiria sua falta",
+        "sua vida não vale",
+    ],
+    "medicacao_perigosa": [
+        "você pode dobrar a dose",
+        "basta dobrar a dose",
+        "você pode tomar sem receita",
+        "você pode misturar com álcool",
+        "você pode parar o remédio por conta",
+    ],
+}
+
+# Categorias de saída que recebem a mensagem de emergência (as demais, o fallback)
+OUTPUT_EMERGENCY_CATEGORIES = frozenset({"metodo_autolesao", "incentivo_autolesao"})
+
+# Compilados uma única vez no import (reaproveitados entre invocações quentes)
+RISK_MATCHER = RiskMatcher(RISK_LEXICON)
+OUTPUT_RISK_MATCHER = RiskMatcher(OUTPUT_RISK_LEXICON)
+
+DEFAULT_RISK_CLASSIFIER_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "risk_classifier.npz"
+)
+# Scores do classificador: abaixo de LOW é seguro, a partir de HIGH é risco;
+# o intervalo entre eles é ambíguo e vai para o escalonamento (tier 3).
+RISK_LOW_THRESHOLD = 0.3
+RISK_HIGH_THRESHOLD = 0.7
+CLASSIFIER_CATEGORY = "risco_indireto"
+
+
+@dataclass(frozen=True)
+class RiskAssessment:
+    """Resultado da avaliação em camadas de uma mensagem."""
+
+    risk: bool
+    tier: str  # "lexico" | "classificador" | "escalonamento"
+    category: Optional[str] = None
+    term: Optional[str] = None
+    score: Optional[float] = None
+    ambiguous: bool = False
+
+
+class TieredRiskDetector:
+    """
+    Detecção de risco em camadas, da mais barata para a mais cara:
+    1. RiskMatcher (léxico, Aho-Corasick) decide sozinho quando encontra termo;
+    2. RiskClassifier local (n-gramas, < 1 ms) pontua o restante;
+    3. `escalate` (opcional, ex.: LLM) só é chamado nos scores ambíguos.
+    Sem escalonamento, uma mensagem ambígua é tratada como segura, mas marcada.
+    Com `classifier_loader`, o classificador (e o NumPy) só é carregado na
+    primeira mensagem que passa pelo léxico, fora do import.
+    """
+
+    def __init__(
+        self,
+        matcher: RiskMatcher,
+        classifier: Optional["RiskClassifier"] = None,
+        low_threshold: float = RISK_LOW_THRESHOLD,
+        high_threshold: float = RISK_HIGH_THRESHOLD,
+        escalate: Optional[Callable[[str], bool]] = None,
+        classifier_loader: Optional[Callable[[], Optional["RiskClassifier"]]] = None,
+    ):
+        self.matcher = matcher
+        self._classifier = classifier
+        self._classifier_loader = None if classifier is not None else classifier_loader
+        self._lock = threading.Lock()
+        self.low_threshold = low_threshold
+        self.high_threshold = high_threshold
+        self.escalate = escalate
+
+    @property
+    def classifier(self) -> Optional["RiskClassifier"]:
+        if self._classifier_loader is not None:
+            with self._lock:
+                if self._classifier_loader is not None:
+                    self._classifier = self._classifier_loader()
+                    self._classifier_loader = None
+        return self._classifier
+
+    def warm_up(self) -> float:
+        """Carrega o classificador, se ainda não carregado; devolve o tempo gasto (ms)."""
+        started = time.perf_counter()
+        classifier = self.classifier
+        logger.info(
+            f"Classificador de risco aquecido: {'ativo' if classifier else 'desativado'}"
+        )
+        return (time.perf_counter() - started) * 1000
+
+    def assess(self, text: str) -> RiskAssessment:
+        return self.assess_batch([text])[0]
+
+    def assess_batch(self, texts: Sequence[str]) -> List[RiskAssessment]:
+        """Avalia várias mensagens; o classificador pontua o lote de uma vez."""
+        results: List[Optional[RiskAssessment]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            match = self.matcher.find(text) if text else None
+            if match is not None:
+                results[i] = RiskAssessment(
+                    True, "lexico", category=match.category, term=match.term
+                )
+            elif not text or self.classifier is None:
+                results[i] = RiskAssessment(False, "lexico")
+            else:
+                pending.append(i)
+
+        if pending:
+            scores = self.classifier.score_batch([texts[i] for i in pending])
+            for i, score in zip(pending, scores.tolist()):
+                results[i] = self._decide(texts[i], score)
+        return results
+
+    def _decide(self, text: str, score: float) -> RiskAssessment:
+        if score >= self.high_threshold:
+            return RiskAssessment(
+                True, "classificador", category=CLASSIFIER_CATEGORY, score=score
+            )
+        if score <= self.low_threshold:
+            return RiskAssessment(False, "classificador", score=score)
+        if self.escalate is None:
+            return RiskAssessment(False, "classificador", score=score, ambiguous=True)
+
+        try:
+            risk = bool(self.escalate(text))
+        except Exception as e:
+            # Na dúvida e sem resposta do tier 3, prioriza a segurança do usuário
+            logger.error(f"Erro no escalonamento de risco: {str(e)}")
+            risk = True
+        return RiskAssessment(
+            risk,
+            "escalonamento",
+            category=CLASSIFIER_CATEGORY if risk else None,
+            score=score,
+            ambiguous=True,
+        )
+
+
+def load_risk_classifier(path: Optional[str] = None) -> Optional["RiskClassifier"]:
+    """
+    Carrega o artefato do classificador (RISK_CLASSIFIER_PATH). Retorna None
+    (apenas o léxico) se desativado com "none" ou se o arquivo não existir.
+    """
+    path = path or os.getenv("RISK_CLASSIFIER_PATH", DEFAULT_RISK_CLASSIFIER_PATH)
+    if path.lower() == "none" or not os.path.exists(path):
+        return None
+    try:
+        from src.utils.risk_classifier import RiskClassifier
+
+        return RiskClassifier.from_file(path)
+    except Exception as e:
+        logger.error(f"Erro ao carregar o classificador de risco: {str(e)}")
+        return None
+
+
+# Classificador carregado uma única vez, no primeiro uso (ou em warm_up do handler)
+RISK_DETECTOR = TieredRiskDetector(RISK_MATCHER, classifier_loader=load_risk_classifier)
+
+
+def detect_risk(text: str) -> Optional[RiskMatch]:
+    """
+    Retorna o termo e a categoria de risco encontrados no texto, ou None.
+    """
+    return RISK_MATCHER.find(text)
+
+
+def assess_risk(text: str) -> RiskAssessment:
+    """Avaliação completa (léxico + classificador + escalonamento)."""
+    return RISK_DETECTOR.assess(text)
+
 
 def check_safety(text: str) -> Tuple[bool, Optional[str]]:
     """
@@ -43,10 +253,7 @@ def check_safety(text: str) -> Tuple[bool, Optional[str]]:
     if not text:
         return True, None
 
-    normalized_text = text.lower()
-
-    for pattern in RISK_KEYWORDS:
-        if re.search(pattern, normalized_text):
-            return False, EMERGENCY_MESSAGE
+    if RISK_DETECTOR.assess(text).risk:
+        return False, EMERGENCY_MESSAGE
 
     return True, None
@@ -0,0 +1,62 @@
+import re
+import unicodedata
+from typing import List
+
+"""
+Utilitários de normalização de texto compartilhados (cache, busca e segurança).
+"""
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCTUATION_RE = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+def fold_accents(text: str) -> str:
+    """
+    Remove acentos/diacríticos (ex: "remédio" -> "remedio").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalização canônica: minúsculas, sem acentos, espaços colapsados e
+    sem pontuação nas bordas ("  Preciso tomar Remédio?? " -> "preciso tomar remedio").
+    """
+    if not text:
+        return ""
+
+    normalized = fold_accents(text.lower())
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    return _EDGE_PUNCTUATION_RE.sub("", normalized)
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Stopwords do português (artigos, preposições, pronomes e conectivos frequentes)
+PORTUGUESE_STOPWORDS = frozenset(
+    """
+    a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles
+    em entre era essa esse esta este eu foi ha isso isto ja la lhe mais mas me
+    mesmo meu minha muito na nas nao nem no nos nossa nosso num numa o os ou para
+    pela pelas pelo pelos por qual quando que quem se sem ser seu sua suas seus
+    so sao tambem te tem ter um uma umas uns voce voces
+    """.split()
+)
+
+
+def tokenize(text: str, stopwords: frozenset = PORTUGUESE_STOPWORDS) -> List[str]:
+    """
+    Tokenização para busca lexical em português: minúsculas, sem acentos,
+    sem stopwords e com remoção leve de plural ("remédios" -> "remedio", "ações" -> "acao").
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(fold_accents(text.lower())):
+        if token in stopwords:
+            continue
+        if len(token) > 4 and token.endswith(("oes", "aes")):
+            token = token[:-3] + "ao"
+        elif len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
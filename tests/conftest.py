@@ -0,0 +1,10 @@
+import pytest
+
+from src.infrastructure.client_factory import get_client_factory
+
+
+@pytest.fixture(autouse=True)
+def _fresh_shared_clients():
+    """Os clientes da fábrica compartilhada não vazam entre testes (mocks de boto3)."""
+    get_client_factory().clear()
+    yield
@@ -0,0 +1,82 @@
+from unittest.mock import Mock
+
+from src.application.services.context_compressor import ContextCompressor
+from src.domain.interfaces.repositories import LLMProvider
+
+
+class WordProvider(LLMProvider):
+    """Provedor fake: um token por palavra."""
+
+    model_id = "fake-model"
+
+    def invoke(self, prompt, context=None):
+        return ""
+
+    def count_tokens(self, text):
+        return len(text.split())
+
+
+CONTEXT = "\n\n".join(
+    [
+        "O TDAH afeta a atenção. A TCC ajuda na organização da rotina.",
+        "A TCC ajuda na organização da rotina. O SUS oferece atendimento nos CAPS.",
+        "Metilfenidato é prescrito pelo psiquiatra. Exercícios físicos ajudam no foco.",
+    ]
+)
+
+
+def test_context_within_budget_is_only_deduplicated():
+    compressor = ContextCompressor(default_budget=1000)
+
+    result = compressor.compress("TCC", CONTEXT, WordProvider())
+
+    assert result.text.count("A TCC ajuda na organização da rotina.") == 1
+    assert "Metilfenidato" in result.text
+    assert result.tokens_saved == 7
+
+
+def test_keeps_sentences_most_relevant_to_query_within_budget():
+    compressor = ContextCompressor(default_budget=12)
+
+    result = compressor.compress(
+        "Onde tem atendimento pelo SUS?", CONTEXT, WordProvider()
+    )
+
+    assert "O SUS oferece atendimento nos CAPS." in result.text
+    assert "Metilfenidato" not in result.text
+    assert result.tokens <= 12
+    assert result.original_tokens == 35
+    assert (
+        result.as_metadata()["tokens_saved"] == result.original_tokens - result.tokens
+    )
+
+
+def test_preserves_original_order():
+    compressor = ContextCompressor(default_budget=14)
+
+    result = compressor.compress(
+        "psiquiatra e atenção no TDAH", CONTEXT, WordProvider()
+    )
+
+    assert result.text.index("TDAH") < result.text.index("psiquiatra")
+
+
+def test_budget_per_model_and_cached_token_counts():
+    provider = WordProvider()
+    provider.count_tokens = Mock(side_effect=lambda text: len(text.split()))
+    compressor = ContextCompressor(default_budget=5, budgets={"fake-model": 1000})
+
+    compressor.compress("TCC", CONTEXT, provider)
+    first_calls = provider.count_tokens.call_count
+    result = compressor.compress("TCC", CONTEXT, provider)
+
+    assert result.budget == 1000
+    # Segunda chamada só conta o contexto bruto e o resultado (frases em cache)
+    assert provider.count_tokens.call_count - first_calls == 2
+
+
+def test_empty_context():
+    result = ContextCompressor().compress("TCC", "", WordProvider())
+
+    assert result.text == ""
+    assert result.tokens_saved == 0
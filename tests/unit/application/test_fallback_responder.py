@@ -0,0 +1,44 @@
+from src.application.services.fallback_responder import (
+    CONTEXT_FALLBACK_PREFIX,
+    DEADLINE_FALLBACK_MESSAGE,
+    FallbackResponder,
+    load_canned_responses,
+)
+from src.application.services.intent_matcher import IntentMatcher
+
+CONTEXT = (
+    "O TDAH afeta a atenção. A procrastinação é comum em adultos com TDAH. "
+    "Técnicas como o pomodoro ajudam a reduzir a procrastinação.\n"
+    "O diagnóstico é clínico."
+)
+
+
+def test_answers_with_most_relevant_context_sentences():
+    answer = FallbackResponder().answer("Como vencer a procrastinação?", CONTEXT)
+
+    assert answer.startswith(CONTEXT_FALLBACK_PREFIX)
+    assert "procrastinação é comum" in answer and "pomodoro" in answer
+    assert "diagnóstico" not in answer
+
+
+def test_generic_message_without_relevant_context():
+    responder = FallbackResponder()
+
+    assert responder.answer("Oi", "") == DEADLINE_FALLBACK_MESSAGE
+    assert responder.answer("Qual o horário?", CONTEXT) == DEADLINE_FALLBACK_MESSAGE
+
+
+def test_canned_intent_response_takes_precedence():
+    responses = load_canned_responses("src/dialogflow/data/initial_config.json")
+    matcher = IntentMatcher(responses, min_score=0.7)
+    responder = FallbackResponder(intent_matcher=matcher)
+
+    answer = responder.answer("O que é TDAH?", CONTEXT)
+
+    assert answer.startswith("O TDAH (Transtorno do Déficit de Atenção")
+    assert responder.canned("Qual o horário do ônibus?") is None
+    # Mesmo critério do caminho rápido (TF-IDF), sem contar nas métricas dele
+    assert (
+        responder.canned("o que e tdah").intent == matcher.match("o que e tdah").intent
+    )
+    assert matcher.stats()["lookups"] == 1
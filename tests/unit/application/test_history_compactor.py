@@ -0,0 +1,256 @@
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from src.application.dtos.message_dto import ProcessMessageInput
+from src.application.services.history_compactor import (
+    SUMMARY_INSTRUCTIONS,
+    SUMMARY_KEY,
+    HistoryCompactor,
+)
+from src.application.use_cases.process_message import ProcessUserMessage
+from src.domain.entities.deadline import Deadline
+from src.domain.entities.session import Message, Session
+from src.domain.interfaces.repositories import (
+    ContextRepository,
+    LLMProvider,
+    SemanticCache,
+)
+from src.infrastructure.cache.response_cache import InMemoryResponseCache
+from src.infrastructure.repositories.dynamodb_session_repository import (
+    DynamoDBSessionRepository,
+)
+from src.infrastructure.repositories.in_memory_dynamodb import InMemoryDynamoDBTable
+
+
+class SummarizerStub(LLMProvider):
+    """Resumo fake: concatena as últimas palavras do contexto."""
+
+    def __init__(self):
+        self.calls = 0
+        self.context = None
+        self.timeout = None
+
+    def invoke(self, prompt, context=None, timeout=None):
+        self.calls += 1
+        self.context = context
+        self.timeout = timeout
+        return "Resumo: " + " ".join(context["rag_content"].split()[-20:])
+
+
+def _repo():
+    return DynamoDBSessionRepository(
+        table=InMemoryDynamoDBTable("session_id"), write_behind=False, max_messages=200
+    )
+
+
+def _session(turns: int) -> Session:
+    start = datetime(2024, 1, 1)
+    messages = []
+    for i in range(turns):
+        at = start + timedelta(minutes=i)
+        messages.append(Message(f"pergunta {i}", "user", at))
+        messages.append(Message(f"resposta {i}", "assistant", at))
+    return Session("s1", "u1", messages, created_at=start, updated_at=start)
+
+
+def test_build_history_keeps_last_turns_verbatim():
+    compactor = HistoryCompactor(SummarizerStub(), _repo(), keep_turns=2)
+
+    history = compactor.build_history(_session(5))
+
+    assert "pergunta 0" not in history
+    assert history.splitlines() == [
+        "Usuário: pergunta 3",
+        "Assistente: resposta 3",
+        "Usuário: pergunta 4",
+        "Assistente: resposta 4",
+    ]
+
+
+def test_compact_folds_old_turns_into_summary_incrementally():
+    repo = _repo()
+    summarizer = SummarizerStub()
+    compactor = HistoryCompactor(summarizer, repo, keep_turns=2, compact_every=2)
+
+    repo.save_session(_session(3))
+    assert compactor.compact("s1") is False  # só 1 troca fora da janela
+
+    repo.save_session(_session(4))
+    assert compactor.compact("s1") is True
+    session = repo.get_session("s1")
+    assert "resposta 1" in session.context[SUMMARY_KEY]
+    assert "Resumo da conversa anterior" in compactor.build_history(session)
+
+    # Nada novo a resumir: não chama o LLM de novo
+    assert compactor.compact("s1") is False
+    assert summarizer.calls == 1
+
+
+def test_compact_uses_summary_prompt_and_timeout():
+    repo = _repo()
+    summarizer = SummarizerStub()
+    compactor = HistoryCompactor(summarizer, repo, keep_turns=2, timeout=3.0)
+    repo.save_session(_session(6))
+
+    assert compactor.compact("s1", timeout=1.5) is True
+    assert summarizer.context["instructions"] == SUMMARY_INSTRUCTIONS
+    assert summarizer.timeout == 1.5
+
+    repo.save_session(_session(9))
+    assert compactor.compact("s1") is True
+    assert summarizer.timeout == 3.0
+
+
+def test_compact_ignores_provider_errors():
+    repo = _repo()
+    summarizer = Mock(spec=LLMProvider)
+    summarizer.invoke.return_value = "Desculpe, estou tendo dificuldades (Erro)"
+    repo.save_session(_session(10))
+
+    compactor = HistoryCompactor(summarizer, repo, keep_turns=2)
+
+    assert compactor.compact("s1") is False
+    assert repo.get_session("s1").context is None
+
+
+def test_prompt_size_stays_constant_over_long_conversation():
+    repo = _repo()
+    llm = Mock(spec=LLMProvider)
+    llm.invoke.side_effect = lambda prompt, context: "resposta " * 30
+    compactor = HistoryCompactor(SummarizerStub(), repo, keep_turns=3)
+    context_repo = Mock(spec=ContextRepository)
+    context_repo.retrieve_context.return_value = "Contexto"
+    use_case = ProcessUserMessage(
+        llm, context_repo, session_repo=repo, history_compactor=compactor
+    )
+
+    sizes = []
+    for turn in range(40):
+        use_case.execute(
+            ProcessMessageInput("u1", "s1", f"Como organizar a tarefa {turn}?", "api")
+        )
+        sizes.append(len(llm.invoke.call_args.kwargs["context"].get("history", "")))
+
+    assert max(sizes[10:]) - min(sizes[10:]) < 200
+    assert max(sizes) < 2000
+    assert SUMMARY_KEY in repo.get_session("s1").context
+
+
+def test_compaction_runs_inline_at_start_of_next_turn():
+    repo = _repo()
+    repo.save_session(_session(6))
+    llm = Mock(spec=LLMProvider)
+    llm.invoke.return_value = "Resposta"
+    summarizer = SummarizerStub()
+    compactor = HistoryCompactor(summarizer, repo, keep_turns=2)
+    context_repo = Mock(spec=ContextRepository)
+    context_repo.retrieve_context.return_value = "Contexto"
+    use_case = ProcessUserMessage(
+        llm, context_repo, session_repo=repo, history_compactor=compactor
+    )
+
+    result = use_case.execute(ProcessMessageInput("u1", "s1", "E agora?", "api"))
+
+    assert summarizer.calls == 1
+    history = llm.invoke.call_args.kwargs["context"]["history"]
+    assert "Resumo da conversa anterior" in history
+    assert "history" in result.metadata["timings"]["stages_ms"]
+
+
+def test_history_keeps_answers_out_of_shared_caches():
+    repo = _repo()
+    llm = Mock(spec=LLMProvider)
+    llm.invoke.side_effect = ["Resposta de s1", "Resposta de s2", "Resposta de s3"]
+    compactor = HistoryCompactor(SummarizerStub(), repo, keep_turns=2)
+    context_repo = Mock(spec=ContextRepository)
+    context_repo.retrieve_context.return_value = "Contexto"
+    semantic_cache = Mock(spec=SemanticCache)
+    semantic_cache.lookup.return_value = None
+    semantic_cache.stats.return_value = {}
+    use_case = ProcessUserMessage(
+        llm,
+        context_repo,
+        response_cache=InMemoryResponseCache(),
+        semantic_cache=semantic_cache,
+        session_repo=repo,
+        history_compactor=compactor,
+    )
+    repo.save_session(_session(1))
+
+    with_history = use_case.execute(
+        ProcessMessageInput("u1", "s1", "O que é TCC?", "api")
+    )
+    other_user = use_case.execute(
+        ProcessMessageInput("u2", "s2", "O que é TCC?", "api")
+    )
+
+    # s2 não recebe a resposta moldada pela conversa de s1
+    assert with_history.response_text == "Resposta de s1"
+    assert other_user.response_text == "Resposta de s2"
+    semantic_cache.lookup.assert_called_once_with("O que é TCC?")
+    semantic_cache.store.assert_called_once_with("O que é TCC?", "Resposta de s2")
+
+    # O turno seguinte de s2 já tem histórico: nova chamada, sem cache
+    follow_up = use_case.execute(ProcessMessageInput("u2", "s2", "O que é TCC?", "api"))
+    assert follow_up.response_text == "Resposta de s3"
+    assert llm.invoke.call_count == 3
+
+
+def test_compaction_timeout_takes_a_share_of_the_budget():
+    compactor = HistoryCompactor(SummarizerStub(), _repo(), timeout=3)
+
+    assert compactor.compaction_timeout(None) == 3
+    # Orçamento típico do webhook do Dialogflow (~4,3 s menos a reserva)
+    assert abs(compactor.compaction_timeout(4.0) - 1.0) < 1e-9
+    # Resumo + resposta completa não cabem: fica para outro turno
+    assert compactor.compaction_timeout(3.0) is None
+
+
+def test_compaction_is_skipped_when_budget_cannot_cover_the_answer():
+    repo = _repo()
+    repo.save_session(_session(6))
+    llm = Mock(spec=LLMProvider)
+    llm.invoke.return_value = "Resposta"
+    summarizer = SummarizerStub()
+    compactor = HistoryCompactor(summarizer, repo, keep_turns=2, timeout=3)
+    context_repo = Mock(spec=ContextRepository)
+    context_repo.retrieve_context.return_value = "Contexto"
+    use_case = ProcessUserMessage(
+        llm, context_repo, session_repo=repo, history_compactor=compactor
+    )
+
+    tight = use_case.execute(
+        ProcessMessageInput("u1", "s1", "E agora?", "api", deadline=Deadline.after(3))
+    )
+    assert summarizer.calls == 0
+    assert tight.response_text == "Resposta"
+
+    use_case.execute(
+        ProcessMessageInput("u1", "s1", "E agora?", "api", deadline=Deadline.after(4.3))
+    )
+    assert summarizer.calls == 1
+    assert summarizer.timeout <= 4.3 * compactor.budget_share
+
+
+def test_session_lock_does_not_block_other_sessions():
+    repo = _repo()
+    compactor = HistoryCompactor(SummarizerStub(), repo)
+    use_case = ProcessUserMessage(
+        Mock(spec=LLMProvider),
+        Mock(spec=ContextRepository),
+        session_repo=repo,
+        history_compactor=compactor,
+    )
+    assert compactor.lock_for("s1") is compactor.lock_for("s1")
+
+    with compactor.lock_for("s1"):
+        worker = threading.Thread(
+            target=use_case._record_turn,
+            args=(ProcessMessageInput("u2", "s2", "Oi", "api"), "Olá"),
+        )
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+
+    assert len(repo.get_session("s2").messages) == 2
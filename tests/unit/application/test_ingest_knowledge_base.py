@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock
+
+from src.application.services.document_chunker import chunk_document
+from src.application.use_cases.ingest_knowledge_base import IngestKnowledgeBase
+from src.domain.entities.knowledge import Document
+from src.domain.interfaces.repositories import VectorStoreWriter
+from src.infrastructure.embeddings.hashing_embeddings import HashingEmbeddings
+
+GUIDE = """# Guia TDAH
+
+Introdução ao guia.
+
+## Sintomas
+
+Desatenção, hiperatividade e impulsividade.
+
+## Tratamento
+
+TCC e medicação prescrita pelo psiquiatra.
+"""
+
+
+class RecordingWriter(VectorStoreWriter):
+    def __init__(self):
+        self.rows = {}
+        self.flushes = 0
+        self.reject = set()
+
+    def upsert(self, chunks, vectors):
+        for chunk, vector in zip(chunks, vectors):
+            if chunk.chunk_id not in self.reject:
+                self.rows[chunk.chunk_id] = chunk.text
+        return [c.chunk_id for c in chunks if c.chunk_id in self.reject]
+
+    def delete(self, chunk_ids):
+        for chunk_id in chunk_ids:
+            self.rows.pop(chunk_id, None)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def _use_case(batch_size=2):
+    embeddings = HashingEmbeddings(dimensions=64)
+    embeddings.embed = MagicMock(side_effect=embeddings.embed)
+    writer = RecordingWriter()
+    return IngestKnowledgeBase(embeddings, writer, batch_size=batch_size), writer
+
+
+def test_chunker_splits_on_headings():
+    chunks = chunk_document(Document(source="guia.md", text=GUIDE))
+
+    assert [c.heading for c in chunks] == [
+        "Guia TDAH",
+        "Sintomas",
+        "Tratamento",
+    ]
+    assert chunks[1].text.startswith("## Sintomas")
+
+
+def test_chunker_overlaps_long_sections():
+    text = "## Seção\n\n" + " ".join(f"Frase número {i}." for i in range(200))
+    chunks = chunk_document(Document("longo.md", text), max_chars=300, overlap=60)
+
+    assert len(chunks) > 1
+    assert all(len(c.text) <= 300 + len("Seção\n") for c in chunks)
+    assert chunks[1].text.startswith("Seção\n")
+    # A janela seguinte recomeça dentro da anterior
+    tail = chunks[0].text[-30:]
+    assert tail in chunks[1].text
+
+
+def test_chunk_ids_are_deterministic():
+    first = chunk_document(Document("guia.md", GUIDE))
+    second = chunk_document(Document("guia.md", GUIDE))
+
+    assert [c.chunk_id for c in first] == [c.chunk_id for c in second]
+
+
+def test_first_run_embeds_in_batches():
+    use_case, writer = _use_case(batch_size=2)
+
+    report = use_case.execute([Document("guia.md", GUIDE)])
+
+    assert report.embedded_chunks == 3
+    assert report.embedding_batches == 2
+    assert len(writer.rows) == 3
+    assert writer.flushes == 1
+    assert report.manifest["guia.md"]["chunks"] == list(writer.rows)
+
+
+def test_rerun_without_changes_embeds_nothing():
+    use_case, writer = _use_case()
+    manifest = use_case.execute([Document("guia.md", GUIDE)]).manifest
+    use_case.embedding_provider.embed.reset_mock()
+
+    report = use_case.execute([Document("guia.md", GUIDE)], manifest)
+
+    assert report.unchanged_documents == 1
+    assert report.embedded_chunks == 0
+    use_case.embedding_provider.embed.assert_not_called()
+
+
+def test_rerun_only_embeds_changed_chunks_and_deletes_removed():
+    use_case, writer = _use_case()
+    manifest = use_case.execute([Document("guia.md", GUIDE)]).manifest
+
+    changed = GUIDE.replace("TCC e medicação", "TCC, exercícios e medicação")
+    report = use_case.execute([Document("guia.md", changed)], manifest)
+
+    assert report.embedded_chunks == 1
+    assert report.reused_chunks == 2
+    assert report.deleted_chunks == 1
+    assert len(writer.rows) == 3
+    assert any("exercícios" in text for text in writer.rows.values())
+
+
+def test_missing_documents_are_pruned():
+    use_case, writer = _use_case()
+    manifest = use_case.execute(
+        [Document("guia.md", GUIDE), Document("extra.md", "# Extra\n\nTexto.")]
+    ).manifest
+
+    report = use_case.execute([Document("guia.md", GUIDE)], manifest)
+
+    assert report.removed_documents == 1
+    assert "extra.md" not in report.manifest
+    assert len(writer.rows) == 3
+
+
+def test_rejected_chunks_stay_out_of_manifest_and_are_retried():
+    use_case, writer = _use_case(batch_size=2)
+    chunks = chunk_document(Document("guia.md", GUIDE))
+    writer.reject = {chunks[1].chunk_id}
+
+    report = use_case.execute([Document("guia.md", GUIDE)])
+
+    assert report.failed_chunks == 1
+    entry = report.manifest["guia.md"]
+    assert entry["content_hash"] is None
+    assert chunks[1].chunk_id not in entry["chunks"]
+
+    # Próxima execução incremental: só o chunk recusado é gravado de novo
+    writer.reject = set()
+    retry = use_case.execute([Document("guia.md", GUIDE)], report.manifest)
+
+    assert retry.embedded_chunks == 1 and retry.reused_chunks == 2
+    assert retry.failed_chunks == 0 and retry.deleted_chunks == 0
+    assert set(writer.rows) == {c.chunk_id for c in chunks}
+    assert retry.manifest["guia.md"]["content_hash"] is not None
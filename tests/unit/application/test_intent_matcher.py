@@ -0,0 +1,70 @@
+from src.application.services.fallback_responder import (
+    CannedResponse,
+    load_canned_responses,
+)
+from src.application.services.intent_matcher import IntentMatcher
+
+RESPONSES = [
+    CannedResponse(
+        "Saudação", ("Olá", "Bom dia", "Oi, tudo bem?"), "Oi! Como posso ajudar?"
+    ),
+    CannedResponse(
+        "Organização",
+        ("Dicas de organização", "Como parar de procrastinar?"),
+        "Use listas curtas.",
+    ),
+]
+
+
+def test_matches_paraphrases_typos_and_accents():
+    matcher = IntentMatcher(RESPONSES)
+
+    for message in [
+        "oi tudo bem",
+        "Dicas de organizaçao!!",
+        "como parar de procastinar",
+    ]:
+        match = matcher.match(message)
+        assert match is not None, message
+
+    assert matcher.match("bom dia").intent == "Saudação"
+    assert matcher.match("Como parar de procrastinar?").text == "Use listas curtas."
+
+
+def test_unrelated_or_partial_messages_fall_through():
+    matcher = IntentMatcher(RESPONSES)
+
+    assert matcher.match("Qual a dose de ritalina para adultos?") is None
+    # Um termo em comum numa pergunta longa não basta
+    assert (
+        matcher.match("Quais estratégias de organização funcionam no trabalho remoto?")
+        is None
+    )
+    assert matcher.match("") is None
+    assert matcher.stats()["lookups"] == 3
+    assert matcher.stats()["hits"] == 0
+
+
+def test_dialogflow_config_routes_known_intents():
+    matcher = IntentMatcher(
+        load_canned_responses("src/dialogflow/data/initial_config.json")
+    )
+
+    assert matcher.match("o que e tdah").intent == "TDAH Help"
+    assert matcher.match("Venvanse engorda?") is None
+    assert matcher.stats()["hit_rate"] == 0.5
+
+
+def test_empty_index_never_matches():
+    assert IntentMatcher([]).match("Olá") is None
+
+
+def test_index_built_on_first_match_or_warm_up():
+    matcher = IntentMatcher(RESPONSES)
+    assert not matcher._indexed and len(matcher) > 0
+
+    assert matcher.match("oi tudo bem") is not None
+    assert matcher._indexed
+
+    warmed = IntentMatcher(RESPONSES)
+    assert warmed.warm_up() > 0 and warmed._indexed
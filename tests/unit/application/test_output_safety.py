@@ -0,0 +1,78 @@
+from src.application.services.output_safety import OutputSafetyGuard
+from src.utils.risk_matcher import RiskMatcher
+from src.utils.safety_filters import EMERGENCY_MESSAGE, SAFE_FALLBACK_MESSAGE
+
+
+def _stream(text, size=3):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+def test_safe_stream_is_passed_through_unchanged():
+    guard = OutputSafetyGuard()
+    text = "Organize a rotina com listas curtas e pausas regulares."
+
+    assert "".join(guard.wrap(_stream(text))) == text
+    assert guard.stats()["blocked_responses"] == 0
+
+
+def test_safe_text_is_released_without_holdback():
+    guard = OutputSafetyGuard()
+    stream = iter(guard.wrap(iter(["Use um planner ", "todas as manhãs."])))
+
+    assert next(stream) == "Use um planner "
+
+
+def test_term_split_across_chunks_is_never_emitted():
+    guard = OutputSafetyGuard()
+    chunks = ["Existem ", "formas de se", " ma", "tar que...", " mais texto"]
+
+    emitted = list(guard.wrap(iter(chunks)))
+
+    assert emitted[-1].strip() == EMERGENCY_MESSAGE
+    assert "".join(emitted[:-1]) == "Existem "
+
+
+def test_stream_is_cut_and_generator_closed():
+    closed = []
+
+    def llm_stream():
+        try:
+            yield "Você pode dobrar a dose "
+            yield "se esquecer."
+        finally:
+            closed.append(True)
+
+    guard = OutputSafetyGuard()
+    stream = guard.wrap(llm_stream())
+    emitted = list(stream)
+
+    assert emitted == [SAFE_FALLBACK_MESSAGE]
+    assert closed == [True]
+    assert stream.match.category == "medicacao_perigosa"
+    assert guard.stats()["blocked_responses"] == 1
+
+
+def test_scanner_state_avoids_rescanning():
+    guard = OutputSafetyGuard()
+    stream = guard.wrap(_stream("Texto seguro " * 20, size=5))
+    list(stream)
+
+    assert stream.chunks == 52
+    stats = guard.stats()
+    assert stats["chunks"] == 52 and stats["avg_chunk_us"] > 0
+
+
+def test_screen_full_response():
+    guard = OutputSafetyGuard(RiskMatcher({"incentivo_autolesao": ["se matar"]}))
+
+    assert guard.screen("Dicas de foco") == ("Dicas de foco", None)
+    text, match = guard.screen("Você deveria se matar")
+    assert text == EMERGENCY_MESSAGE and match.term == "se matar"
+
+
+def test_educational_mentions_are_not_blocked():
+    guard = OutputSafetyGuard()
+
+    text = "Se você pensa em suicídio, ligue 188. Não dobre a dose sem orientação."
+    assert guard.screen(text)[1] is None
@@ -0,0 +1,136 @@
+import threading
+import time
+
+from src.application.services.precomputed_answers import (
+    PrecomputedAnswerStore,
+    load_artifact,
+    save_artifact,
+)
+from src.application.use_cases.precompute_answers import PrecomputeAnswers
+from src.domain.interfaces.repositories import ContextRepository, LLMProvider
+
+
+class FakeContextRepository(ContextRepository):
+    def __init__(self, context="Contexto v1"):
+        self.context = context
+
+    def retrieve_context(self, query: str) -> str:
+        return self.context
+
+
+class FakeLLM(LLMProvider):
+    model_id = "fake"
+
+    def __init__(self, fail_on=(), delay=0.0):
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, context=None, timeout=None):
+        with self._lock:
+            self.calls.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if prompt in self.fail_on:
+            return "Desculpe, estou tendo dificuldades (Erro Bedrock)."
+        return f"Resposta: {prompt}"
+
+
+QUESTIONS = ["O que é TCC?", "Preciso tomar remédio?", "Psicólogo pelo SUS"]
+
+
+def test_generates_answers_with_bounded_concurrency():
+    llm = FakeLLM(delay=0.02)
+    use_case = PrecomputeAnswers(llm, FakeContextRepository(), max_concurrency=2)
+
+    report = use_case.execute(QUESTIONS + ["o que é tcc"])
+
+    assert report.questions == 3
+    assert report.generated == 3
+    assert llm.max_in_flight == 2
+    answers = report.artifact["answers"]
+    assert [a["question"] for a in answers] == QUESTIONS
+    assert answers[0]["key"].startswith("v1:p1:")
+
+
+def test_rerun_only_regenerates_stale_answers():
+    llm = FakeLLM()
+    first = PrecomputeAnswers(llm, FakeContextRepository()).execute(QUESTIONS)
+
+    again = PrecomputeAnswers(llm, FakeContextRepository()).execute(
+        QUESTIONS[:2], first.artifact
+    )
+    assert again.generated == 0
+    assert again.unchanged == 2
+    assert again.removed == 1
+
+    # Base de conhecimento mudou: o contexto recuperado muda a chave
+    kb_changed = PrecomputeAnswers(llm, FakeContextRepository("Contexto v2")).execute(
+        QUESTIONS, first.artifact, dry_run=True
+    )
+    assert kb_changed.stale == QUESTIONS
+    assert kb_changed.generated == 0
+
+    # Prompt novo: todas desatualizadas
+    llm.prompt_version = "2"
+    prompt_changed = PrecomputeAnswers(llm, FakeContextRepository()).execute(
+        QUESTIONS, first.artifact
+    )
+    assert prompt_changed.generated == 3
+    assert prompt_changed.artifact["prompt_version"] == "2"
+
+
+def test_provider_errors_are_not_stored():
+    llm = FakeLLM(fail_on={"Preciso tomar remédio?"})
+
+    report = PrecomputeAnswers(llm, FakeContextRepository()).execute(QUESTIONS)
+
+    assert report.failed == ["Preciso tomar remédio?"]
+    assert len(report.artifact["answers"]) == 2
+
+
+def test_store_serves_normalized_questions_from_artifact(tmp_path):
+    report = PrecomputeAnswers(FakeLLM(), FakeContextRepository()).execute(QUESTIONS)
+    path = str(tmp_path / "answers.json")
+    save_artifact(report.artifact, path)
+
+    store = PrecomputedAnswerStore.from_file(path, namespace="v1")
+
+    assert len(store) == 3
+    assert store.lookup("  o que e tcc ").answer == "Resposta: O que é TCC?"
+    assert store.lookup("O que é TDAH?") is None
+    assert store.stats()["hit_rate"] == 0.5
+    # Artefato de outro namespace não é servido
+    assert len(PrecomputedAnswerStore(load_artifact(path), namespace="v2")) == 0
+
+
+def test_store_ignores_artifact_from_another_model_or_prompt(tmp_path):
+    report = PrecomputeAnswers(FakeLLM(), FakeContextRepository()).execute(QUESTIONS)
+    path = str(tmp_path / "answers.json")
+    save_artifact(report.artifact, path)
+
+    same = PrecomputedAnswerStore.from_file(
+        path, namespace="v1", llm_provider=FakeLLM()
+    )
+    assert same.lookup("O que é TCC?") is not None
+
+    upgraded = FakeLLM()
+    upgraded.model_id = "fake-v2"
+    stale = PrecomputedAnswerStore.from_file(
+        path, namespace="v1", llm_provider=upgraded
+    )
+    assert stale.lookup("O que é TCC?") is None
+    assert len(stale) == 0
+
+    new_prompt = FakeLLM()
+    new_prompt.prompt_version = "2"
+    stale = PrecomputedAnswerStore.from_file(
+        path, namespace="v1", llm_provider=new_prompt
+    )
+    assert stale.lookup("O que é TCC?") is None
@@ -1,10 +1,28 @@
-from unittest.mock import Mock
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from src.application.dtos.message_dto import ProcessMessageInput
+from src.application.services.fallback_responder import (
+    DEADLINE_FALLBACK_MESSAGE,
+    CannedResponse,
+)
+from src.application.services.intent_matcher import IntentMatcher
+from src.application.services.output_safety import OutputSafetyGuard
+from src.application.services.precomputed_answers import PrecomputedAnswerStore
 from src.application.use_cases.process_message import ProcessUserMessage
-from src.domain.interfaces.repositories import ContextRepository, LLMProvider
+from src.domain.entities.deadline import Deadline
+from src.domain.interfaces.repositories import (
+    ContextRepository,
+    LLMProvider,
+    ResponseCache,
+    SemanticCache,
+    SessionRepository,
+)
+from src.infrastructure.cache.response_cache import InMemoryResponseCache
+from src.utils.safety_filters import EMERGENCY_MESSAGE, SAFE_FALLBACK_MESSAGE
 
 
 class TestProcessUserMessage:
@@ -55,3 +73,813 @@ class TestProcessUserMessage:
         # Verifica se retornou mensagem de emergência (conteúdo exato depende do safety_filters)
         assert len(result.response_text) > 0
         mock_llm_provider.invoke.assert_not_called()
+
+    def test_stream_safe_message(self, use_case, mock_llm_provider, mock_context_repo):
+        # Arrange
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="O que é TDAH?", platform="api"
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto relevante"
+        mock_llm_provider.stream.return_value = iter(["O TDAH ", "é um transtorno."])
+
+        # Act
+        result = use_case.stream(input_dto)
+
+        # Assert
+        assert result.risk_detected is False
+        assert "".join(result.chunks) == "O TDAH é um transtorno."
+        mock_llm_provider.stream.assert_called_once_with(
+            prompt="O que é TDAH?", context={"rag_content": "Contexto relevante"}
+        )
+
+    def test_stream_unsafe_message(self, use_case, mock_llm_provider):
+        # Arrange
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="Quero morrer", platform="api"
+        )
+
+        # Act
+        result = use_case.stream(input_dto)
+
+        # Assert
+        assert result.risk_detected is True
+        assert len(list(result.chunks)) == 1
+        mock_llm_provider.stream.assert_not_called()
+
+    def test_aexecute_safe_message(
+        self, use_case, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="Olá, como vai?", platform="api"
+        )
+        mock_context_repo.aretrieve_context = AsyncMock(
+            return_value="Contexto relevante"
+        )
+        mock_llm_provider.ainvoke = AsyncMock(return_value="Estou bem!")
+
+        # Act
+        result = asyncio.run(use_case.aexecute(input_dto))
+
+        # Assert
+        assert result.response_text == "Estou bem!"
+        assert result.risk_detected is False
+        mock_llm_provider.ainvoke.assert_awaited_once_with(
+            prompt="Olá, como vai?", context={"rag_content": "Contexto relevante"}
+        )
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_aexecute_keeps_blocking_stores_off_the_event_loop(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        class SlowResponseCache(ResponseCache):
+            def get(self, key):
+                time.sleep(0.05)
+
+            def set(self, key, value):
+                time.sleep(0.05)
+
+        class SlowSemanticCache(SemanticCache):
+            def lookup(self, text):
+                time.sleep(0.05)
+
+            def store(self, text, answer):
+                time.sleep(0.05)
+
+        class SlowSessionRepository(SessionRepository):
+            def get_session(self, session_id):
+                time.sleep(0.05)
+
+            def save_session(self, session):
+                time.sleep(0.05)
+
+        mock_context_repo.aretrieve_context = AsyncMock(return_value="Contexto")
+        mock_llm_provider.ainvoke = AsyncMock(return_value="Resposta")
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            response_cache=SlowResponseCache(),
+            semantic_cache=SlowSemanticCache(),
+            session_repo=SlowSessionRepository(),
+        )
+
+        async def run():
+            gaps = []
+
+            async def heartbeat():
+                while True:
+                    started = time.perf_counter()
+                    await asyncio.sleep(0.005)
+                    gaps.append(time.perf_counter() - started)
+
+            ticker = asyncio.ensure_future(heartbeat())
+            result = await use_case.aexecute(
+                ProcessMessageInput("u", "s", "O que é TCC?", "api")
+            )
+            ticker.cancel()
+            return result, max(gaps)
+
+        result, worst_gap = asyncio.run(run())
+
+        assert result.response_text == "Resposta"
+        assert worst_gap < 0.04
+
+    def test_aexecute_unsafe_message(self, use_case, mock_llm_provider):
+        # Arrange
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="Quero morrer", platform="api"
+        )
+        mock_llm_provider.ainvoke = AsyncMock()
+
+        # Act
+        result = asyncio.run(use_case.aexecute(input_dto))
+
+        # Assert
+        assert result.risk_detected is True
+        mock_llm_provider.ainvoke.assert_not_awaited()
+
+    def test_execute_uses_response_cache(self, mock_llm_provider, mock_context_repo):
+        # Arrange
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            response_cache=InMemoryResponseCache(),
+        )
+        mock_llm_provider.model_id = "modelo-teste"
+        mock_context_repo.retrieve_context.return_value = "Contexto relevante"
+        mock_llm_provider.invoke.return_value = "Resposta gerada"
+
+        def make_input(message):
+            return ProcessMessageInput(
+                user_id="123", session_id="abc", message=message, platform="api"
+            )
+
+        # Act
+        first = use_case.execute(make_input("O que é TDAH?"))
+        second = use_case.execute(make_input("o que e tdah"))
+
+        # Assert
+        assert second.response_text == "Resposta gerada"
+        mock_llm_provider.invoke.assert_called_once()
+        assert first.metadata["cache"]["hit"] is False
+        assert second.metadata["cache"] == {
+            "hit": True,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "entries": 1,
+            "bytes": len("Resposta gerada"),
+        }
+
+    def test_execute_does_not_cache_provider_errors(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, response_cache=cache
+        )
+        mock_llm_provider.model_id = "modelo-teste"
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = (
+            "Desculpe, estou tendo dificuldades para processar sua solicitação"
+        )
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="Olá", platform="api"
+        )
+
+        # Act
+        use_case.execute(input_dto)
+
+        # Assert
+        assert len(cache) == 0
+
+    def test_stream_stores_full_response_in_cache(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, response_cache=cache
+        )
+        mock_llm_provider.model_id = "modelo-teste"
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.stream.return_value = iter(["Parte 1, ", "parte 2"])
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="Olá", platform="api"
+        )
+
+        # Act
+        list(use_case.stream(input_dto).chunks)
+        cached = use_case.stream(input_dto)
+
+        # Assert
+        assert list(cached.chunks) == ["Parte 1, parte 2"]
+        assert cached.metadata["cache"]["hit"] is True
+        mock_llm_provider.stream.assert_called_once()
+
+    def test_execute_semantic_cache_hit_skips_rag_and_llm(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        semantic_cache = Mock(spec=SemanticCache)
+        semantic_cache.lookup.return_value = "Resposta reaproveitada"
+        semantic_cache.stats.return_value = {"hit_rate": 1.0, "avg_lookup_ms": 0.2}
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, semantic_cache=semantic_cache
+        )
+        input_dto = ProcessMessageInput(
+            user_id="123",
+            session_id="abc",
+            message="Tenho que tomar medicação?",
+            platform="api",
+        )
+
+        # Act
+        result = use_case.execute(input_dto)
+
+        # Assert
+        assert result.response_text == "Resposta reaproveitada"
+        assert result.metadata["semantic_cache"]["hit"] is True
+        assert result.metadata["semantic_cache"]["avg_lookup_ms"] == 0.2
+        mock_context_repo.retrieve_context.assert_not_called()
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_execute_semantic_cache_miss_stores_answer(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        semantic_cache = Mock(spec=SemanticCache)
+        semantic_cache.lookup.return_value = None
+        semantic_cache.stats.return_value = {}
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, semantic_cache=semantic_cache
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta nova"
+        input_dto = ProcessMessageInput(
+            user_id="123", session_id="abc", message="O que é TCC?", platform="api"
+        )
+
+        # Act
+        result = use_case.execute(input_dto)
+
+        # Assert
+        assert result.metadata["semantic_cache"]["hit"] is False
+        semantic_cache.store.assert_called_once_with("O que é TCC?", "Resposta nova")
+
+    def test_execute_risk_and_bypass_never_touch_semantic_cache(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        semantic_cache = Mock(spec=SemanticCache)
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, semantic_cache=semantic_cache
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta"
+
+        # Act
+        risky = use_case.execute(
+            ProcessMessageInput(
+                user_id="123", session_id="abc", message="Quero morrer", platform="api"
+            )
+        )
+        use_case.execute(
+            ProcessMessageInput(
+                user_id="123",
+                session_id="abc",
+                message="O que é TDAH?",
+                platform="api",
+                metadata={"bypass_cache": True},
+            )
+        )
+
+        # Assert
+        assert risky.risk_detected is True
+        semantic_cache.lookup.assert_not_called()
+        semantic_cache.store.assert_not_called()
+
+    def test_execute_compresses_context_and_reports_tokens_saved(
+        self, mock_context_repo
+    ):
+        # Arrange
+        from src.application.services.context_compressor import ContextCompressor
+
+        llm = Mock(spec=LLMProvider)
+        llm.model_id = "fake-model"
+        llm.count_tokens.side_effect = lambda text: len(text.split())
+        llm.invoke.return_value = "Resposta"
+        use_case = ProcessUserMessage(
+            llm,
+            mock_context_repo,
+            context_compressor=ContextCompressor(default_budget=6),
+        )
+        mock_context_repo.retrieve_context.return_value = (
+            "O SUS oferece atendimento gratuito.\n\n"
+            "Exercícios físicos ajudam no foco diário."
+        )
+
+        # Act
+        result = use_case.execute(
+            ProcessMessageInput(
+                user_id="123", session_id="abc", message="Tem no SUS?", platform="api"
+            )
+        )
+
+        # Assert
+        llm.invoke.assert_called_once_with(
+            prompt="Tem no SUS?",
+            context={"rag_content": "O SUS oferece atendimento gratuito."},
+        )
+        assert result.metadata["context"]["tokens_saved"] == 6
+
+    def test_execute_records_turn_in_session(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        # Arrange
+        from src.domain.interfaces.repositories import SessionRepository
+
+        session_repo = Mock(spec=SessionRepository)
+        session_repo.get_session.return_value = None
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, session_repo=session_repo
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta"
+
+        # Act
+        use_case.execute(
+            ProcessMessageInput(
+                user_id="u1", session_id="s1", message="O que é TDAH?", platform="api"
+            )
+        )
+
+        # Assert
+        saved = session_repo.save_session.call_args.args[0]
+        assert saved.session_id == "s1"
+        assert saved.user_id == "u1"
+        assert [(m.role, m.content) for m in saved.messages] == [
+            ("user", "O que é TDAH?"),
+            ("assistant", "Resposta"),
+        ]
+
+    def test_turn_without_session_skips_history(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        from src.application.services.history_compactor import HistoryCompactor
+        from src.domain.interfaces.repositories import SessionRepository
+
+        session_repo = Mock(spec=SessionRepository)
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            session_repo=session_repo,
+            history_compactor=HistoryCompactor(mock_llm_provider, session_repo),
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta"
+
+        use_case.execute(ProcessMessageInput("u1", None, "O que é TDAH?", "api"))
+
+        session_repo.get_session.assert_not_called()
+        session_repo.save_session.assert_not_called()
+        assert "history" not in mock_llm_provider.invoke.call_args.kwargs["context"]
+
+    def test_execute_blocks_unsafe_llm_output_and_skips_cache(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            response_cache=cache,
+            output_guard=OutputSafetyGuard(),
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Você pode dobrar a dose à vontade."
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "Esqueci o remédio", "api")
+        )
+
+        assert result.response_text == SAFE_FALLBACK_MESSAGE
+        assert result.metadata["output_safety"]["blocked"] is True
+        assert len(cache) == 0
+
+    def test_stream_cuts_unsafe_llm_output(self, mock_llm_provider, mock_context_repo):
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            response_cache=cache,
+            output_guard=OutputSafetyGuard(),
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.stream.return_value = iter(
+            ["Organize-se. ", "Existem formas de ", "se matar", " e ..."]
+        )
+
+        result = use_case.stream(ProcessMessageInput("u", "s", "Oi", "api"))
+        chunks = list(result.chunks)
+
+        assert chunks[0] == "Organize-se. "
+        assert chunks[-1].strip() == EMERGENCY_MESSAGE
+        assert "se matar" not in "".join(chunks)
+        assert len(cache) == 0
+
+    def _slow_repo(self, mock_llm_provider, retrieval_delay=0.05):
+        def retrieve(message):
+            time.sleep(retrieval_delay)
+            return "Contexto"
+
+        repo = Mock(spec=ContextRepository)
+        repo.retrieve_context.side_effect = retrieve
+        mock_llm_provider.invoke.return_value = "Resposta"
+        return repo
+
+    def test_concurrent_pipeline_overlaps_safety_and_retrieval(self, mock_llm_provider):
+        def slow_safety(message):
+            time.sleep(0.05)
+            return True, None
+
+        repo = self._slow_repo(mock_llm_provider)
+        use_case = ProcessUserMessage(
+            mock_llm_provider, repo, concurrent=True, safety_check=slow_safety
+        )
+
+        started = time.perf_counter()
+        result = use_case.execute(ProcessMessageInput("u", "s", "Oi", "api"))
+        elapsed = time.perf_counter() - started
+
+        assert result.response_text == "Resposta"
+        assert elapsed < 0.09  # sequencial levaria ~0.1 s
+        timings = result.metadata["timings"]
+        assert timings["mode"] == "concurrent"
+        assert {"safety", "retrieval", "llm"} <= set(timings["stages_ms"])
+
+    def test_concurrent_pipeline_discards_retrieval_on_risk(self, mock_llm_provider):
+        repo = self._slow_repo(mock_llm_provider, retrieval_delay=0.2)
+        use_case = ProcessUserMessage(mock_llm_provider, repo, concurrent=True)
+
+        started = time.perf_counter()
+        result = use_case.execute(ProcessMessageInput("u", "s", "Quero morrer", "api"))
+
+        assert result.risk_detected is True
+        assert time.perf_counter() - started < 0.1  # não espera o RAG
+        assert result.metadata["timings"]["cancelled"] == ["retrieval"]
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_concurrent_pipeline_stage_timeouts(self, mock_llm_provider):
+        def hanging_safety(message):
+            time.sleep(0.3)
+            return True, None
+
+        repo = self._slow_repo(mock_llm_provider, retrieval_delay=0.3)
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            repo,
+            concurrent=True,
+            safety_check=hanging_safety,
+            safety_timeout=0.02,
+            retrieval_timeout=0.05,
+        )
+
+        safe = use_case.execute(ProcessMessageInput("u", "s", "Oi", "api"))
+        assert safe.metadata["timings"]["timeouts"] == ["safety", "retrieval"]
+        mock_llm_provider.invoke.assert_called_once_with(
+            prompt="Oi", context={"rag_content": ""}
+        )
+
+        # Timeout na segurança ainda aplica o léxico
+        risky = use_case.execute(ProcessMessageInput("u", "s", "Quero morrer", "api"))
+        assert risky.risk_detected is True
+
+    def test_aexecute_concurrent_pipeline(self, mock_llm_provider):
+        async def retrieve(message):
+            await asyncio.sleep(0.01)
+            return "Contexto"
+
+        repo = Mock(spec=ContextRepository)
+        repo.aretrieve_context.side_effect = retrieve
+        mock_llm_provider.ainvoke = AsyncMock(return_value="Resposta")
+        use_case = ProcessUserMessage(mock_llm_provider, repo, concurrent=True)
+
+        result = asyncio.run(
+            use_case.aexecute(ProcessMessageInput("u", "s", "Oi", "api"))
+        )
+
+        assert result.response_text == "Resposta"
+        assert result.metadata["timings"]["mode"] == "concurrent"
+        mock_llm_provider.ainvoke.assert_awaited_once_with(
+            prompt="Oi", context={"rag_content": "Contexto"}
+        )
+
+    def test_deadline_is_passed_to_llm_as_timeout(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        use_case = ProcessUserMessage(mock_llm_provider, mock_context_repo)
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta"
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "Oi", "api", deadline=Deadline.after(3.0))
+        )
+
+        assert result.response_text == "Resposta"
+        timeout = mock_llm_provider.invoke.call_args[1]["timeout"]
+        assert 2.5 < timeout <= 2.75  # deadline menos a reserva de pós-processamento
+        assert 2900 < result.metadata["timings"]["budget_ms"] <= 3000
+
+    def test_slow_llm_degrades_to_fallback_before_deadline(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            response_cache=cache,
+            deadline_reserve=0.05,
+            min_llm_seconds=0.05,
+        )
+        mock_context_repo.retrieve_context.return_value = (
+            "A procrastinação é comum no TDAH. O diagnóstico é clínico."
+        )
+        mock_llm_provider.invoke.side_effect = lambda **kwargs: time.sleep(1) or "x"
+
+        started = time.perf_counter()
+        result = use_case.execute(
+            ProcessMessageInput(
+                "u", "s", "procrastinação", "api", deadline=Deadline.after(0.3)
+            )
+        )
+
+        assert time.perf_counter() - started < 0.35
+        assert "A procrastinação é comum no TDAH." in result.response_text
+        assert result.metadata["timings"]["fallbacks"] == ["llm"]
+        assert result.metadata["timings"]["timeouts"] == ["llm"]
+        assert len(cache) == 0
+
+    def test_llm_call_abandoned_in_queue_never_starts(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            deadline_reserve=0.05,
+            min_llm_seconds=0.05,
+            max_workers=1,
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        # Pool ocupado: a chamada ao LLM fica na fila além do prazo
+        use_case._deadline_executor().submit(time.sleep, 0.4)
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "Oi", "api", deadline=Deadline.after(0.2))
+        )
+        time.sleep(0.3)
+
+        assert result.metadata["timings"]["timeouts"] == ["llm"]
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_abandoned_llm_calls_do_not_starve_pipeline_stages(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            concurrent=True,
+            safety_timeout=0.2,
+            retrieval_timeout=0.2,
+            max_workers=1,
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta"
+        # Chamada ao LLM abandonada ainda em curso no pool do LLM
+        use_case._deadline_executor().submit(time.sleep, 0.5)
+
+        result = use_case.execute(ProcessMessageInput("u", "s", "Oi", "api"))
+
+        assert "timeouts" not in result.metadata["timings"]
+
+    def test_exhausted_deadline_skips_llm(self, mock_llm_provider, mock_context_repo):
+        use_case = ProcessUserMessage(mock_llm_provider, mock_context_repo)
+        mock_context_repo.retrieve_context.return_value = ""
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "Oi", "api", deadline=Deadline.after(0.1))
+        )
+
+        assert result.response_text == DEADLINE_FALLBACK_MESSAGE
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_aexecute_deadline_fallback(self, mock_llm_provider, mock_context_repo):
+        async def slow_ainvoke(**kwargs):
+            await asyncio.sleep(1)
+            return "tarde demais"
+
+        mock_context_repo.aretrieve_context = AsyncMock(return_value="")
+        mock_llm_provider.ainvoke = slow_ainvoke
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            deadline_reserve=0.05,
+            min_llm_seconds=0.05,
+        )
+
+        result = asyncio.run(
+            use_case.aexecute(
+                ProcessMessageInput("u", "s", "Oi", "api", deadline=Deadline.after(0.2))
+            )
+        )
+
+        assert result.response_text == DEADLINE_FALLBACK_MESSAGE
+
+    def test_provider_failure_degrades_to_fallback_answer(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, response_cache=cache
+        )
+        mock_context_repo.retrieve_context.return_value = (
+            "A procrastinação é comum no TDAH."
+        )
+        mock_llm_provider.invoke.return_value = (
+            "Desculpe, estou tendo dificuldades para processar sua solicitação"
+        )
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "procrastinação", "api")
+        )
+
+        assert "A procrastinação é comum no TDAH." in result.response_text
+        assert result.metadata["timings"]["fallbacks"] == ["llm"]
+        assert len(cache) == 0
+
+    def test_stream_provider_failure_degrades_to_fallback_answer(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, response_cache=cache
+        )
+        mock_context_repo.retrieve_context.return_value = (
+            "A procrastinação é comum no TDAH."
+        )
+        mock_llm_provider.stream.return_value = iter(
+            ["Desculpe, estou tendo dificuldades para processar sua solicitação"]
+        )
+
+        chunks = list(
+            use_case.stream(
+                ProcessMessageInput("u", "s", "procrastinação", "api")
+            ).chunks
+        )
+
+        assert "A procrastinação é comum no TDAH." in "".join(chunks)
+        assert len(cache) == 0
+
+    def test_stream_failure_after_first_chunk_ends_partial_answer(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        def failing_stream(**kwargs):
+            yield "Parte 1"
+            raise ConnectionError("conexão perdida")
+
+        cache = InMemoryResponseCache()
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, response_cache=cache
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.stream.side_effect = failing_stream
+
+        chunks = list(
+            use_case.stream(ProcessMessageInput("u", "s", "Oi", "api")).chunks
+        )
+
+        assert chunks == ["Parte 1"]
+        assert len(cache) == 0
+
+    def test_known_intent_skips_rag_and_llm(self, mock_llm_provider, mock_context_repo):
+        matcher = IntentMatcher(
+            [CannedResponse("Saudação", ("Olá", "Bom dia"), "Oi! Como posso ajudar?")]
+        )
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, intent_matcher=matcher
+        )
+        mock_context_repo.aretrieve_context = AsyncMock(return_value="")
+
+        result = use_case.execute(ProcessMessageInput("u", "s", "bom dia!", "api"))
+        streamed = use_case.stream(ProcessMessageInput("u", "s", "Olá", "api"))
+        awaited = asyncio.run(
+            use_case.aexecute(ProcessMessageInput("u", "s", "ola", "api"))
+        )
+
+        assert result.response_text == "Oi! Como posso ajudar?"
+        assert result.metadata["intent"]["name"] == "Saudação"
+        assert "intent" in result.metadata["timings"]["stages_ms"]
+        assert "".join(streamed.chunks) == "Oi! Como posso ajudar?"
+        assert awaited.response_text == "Oi! Como posso ajudar?"
+        mock_context_repo.retrieve_context.assert_not_called()
+        mock_llm_provider.invoke.assert_not_called()
+
+    def test_intent_fast_path_skipped_for_dialogflow(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        matcher = IntentMatcher(
+            [CannedResponse("Saudação", ("Olá", "Bom dia"), "Oi! Como posso ajudar?")]
+        )
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, intent_matcher=matcher
+        )
+        mock_context_repo.retrieve_context.return_value = "Contexto"
+        mock_llm_provider.invoke.return_value = "Resposta do LLM"
+
+        result = use_case.execute(
+            ProcessMessageInput("u", "s", "bom dia!", "dialogflow")
+        )
+
+        # O agente já casou os intents antes do webhook: segue para RAG + LLM
+        assert result.response_text == "Resposta do LLM"
+        assert "intent" not in result.metadata["timings"]["stages_ms"]
+        assert matcher.stats()["lookups"] == 0
+
+        configured = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            intent_matcher=matcher,
+            intent_platforms=("api", "dialogflow"),
+        )
+        assert (
+            configured.execute(
+                ProcessMessageInput("u", "s", "bom dia!", "dialogflow")
+            ).response_text
+            == "Oi! Como posso ajudar?"
+        )
+        mock_llm_provider.stream.assert_not_called()
+
+    def test_intent_fast_path_after_safety_and_respects_bypass(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        matcher = IntentMatcher(
+            [
+                CannedResponse("Crise", ("Quero morrer",), "Resposta pronta"),
+                CannedResponse("Organização", ("Dicas de organização",), "Listas"),
+            ]
+        )
+        use_case = ProcessUserMessage(
+            mock_llm_provider, mock_context_repo, intent_matcher=matcher
+        )
+        mock_context_repo.retrieve_context.return_value = ""
+        mock_llm_provider.invoke.return_value = "Resposta do LLM"
+
+        risky = use_case.execute(ProcessMessageInput("u", "s", "Quero morrer", "api"))
+        bypass = use_case.execute(
+            ProcessMessageInput(
+                "u",
+                "s",
+                "Dicas de organização",
+                "api",
+                metadata={"bypass_cache": True},
+            )
+        )
+
+        assert risky.risk_detected is True
+        assert risky.response_text == EMERGENCY_MESSAGE
+        assert bypass.response_text == "Resposta do LLM"
+        assert matcher.stats()["lookups"] == 0
+
+    def test_precomputed_answer_served_before_intents(
+        self, mock_llm_provider, mock_context_repo
+    ):
+        store = PrecomputedAnswerStore(
+            {
+                "namespace": "v1",
+                "answers": [
+                    {
+                        "question": "O que é TCC?",
+                        "answer": "Resposta pré-computada",
+                        "key": "v1:p1:abc",
+                        "context_hash": "def",
+                    }
+                ],
+            }
+        )
+        matcher = IntentMatcher(
+            [CannedResponse("TCC", ("O que é TCC?",), "Resposta do intent")]
+        )
+        use_case = ProcessUserMessage(
+            mock_llm_provider,
+            mock_context_repo,
+            intent_matcher=matcher,
+            precomputed_answers=store,
+        )
+
+        result = use_case.execute(ProcessMessageInput("u", "s", "o que é tcc", "api"))
+
+        assert result.response_text == "Resposta pré-computada"
+        assert result.metadata["precomputed"]["hit"] is True
+        assert matcher.stats()["lookups"] == 0
+        mock_context_repo.retrieve_context.assert_not_called()
+        mock_llm_provider.invoke.assert_not_called()
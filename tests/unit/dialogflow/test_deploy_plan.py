@@ -0,0 +1,62 @@
+from src.dialogflow.deploy_plan import (
+    compute_plan,
+    empty_state,
+    load_state,
+    resource_hash,
+    save_state,
+)
+
+
+def _intent(name, phrase="oi"):
+    return {"display_name": name, "training_phrases": [phrase]}
+
+
+def _state(**intents):
+    state = empty_state("proj")
+    for display_name, item in intents.items():
+        state["intents"][display_name] = {
+            "hash": resource_hash(item),
+            "name": f"intents/{display_name}",
+        }
+    return state
+
+
+def test_hash_ignores_key_order():
+    assert resource_hash({"a": 1, "b": [1, 2]}) == resource_hash({"b": [1, 2], "a": 1})
+    assert resource_hash({"a": 1}) != resource_hash({"a": 2})
+
+
+def test_offline_plan_diffs_against_last_applied_state():
+    state = _state(A=_intent("A"), B=_intent("B"), C=_intent("C"))
+    config = {"intents": [_intent("A"), _intent("B", "olá"), _intent("D")]}
+
+    plan = compute_plan(config, state)
+
+    assert plan.against == "estado"
+    assert plan.intents.create == ["D"]
+    assert plan.intents.update == ["B"]
+    assert plan.intents.delete == {"C": "intents/C"}
+    assert plan.intents.unchanged == 1
+    assert plan.changes == 3
+
+
+def test_live_plan_detects_drift_and_never_deletes_unmanaged_resources():
+    state = _state(A=_intent("A"), C=_intent("C"))
+    live = {
+        "entities": {},
+        # A foi apagada no console; Default Welcome Intent não é do config
+        "intents": {"C": "intents/9", "Default Welcome Intent": "intents/0"},
+    }
+
+    plan = compute_plan({"intents": [_intent("A")]}, state, live)
+
+    assert plan.intents.create == ["A"]
+    assert plan.intents.delete == {"C": "intents/9"}
+
+
+def test_state_from_other_project_is_ignored(tmp_path):
+    path = str(tmp_path / "state.json")
+    save_state(_state(A=_intent("A")), path)
+
+    assert load_state(path, "proj")["intents"]
+    assert load_state(path, "outro") == empty_state("outro")
@@ -1,8 +1,12 @@
+import json
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 from google.api_core.exceptions import AlreadyExists
 
+from src.dialogflow.in_memory_agent import InMemoryAgent
 from src.dialogflow.manager import DialogflowManager
 
 
@@ -74,3 +78,277 @@ def test_create_entity_exists_update(manager):
 
     manager.entity_types_client.update_entity_type.assert_called_once()
     manager.entity_types_client.batch_update_entities.assert_called_once()
+
+
+def _resource(display_name, name):
+    return SimpleNamespace(display_name=display_name, name=name)
+
+
+def _write_config(tmp_path, intents, entities):
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps(
+            {
+                "intents": [
+                    {"display_name": n, "training_phrases": ["oi"], "messages": []}
+                    for n in intents
+                ],
+                "entities": [
+                    {
+                        "display_name": n,
+                        "kind": "KIND_MAP",
+                        "entries": [{"value": "v", "synonyms": ["v"]}],
+                    }
+                    for n in entities
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_sync_lists_agent_once_and_decides_create_or_update_upfront(manager, tmp_path):
+    manager.intents_client.list_intents.return_value = [
+        _resource("A", "intents/1"),
+        _resource("B", "intents/2"),
+    ]
+    manager.entity_types_client.list_entity_types.return_value = [
+        _resource("E", "entityTypes/1")
+    ]
+    path = _write_config(tmp_path, ["A", "B", "C"], ["E", "F"])
+
+    manager.sync_from_json(path)
+
+    manager.intents_client.list_intents.assert_called_once()
+    manager.entity_types_client.list_entity_types.assert_called_once()
+    # Visão leve: a listagem não pede INTENT_VIEW_FULL
+    assert "intent_view" not in manager.intents_client.list_intents.call_args.kwargs
+    assert manager.intents_client.create_intent.call_count == 1
+    assert manager.intents_client.update_intent.call_count == 2
+    assert manager.entity_types_client.create_entity_type.call_count == 1
+    assert manager.stats["intents_updated"] == 2
+    assert manager.stats["entities_created"] == 1
+    # 2 listagens + 3 intents + (1 create + 1 update + 2 batch) entidades
+    assert sum(manager.rpc_counts.values()) == 9
+    assert manager._legacy_rpc_estimate() == {"total": 13, "listings": 3}
+
+
+def test_stale_index_relists_once_on_already_exists(manager):
+    manager._intent_index = {}
+    manager.intents_client.create_intent.side_effect = AlreadyExists("Exists")
+    manager.intents_client.list_intents.return_value = [_resource("A", "intents/1")]
+
+    manager.create_intent({"display_name": "A", "training_phrases": ["oi"]})
+
+    manager.intents_client.list_intents.assert_called_once()
+    manager.intents_client.update_intent.assert_called_once()
+    assert manager._intent_index == {"A": "intents/1"}
+
+
+def test_index_listing_runs_outside_the_manager_lock(manager):
+    listing, release = threading.Event(), threading.Event()
+
+    def slow_listing(request):
+        listing.set()
+        release.wait(2)
+        return [_resource("A", "intents/1")]
+
+    manager.intents_client.list_intents.side_effect = slow_listing
+    worker = threading.Thread(target=manager._get_intent_id, args=("A",))
+    worker.start()
+    try:
+        assert listing.wait(2)
+        # Outras threads seguem contando stats enquanto a listagem está na rede
+        assert manager._lock.acquire(timeout=1)
+        manager._lock.release()
+    finally:
+        release.set()
+        worker.join(2)
+
+    assert manager._intent_index == {"A": "intents/1"}
+
+
+def _concurrent_manager(agent, max_workers=4):
+    return DialogflowManager(
+        "bench",
+        max_workers=max_workers,
+        intents_client=agent.intents_client,
+        entity_types_client=agent.entity_types_client,
+    )
+
+
+def test_concurrent_sync_runs_entities_before_dependent_intents(tmp_path):
+    agent = InMemoryAgent(latency_ms=5)
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps(
+            {
+                "entities": [
+                    {
+                        "display_name": f"entidade_{i}",
+                        "kind": "KIND_MAP",
+                        "entries": [{"value": "v", "synonyms": ["v"]}],
+                    }
+                    for i in range(2)
+                ],
+                "intents": [
+                    {"display_name": f"livre_{i}", "training_phrases": ["oi"]}
+                    for i in range(6)
+                ]
+                + [
+                    {
+                        "display_name": "pedido",
+                        "training_phrases": ["quero"],
+                        "parameters": [
+                            {
+                                "display_name": "item",
+                                "entity_type_display_name": "@entidade_0",
+                            }
+                        ],
+                    }
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    manager = _concurrent_manager(agent)
+    events = []
+    create_entity_type, create_intent = (
+        manager.create_entity_type,
+        manager.create_intent,
+    )
+
+    def entity_spy(display_name, *args):
+        create_entity_type(display_name, *args)
+        events.append(f"entidade pronta: {display_name}")
+
+    def intent_spy(intent_data):
+        events.append(f"intent: {intent_data['display_name']}")
+        create_intent(intent_data)
+
+    manager.create_entity_type, manager.create_intent = entity_spy, intent_spy
+
+    manager.sync_from_json(str(path))
+
+    assert manager.stats["entities_created"] == 2
+    assert manager.stats["intents_created"] == 7
+    assert 1 < agent.max_in_flight <= 4
+    entities_done = max(i for i, e in enumerate(events) if e.startswith("entidade"))
+    # Intents independentes andam junto com as entidades; "pedido" espera por elas
+    assert events.index("intent: livre_0") < entities_done
+    assert events.index("intent: pedido") > entities_done
+    assert len(agent.intents) == 7
+    assert len(manager.rpc_latencies["create_intent"]) == 7
+    assert "create_intent: n=7" in manager._latency_report()
+
+
+def test_concurrent_sync_updates_existing_resources(tmp_path):
+    agent = InMemoryAgent()
+    path = _write_config(tmp_path, ["A", "B"], ["E"])
+    _concurrent_manager(agent).sync_from_json(path)
+
+    manager = _concurrent_manager(agent)
+    manager.sync_from_json(path)
+
+    assert manager.stats["intents_updated"] == 2
+    assert manager.stats["entities_updated"] == 1
+    assert manager.rpc_counts["create_intent"] == 0
+    assert len(agent.intents) == 2
+
+
+def _write_agent_config(path, intents, entities=()):
+    path.write_text(
+        json.dumps(
+            {
+                "entities": [
+                    {
+                        "display_name": name,
+                        "kind": "KIND_MAP",
+                        "entries": [{"value": value, "synonyms": [value]}],
+                    }
+                    for name, value in entities
+                ],
+                "intents": [
+                    {"display_name": name, "training_phrases": [phrase]}
+                    for name, phrase in intents
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_apply_pushes_only_the_diff_and_records_state(tmp_path):
+    agent = InMemoryAgent()
+    state = str(tmp_path / "state.json")
+    config = tmp_path / "config.json"
+    names = [(f"intent_{i}", "oi") for i in range(10)]
+    _write_agent_config(config, names, [("E", "v"), ("F", "v")])
+    _concurrent_manager(agent).apply(str(config), state)
+    assert len(agent.intents) == 10
+
+    # Uma intent alterada, uma removida, uma nova e uma entidade removida
+    _write_agent_config(
+        config,
+        [("intent_0", "olá")] + names[1:9] + [("nova", "oi")],
+        [("E", "v")],
+    )
+    manager = _concurrent_manager(agent)
+    plan = manager.plan(str(config), state)
+    assert plan.intents.update == ["intent_0"]
+    assert plan.intents.create == ["nova"]
+    assert list(plan.intents.delete) == ["intent_9"]
+    assert list(plan.entities.delete) == ["F"]
+    assert sum(manager.rpc_counts.values()) == 2
+
+    agent.calls.clear()
+    manager.apply(str(config), state)
+
+    assert sorted(agent.calls) == [
+        "create_intent",
+        "delete_entity_type",
+        "delete_intent",
+        "list_entity_types",
+        "list_intents",
+        "update_intent",
+    ]
+    assert manager.stats["intents_deleted"] == 1
+    assert manager.stats["entities_deleted"] == 1
+    assert sorted(i.display_name for i in agent.intents.values()) == sorted(
+        [n for n, _ in names[:9]] + ["nova"]
+    )
+    assert _concurrent_manager(agent).plan(str(config), state).changes == 0
+
+
+def test_apply_keeps_failed_items_pending_for_the_next_run(tmp_path):
+    agent = InMemoryAgent()
+    state = str(tmp_path / "state.json")
+    config = _write_agent_config(tmp_path / "config.json", [("A", "oi"), ("B", "oi")])
+    manager = _concurrent_manager(agent, max_workers=1)
+    original = agent.intents_client.create_intent
+
+    def flaky_create(parent, intent, **kwargs):
+        if intent.display_name == "B":
+            raise RuntimeError("quota")
+        return original(parent=parent, intent=intent, **kwargs)
+
+    manager.intents_client = MagicMock(wraps=agent.intents_client)
+    manager.intents_client.create_intent.side_effect = flaky_create
+    manager.apply(config, state)
+    assert manager.stats["intents_failed"] == 1
+
+    plan = _concurrent_manager(agent).plan(config, state, offline=True)
+    assert plan.intents.create == ["B"]
+    assert plan.intents.unchanged == 1
+
+
+def test_full_sync_writes_state_for_incremental_applies(tmp_path):
+    agent = InMemoryAgent()
+    state = str(tmp_path / "state.json")
+    config = _write_agent_config(tmp_path / "config.json", [("A", "oi")], [("E", "v")])
+
+    _concurrent_manager(agent).sync_from_json(config, state_path=state)
+
+    assert _concurrent_manager(agent).plan(config, state, offline=True).changes == 0
@@ -0,0 +1,40 @@
+import pytest
+
+from src.dialogflow.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_burst_then_throttles_to_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    # Rajada esgotada: a próxima ficha leva 1/rate segundos
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.waited == pytest.approx(0.5)
+
+
+def test_refill_is_capped_at_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket.per_minute(60, burst=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+
+    clock.now += 30
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
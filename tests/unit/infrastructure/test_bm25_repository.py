@@ -0,0 +1,183 @@
+import threading
+import time
+
+import numpy as np
+
+from src.domain.entities.knowledge import RetrievedChunk
+from src.infrastructure.embeddings.hashing_embeddings import HashingEmbeddings
+from src.infrastructure.repositories.bm25_repository import BM25ContextRepository
+from src.infrastructure.repositories.hybrid_repository import (
+    HybridContextRepository,
+    reciprocal_rank_fusion,
+)
+from src.infrastructure.repositories.local_vector_repository import (
+    LocalVectorContextRepository,
+    save_vector_index,
+)
+from src.utils.text_normalization import tokenize
+
+CHUNKS = {
+    "tcc": "A TCC (Terapia Cognitivo-Comportamental) ajuda na organização da rotina.",
+    "sus": "O SUS oferece atendimento gratuito nos CAPS para adultos com TDAH.",
+    "med": "Metilfenidato e lisdexanfetamina são medicações prescritas pelo psiquiatra.",
+    "dica": "Use listas, alarmes e divida tarefas grandes em etapas menores.",
+}
+
+
+def _bm25(**kwargs):
+    return BM25ContextRepository(list(CHUNKS), list(CHUNKS.values()), **kwargs)
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert tokenize("As Medicações do SUS são remédios") == [
+        "medicacao",
+        "sus",
+        "remedio",
+    ]
+
+
+def test_bm25_matches_clinical_acronyms_and_drug_names():
+    repo = _bm25(top_k=1)
+
+    assert repo.search("tcc")[0].chunk_id == "tcc"
+    assert repo.search("Atendimento pelo SUS?")[0].chunk_id == "sus"
+    assert repo.search("metilfenidato")[0].chunk_id == "med"
+
+
+def test_bm25_accent_insensitive_and_plural():
+    repo = _bm25(top_k=1)
+
+    assert repo.search("medicacao prescrita")[0].chunk_id == "med"
+    assert repo.search("organizacão")[0].chunk_id == "tcc"
+
+
+def test_bm25_no_match_returns_empty():
+    assert _bm25().search("xyzzy") == []
+    assert _bm25().retrieve_context("de a o") == ""
+
+
+def test_bm25_from_file(tmp_path):
+    path = str(tmp_path / "kb.npz")
+    save_vector_index(
+        path, list(CHUNKS), list(CHUNKS.values()), np.zeros((len(CHUNKS), 4))
+    )
+
+    repo = BM25ContextRepository.from_file(path, top_k=2)
+
+    assert repo.search("CAPS")[0].chunk_id == "sus"
+
+
+def test_bm25_latency_well_under_a_millisecond():
+    rng = np.random.default_rng(1)
+    vocabulary = [f"termo{i}" for i in range(3000)] + ["tcc", "sus"]
+    texts = [" ".join(rng.choice(vocabulary, 120)) for _ in range(2000)]
+    repo = BM25ContextRepository([str(i) for i in range(2000)], texts, top_k=4)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        repo.search("tcc pelo sus termo42")
+    elapsed_ms = (time.perf_counter() - start) * 1000 / 200
+
+    assert elapsed_ms < 1.0
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a = [RetrievedChunk("x", "x", 9.0), RetrievedChunk("y", "y", 5.0)]
+    b = [RetrievedChunk("y", "y", 0.9), RetrievedChunk("z", "z", 0.8)]
+
+    fused = reciprocal_rank_fusion([a, b], k=60)
+
+    assert [c.chunk_id for c in fused] == ["y", "x", "z"]
+    assert fused[0].score == 1 / 61 + 1 / 62
+
+
+def test_hybrid_combines_lexical_and_vector():
+    embeddings = HashingEmbeddings()
+    texts = list(CHUNKS.values())
+    vector = LocalVectorContextRepository(
+        embeddings, list(CHUNKS), texts, embeddings.embed(texts)
+    )
+    repo = HybridContextRepository([_bm25(), vector], top_k=2)
+
+    chunks = repo.search("tratamento com metilfenidato")
+
+    assert chunks[0].chunk_id == "med"
+    assert len(chunks) == 2
+
+
+def test_hybrid_queries_retrievers_concurrently_and_survives_failures():
+    class Slow(BM25ContextRepository):
+        in_process = False  # simula um backend remoto
+
+        def search(self, query, top_k=None, min_score=None):
+            time.sleep(0.1)
+            return super().search(query, top_k)
+
+    class Broken(BM25ContextRepository):
+        def search(self, query, top_k=None, min_score=None):
+            raise RuntimeError("falhou")
+
+    repo = HybridContextRepository(
+        [Slow(list(CHUNKS), list(CHUNKS.values())) for _ in range(2)]
+    )
+    start = time.perf_counter()
+    assert repo.search("SUS")[0].chunk_id == "sus"
+    assert time.perf_counter() - start < 0.19
+
+    broken = HybridContextRepository(
+        [Broken(list(CHUNKS), list(CHUNKS.values())), _bm25()]
+    )
+    assert broken.search("SUS")[0].chunk_id == "sus"
+
+
+def test_hybrid_timeout_drops_slow_retriever():
+    class Slow(BM25ContextRepository):
+        in_process = False
+
+        def search(self, query, top_k=None, min_score=None):
+            time.sleep(0.3)
+            return []
+
+    repo = HybridContextRepository(
+        [Slow(list(CHUNKS), list(CHUNKS.values())), _bm25()], timeout=0.05
+    )
+
+    start = time.perf_counter()
+    assert repo.search("SUS")[0].chunk_id == "sus"
+    assert time.perf_counter() - start < 0.2
+
+
+def test_hybrid_runs_in_process_retrievers_inline():
+    threads = []
+
+    class Local(BM25ContextRepository):
+        def search(self, query, top_k=None, min_score=None):
+            threads.append(threading.current_thread())
+            return super().search(query, top_k)
+
+    class Remote(Local):
+        in_process = False
+
+    embeddings = HashingEmbeddings()
+    texts = list(CHUNKS.values())
+    vector = LocalVectorContextRepository(
+        embeddings, list(CHUNKS), texts, embeddings.embed(texts)
+    )
+    assert vector.in_process
+
+    local = HybridContextRepository(
+        [Local(list(CHUNKS), list(CHUNKS.values())), vector]
+    )
+    assert local._executor is None
+    assert local.search("SUS")[0].chunk_id == "sus"
+    assert threads == [threading.current_thread()]
+
+    threads.clear()
+    mixed = HybridContextRepository(
+        [
+            Remote(list(CHUNKS), list(CHUNKS.values())),
+            Local(list(CHUNKS), list(CHUNKS.values())),
+        ]
+    )
+    assert mixed.search("SUS")[0].chunk_id == "sus"
+    assert sorted(t is threading.current_thread() for t in threads) == [False, True]
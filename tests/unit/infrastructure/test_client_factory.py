@@ -0,0 +1,140 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ReadTimeoutError
+
+from src.infrastructure.client_factory import (
+    ClientFactory,
+    ClientSettings,
+    call_timeout,
+    get_client_factory,
+)
+
+
+def test_settings_from_env():
+    env = {
+        "AWS_REGION": "sa-east-1",
+        "CLIENT_MAX_POOL_CONNECTIONS": "20",
+        "CLIENT_CONNECT_TIMEOUT_SECONDS": "0.5",
+        "CLIENT_TCP_KEEPALIVE": "false",
+    }
+    with patch.dict("os.environ", env):
+        settings = ClientSettings.from_env()
+
+    assert settings.region_name == "sa-east-1"
+    assert settings.max_pool_connections == 20
+    assert settings.connect_timeout == 0.5
+    assert settings.tcp_keepalive is False
+
+
+def test_botocore_config_uses_pool_keepalive_and_overrides():
+    factory = ClientFactory(ClientSettings(max_pool_connections=32))
+
+    config = factory.botocore_config(read_timeout=5, max_attempts=1)
+
+    assert config.max_pool_connections == 32
+    assert config.tcp_keepalive is True
+    assert config.connect_timeout == 2.0
+    assert config.read_timeout == 5
+    assert config.retries == {"max_attempts": 1, "mode": "standard"}
+
+
+def test_region_and_endpoint_per_service():
+    factory = ClientFactory(ClientSettings(region_name="us-east-1"))
+    env = {
+        "BEDROCK_RUNTIME_REGION": "us-west-2",
+        "DYNAMODB_ENDPOINT_URL": "http://localhost:8000",
+    }
+    with patch.dict("os.environ", env):
+        assert factory.region_for("bedrock-runtime") == "us-west-2"
+        assert factory.region_for("s3") == "us-east-1"
+        assert factory.endpoint_for("dynamodb") == "http://localhost:8000"
+        assert factory.endpoint_for("s3") is None
+
+
+@patch("boto3.client")
+def test_aws_client_is_shared_per_configuration(mock_client):
+    mock_client.side_effect = lambda **kwargs: object()
+    factory = ClientFactory(ClientSettings())
+
+    first = factory.aws_client("bedrock-runtime", max_attempts=1)
+
+    assert factory.aws_client("bedrock-runtime", max_attempts=1) is first
+    assert factory.aws_client("bedrock-runtime", read_timeout=3) is not first
+    assert mock_client.call_count == 2
+    kwargs = mock_client.call_args_list[0].kwargs
+    assert kwargs["service_name"] == "bedrock-runtime"
+    assert kwargs["config"].max_pool_connections == 50
+
+    factory.clear()
+    assert factory.stats() == {"clients": 0}
+
+
+class _SlowBedrock(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(0.3)
+        body = b'{"generation": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_per_call_timeout_applies_deadline_on_one_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowBedrock)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    factory = ClientFactory(ClientSettings(read_timeout=60.0))
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def client():
+        return factory.aws_client(
+            "bedrock-runtime",
+            region_name="us-east-1",
+            endpoint_url=endpoint,
+            max_attempts=1,
+            per_call_timeout=True,
+        )
+
+    try:
+        with call_timeout(0.1), pytest.raises(ReadTimeoutError):
+            client().invoke_model(modelId="m", body="{}")
+        with call_timeout(5.0):
+            assert client().invoke_model(modelId="m", body="{}")["body"].read()
+        # Fora do bloco vale o read_timeout da configuração
+        assert client().invoke_model(modelId="m", body="{}")["body"].read()
+    finally:
+        server.shutdown()
+
+    assert client() is client()
+    assert factory.stats() == {"clients": 1}
+
+
+def test_http_client_is_reused_with_pool_limits():
+    factory = ClientFactory(
+        ClientSettings(max_pool_connections=8, connect_timeout=1.0, read_timeout=9.0)
+    )
+
+    client = factory.http_client()
+
+    assert factory.http_client() is client
+    assert client.timeout.connect == 1.0
+    assert client.timeout.read == 9.0
+    pool = client._transport._pool
+    assert pool._max_connections == 8
+    assert pool._keepalive_expiry == 60.0
+    client.close()
+
+
+def test_process_factory_is_a_singleton():
+    assert get_client_factory() is get_client_factory()
@@ -0,0 +1,37 @@
+import io
+from unittest.mock import MagicMock
+
+from src.infrastructure.repositories.document_sources import (
+    iter_local_documents,
+    iter_s3_documents,
+)
+
+
+def test_iter_local_documents_walks_directories(tmp_path):
+    (tmp_path / "a.md").write_text("# A", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("B", encoding="utf-8")
+    (tmp_path / "ignorado.png").write_bytes(b"\x89")
+
+    documents = list(iter_local_documents([str(tmp_path)]))
+
+    assert sorted(d.text for d in documents) == ["# A", "B"]
+
+
+def test_iter_s3_documents_paginates():
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": "kb/a.md"}, {"Key": "kb/foto.jpg"}]},
+        {"Contents": [{"Key": "kb/b.md"}]},
+    ]
+    client.get_object.side_effect = lambda Bucket, Key: {
+        "Body": io.BytesIO(f"conteúdo {Key}".encode("utf-8"))
+    }
+
+    documents = list(iter_s3_documents("bucket", "kb/", client=client))
+
+    assert [d.source for d in documents] == [
+        "s3://bucket/kb/a.md",
+        "s3://bucket/kb/b.md",
+    ]
+    assert client.get_object.call_count == 2
@@ -0,0 +1,37 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from src.infrastructure.embeddings.bedrock_embeddings import BedrockEmbeddings
+
+
+class TestBedrockEmbeddings:
+    @patch("boto3.client")
+    def test_embed_success(self, mock_boto):
+        # Arrange
+        mock_client = MagicMock()
+        mock_boto.return_value = mock_client
+        responses = {
+            "a": b'{"embedding": [0.6, 0.8]}',
+            "b": b'{"embedding": [1.0, 0.0]}',
+        }
+
+        def invoke_model(modelId, body):
+            payload = responses[json.loads(body)["inputText"]]
+            return {"body": MagicMock(read=lambda: payload)}
+
+        mock_client.invoke_model.side_effect = invoke_model
+
+        adapter = BedrockEmbeddings(dimensions=2)
+
+        # Act
+        vectors = adapter.embed(["a", "b"])
+
+        # Assert
+        assert vectors.shape == (2, 2)
+        assert vectors[0].tolist() == [0.6000000238418579, 0.800000011920929]
+        assert vectors[1].tolist() == [1.0, 0.0]
+        bodies = [
+            json.loads(call[1]["body"])
+            for call in mock_client.invoke_model.call_args_list
+        ]
+        assert {"inputText": "a", "dimensions": 2, "normalize": True} in bodies
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from src.domain.interfaces.repositories import PROVIDER_ERROR_PREFIX, LLMProvider
+from src.infrastructure.llm.hedged_provider import HedgedLLMProvider
+
+
+class SleepyProvider(LLMProvider):
+    def __init__(self, name, delay, fail=False):
+        self.name = name
+        self.model_id = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.timeouts = []
+
+    def invoke(self, prompt, context=None, timeout=None):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        time.sleep(self.delay)
+        if self.fail:
+            return f"{PROVIDER_ERROR_PREFIX} (Erro {self.name})"
+        return f"resposta {self.name}"
+
+
+def test_fast_primary_never_fires_hedge():
+    primary, hedge = SleepyProvider("bedrock", 0.01), SleepyProvider("openai", 0.01)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=0.2)
+
+    assert provider.invoke("Oi") == "resposta bedrock"
+    assert hedge.calls == 0 and provider.stats()["hedged"] == 0
+
+
+def test_slow_primary_is_hedged_and_fastest_wins():
+    primary, hedge = SleepyProvider("bedrock", 0.5), SleepyProvider("openai", 0.02)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=0.05)
+
+    started = time.monotonic()
+    assert provider.invoke("Oi") == "resposta openai"
+    assert time.monotonic() - started < 0.3
+    assert provider.stats()["hedge_wins"] == 1
+
+
+def test_hedge_delay_follows_primary_latency_percentile():
+    primary, hedge = SleepyProvider("bedrock", 0.0), SleepyProvider("openai", 0.0)
+    provider = HedgedLLMProvider(
+        primary, hedge, hedge_percentile=0.9, initial_delay=1.0, min_samples=10
+    )
+    assert provider.hedge_delay() == 1.0
+
+    provider._latencies.extend([0.1] * 9 + [0.4])
+
+    assert provider.hedge_delay() == 0.4
+    provider._latencies.extend([0.1] * 10)
+    assert provider.hedge_delay() == 0.1
+
+
+def test_primary_failure_fires_hedge_immediately():
+    primary = SleepyProvider("bedrock", 0.0, fail=True)
+    hedge = SleepyProvider("openai", 0.0)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=5.0)
+
+    assert provider.invoke("Oi") == "resposta openai"
+
+
+def test_deadline_bounds_both_calls():
+    primary, hedge = SleepyProvider("bedrock", 0.5), SleepyProvider("openai", 0.5)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=0.05)
+
+    started = time.monotonic()
+    response = provider.invoke("Oi", timeout=0.15)
+
+    assert time.monotonic() - started < 0.3
+    assert response.startswith(PROVIDER_ERROR_PREFIX)
+    assert 0.14 < primary.timeouts[0] <= 0.15 and 0 < hedge.timeouts[0] < 0.15
+
+
+def test_hedge_queued_past_the_deadline_never_starts():
+    primary, hedge = SleepyProvider("bedrock", 0.3), SleepyProvider("openai", 0.01)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=0.05, max_workers=1)
+
+    response = provider.invoke("Oi", timeout=0.1)
+    time.sleep(0.3)
+
+    assert response.startswith(PROVIDER_ERROR_PREFIX)
+    assert provider.stats()["hedged"] == 1 and hedge.calls == 0
+
+
+def test_ainvoke_hedges_and_cancels_loser():
+    primary, hedge = SleepyProvider("bedrock", 0.3), SleepyProvider("openai", 0.01)
+    provider = HedgedLLMProvider(primary, hedge, initial_delay=0.05)
+
+    assert asyncio.run(provider.ainvoke("Oi")) == "resposta openai"
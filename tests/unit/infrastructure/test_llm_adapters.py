@@ -1,5 +1,12 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from aiohttp import web
+
+from src.domain.interfaces.repositories import PROVIDER_ERROR_PREFIX
+from src.infrastructure.client_factory import ClientFactory, ClientSettings
 from src.infrastructure.llm.bedrock_adapter import BedrockLLM
 from src.infrastructure.llm.gemini_adapter import GeminiLLM
 from src.infrastructure.llm.openai_adapter import OpenAILLM
@@ -27,6 +34,141 @@ class TestBedrockLLM:
         assert response == "Resposta do Bedrock"
         mock_client.invoke_model.assert_called_once()
 
+    @patch("src.infrastructure.llm.bedrock_adapter.call_timeout")
+    @patch("boto3.client")
+    def test_invoke_with_deadline_sets_call_timeout_on_shared_client(
+        self, mock_boto, mock_call_timeout
+    ):
+        mock_client = MagicMock()
+        mock_client.invoke_model.return_value = {
+            "body": MagicMock(read=lambda: b'{"generation": "ok"}')
+        }
+        mock_boto.return_value = mock_client
+        adapter = BedrockLLM(region_name="us-east-1")
+
+        assert adapter.invoke("Teste", {}, timeout=2.3) == "ok"
+        adapter.invoke("Teste", {}, timeout=2.9)
+        adapter.invoke("Teste", {})
+
+        # Um único cliente (e pool); o deadline vira o timeout de cada chamada
+        assert mock_boto.call_count == 1
+        assert mock_client.invoke_model.call_count == 3
+        assert [c.args[0] for c in mock_call_timeout.call_args_list] == [
+            2.3,
+            2.9,
+            None,
+        ]
+
+    @patch("boto3.client")
+    def test_prompt_renders_rag_content_and_counts_tokens(self, mock_boto):
+        adapter = BedrockLLM(region_name="us-east-1")
+
+        body = json.loads(
+            adapter._build_body("Pergunta", {"rag_content": "Contexto sobre TDAH"})
+        )
+
+        assert "Contexto sobre TDAH" in body["prompt"]
+        assert "rag_content" not in body["prompt"]
+        assert adapter.count_tokens("Organização da rotina.") == 8
+        assert adapter.render_context(
+            {"rag_content": "RAG", "history": "Usuário: oi"}
+        ) == ("RAG\n\nHistórico da conversa:\nUsuário: oi")
+
+    @patch("boto3.client")
+    def test_stream_success(self, mock_boto):
+        # Arrange
+        mock_client = MagicMock()
+        mock_boto.return_value = mock_client
+        mock_client.invoke_model_with_response_stream.return_value = {
+            "body": [
+                {"chunk": {"bytes": b'{"generation": "Resposta "}'}},
+                {"chunk": {"bytes": b'{"generation": "em partes"}'}},
+            ]
+        }
+
+        adapter = BedrockLLM(region_name="us-east-1")
+
+        # Act
+        chunks = list(adapter.stream("Teste", {}))
+
+        # Assert
+        assert chunks == ["Resposta ", "em partes"]
+
+    @patch("boto3.client")
+    def test_ainvoke_success(self, mock_boto, monkeypatch):
+        # Arrange
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+        received = {}
+
+        async def handle_invoke(request):
+            received["path"] = request.raw_path
+            received["authorization"] = request.headers.get("Authorization", "")
+            return web.json_response({"generation": " Resposta async "})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_post("/model/{model_id}/invoke", handle_invoke)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            mock_boto.return_value.meta.endpoint_url = f"http://127.0.0.1:{port}"
+            adapter = BedrockLLM(region_name="us-east-1")
+            try:
+                return await adapter.ainvoke("Teste", {})
+            finally:
+                await adapter._http_session.close()
+                await runner.cleanup()
+
+        # Act
+        response = asyncio.run(scenario())
+
+        # Assert
+        assert response == "Resposta async"
+        assert received["path"] == "/model/meta.llama3-8b-instruct-v1%3A0/invoke"
+        assert received["authorization"].startswith("AWS4-HMAC-SHA256")
+
+    @patch("boto3.client")
+    def test_ainvoke_without_deadline_keeps_session_timeout(
+        self, mock_boto, monkeypatch
+    ):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+
+        async def handle_invoke(request):
+            await asyncio.sleep(2)
+            return web.json_response({"generation": "tarde demais"})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_post("/model/{model_id}/invoke", handle_invoke)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            mock_boto.return_value.meta.endpoint_url = f"http://127.0.0.1:{port}"
+            adapter = BedrockLLM(
+                region_name="us-east-1",
+                client_factory=ClientFactory(ClientSettings(read_timeout=0.2)),
+            )
+            try:
+                started = time.monotonic()
+                response = await adapter.ainvoke("Teste", {})
+                return response, time.monotonic() - started
+            finally:
+                await adapter._http_session.close()
+                await runner.cleanup()
+
+        response, elapsed = asyncio.run(scenario())
+
+        assert response.startswith(PROVIDER_ERROR_PREFIX)
+        assert elapsed < 1.0
+
 
 class TestOpenAILLM:
     @patch("src.infrastructure.llm.openai_adapter.OpenAI")
@@ -49,6 +191,68 @@ class TestOpenAILLM:
         # Assert
         assert response == "Resposta OpenAI"
 
+    @patch("src.infrastructure.llm.openai_adapter.OpenAI")
+    @patch("os.getenv")
+    def test_stream_success(self, mock_getenv, mock_openai_class):
+        # Arrange
+        mock_getenv.return_value = "fake-key"
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+
+        chunks = []
+        for text in ["Resposta ", None, "OpenAI"]:
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = text
+            chunks.append(chunk)
+        mock_client.chat.completions.create.return_value = iter(chunks)
+
+        adapter = OpenAILLM()
+
+        # Act
+        result = list(adapter.stream("Teste"))
+
+        # Assert
+        assert result == ["Resposta ", "OpenAI"]
+        assert mock_client.chat.completions.create.call_args[1]["stream"] is True
+
+    @patch("src.infrastructure.llm.openai_adapter.AsyncOpenAI")
+    @patch("src.infrastructure.llm.openai_adapter.OpenAI")
+    @patch("os.getenv")
+    def test_ainvoke_success(self, mock_getenv, mock_openai_class, mock_async_class):
+        # Arrange
+        mock_getenv.return_value = "fake-key"
+        mock_async_client = MagicMock()
+        mock_async_class.return_value = mock_async_client
+
+        mock_completion = MagicMock()
+        mock_completion.choices[0].message.content = "Resposta OpenAI async"
+        mock_async_client.chat.completions.create = AsyncMock(
+            return_value=mock_completion
+        )
+
+        adapter = OpenAILLM()
+
+        # Act
+        response = asyncio.run(adapter.ainvoke("Teste"))
+
+        # Assert
+        assert response == "Resposta OpenAI async"
+        mock_openai_class.return_value.chat.completions.create.assert_not_called()
+
+    @patch("src.infrastructure.llm.openai_adapter.OpenAI")
+    @patch("os.getenv")
+    def test_invoke_forwards_deadline_timeout(self, mock_getenv, mock_openai_class):
+        mock_getenv.return_value = "fake-key"
+        create = mock_openai_class.return_value.chat.completions.create
+        create.return_value.choices[0].message.content = "ok"
+        adapter = OpenAILLM()
+
+        adapter.invoke("Teste")
+        assert "timeout" not in create.call_args[1]
+
+        adapter.invoke("Teste", timeout=1.5)
+        assert create.call_args[1]["timeout"] == 1.5
+
 
 class TestGeminiLLM:
     @patch("src.infrastructure.llm.gemini_adapter.genai")
@@ -70,3 +274,44 @@ class TestGeminiLLM:
 
         # Assert
         assert response == "Resposta Gemini"
+
+    @patch("src.infrastructure.llm.gemini_adapter.genai")
+    @patch("os.getenv")
+    def test_stream_success(self, mock_getenv, mock_genai):
+        # Arrange
+        mock_getenv.return_value = "fake-key"
+        mock_model = MagicMock()
+        mock_genai.GenerativeModel.return_value = mock_model
+        mock_model.generate_content.return_value = [
+            MagicMock(text="Resposta "),
+            MagicMock(text="Gemini"),
+        ]
+
+        adapter = GeminiLLM()
+
+        # Act
+        result = list(adapter.stream("Teste"))
+
+        # Assert
+        assert result == ["Resposta ", "Gemini"]
+        assert mock_model.generate_content.call_args[1]["stream"] is True
+
+    @patch("src.infrastructure.llm.gemini_adapter.genai")
+    @patch("os.getenv")
+    def test_ainvoke_success(self, mock_getenv, mock_genai):
+        # Arrange
+        mock_getenv.return_value = "fake-key"
+        mock_model = MagicMock()
+        mock_genai.GenerativeModel.return_value = mock_model
+        mock_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text="Resposta Gemini async")
+        )
+
+        adapter = GeminiLLM()
+
+        # Act
+        response = asyncio.run(adapter.ainvoke("Teste"))
+
+        # Assert
+        assert response == "Resposta Gemini async"
+        mock_model.generate_content.assert_not_called()
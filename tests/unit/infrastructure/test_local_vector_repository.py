@@ -0,0 +1,109 @@
+import numpy as np
+
+from src.infrastructure.embeddings.hashing_embeddings import HashingEmbeddings
+from src.infrastructure.repositories.local_vector_repository import (
+    IVFIndex,
+    LocalVectorContextRepository,
+    save_vector_index,
+)
+
+CHUNKS = {
+    "c1": "A TCC (Terapia Cognitivo-Comportamental) ajuda na organização.",
+    "c2": "O tratamento medicamentoso usa estimulantes prescritos pelo psiquiatra.",
+    "c3": "O SUS oferece atendimento gratuito nos CAPS.",
+}
+
+
+def _repository(**kwargs):
+    embeddings = HashingEmbeddings()
+    ids = list(CHUNKS)
+    texts = list(CHUNKS.values())
+    return LocalVectorContextRepository(
+        embeddings, ids, texts, embeddings.embed(texts), **kwargs
+    )
+
+
+def test_exact_search_ranks_relevant_chunk_first():
+    repo = _repository(top_k=2)
+
+    chunks = repo.search("atendimento gratuito no SUS")
+
+    assert len(chunks) == 2
+    assert chunks[0].chunk_id == "c3"
+    assert chunks[0].score >= chunks[1].score
+
+
+def test_retrieve_context_contract_and_min_score():
+    repo = _repository(top_k=3, min_score=0.3)
+
+    context = repo.retrieve_context("estimulantes prescritos pelo psiquiatra")
+
+    assert CHUNKS["c2"] in context
+    assert CHUNKS["c3"] not in context
+
+
+def test_roundtrip_from_file(tmp_path):
+    embeddings = HashingEmbeddings()
+    path = str(tmp_path / "kb_index.npz")
+    texts = list(CHUNKS.values())
+    save_vector_index(path, list(CHUNKS), texts, embeddings.embed(texts), ["kb.md"] * 3)
+
+    repo = LocalVectorContextRepository.from_file(path, embeddings, top_k=1)
+    chunks = repo.search("Terapia Cognitivo-Comportamental")
+
+    assert chunks[0].chunk_id == "c1"
+    assert chunks[0].metadata == {"source": "kb.md"}
+
+
+def test_empty_index_returns_no_context():
+    repo = LocalVectorContextRepository(
+        HashingEmbeddings(), [], [], np.zeros((0, 512), dtype=np.float32)
+    )
+
+    assert repo.retrieve_context("qualquer coisa") == ""
+
+
+def test_ivf_index_recall_on_clustered_data():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(16, 32))
+    vectors = np.repeat(centers, 50, axis=0) + 0.05 * rng.normal(size=(800, 32))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+        np.float32
+    )
+    index = IVFIndex(vectors, n_lists=16, n_probe=3)
+
+    hits = 0
+    for query in vectors[::40]:
+        exact = set(np.argsort(-(vectors @ query))[:5].tolist())
+        approx, _ = index.search(query, 5)
+        hits += len(exact & set(approx.tolist()))
+
+    assert hits / (len(vectors[::40]) * 5) >= 0.9
+
+
+def test_approximate_mode_is_enabled_by_threshold():
+    assert _repository(approximate_threshold=2).ann_index is not None
+    assert _repository().ann_index is None
+
+
+def test_local_writer_applies_upserts_and_deletes(tmp_path):
+    from src.domain.entities.knowledge import DocumentChunk
+    from src.infrastructure.repositories.local_vector_repository import (
+        LocalVectorStoreWriter,
+    )
+
+    path = str(tmp_path / "kb.npz")
+    embeddings = HashingEmbeddings()
+    chunks = [DocumentChunk(cid, "guia.md", text) for cid, text in CHUNKS.items()]
+
+    writer = LocalVectorStoreWriter(path)
+    writer.upsert(chunks, embeddings.embed([c.text for c in chunks]))
+    writer.flush()
+
+    writer = LocalVectorStoreWriter(path)
+    writer.delete(["c1"])
+    writer.flush()
+
+    repo = LocalVectorContextRepository.from_file(path, embeddings)
+    assert repo.ids == ["c2", "c3"]
+    assert repo.search("SUS gratuito", top_k=1)[0].chunk_id == "c3"
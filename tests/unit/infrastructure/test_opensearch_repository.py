@@ -1,5 +1,13 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from src.infrastructure.repositories.in_memory_opensearch import (
+    InMemoryOpenSearchClient,
+)
 from src.infrastructure.repositories.opensearch_repository import (
     MockOpenSearchRepository,
+    OpenSearchContextRepository,
+    get_opensearch_client,
 )
 
 
@@ -7,3 +15,151 @@ def test_mock_repository_retrieve():
     repo = MockOpenSearchRepository()
     context = repo.retrieve_context("qualquer coisa")
     assert context == "Este é um contexto simulado sobre TDAH para testes."
+
+
+def test_mock_repository_aretrieve():
+    repo = MockOpenSearchRepository()
+    context = asyncio.run(repo.aretrieve_context("qualquer coisa"))
+    assert context == "Este é um contexto simulado sobre TDAH para testes."
+
+
+class FakeEmbeddings:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed(self, texts):
+        return [self.vectors[t] for t in texts]
+
+
+def _seeded_repository(**kwargs):
+    client = InMemoryOpenSearchClient()
+    embeddings = FakeEmbeddings({"Como tratar TDAH?": [1.0, 0.0, 0.0]})
+    repo = OpenSearchContextRepository(client, embeddings, index_name="kb", **kwargs)
+    repo.ensure_index(dimension=3)
+    docs = {
+        "c1": ("TCC ajuda no tratamento.", [0.9, 0.1, 0.0]),
+        "c2": ("Medicação estimulante.", [0.7, 0.7, 0.0]),
+        "c3": ("Horário do SUS.", [0.0, 0.0, 1.0]),
+    }
+    for doc_id, (text, vector) in docs.items():
+        client.index(
+            index="kb",
+            id=doc_id,
+            body={"text": text, "embedding": vector, "source": "kb.md"},
+        )
+    return repo, client
+
+
+def test_opensearch_repository_knn_top_k():
+    repo, _ = _seeded_repository(top_k=2)
+
+    chunks = repo.search("Como tratar TDAH?")
+
+    assert [c.chunk_id for c in chunks] == ["c1", "c2"]
+    assert chunks[0].score > chunks[1].score
+    assert repo.retrieve_context("Como tratar TDAH?") == (
+        "TCC ajuda no tratamento.\n\nMedicação estimulante."
+    )
+
+
+def test_opensearch_repository_min_score_and_projection():
+    repo, client = _seeded_repository(top_k=3, min_score=0.75)
+    client.search = MagicMock(wraps=client.search)
+
+    chunks = repo.search("Como tratar TDAH?", timeout=0.5)
+
+    assert [c.chunk_id for c in chunks] == ["c1", "c2"]
+    assert chunks[0].metadata is None
+    kwargs = client.search.call_args[1]
+    assert kwargs["body"]["_source"] == ["text"]
+    assert kwargs["body"]["min_score"] == 0.75
+    assert kwargs["request_timeout"] == 0.5
+    assert "hits.hits._source" in kwargs["filter_path"]
+
+
+def test_opensearch_repository_errors_return_empty_context():
+    client = MagicMock()
+    client.search.side_effect = ConnectionError("timeout")
+    repo = OpenSearchContextRepository(
+        client, FakeEmbeddings({"q": [1.0]}), index_name="kb"
+    )
+
+    assert repo.retrieve_context("q") == ""
+
+
+def test_ensure_index_creates_hnsw_mapping_once():
+    client = InMemoryOpenSearchClient()
+    repo = OpenSearchContextRepository(client, FakeEmbeddings({}), index_name="kb")
+
+    assert repo.ensure_index(dimension=512, m=24, ef_construction=256) is True
+    assert repo.ensure_index(dimension=512) is False
+
+    mapping = client.indices_store["kb"]["body"]["mappings"]["properties"]
+    method = mapping["embedding"]["method"]
+    assert mapping["embedding"]["dimension"] == 512
+    assert method["name"] == "hnsw"
+    assert method["parameters"] == {"ef_construction": 256, "m": 24}
+
+
+@patch("src.infrastructure.repositories.opensearch_repository.OpenSearch")
+def test_get_opensearch_client_is_pooled_and_reused(mock_opensearch):
+    first = get_opensearch_client(
+        "reuse.example.com", http_auth=("u", "p"), pool_maxsize=20
+    )
+    second = get_opensearch_client("reuse.example.com", http_auth=("u", "p"))
+
+    assert first is second
+    mock_opensearch.assert_called_once()
+    assert mock_opensearch.call_args[1]["pool_maxsize"] == 20
+
+
+def test_vector_store_writer_bulk_indexes_and_deletes():
+    from src.domain.entities.knowledge import DocumentChunk
+    from src.infrastructure.embeddings.hashing_embeddings import HashingEmbeddings
+    from src.infrastructure.repositories.opensearch_repository import (
+        OpenSearchVectorStoreWriter,
+    )
+
+    client = InMemoryOpenSearchClient()
+    embeddings = HashingEmbeddings(dimensions=64)
+    writer = OpenSearchVectorStoreWriter(client, index_name="kb", batch_size=2)
+    chunks = [
+        DocumentChunk("a", "guia.md", "TCC ajuda na organização."),
+        DocumentChunk("b", "guia.md", "O SUS oferece atendimento gratuito."),
+        DocumentChunk("c", "guia.md", "Medicação prescrita pelo psiquiatra."),
+    ]
+
+    writer.upsert(chunks, embeddings.embed([c.text for c in chunks]))
+    assert client.calls.count("bulk") == 2
+    assert set(client.indices_store["kb"]["docs"]) == {"a", "b", "c"}
+
+    writer.delete(["b"])
+    assert set(client.indices_store["kb"]["docs"]) == {"a", "c"}
+
+    repo = OpenSearchContextRepository(client, embeddings, index_name="kb")
+    assert repo.search("psiquiatra", top_k=1)[0].chunk_id == "c"
+
+
+def test_vector_store_writer_returns_rejected_ids():
+    from src.domain.entities.knowledge import DocumentChunk
+    from src.infrastructure.repositories.opensearch_repository import (
+        OpenSearchVectorStoreWriter,
+    )
+
+    class RejectingClient(InMemoryOpenSearchClient):
+        def bulk(self, body, index=None, **kwargs):
+            response = super().bulk(body, index, **kwargs)
+            for item in response["items"]:
+                meta = item["index"]
+                if meta["_id"] == "b":
+                    meta.update(status=400, error={"type": "mapper_parsing_exception"})
+                    response["errors"] = True
+            return response
+
+    writer = OpenSearchVectorStoreWriter(RejectingClient(), index_name="kb")
+    chunks = [
+        DocumentChunk("a", "guia.md", "TCC."),
+        DocumentChunk("b", "guia.md", "SUS."),
+    ]
+
+    assert writer.upsert(chunks, [[0.1, 0.2], [0.3, 0.4]]) == ["b"]
@@ -0,0 +1,57 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.infrastructure.llm.provider_registry import (
+    LLM_PROVIDERS,
+    LazyLLMProvider,
+    ProviderRegistry,
+)
+
+
+def test_registry_imports_on_first_use_and_reuses_instance():
+    registry = ProviderRegistry({"ordered": "collections:OrderedDict"})
+
+    assert registry.loaded() == {}
+    first = registry.get("ordered")
+
+    assert registry.get("ordered") is first
+    assert set(registry.loaded()["ordered"]) == {"import_ms", "init_ms"}
+
+
+def test_registry_accepts_factories_and_rejects_unknown_names():
+    registry = ProviderRegistry({})
+    provider = MagicMock()
+    registry.register("fake", lambda: provider)
+
+    assert registry.get("fake") is provider
+    with pytest.raises(ValueError, match="desconhecido"):
+        registry.get("bedrok")
+
+
+def test_default_specs_cover_supported_providers():
+    assert set(LLM_PROVIDERS) == {"bedrock", "openai", "gemini"}
+
+
+def test_lazy_provider_builds_only_on_first_call():
+    inner = MagicMock(model_id="modelo", chars_per_token=3.5)
+    inner._invoke.return_value = "ok"
+    factory = MagicMock(return_value=inner)
+    provider = LazyLLMProvider(factory)
+
+    factory.assert_not_called()
+    assert provider.invoke("Oi", {"rag_content": ""}, timeout=2.0) == "ok"
+    assert provider.model_id == "modelo" and provider.chars_per_token == 3.5
+    factory.assert_called_once()
+    inner._invoke.assert_called_once_with("Oi", {"rag_content": ""}, 2.0)
+
+
+def test_lazy_provider_warm_up_and_async_delegation():
+    inner = MagicMock()
+    inner.ainvoke = MagicMock(side_effect=lambda *a, **kw: asyncio.sleep(0, "ok"))
+    provider = LazyLLMProvider(lambda: inner)
+
+    assert provider.warm_up() >= 0 and provider.loaded
+    assert asyncio.run(provider.ainvoke("Oi")) == "ok"
+    inner.ainvoke.assert_called_once_with("Oi", None)
@@ -0,0 +1,133 @@
+import time
+from unittest.mock import patch
+
+from src.application.services.response_cache_key import build_response_cache_key
+from src.infrastructure.cache.response_cache import (
+    DynamoDBResponseCache,
+    InMemoryResponseCache,
+    TieredResponseCache,
+)
+
+
+class FakeDynamoTable:
+    """Stand-in local de uma Table do DynamoDB (get_item/put_item)."""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["cache_key"])
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["cache_key"]] = dict(Item)
+
+
+class TestInMemoryResponseCache:
+    def test_get_set_counts_hits_and_misses(self):
+        cache = InMemoryResponseCache()
+
+        assert cache.get("k") is None
+        cache.set("k", "resposta")
+        assert cache.get("k") == "resposta"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction_by_entries(self):
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # "a" passa a ser o mais recente
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        cache = InMemoryResponseCache(max_bytes=10)
+        cache.set("a", "12345")
+        cache.set("b", "123456")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "123456"
+        assert cache.stats()["bytes"] == 6
+
+    def test_value_larger_than_budget_is_ignored(self):
+        cache = InMemoryResponseCache(max_bytes=4)
+        cache.set("a", "12345")
+        assert len(cache) == 0
+
+    def test_ttl_expiration(self):
+        cache = InMemoryResponseCache(ttl_seconds=10)
+        with patch("src.infrastructure.cache.response_cache.time") as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            cache.set("k", "v")
+            mock_time.monotonic.return_value = 111.0
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+
+class TestDynamoDBResponseCache:
+    def test_roundtrip_against_local_table(self):
+        cache = DynamoDBResponseCache("tabela", table=FakeDynamoTable())
+
+        assert cache.get("k") is None
+        cache.set("k", "resposta")
+        assert cache.get("k") == "resposta"
+        assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+    def test_expired_item_is_a_miss(self):
+        table = FakeDynamoTable()
+        table.items["k"] = {
+            "cache_key": "k",
+            "response": "velha",
+            "expires_at": int(time.time()) - 1,
+        }
+        cache = DynamoDBResponseCache("tabela", table=table)
+
+        assert cache.get("k") is None
+
+    def test_errors_degrade_to_miss(self):
+        class BrokenTable:
+            def get_item(self, Key):
+                raise ConnectionError("indisponível")
+
+        cache = DynamoDBResponseCache("tabela", table=BrokenTable())
+
+        assert cache.get("k") is None
+        assert cache.stats()["errors"] == 1
+
+
+def test_tiered_cache_promotes_l2_hits():
+    l1 = InMemoryResponseCache()
+    l2 = DynamoDBResponseCache("tabela", table=FakeDynamoTable())
+    l2.set("k", "resposta")
+    cache = TieredResponseCache(l1, l2)
+
+    assert cache.get("k") == "resposta"
+    assert l1.get("k") == "resposta"
+
+
+class TestResponseCacheKey:
+    def test_normalizes_message(self):
+        a = build_response_cache_key("Preciso tomar remédio?", "ctx", "m")
+        b = build_response_cache_key("  preciso TOMAR remedio ", "ctx", "m")
+        assert a == b
+
+    def test_context_model_and_versions_change_key(self):
+        base = build_response_cache_key("oi", "ctx", "m")
+        assert build_response_cache_key("oi", "outro ctx", "m") != base
+        assert build_response_cache_key("oi", "ctx", "outro-modelo") != base
+        assert build_response_cache_key("oi", "ctx", "m", prompt_version="2") != base
+        assert build_response_cache_key("oi", "ctx", "m", namespace="v2") != base
+
+    def test_history_changes_key(self):
+        base = build_response_cache_key("oi", "ctx", "m")
+        assert build_response_cache_key("oi", "ctx", "m", history="") == base
+        a = build_response_cache_key("oi", "ctx", "m", history="Usuário: a")
+        b = build_response_cache_key("oi", "ctx", "m", history="Usuário: b")
+        assert len({base, a, b}) == 3
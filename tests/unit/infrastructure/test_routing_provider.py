@@ -0,0 +1,213 @@
+import asyncio
+import threading
+
+from src.domain.interfaces.repositories import PROVIDER_ERROR_PREFIX, LLMProvider
+from src.infrastructure.llm.routing_provider import RoutingLLMProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProvider(LLMProvider):
+    """Provedor simulado: avança o relógio em `latency_ms` e pode falhar."""
+
+    def __init__(self, name, clock, latency_ms, fail=False):
+        self.name = name
+        self.model_id = name
+        self.clock = clock
+        self.latency_ms = latency_ms
+        self.fail = fail
+        self.calls = 0
+
+    def invoke(self, prompt, context=None):
+        self.calls += 1
+        self.clock.now += self.latency_ms / 1000
+        if self.fail:
+            return f"{PROVIDER_ERROR_PREFIX} (Erro {self.name})"
+        return f"resposta {self.name}"
+
+
+def _router(clock, **latencies):
+    providers = {n: FakeProvider(n, clock, ms) for n, ms in latencies.items()}
+    return providers, RoutingLLMProvider(providers, clock=clock, explore_every=0)
+
+
+def test_routes_to_fastest_after_measuring_each_provider():
+    clock = FakeClock()
+    providers, router = _router(clock, bedrock=300, openai=150, gemini=500)
+
+    answers = [router.invoke("Oi") for _ in range(10)]
+
+    # Cada provedor é medido uma vez; depois, todo o tráfego vai para o mais rápido
+    assert answers[3:] == ["resposta openai"] * 7
+    assert [p.calls for p in providers.values()] == [1, 8, 1]
+
+
+def test_weights_bias_the_choice():
+    clock = FakeClock()
+    providers = {
+        "bedrock": FakeProvider("bedrock", clock, 200),
+        "openai": FakeProvider("openai", clock, 150),
+    }
+    router = RoutingLLMProvider(
+        providers, weights={"bedrock": 2.0}, clock=clock, explore_every=0
+    )
+
+    for _ in range(5):
+        router.invoke("Oi")
+
+    assert router.decisions()[-1].provider == "bedrock"  # 200/2 < 150/1
+
+
+def test_simulation_shifts_traffic_away_from_degraded_provider():
+    clock = FakeClock()
+    providers, router = _router(clock, bedrock=100, openai=180)
+    for _ in range(10):
+        router.invoke("Oi")
+    assert router.decisions()[-1].provider == "bedrock"
+
+    # Incidente: o Bedrock passa a levar 2 s por resposta
+    providers["bedrock"].latency_ms = 2000
+    shifted_after = None
+    for i in range(1, 11):
+        router.invoke("Oi")
+        if shifted_after is None and router.decisions()[-1].provider == "openai":
+            shifted_after = i
+
+    assert shifted_after is not None and shifted_after <= 3
+    assert router.decisions()[-1].provider == "openai"
+
+
+def test_errors_fail_over_and_mark_provider_unhealthy():
+    clock = FakeClock()
+    providers, router = _router(clock, bedrock=100, openai=200)
+    router.invoke("Oi")
+    router.invoke("Oi")
+
+    providers["bedrock"].fail = True
+    assert router.invoke("Oi") == "resposta openai"  # failover na mesma requisição
+    last = router.decisions()[-2:]
+    assert [(d.provider, d.ok) for d in last] == [("bedrock", False), ("openai", True)]
+
+    # Segunda falha leva a taxa de erro acima do limite: o Bedrock sai da rota
+    router.invoke("Oi")
+    providers["bedrock"].calls = 0
+    for _ in range(3):
+        assert router.invoke("Oi") == "resposta openai"
+    assert providers["bedrock"].calls == 0
+    assert router.stats()["bedrock"]["errors"] == 2
+
+
+def test_degraded_provider_is_probed_after_cooldown():
+    clock = FakeClock()
+    providers = {
+        "bedrock": FakeProvider("bedrock", clock, 100, fail=True),
+        "openai": FakeProvider("openai", clock, 300),
+    }
+    router = RoutingLLMProvider(
+        providers, clock=clock, cooldown_seconds=10, explore_every=0
+    )
+    for _ in range(4):
+        router.invoke("Oi")
+
+    providers["bedrock"].fail = False
+    clock.now += 11
+    router.invoke("Oi")
+
+    assert router.decisions()[-1].provider == "bedrock"
+
+
+def test_only_one_request_probes_after_cooldown():
+    clock = FakeClock()
+    probing = threading.Event()
+    release = threading.Event()
+
+    class Blocking(FakeProvider):
+        def invoke(self, prompt, context=None):
+            if not self.fail:
+                probing.set()
+                release.wait(1)
+            return super().invoke(prompt, context)
+
+    providers = {
+        "bedrock": Blocking("bedrock", clock, 100, fail=True),
+        "openai": FakeProvider("openai", clock, 300),
+    }
+    router = RoutingLLMProvider(
+        providers, clock=clock, cooldown_seconds=10, explore_every=0
+    )
+    for _ in range(3):
+        router.invoke("Oi")
+
+    providers["bedrock"].fail = False
+    providers["bedrock"].calls = 0
+    clock.now += 11
+    probe = threading.Thread(target=router.invoke, args=("Oi",))
+    probe.start()
+    assert probing.wait(1)
+
+    # Enquanto o teste não termina, as demais requisições não vão ao Bedrock
+    assert [router.invoke("Oi") for _ in range(3)] == ["resposta openai"] * 3
+    release.set()
+    probe.join(1)
+    assert providers["bedrock"].calls == 1
+
+
+def test_fast_failures_do_not_make_provider_the_fastest():
+    clock = FakeClock()
+    providers = {
+        "bedrock": FakeProvider("bedrock", clock, 5, fail=True),
+        "openai": FakeProvider("openai", clock, 300),
+    }
+    router = RoutingLLMProvider(
+        providers, clock=clock, cooldown_seconds=10, explore_every=0
+    )
+    for _ in range(3):
+        router.invoke("Oi")
+    assert router.stats()["bedrock"]["latency_ms"] is None
+
+    # Volta lento: o teste passa, mas as falhas rápidas não contam como latência
+    providers["bedrock"].fail = False
+    providers["bedrock"].latency_ms = 400
+    clock.now += 11
+    router.invoke("Oi")
+    assert router.decisions()[-1].provider == "bedrock"
+
+    for _ in range(5):
+        assert router.invoke("Oi") == "resposta openai"
+
+
+def test_exploration_refreshes_idle_provider():
+    clock = FakeClock()
+    providers = {
+        "bedrock": FakeProvider("bedrock", clock, 100),
+        "openai": FakeProvider("openai", clock, 300),
+    }
+    router = RoutingLLMProvider(providers, clock=clock, explore_every=5)
+
+    for _ in range(10):
+        router.invoke("Oi")
+
+    assert [d.reason for d in router.decisions()].count("exploração") == 2
+
+
+def test_stream_and_ainvoke_are_routed():
+    clock = FakeClock()
+    _, router = _router(clock, bedrock=100, openai=200)
+
+    assert list(router.stream("Oi")) == ["resposta bedrock"]
+    assert asyncio.run(router.ainvoke("Oi")).startswith("resposta")
+    assert router.model_id == "router:bedrock+openai"
+
+
+def test_all_providers_failing_returns_apology():
+    clock = FakeClock()
+    providers = {"bedrock": FakeProvider("bedrock", clock, 100, fail=True)}
+    router = RoutingLLMProvider(providers, clock=clock)
+
+    assert router.invoke("Oi").startswith(PROVIDER_ERROR_PREFIX)
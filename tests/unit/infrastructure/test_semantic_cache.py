@@ -0,0 +1,99 @@
+import numpy as np
+
+from src.infrastructure.cache.semantic_cache import InMemorySemanticCache
+from src.infrastructure.embeddings.hashing_embeddings import HashingEmbeddings
+
+
+class FakeEmbeddings:
+    """Embeddings controlados: cada texto mapeia para um vetor fixo."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return np.array([self.vectors[t] for t in texts], dtype=np.float32)
+
+
+def test_hit_above_threshold_and_miss_below():
+    embeddings = FakeEmbeddings(
+        {
+            "Preciso tomar remédio?": [1.0, 0.0, 0.0],
+            "Tenho que tomar medicação?": [0.95, 0.31, 0.0],
+            "O que é TCC?": [0.0, 0.0, 1.0],
+        }
+    )
+    cache = InMemorySemanticCache(embeddings, similarity_threshold=0.9)
+
+    cache.store("Preciso tomar remédio?", "Resposta sobre medicação")
+
+    assert cache.lookup("Tenho que tomar medicação?") == "Resposta sobre medicação"
+    assert cache.lookup("O que é TCC?") is None
+
+    stats = cache.stats()
+    assert stats["lookups"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["avg_lookup_ms"] >= 0.0
+
+
+def test_store_reuses_embedding_from_lookup():
+    embeddings = FakeEmbeddings({"pergunta": [1.0, 0.0]})
+    cache = InMemorySemanticCache(embeddings)
+
+    cache.lookup("pergunta")
+    cache.store("pergunta", "resposta")
+
+    assert embeddings.calls == 1
+
+
+def test_bounded_memory_evicts_least_recently_used():
+    embeddings = FakeEmbeddings(
+        {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]}
+    )
+    cache = InMemorySemanticCache(embeddings, max_entries=2)
+
+    cache.store("a", "A")
+    cache.store("b", "B")
+    cache.lookup("a")  # "a" passa a ser o mais recente
+    cache.store("c", "C")
+
+    assert len(cache) == 2
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == "A"
+    assert cache.lookup("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_ignored():
+    embeddings = FakeEmbeddings({"a": [1.0, 0.0]})
+    cache = InMemorySemanticCache(embeddings, ttl_seconds=-1)
+
+    cache.store("a", "A")
+
+    assert cache.lookup("a") is None
+
+
+def test_embedding_errors_degrade_to_miss():
+    class BrokenEmbeddings:
+        def embed(self, texts):
+            raise ConnectionError("indisponível")
+
+    cache = InMemorySemanticCache(BrokenEmbeddings())
+
+    assert cache.lookup("a") is None
+    cache.store("a", "A")
+    assert len(cache) == 0
+
+
+def test_hashing_embeddings_similar_spellings():
+    embeddings = HashingEmbeddings()
+    vectors = embeddings.embed(
+        ["Preciso tomar remédio?", "preciso tomar remedio", "Dicas de organização"]
+    )
+
+    assert vectors.shape == (3, 512)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert float(vectors[0] @ vectors[1]) > 0.99
+    assert float(vectors[0] @ vectors[2]) < 0.5
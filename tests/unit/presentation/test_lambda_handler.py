@@ -1,8 +1,23 @@
+import asyncio
 import json
-from unittest.mock import patch
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
 
 from src.application.dtos.message_dto import ProcessMessageOutput
-from src.presentation.handlers.lambda_handler import lambda_handler
+from src.presentation.handlers.lambda_handler import alambda_handler, lambda_handler
+
+
+@pytest.fixture(autouse=True)
+def _isolated_breakers(monkeypatch):
+    """Breakers criados por um teste não vazam para o estado do módulo."""
+    from src.presentation.handlers import lambda_handler as handler
+
+    monkeypatch.setattr(handler, "LLM_BREAKERS", {})
 
 
 @patch("src.presentation.handlers.lambda_handler.process_message_uc")
@@ -52,6 +67,15 @@ def test_lambda_handler_success_api(mock_use_case):
     assert body["risk_detected"] is False
 
 
+@patch("src.presentation.handlers.lambda_handler.process_message_uc")
+def test_api_request_without_session_has_no_session_id(mock_use_case):
+    mock_use_case.execute.return_value = ProcessMessageOutput("ok", False)
+
+    lambda_handler({"body": json.dumps({"message": "Olá via API"})}, None)
+
+    assert mock_use_case.execute.call_args.args[0].session_id is None
+
+
 def test_lambda_handler_empty_message():
     # Arrange
     event = {"body": json.dumps({})}
@@ -63,3 +87,206 @@ def test_lambda_handler_empty_message():
     assert response["statusCode"] == 400
     body = json.loads(response["body"])
     assert "error" in body
+
+
+@patch("src.presentation.handlers.lambda_handler.process_message_uc")
+def test_alambda_handler_success_api(mock_use_case):
+    # Arrange
+    mock_output = ProcessMessageOutput(
+        response_text="Resposta Async", risk_detected=False
+    )
+    mock_use_case.aexecute = AsyncMock(return_value=mock_output)
+
+    event = {"body": json.dumps({"message": "Olá via API", "session": "123"})}
+
+    # Act
+    response = asyncio.run(alambda_handler(event, None))
+
+    # Assert
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["response"] == "Resposta Async"
+    mock_use_case.aexecute.assert_awaited_once()
+    mock_use_case.execute.assert_not_called()
+
+
+@patch("src.presentation.handlers.lambda_handler.process_message_uc")
+def test_lambda_handler_extracts_user_id(mock_use_case):
+    # Arrange
+    mock_use_case.execute.return_value = ProcessMessageOutput(
+        response_text="ok", risk_detected=False
+    )
+    api_event = {
+        "body": json.dumps({"message": "Olá", "session": "s1"}),
+        "requestContext": {"authorizer": {"claims": {"sub": "cognito-42"}}},
+    }
+    dialogflow_event = {
+        "body": json.dumps(
+            {
+                "queryResult": {"queryText": "Olá"},
+                "session": "projects/foo/agent/sessions/123",
+                "originalDetectIntentRequest": {"payload": {"userId": "df-7"}},
+            }
+        )
+    }
+
+    # Act
+    lambda_handler(api_event, None)
+    lambda_handler(dialogflow_event, None)
+
+    # Assert
+    user_ids = [c.args[0].user_id for c in mock_use_case.execute.call_args_list]
+    assert user_ids == ["cognito-42", "df-7"]
+
+
+@patch("src.presentation.handlers.lambda_handler._create_llm")
+def test_build_llm_provider_router_from_env(mock_create, monkeypatch):
+    from src.domain.interfaces.repositories import LLMProvider
+    from src.presentation.handlers import lambda_handler
+
+    mock_create.side_effect = lambda name: Mock(
+        spec=LLMProvider, model_id=name, chars_per_token=4.0
+    )
+    monkeypatch.setenv("LLM_ROUTER_PROVIDERS", "bedrock, openai")
+    monkeypatch.setenv("LLM_ROUTER_WEIGHTS", "openai=0.5")
+
+    router = lambda_handler._build_llm_provider()
+
+    assert list(router.providers) == ["bedrock", "openai"]
+    assert router.health["openai"].weight == 0.5
+    assert router.health["bedrock"].weight == 1.0
+
+
+def test_request_deadline_uses_lambda_remaining_time_and_webhook_limit(monkeypatch):
+    from src.presentation.handlers import lambda_handler as handler
+
+    monkeypatch.setenv("DEADLINE_MARGIN_MS", "300")
+    monkeypatch.setenv("DIALOGFLOW_DEADLINE_MS", "4500")
+    context = Mock(get_remaining_time_in_millis=Mock(return_value=10000))
+
+    api = handler._request_deadline(context, is_dialogflow=False)
+    dialogflow = handler._request_deadline(context, is_dialogflow=True)
+
+    assert 9.6 < api.remaining() <= 9.7
+    assert 4.4 < dialogflow.remaining() <= 4.5
+    assert handler._request_deadline(None, is_dialogflow=False) is None
+
+
+@patch("src.presentation.handlers.lambda_handler._create_adapter")
+def test_create_llm_wraps_adapter_with_circuit_breaker(mock_adapter, monkeypatch):
+    from src.presentation.handlers import lambda_handler as handler
+
+    mock_adapter.return_value = Mock(chars_per_token=4.0, model_id="m")
+    monkeypatch.setenv("LLM_BREAKER_FAILURE_THRESHOLD", "2")
+
+    provider = handler._create_llm("openai")
+
+    assert provider.breaker.failure_threshold == 2
+    assert handler.llm_resilience_stats()["openai"]["state"] == "closed"
+
+    monkeypatch.setenv("LLM_RESILIENCE_ENABLED", "false")
+    assert handler._create_llm("openai") is mock_adapter.return_value
+
+
+@patch("src.presentation.handlers.lambda_handler._create_adapter")
+def test_router_member_and_hedge_share_one_breaker(mock_adapter, monkeypatch):
+    from src.presentation.handlers import lambda_handler as handler
+
+    mock_adapter.side_effect = lambda name: Mock(chars_per_token=4.0, model_id=name)
+    monkeypatch.setenv("LLM_ROUTER_PROVIDERS", "bedrock,openai")
+    monkeypatch.setenv("LLM_HEDGE_PROVIDER", "openai")
+
+    provider = handler._with_hedge(handler._build_llm_provider())
+
+    assert provider.hedge is handler.LLM_BREAKERS["openai"]
+    assert set(handler.LLM_BREAKERS) == {"bedrock", "openai"}
+    assert mock_adapter.call_count == 2
+
+
+@patch("src.presentation.handlers.lambda_handler.process_message_uc")
+@patch("src.presentation.handlers.lambda_handler.llm_provider")
+def test_warmup_ping_builds_provider_without_running_pipeline(mock_llm, mock_uc):
+    mock_llm.warm_up.return_value = 12.5
+    mock_uc.fallback_responder.intent_matcher.warm_up.return_value = 1.5
+
+    response = lambda_handler({"source": "aws.events"}, None)
+
+    assert response["statusCode"] == 200
+    warmup = json.loads(response["body"])["warmup"]
+    assert warmup["llm_ms"] == 12.5
+    assert warmup["intent_index_ms"] == 1.5
+    assert warmup["risk_classifier_ms"] >= 0
+    mock_llm.warm_up.assert_called_once()
+    mock_uc.execute.assert_not_called()
+
+
+def test_async_warmup_runs_off_the_event_loop():
+    threads = []
+
+    def fake_warm_up():
+        threads.append(threading.current_thread())
+        return {"llm_ms": 1.0}
+
+    with patch("src.presentation.handlers.lambda_handler.warm_up", fake_warm_up):
+        response = asyncio.run(alambda_handler({"warmup": True}, None))
+
+    assert json.loads(response["body"])["warmup"] == {"llm_ms": 1.0}
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_import_defers_numpy_to_first_use():
+    # Processo limpo: os demais testes já importaram o NumPy neste
+    code = (
+        "import sys; import src.presentation.handlers.lambda_handler; "
+        "sys.exit('numpy' in sys.modules)"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "CONTEXT_REPOSITORY"}
+    result = subprocess.run([sys.executable, "-c", code], env=env)
+
+    assert result.returncode == 0
+
+
+def test_intent_fast_path_built_from_dialogflow_config(monkeypatch):
+    from src.presentation.handlers import lambda_handler as handler
+
+    responses = handler._load_canned_responses()
+    matcher = handler._build_intent_matcher(responses)
+
+    assert len(matcher) == sum(len(r.training_phrases) for r in responses)
+    assert matcher.min_score == 0.7
+    # Fallback e caminho rápido usam o mesmo classificador
+    assert handler.process_message_uc.fallback_responder.intent_matcher is (
+        handler.process_message_uc.intent_matcher
+    )
+    monkeypatch.setenv("INTENT_FAST_PATH_ENABLED", "false")
+    assert handler._fast_path_matcher(matcher) is None
+    assert handler._build_fallback_responder(matcher).intent_matcher is matcher
+
+
+def test_precomputed_answers_loaded_only_when_configured(monkeypatch, tmp_path):
+    from src.application.services.precomputed_answers import save_artifact
+    from src.presentation.handlers import lambda_handler as handler
+
+    assert handler._build_precomputed_answers() is None
+
+    path = str(tmp_path / "answers.json")
+    save_artifact({"version": 1, "namespace": "v1", "answers": []}, path)
+    monkeypatch.setenv("PRECOMPUTED_ANSWERS_PATH", path)
+    assert len(handler._build_precomputed_answers()) == 0
+
+    monkeypatch.setenv("PRECOMPUTED_ANSWERS_PATH", str(tmp_path / "missing.json"))
+    assert handler._build_precomputed_answers() is None
+
+
+@patch("src.presentation.handlers.lambda_handler.session_repo")
+@patch("src.presentation.handlers.lambda_handler.process_message_uc")
+def test_lambda_handler_flushes_session_writes_before_returning(
+    mock_use_case, mock_session_repo
+):
+    mock_use_case.execute.return_value = ProcessMessageOutput(
+        response_text="Resposta", risk_detected=False
+    )
+
+    lambda_handler({"body": json.dumps({"message": "Olá", "session": "1"})}, None)
+
+    mock_session_repo.flush.assert_called_once()
@@ -0,0 +1,176 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from src.utils.risk_classifier import (
+    RiskClassifier,
+    featurize_batch,
+    train_logistic_regression,
+)
+from src.utils.risk_matcher import RiskMatcher
+from src.utils.safety_filters import (
+    DEFAULT_RISK_CLASSIFIER_PATH,
+    RISK_DETECTOR,
+    TieredRiskDetector,
+    check_safety,
+    load_risk_classifier,
+)
+
+DATA_PATH = os.path.join(
+    os.path.dirname(DEFAULT_RISK_CLASSIFIER_PATH), "risk_training.jsonl"
+)
+INTENTS_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "../../../src/dialogflow/data/initial_config.json",
+)
+
+
+class _FixedClassifier:
+    def __init__(self, score):
+        self.value = score
+
+    def score_batch(self, texts):
+        return np.full(len(texts), self.value, dtype=np.float32)
+
+
+def _detector(score, escalate=None):
+    return TieredRiskDetector(
+        RiskMatcher({"suicidio": ["suicid"]}),
+        _FixedClassifier(score),
+        escalate=escalate,
+    )
+
+
+def test_featurize_batch_offsets_and_empty_text():
+    indices, values, offsets = featurize_batch(["ola", "", "tudo bem"], 1024)
+
+    assert offsets.tolist()[0] == 0 and len(offsets) == 3
+    assert offsets[1] == offsets[2]  # texto vazio não gera features
+    assert indices.max() < 1024 and len(values) == len(indices)
+
+
+def test_trained_model_separates_training_examples(tmp_path):
+    texts = ["quero sumir de vez", "não aguento mais nada"] * 5 + [
+        "como organizar a rotina",
+        "dicas de estudo com tdah",
+    ] * 5
+    labels = [1, 1] * 5 + [0, 0] * 5
+    classifier = train_logistic_regression(texts, labels, dimensions=2**12, epochs=200)
+
+    path = str(tmp_path / "model.npz")
+    classifier.save(path, {"recall": 1.0})
+    loaded = RiskClassifier.from_file(path)
+
+    assert loaded.score("quero sumir de vez") > 0.7
+    assert loaded.score("dicas de estudo com tdah") < 0.3
+    np.testing.assert_allclose(
+        loaded.score_batch(texts[:3]), classifier.score_batch(texts[:3]), rtol=1e-5
+    )
+
+
+def test_shipped_model_recall_and_latency():
+    classifier = load_risk_classifier(DEFAULT_RISK_CLASSIFIER_PATH)
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    positives = [r["text"] for r in rows if r["label"] == 1]
+
+    scores = classifier.score_batch(positives)
+    assert (scores > 0.3).mean() >= 0.9
+
+    start = time.perf_counter()
+    for text in positives:
+        classifier.score(text)
+    assert (time.perf_counter() - start) * 1000 / len(positives) < 1.0
+
+
+def test_lexical_tier_short_circuits_classifier():
+    result = _detector(0.0).assess("pensando em suicidio")
+
+    assert result.risk and result.tier == "lexico" and result.category == "suicidio"
+
+
+def test_classifier_thresholds():
+    assert _detector(0.9).assess("frase indireta").risk
+    assert not _detector(0.1).assess("frase comum").risk
+
+    ambiguous = _detector(0.5).assess("frase ambígua")
+    assert not ambiguous.risk and ambiguous.ambiguous
+
+
+def test_escalation_only_for_ambiguous_scores():
+    calls = []
+
+    def escalate(text):
+        calls.append(text)
+        return True
+
+    assert _detector(0.5, escalate).assess("talvez").tier == "escalonamento"
+    _detector(0.9, escalate).assess("certo")
+    _detector(0.1, escalate).assess("seguro")
+
+    assert calls == ["talvez"]
+
+
+def test_escalation_failure_fails_safe():
+    def escalate(text):
+        raise RuntimeError("timeout")
+
+    assert _detector(0.5, escalate).assess("talvez").risk
+
+
+def test_assess_batch_preserves_order():
+    results = _detector(0.9).assess_batch(["suicidio", "", "indireto"])
+
+    assert [r.tier for r in results] == ["lexico", "lexico", "classificador"]
+    assert [r.risk for r in results] == [True, False, True]
+
+
+def test_check_safety_catches_indirect_phrasing():
+    assert RISK_DETECTOR.classifier is not None
+
+    is_safe, message = check_safety("Não vejo mais sentido em nada")
+    assert not is_safe and message
+    assert check_safety("Como organizar minha rotina de estudos?") == (True, None)
+
+
+def test_faq_intent_phrases_are_not_flagged_as_crisis():
+    with open(INTENTS_PATH, "r", encoding="utf-8") as f:
+        intents = json.load(f)["intents"]
+    phrases = [
+        phrase
+        for intent in intents
+        if intent["display_name"] != "Crisis Support"
+        for phrase in intent["training_phrases"]
+    ]
+
+    flagged = [phrase for phrase in phrases if not check_safety(phrase)[0]]
+
+    assert phrases and flagged == []
+    assert check_safety("Tenho que tomar remédio pra sempre?") == (True, None)
+    assert not check_safety("Quero sumir pra sempre")[0]
+
+
+def test_load_risk_classifier_disabled_or_missing(tmp_path):
+    assert load_risk_classifier("none") is None
+    assert load_risk_classifier(str(tmp_path / "missing.npz")) is None
+
+
+def test_classifier_loaded_on_first_message_past_the_lexicon():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _FixedClassifier(0.9)
+
+    detector = TieredRiskDetector(
+        RiskMatcher({"suicidio": ["suicid"]}), classifier_loader=loader
+    )
+    assert detector.assess("suicidio").tier == "lexico"
+    assert loads == []
+
+    assert detector.assess("indireto").tier == "classificador"
+    detector.assess("outro")
+    assert loads == [1]
+    assert detector.warm_up() >= 0 and loads == [1]
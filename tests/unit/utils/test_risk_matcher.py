@@ -0,0 +1,76 @@
+from src.utils.risk_matcher import RiskMatcher, normalize_for_matching, typo_variants
+from src.utils.safety_filters import check_safety, detect_risk
+
+LEXICON = {
+    "suicidio": ["suicid", "morrer", "acabar com tudo"],
+    "autolesao": ["cortar os pulsos"],
+}
+
+
+def test_normalize_folds_case_accents_and_repeats():
+    assert normalize_for_matching("Suicííídio!!  Agora") == "suicidio agora"
+
+
+def test_typo_variants_keep_first_and_last_letters():
+    variants = typo_variants("suicid")
+
+    assert "sucid" in variants  # letra omitida
+    assert "siucid" in variants  # letras trocadas
+    assert "suisid" in variants  # troca fonética
+    assert all(v[0] == "s" and v[-1] == "d" for v in variants)
+    assert typo_variants("matar") == []
+
+
+def test_matcher_returns_category():
+    matcher = RiskMatcher(LEXICON)
+
+    assert matcher.find("Quero MORRER").category == "suicidio"
+    assert matcher.find("pensei em cortar os pulsos").category == "autolesao"
+    assert matcher.find("O que é TDAH?") is None
+
+
+def test_matcher_requires_word_start():
+    matcher = RiskMatcher(LEXICON)
+
+    assert matcher.find("amorrer") is None
+    assert matcher.find("morreria") is not None
+
+
+def test_matcher_handles_typos():
+    matcher = RiskMatcher(LEXICON)
+
+    for text in ["sucidio", "siucidio", "suicidiooo", "acabar com tdo"]:
+        assert matcher.find(text) is not None, text
+    assert RiskMatcher(LEXICON, typos=False).find("sucidio") is None
+
+
+def test_find_all_lists_every_match_in_order():
+    matcher = RiskMatcher(LEXICON)
+
+    matches = matcher.find_all("vou cortar os pulsos e morrer")
+
+    assert [m.term for m in matches] == ["cortar os pulsos", "morrer"]
+
+
+def test_scanner_matches_across_chunk_boundaries():
+    scanner = RiskMatcher(LEXICON).scanner()
+
+    assert scanner.feed("Às vezes penso em acabar co") is None
+    match = scanner.feed("m tudo.")
+
+    assert match.term == "acabar com tudo"
+    assert scanner.feed("mais texto") == match
+
+
+def test_scanner_collapses_repeats_across_chunks():
+    scanner = RiskMatcher(LEXICON).scanner()
+
+    scanner.feed("quero mor")
+    assert scanner.feed("rer") is not None
+
+
+def test_detect_risk_and_check_safety_use_compiled_lexicon():
+    assert detect_risk("pensando em suicídio").category == "suicidio"
+    assert detect_risk("automutilação").category == "autolesao"
+    assert check_safety("Quero MORRRER")[0] is False
+    assert check_safety("Como organizar meus estudos?") == (True, None)